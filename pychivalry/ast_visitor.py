@@ -0,0 +1,274 @@
+"""
+CK3 AST Visitor - Single-Traversal Dispatch for Diagnostic Checks
+
+MODULE OVERVIEW:
+    Diagnostic modules (paradox_checks.py, diagnostics.py, scope_timing.py,
+    generic_rules_validator.py) each contain many independent checks, and
+    each check used to walk the whole AST on its own. Most checks only care
+    about a handful of keys (option, ai_chance, trigger_if, ...), so nearly
+    all of those walks were wasted.
+
+    This module walks the AST once and hands every node to the checks that
+    registered interest in it. Each check declares what it wants to see:
+
+    - keys: exact node keys (e.g. {"option"})
+    - prefixes / suffixes: key patterns (e.g. ("any_",), ("_portrait",))
+    - visit_all: every node (for checks that track context, like
+      "inside a trigger block")
+    - top_level: only top-level nodes (event definitions, ...)
+
+ARCHITECTURE:
+    **NodeCheck** (subclass per check):
+    - visit(node, ancestors): called for each matching node in pre-order;
+      ``ancestors`` is the live list of enclosing nodes, outermost first
+    - leave(node): called after the node's subtree, for checks that set
+      ``wants_leave`` (to pop context they pushed in visit())
+    - diagnostics: list the check appends to
+    - finish(): called once after the traversal
+
+    **CheckDispatcher**:
+    Resolves, once per distinct key, the tuple of checks interested in it
+    (exact key, prefix, suffix and visit_all matches in registration order)
+    and caches it. The traversal uses an explicit stack, so deep nesting
+    costs no recursion.
+
+    **Error Isolation**:
+    A check that raises is logged and dropped from the rest of the
+    traversal; the diagnostics it produced so far are kept and the other
+    checks are unaffected (matching the per-module try/except the modules
+    use around their own checks).
+
+    **Ordering**:
+    Diagnostics are kept per check. run_checks() concatenates them in
+    registration order, and every check sees nodes in the same pre-order a
+    recursive walk would, so each check reports exactly what (and in the
+    order) its standalone walk did.
+
+USAGE EXAMPLES:
+    >>> class OptionNameCheck(NodeCheck):
+    ...     keys = frozenset({"option"})
+    ...     def visit(self, node, ancestors):
+    ...         if not any(child.key == "name" for child in node.children):
+    ...             self.diagnostics.append(make_diagnostic(node))
+    >>> diagnostics = run_checks(ast, [OptionNameCheck(), OtherCheck()])
+
+PERFORMANCE:
+    - One traversal for any number of checks
+    - Per node: one dict lookup for the interested checks (cached per key)
+    - Checks that only need a few keys cost nothing on other nodes
+
+SEE ALSO:
+    - paradox_checks.py: Paradox convention checks (create_paradox_checks)
+    - diagnostics.py: Semantic and scope checks, collect_all_diagnostics()
+    - scope_timing.py, generic_rules_validator.py: further registered checks
+"""
+
+import logging
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from lsprotocol import types
+
+from .cancellation import CancellationToken
+from .parser import CK3Node
+
+logger = logging.getLogger(__name__)
+
+
+class NodeCheck:
+    """
+    Base class for a diagnostic check run by a CheckDispatcher.
+
+    Subclasses set the class attributes describing which nodes they want
+    and implement visit() (and leave(), with ``wants_leave = True``).
+    """
+
+    # Exact node keys to visit
+    keys: FrozenSet[str] = frozenset()
+    # Key prefixes / suffixes to visit
+    prefixes: Tuple[str, ...] = ()
+    suffixes: Tuple[str, ...] = ()
+    # Visit every node (overrides the key filters)
+    visit_all: bool = False
+    # Visit every top-level node (in addition to the key filters)
+    top_level: bool = False
+    # Call leave() after the subtree of each visited node
+    wants_leave: bool = False
+
+    def __init__(self):
+        self.diagnostics: List[types.Diagnostic] = []
+
+    def matches(self, key: str) -> bool:
+        """Whether nodes with this key are visited (top_level aside)."""
+        return (
+            self.visit_all
+            or key in self.keys
+            or (bool(self.prefixes) and key.startswith(self.prefixes))
+            or (bool(self.suffixes) and key.endswith(self.suffixes))
+        )
+
+    def visit(self, node: CK3Node, ancestors: Sequence[CK3Node]):
+        """
+        Inspect one node.
+
+        Args:
+            node: The node
+            ancestors: Enclosing nodes, outermost first (do not modify)
+        """
+
+    def leave(self, node: CK3Node):
+        """Called after the subtree of a visited node (if wants_leave)."""
+
+    def finish(self):
+        """Called once after the traversal."""
+
+
+class CheckDispatcher:
+    """
+    Runs a set of NodeChecks over an AST in a single traversal.
+    """
+
+    def __init__(self, checks: Sequence[NodeCheck]):
+        """
+        Args:
+            checks: Checks to run, in the order their diagnostics are reported
+        """
+        self.checks = list(checks)
+        # Checks that raised (dropped from the rest of the traversal)
+        self.failed: set = set()
+        self._by_key: Dict[str, Tuple[NodeCheck, ...]] = {}
+        self._top_level = tuple(check for check in self.checks if check.top_level)
+
+    def _checks_for(self, key: str) -> Tuple[NodeCheck, ...]:
+        """Checks interested in a key (resolved once per distinct key)."""
+        checks = self._by_key.get(key)
+        if checks is None:
+            checks = self._by_key[key] = tuple(
+                check
+                for check in self.checks
+                if check.matches(key) and check not in self.failed
+            )
+        return checks
+
+    def _fail(self, check: NodeCheck, error: Exception):
+        """Drop a check that raised from the rest of the traversal."""
+        logger.error(f"Error in {type(check).__name__}: {error}", exc_info=True)
+        self.failed.add(check)
+        self._by_key.clear()
+        self._top_level = tuple(c for c in self._top_level if c is not check)
+
+    def _call(self, check: NodeCheck, method, *args):
+        """Call a check hook, dropping the check if it raises."""
+        if check in self.failed:
+            return
+        try:
+            method(*args)
+        except Exception as e:
+            self._fail(check, e)
+
+    def run(
+        self, ast: List[CK3Node], cancel: Optional[CancellationToken] = None
+    ) -> List[List[types.Diagnostic]]:
+        """
+        Traverse the AST once, dispatching nodes to interested checks.
+
+        Args:
+            ast: Top-level AST nodes
+            cancel: Checked before each top-level node
+
+        Returns:
+            Diagnostics of each check, in check order
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
+        """
+        for node in ast:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            self.run_block(node)
+        return self.finish()
+
+    def run_block(self, node: CK3Node):
+        """
+        Traverse one top-level node and its subtree.
+
+        run() is run_block() for each top-level node followed by finish();
+        callers that skip unchanged blocks (BlockDiagnosticCache) call the
+        two directly.
+
+        Args:
+            node: Top-level AST node
+        """
+        checks_for = self._checks_for
+        ancestors: List[CK3Node] = []
+        # Checks owed a leave() call, parallel to ancestors
+        leaving: List[Tuple[NodeCheck, ...]] = []
+        stack = [(node, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+            while len(ancestors) > depth:
+                self._leave(ancestors.pop(), leaving.pop())
+
+            interested = checks_for(node.key)
+            if depth == 0 and self._top_level:
+                interested = interested + tuple(
+                    check for check in self._top_level if check not in interested
+                )
+            for check in interested:
+                # Inlined _call(): this is the hot path. Checks that failed
+                # are no longer returned by checks_for().
+                try:
+                    check.visit(node, ancestors)
+                except Exception as e:
+                    self._fail(check, e)
+
+            children = node.children
+            if children:
+                ancestors.append(node)
+                leaving.append(tuple(check for check in interested if check.wants_leave))
+                stack.extend((child, depth + 1) for child in reversed(children))
+            else:
+                for check in interested:
+                    if check.wants_leave:
+                        self._call(check, check.leave, node)
+
+        while ancestors:
+            self._leave(ancestors.pop(), leaving.pop())
+
+    def finish(self) -> List[List[types.Diagnostic]]:
+        """
+        End the traversal (calls each check's finish()).
+
+        Returns:
+            Diagnostics of each check, in check order
+        """
+        for check in self.checks:
+            self._call(check, check.finish)
+        return [check.diagnostics for check in self.checks]
+
+    def _leave(self, node: CK3Node, checks: Tuple[NodeCheck, ...]):
+        """Send leave() for a node whose subtree is done."""
+        for check in checks:
+            self._call(check, check.leave, node)
+
+
+def run_checks(
+    ast: List[CK3Node],
+    checks: Sequence[NodeCheck],
+    cancel: Optional[CancellationToken] = None,
+) -> List[types.Diagnostic]:
+    """
+    Run checks over an AST in one traversal.
+
+    Args:
+        ast: Top-level AST nodes
+        checks: Checks to run
+        cancel: Checked before each top-level node
+
+    Returns:
+        Diagnostics of all checks, grouped by check in the given order
+    """
+    diagnostics: List[types.Diagnostic] = []
+    for check_diagnostics in CheckDispatcher(checks).run(ast, cancel):
+        diagnostics.extend(check_diagnostics)
+    return diagnostics
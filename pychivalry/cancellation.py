@@ -0,0 +1,106 @@
+"""
+CK3 Cancellation Tokens - Stopping Work Whose Result Nobody Wants
+
+MODULE OVERVIEW:
+    Diagnostics, semantic tokens and workspace scans run in worker threads.
+    Once started, a thread cannot be stopped from outside: a diagnostics run
+    for a document version that was edited meanwhile used to run to the
+    end, and its result was then thrown away. During fast typing on large
+    files, that stale work is most of the CPU the server uses.
+
+    A CancellationToken is passed into the long-running functions, which
+    check it at natural boundaries (each top-level block, every few dozen
+    lines, each scanned file) and stop by raising OperationCancelled.
+
+ARCHITECTURE:
+    **Tokens**:
+    A token is cancelled explicitly (cancel(), e.g. on $/cancelRequest) or
+    by a condition polled on each check, such as "the document version
+    changed". Once the condition returns true, the token stays cancelled.
+    Tokens are callable, so a token can be passed wherever an
+    ``is_cancelled`` callback is expected (workspace_validation.py).
+
+    **OperationCancelled**:
+    Derives from BaseException, like asyncio.CancelledError: the diagnostic
+    pipeline wraps every check in ``except Exception`` so that one broken
+    check cannot hide the others, and a cancellation must get through all
+    of them instead of being logged and swallowed as a check failure.
+
+    **Granularity**:
+    Checks are cheap (an attribute read, or one call of the condition), but
+    not free, so code checks per top-level block or per batch of lines,
+    not per node. A stale run stops within one block.
+
+USAGE EXAMPLES:
+    >>> token = CancellationToken(lambda: server.get_document_version(uri) != version)
+    >>> try:
+    ...     diagnostics = collect_all_diagnostics(doc, ast, index, cancel=token)
+    ... except OperationCancelled:
+    ...     return  # A newer version is being validated
+
+PERFORMANCE:
+    - A stale diagnostics run stops after its current top-level block
+    - Cancellation costs nothing when no token is passed (cancel=None)
+
+SEE ALSO:
+    - server.py: tokens per document update and per request
+    - diagnostics.py: collect_all_diagnostics(..., cancel=...)
+    - indexer.py: scan_workspace(..., cancel=...)
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class OperationCancelled(BaseException):
+    """Raised by code that stops because its CancellationToken was cancelled."""
+
+
+class CancellationToken:
+    """
+    Flag telling long-running work to stop.
+
+    Thread-safe: cancel() may be called from any thread while the work
+    checks the token in another.
+    """
+
+    __slots__ = ("_event", "_condition")
+
+    def __init__(self, condition: Optional[Callable[[], bool]] = None):
+        """
+        Create a token.
+
+        Args:
+            condition: Polled by each check; the token is cancelled once it
+                returns true (e.g. when the document changed)
+        """
+        self._event = threading.Event()
+        self._condition = condition
+
+    def cancel(self):
+        """Cancel the token."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the work should stop."""
+        if self._event.is_set():
+            return True
+        if self._condition is not None and self._condition():
+            self._event.set()
+            return True
+        return False
+
+    def __call__(self) -> bool:
+        """Same as ``cancelled`` (for ``is_cancelled`` callbacks)."""
+        return self.cancelled
+
+    def raise_if_cancelled(self):
+        """
+        Stop the calling code if the token is cancelled.
+
+        Raises:
+            OperationCancelled: If the token is cancelled
+        """
+        if self.cancelled:
+            raise OperationCancelled()
@@ -74,7 +74,7 @@ LENS ACTIONS:
 
 PERFORMANCE:
     - Initial lens generation: ~10ms per 1000 lines
-    - Lens resolution: ~5ms per lens (workspace scan)
+    - Lens resolution: reference counts from the index (no file scanning)
     - Cached results: ~1ms per lens
     - Batch resolution: ~50ms for 20 lenses
     
@@ -584,9 +584,8 @@ def _analyze_event(
     if not document_index:
         return ref_count, trigger_event_count, missing_loc
 
-    # Count references by searching all indexed events and their content
-    # This is a simplified count - full implementation would search ASTs
-    # For now, we count based on event existence in index
+    # Count references from the workspace reference index
+    ref_count = document_index.count_references(event_id, {"event"})
 
     # Check for expected localization keys
     expected_keys = [
@@ -621,11 +620,11 @@ def _count_symbol_usages(
         document_index: Index with workspace symbols
 
     Returns:
-        Number of usages found (approximate)
+        Number of usages found in indexed workspace files
     """
-    # This is a placeholder - full implementation would search all ASTs
-    # For now, return 0 to indicate we'd need to search
-    return 0
+    if not document_index:
+        return 0
+    return document_index.count_references(symbol_name, {"scripted_effect", "scripted_trigger"})
 
 
 def resolve_code_lens(
@@ -0,0 +1,347 @@
+"""
+CK3 Compact AST - Array-Backed Storage for Parsed Documents
+
+MODULE OVERVIEW:
+    A CK3Node tree costs several Python objects per node: the node itself, a
+    Range with two Positions, a children list and the key/value strings.
+    That is fine for the documents being edited, but ASTs kept around for
+    files nobody is looking at (the content-hash LRU cache, closed files
+    indexed in the background) multiply it across the workspace.
+
+    CompactAST stores the same tree in parallel integer columns and a small
+    string table, and materializes CK3Node objects only when asked.
+
+ARCHITECTURE:
+    **Columns** (one array('i') entry per node, nodes in pre-order):
+    - type, key, value, scope_type: ids into the string table
+    - start_line, start_char, end_line, end_char: node range
+    - parent, first_child, next_sibling: node indices (-1 = none)
+
+    Pre-order numbering keeps every subtree contiguous, and a node's
+    parent always comes before it, so materializing is one forward pass.
+
+    **String Table**:
+    Distinct strings per AST, passed through sys.intern() so that keys
+    repeated across files (trigger, limit, add_gold, ...) are shared.
+    Non-string values (None, numbers) are stored as-is.
+
+    **Views**:
+    CompactNode is a two-slot view (AST, index) exposing the CK3Node
+    attributes (type, key, value, range, parent, children, scope_type).
+    Ranges and child lists are built on access; materialize() turns a view
+    back into a CK3Node subtree.
+
+USAGE EXAMPLES:
+    >>> compact = CompactAST.from_nodes(parse_document("a = { b = c }"))
+    >>> len(compact)
+    2
+    >>> root = compact.roots()[0]
+    >>> root.key, root.children[0].value
+    ('a', 'c')
+    >>> compact.to_nodes()[0].children[0].range.start
+    Position(line=0, character=6)
+
+PERFORMANCE:
+    - Storage: 44 bytes per node in the columns, plus each distinct string
+      once (a CK3Node tree is ~400 bytes per node)
+    - from_nodes(): one pass over the tree
+    - to_nodes(): one pass, cheaper than re-parsing (no tokenizing)
+
+SEE ALSO:
+    - parser.py: CK3Node and parse_document()
+    - server.py: AST cache (stores CompactAST entries)
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+from lsprotocol import types
+
+from pychivalry.parser import CK3Node
+
+_COLUMNS = (
+    "_type",
+    "_key",
+    "_value",
+    "_scope",
+    "_start_line",
+    "_start_char",
+    "_end_line",
+    "_end_char",
+    "_parent",
+    "_first_child",
+    "_next_sibling",
+)
+
+
+class CompactAST:
+    """
+    An AST (list of top-level CK3Nodes) stored in parallel integer arrays.
+
+    Build one with from_nodes(); read it through roots()/node() views or
+    materialize the whole tree with to_nodes(). Instances are immutable.
+    """
+
+    __slots__ = _COLUMNS + ("_strings", "_roots")
+
+    def __init__(self):
+        """Create an empty compact AST (use from_nodes() to fill one)."""
+        for column in _COLUMNS:
+            setattr(self, column, array("i"))
+        self._strings: List[Any] = []
+        self._roots = array("i")
+
+    @classmethod
+    def from_nodes(cls, nodes: List[CK3Node]) -> "CompactAST":
+        """
+        Convert top-level CK3Nodes (and all descendants) to compact form.
+
+        Args:
+            nodes: Top-level AST nodes, as returned by parse_document()
+
+        Returns:
+            CompactAST holding the same tree
+        """
+        compact = cls()
+        strings = compact._strings
+        string_ids: Dict[Any, int] = {}
+
+        def string_id(value: Any) -> int:
+            # Non-strings are keyed with their type so that 1 and True stay distinct
+            lookup = value if type(value) is str else (type(value), value)
+            sid = string_ids.get(lookup)
+            if sid is None:
+                sid = string_ids[lookup] = len(strings)
+                strings.append(sys.intern(value) if type(value) is str else value)
+            return sid
+
+        node_type = compact._type
+        key = compact._key
+        value = compact._value
+        scope = compact._scope
+        start_line = compact._start_line
+        start_char = compact._start_char
+        end_line = compact._end_line
+        end_char = compact._end_char
+        parent = compact._parent
+        first_child = compact._first_child
+        next_sibling = compact._next_sibling
+
+        # (node, parent index), popped in pre-order
+        stack = [(node, -1) for node in reversed(nodes)]
+        # Last child index seen per parent, to link siblings
+        last_child: Dict[int, int] = {}
+        while stack:
+            node, parent_index = stack.pop()
+            index = len(node_type)
+            node_range = node.range
+            node_type.append(string_id(node.type))
+            key.append(string_id(node.key))
+            value.append(string_id(node.value))
+            scope.append(string_id(node.scope_type))
+            start_line.append(node_range.start.line)
+            start_char.append(node_range.start.character)
+            end_line.append(node_range.end.line)
+            end_char.append(node_range.end.character)
+            parent.append(parent_index)
+            first_child.append(-1)
+            next_sibling.append(-1)
+
+            previous = last_child.get(parent_index)
+            if previous is not None:
+                next_sibling[previous] = index
+            elif parent_index >= 0:
+                first_child[parent_index] = index
+            last_child[parent_index] = index
+            if parent_index < 0:
+                compact._roots.append(index)
+
+            children = node.children
+            if children:
+                stack.extend((child, index) for child in reversed(children))
+        return compact
+
+    def __len__(self) -> int:
+        """Number of nodes (all depths)."""
+        return len(self._type)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the column arrays (excluding the string table)."""
+        return sum(
+            getattr(self, column).itemsize * len(getattr(self, column))
+            for column in _COLUMNS + ("_roots",)
+        )
+
+    def node(self, index: int) -> "CompactNode":
+        """View of the node at a pre-order index."""
+        if not 0 <= index < len(self._type):
+            raise IndexError(index)
+        return CompactNode(self, index)
+
+    def roots(self) -> List["CompactNode"]:
+        """Views of the top-level nodes."""
+        return [CompactNode(self, index) for index in self._roots]
+
+    def _child_indices(self, index: int) -> List[int]:
+        """Indices of a node's children, in order."""
+        next_sibling = self._next_sibling
+        result = []
+        child = self._first_child[index]
+        while child >= 0:
+            result.append(child)
+            child = next_sibling[child]
+        return result
+
+    def _range(self, index: int) -> types.Range:
+        """Build the LSP Range of a node."""
+        return types.Range(
+            start=types.Position(line=self._start_line[index], character=self._start_char[index]),
+            end=types.Position(line=self._end_line[index], character=self._end_char[index]),
+        )
+
+    def to_nodes(self) -> List[CK3Node]:
+        """
+        Materialize the whole tree as new CK3Node objects.
+
+        Returns:
+            Top-level nodes, equal to the nodes this AST was built from
+        """
+        return self._materialize(0, len(self._type), None)
+
+    def _materialize(
+        self, begin: int, end: int, root_parent: Optional[CK3Node]
+    ) -> List[CK3Node]:
+        """
+        Materialize the nodes in [begin, end), a run of whole subtrees.
+
+        Args:
+            begin: First pre-order index
+            end: One past the last pre-order index
+            root_parent: Parent assigned to nodes whose parent is outside the run
+
+        Returns:
+            The run's top-level nodes
+        """
+        strings = self._strings
+        node_type = self._type
+        key = self._key
+        value = self._value
+        scope = self._scope
+        start_line = self._start_line
+        start_char = self._start_char
+        end_line = self._end_line
+        end_char = self._end_char
+        parent = self._parent
+        Position = types.Position
+        Range = types.Range
+
+        built: List[Optional[CK3Node]] = [None] * (end - begin)
+        top: List[CK3Node] = []
+        for index in range(begin, end):
+            parent_index = parent[index]
+            parent_node = built[parent_index - begin] if parent_index >= begin else root_parent
+            node = CK3Node(
+                type=strings[node_type[index]],
+                key=strings[key[index]],
+                value=strings[value[index]],
+                range=Range(
+                    start=Position(line=start_line[index], character=start_char[index]),
+                    end=Position(line=end_line[index], character=end_char[index]),
+                ),
+                parent=parent_node,
+                scope_type=strings[scope[index]],
+            )
+            built[index - begin] = node
+            if parent_index >= begin:
+                parent_node.children.append(node)
+            else:
+                top.append(node)
+        return top
+
+    def _subtree_end(self, index: int) -> int:
+        """One past the last pre-order index of a node's subtree."""
+        parent = self._parent
+        count = len(self._type)
+        while index >= 0:
+            sibling = self._next_sibling[index]
+            if sibling >= 0:
+                return sibling
+            index = parent[index]
+        return count
+
+
+class CompactNode:
+    """
+    Read-only view of one node in a CompactAST.
+
+    Exposes the same attributes as CK3Node; values are read from the arrays
+    on access. Views compare equal when they refer to the same node.
+    """
+
+    __slots__ = ("_ast", "_index")
+
+    def __init__(self, ast: CompactAST, index: int):
+        self._ast = ast
+        self._index = index
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, CompactNode)
+            and self._ast is other._ast
+            and self._index == other._index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._ast), self._index))
+
+    def __repr__(self) -> str:
+        return f"CompactNode(type={self.type!r}, key={self.key!r}, index={self._index})"
+
+    @property
+    def index(self) -> int:
+        """Pre-order index of the node in its AST."""
+        return self._index
+
+    @property
+    def type(self) -> str:
+        return self._ast._strings[self._ast._type[self._index]]
+
+    @property
+    def key(self) -> str:
+        return self._ast._strings[self._ast._key[self._index]]
+
+    @property
+    def value(self) -> Any:
+        return self._ast._strings[self._ast._value[self._index]]
+
+    @property
+    def scope_type(self) -> str:
+        return self._ast._strings[self._ast._scope[self._index]]
+
+    @property
+    def range(self) -> types.Range:
+        return self._ast._range(self._index)
+
+    @property
+    def parent(self) -> Optional["CompactNode"]:
+        parent_index = self._ast._parent[self._index]
+        return CompactNode(self._ast, parent_index) if parent_index >= 0 else None
+
+    @property
+    def children(self) -> List["CompactNode"]:
+        return [CompactNode(self._ast, child) for child in self._ast._child_indices(self._index)]
+
+    def materialize(self, parent: Optional[CK3Node] = None) -> CK3Node:
+        """
+        Build a CK3Node for this node and its descendants.
+
+        Args:
+            parent: Parent assigned to the returned node (None by default)
+
+        Returns:
+            New CK3Node subtree
+        """
+        end = self._ast._subtree_end(self._index)
+        return self._ast._materialize(self._index, end, parent)[0]
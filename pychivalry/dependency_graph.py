@@ -0,0 +1,115 @@
+"""
+CK3 Dependency Graph - Which Open Documents Use Which Symbols
+
+MODULE OVERVIEW:
+    Diagnostics of a document depend on symbols defined in other files: an
+    event calling ``my_effect = yes`` shows "Unknown effect" until
+    common/scripted_effects/ defines my_effect. When such a definition is
+    added, removed or renamed, the documents using it must be validated
+    again, but only those.
+
+    DependencyGraph is the reverse map from symbol name to the open
+    documents that use it. The server feeds it the node keys of each
+    validated document and asks it for the dependents of the symbols an
+    index update added or removed.
+
+ARCHITECTURE:
+    **Symbols as Node Keys**:
+    Diagnostics look symbols up by node key (see
+    DocumentIndex.dependency_symbols), so a document depends on exactly
+    the keys of its AST. Saved scopes are keyed "scope:<name>", as they
+    appear in scripts.
+
+    **Forward and Reverse Maps**:
+    - uri -> keys of the document (to update incrementally)
+    - key -> uris using it (to answer dependents())
+
+    update() applies only the difference to the previous keys, so
+    re-validating a document after a small edit touches a few entries.
+
+    **Threading**:
+    All methods take an internal lock; diagnostics run in the thread pool
+    while index updates happen on the event loop.
+
+USAGE EXAMPLES:
+    >>> graph = DependencyGraph()
+    >>> graph.update("file:///events/a.txt", frozenset({"a.0001", "my_effect"}))
+    >>> graph.dependents({"my_effect", "other"})
+    {'file:///events/a.txt'}
+
+PERFORMANCE:
+    - update(): O(keys added or removed since the last update)
+    - dependents(): O(number of symbols asked for)
+
+SEE ALSO:
+    - diagnostic_cache.py: BlockDiagnosticCache.keys (the keys fed in)
+    - indexer.py: DocumentIndex.document_dependency_symbols()
+    - server.py: revalidate_dependents() and the revalidation queue
+"""
+
+import threading
+from typing import Dict, FrozenSet, Iterable, Set
+
+
+class DependencyGraph:
+    """
+    Reverse dependency map: symbol name -> URIs of the documents using it.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, FrozenSet[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, uri: str, keys: FrozenSet[str]):
+        """
+        Set the symbols a document uses.
+
+        Args:
+            uri: Document URI
+            keys: All node keys of the document's AST
+        """
+        with self._lock:
+            previous = self._keys.get(uri, frozenset())
+            if previous is keys:
+                return
+            for key in previous - keys:
+                self._discard(key, uri)
+            for key in keys - previous:
+                self._dependents.setdefault(key, set()).add(uri)
+            self._keys[uri] = keys
+
+    def remove(self, uri: str):
+        """
+        Forget a document (when it is closed).
+
+        Args:
+            uri: Document URI
+        """
+        with self._lock:
+            for key in self._keys.pop(uri, ()):
+                self._discard(key, uri)
+
+    def dependents(self, symbols: Iterable[str]) -> Set[str]:
+        """
+        Documents using any of the given symbols.
+
+        Args:
+            symbols: Symbol names (saved scopes as "scope:<name>")
+
+        Returns:
+            Set of document URIs
+        """
+        uris: Set[str] = set()
+        with self._lock:
+            for symbol in symbols:
+                uris.update(self._dependents.get(symbol, ()))
+        return uris
+
+    def _discard(self, key: str, uri: str):
+        """Remove one key -> uri edge (lock held)."""
+        uris = self._dependents.get(key)
+        if uris is not None:
+            uris.discard(uri)
+            if not uris:
+                del self._dependents[key]
@@ -132,6 +132,8 @@ LSP INTEGRATION:
 
 SEE ALSO:
     - parser.py: AST for semantic analysis
+    - ast_visitor.py: Single-traversal dispatch of the AST checks
+    - diagnostic_cache.py: Per-block caching of the AST check results
     - scope_timing.py: Timing validation
     - paradox_checks.py: Convention validation
     - style_checks.py: Style validation
@@ -140,20 +142,27 @@ SEE ALSO:
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from lsprotocol import types
 from pygls.workspace import TextDocument
 
 from .parser import CK3Node
 from .indexer import DocumentIndex
+from .ast_visitor import CheckDispatcher, NodeCheck, run_checks
+from .cancellation import CancellationToken
+from .diagnostic_cache import BlockDiagnosticCache
 from .scopes import (
     validate_scope_chain,
     is_valid_list_base,
     parse_list_iterator,
 )
 from .ck3_language import CK3_EFFECTS, CK3_TRIGGERS, CK3_SCOPES
+
 import logging
 
+if TYPE_CHECKING:
+    from .style_checks import StyleScanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -186,7 +195,9 @@ def create_diagnostic(
     )
 
 
-def check_syntax(doc: TextDocument, ast: List[CK3Node]) -> List[types.Diagnostic]:
+def check_syntax(
+    doc: TextDocument, ast: List[CK3Node], lines: Optional[List[str]] = None
+) -> List[types.Diagnostic]:
     """
     Check for syntax errors in the document.
 
@@ -197,6 +208,7 @@ def check_syntax(doc: TextDocument, ast: List[CK3Node]) -> List[types.Diagnostic
     Args:
         doc: The text document to check
         ast: Parsed AST (may be incomplete if syntax errors exist)
+        lines: ``doc.source.split("\\n")``, if the caller already has it
 
     Returns:
         List of syntax error diagnostics
@@ -205,7 +217,8 @@ def check_syntax(doc: TextDocument, ast: List[CK3Node]) -> List[types.Diagnostic
 
     # Check bracket matching
     stack = []
-    lines = doc.source.split("\n")
+    if lines is None:
+        lines = doc.source.split("\n")
     total_lines = len(lines)
 
     for line_num, line in enumerate(lines):
@@ -306,274 +319,257 @@ def check_syntax(doc: TextDocument, ast: List[CK3Node]) -> List[types.Diagnostic
     return diagnostics
 
 
-def check_trait_references(ast: List[CK3Node]) -> List[types.Diagnostic]:
-    """
-    Validate trait references in has_trait, add_trait, remove_trait.
-    
-    This validation is OPTIONAL and requires user-extracted trait data.
-    If trait data is not available, this check is silently skipped.
-    
-    Detects:
-    - CK3451: Unknown trait referenced
-    
-    Args:
-        ast: Parsed AST nodes
-        
-    Returns:
-        List of diagnostics for invalid trait references,
-        or empty list if trait data not available
-        
-    Note:
-        Trait data must be extracted by users from their own CK3 installation
-        using the VS Code command "PyChivalry: Extract Trait Data from CK3 Installation"
-        due to copyright restrictions.
-    """
-    from pychivalry.traits import is_trait_data_available, is_valid_trait, suggest_similar_traits
-    
-    # Skip trait validation if data not available (user hasn't extracted it)
-    if not is_trait_data_available():
-        logger.debug("Trait data not available - skipping trait validation")
-        return []
-    
-    diagnostics = []
-    
+# Effect parameters - these are arguments to effects, not effects themselves
+# Map of parent_effect -> valid parameter names
+_EFFECT_PARAMETERS = {
+    # Opinion effects
+    "add_opinion": {"target", "modifier", "opinion", "years"},
+    "reverse_add_opinion": {"target", "modifier", "opinion", "years"},
+    "remove_opinion": {"target", "modifier"},
+    # Modifier effects
+    "add_character_modifier": {"modifier", "years", "months", "days", "stacking"},
+    "remove_character_modifier": {"modifier"},
+    "add_county_modifier": {"modifier", "years", "months", "days"},
+    "add_province_modifier": {"modifier", "years", "months", "days"},
+    # Trait effects
+    "add_trait": {"trait", "track", "value"},
+    "remove_trait": {"trait"},
+    # Stress effects
+    "add_stress": {"trait"},
+    # Interaction effects
+    "open_interaction_window": {
+        "interaction",
+        "actor",
+        "recipient",
+        "secondary_actor",
+        "secondary_recipient",
+    },
+    # Event effects
+    "trigger_event": {"id", "days", "weeks", "months", "years", "on_action", "delayed"},
+    # Relation effects
+    "set_relation_lover": {"target", "reason", "copy_reason"},
+    "set_relation_friend": {"target", "reason", "copy_reason"},
+    "set_relation_rival": {"target", "reason", "copy_reason"},
+    "set_relation_best_friend": {"target", "reason", "copy_reason"},
+    "set_relation_nemesis": {"target", "reason", "copy_reason"},
+    "remove_relation_lover": {"target"},
+    "remove_relation_friend": {"target"},
+    "remove_relation_rival": {"target"},
+    # Create character effects
+    "create_character": {
+        "template",
+        "location",
+        "culture",
+        "faith",
+        "dynasty",
+        "gender",
+        "name",
+        "age",
+        "trait",
+        "employer",
+        "father",
+        "mother",
+        "save_scope_as",
+    },
+    # Scope save
+    "save_scope_as": {},  # Takes string value directly
+    "save_temporary_scope_as": {},
+    # Random effects
+    "random": {"chance", "modifier"},
+    "random_list": {},  # Children are weights
+    # Death
+    "death": {"death_reason", "killer"},
+    # Flag effects
+    "add_character_flag": {"flag", "years", "months", "days"},
+    "remove_character_flag": {"flag"},
+    # Marriage
+    "marry": {"target"},
+    "marry_matrilineal": {"target"},
+    # Title effects
+    "create_title_and_vassal_change": {"type", "save_scope_as", "add_claim_on_loss"},
+    "change_title_holder": {"holder", "change", "take_baronies"},
+    # War effects
+    "start_war": {"casus_belli", "target", "target_title", "claimant"},
+    # Duel effects
+    "duel": {"target", "skill", "value", "on_success", "on_failure"},
+    # Send interface message
+    "send_interface_message": {"type", "title", "desc", "left_icon", "right_icon", "goto"},
+    "send_interface_toast": {"type", "title", "desc", "left_icon", "right_icon"},
+    # Custom tooltip
+    "custom_tooltip": {},  # Takes string value
+    # Scheme effects
+    "start_scheme": {"type", "target"},
+    # Show as tooltip
+    "show_as_tooltip": {},  # Children are effects to show
+    # Hidden effect
+    "hidden_effect": {},  # Children are effects
+    # Every/any/random list iterators - have 'limit' as parameter
+    "every_": {
+        "limit",
+        "alternative",
+        "order_by",
+        "position",
+        "min",
+        "max",
+        "check_range_bounds",
+    },
+    "any_": {"limit", "count", "percent"},
+    "random_": {"limit", "weight", "alternative"},
+    "ordered_": {"limit", "order_by", "position", "min", "max", "check_range_bounds"},
+    # Set variable effects
+    "set_variable": {"name", "value", "days", "years", "months"},
+    "change_variable": {"name", "add", "subtract", "multiply", "divide"},
+    "clamp_variable": {"name", "min", "max"},
+    # Script values use base/add/multiply etc
+    "script_value": {"base", "add", "multiply", "divide", "min", "max", "desc"},
+}
+
+# Common parameters that are valid in many contexts
+_COMMON_PARAMETERS = {
+    "target",
+    "modifier",
+    "limit",
+    "weight",
+    "years",
+    "months",
+    "days",
+    "opinion",
+    "reason",
+    "save_scope_as",
+    "value",
+    "min",
+    "max",
+    "desc",
+    "title",
+    "type",
+    "name",
+    "holder",
+    "skill",
+    # Script value components
+    "base",
+    "add",
+    "subtract",
+    "multiply",
+    "divide",
+    # Random list weights
+    "modifier",
+    "trigger",
+    "effect",
+    # Common block types
+    "alternative",
+    "fallback",
+    "on_success",
+    "on_failure",
+}
+
+
+def _is_effect_parameter(key: str) -> bool:
+    """Check if a key looks like an effect parameter (ALL_CAPS or known param)."""
+    # All uppercase words are typically effect parameters/arguments
+    return key.isupper() or key in _COMMON_PARAMETERS
+
+
+def _get_parent_effect_params(parent_key: str) -> set:
+    """Get valid parameters for a parent effect."""
+    # Direct lookup
+    if parent_key in _EFFECT_PARAMETERS:
+        return _EFFECT_PARAMETERS[parent_key]
+    # Check prefixes for list iterators
+    for prefix in ["every_", "any_", "random_", "ordered_"]:
+        if parent_key.startswith(prefix):
+            return _EFFECT_PARAMETERS.get(prefix, set())
+    return set()
+
+
+def _is_event_id(key: str) -> bool:
+    """Check if a key looks like an event ID (e.g., namespace.0001)."""
+    if "." not in key:
+        return False
+    parts = key.split(".")
+    # Event IDs typically have format: namespace.number (e.g., test_events.0001)
+    if len(parts) == 2:
+        # Check if second part is numeric (event ID)
+        try:
+            int(parts[1])
+            return True
+        except ValueError:
+            pass
+    return False
+
+
+class TraitReferenceCheck(NodeCheck):
+    """CK3451: Unknown trait in has_trait, add_trait, remove_trait."""
+
     # Trait reference effects/triggers
-    trait_keywords = {'has_trait', 'add_trait', 'remove_trait'}
-    
-    def check_node(node: CK3Node):
-        if node.key in trait_keywords and node.value:
-            trait_name = node.value.strip()
-            
-            # Skip if it's a variable or scope reference
-            if trait_name.startswith('var:') or trait_name.startswith('scope:') or trait_name.startswith('local_var:') or trait_name.startswith('global_var:'):
-                return
-            
-            # Validate trait exists
-            if not is_valid_trait(trait_name):
-                # Get suggestions
-                suggestions = suggest_similar_traits(trait_name, max_suggestions=3)
-                
-                # Build message with suggestions
-                message = f"Unknown trait '{trait_name}'"
-                if suggestions:
-                    message += f". Did you mean: {', '.join(suggestions)}?"
-                
-                diagnostics.append(
-                    create_diagnostic(
-                        message=message,
-                        range_=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3451",
-                    )
+    keys = frozenset({"has_trait", "add_trait", "remove_trait"})
+
+    def visit(self, node: CK3Node, ancestors):
+        from pychivalry.traits import is_valid_trait, suggest_similar_traits
+
+        if not node.value:
+            return
+        trait_name = node.value.strip()
+
+        # Skip if it's a variable or scope reference
+        if trait_name.startswith('var:') or trait_name.startswith('scope:') or trait_name.startswith('local_var:') or trait_name.startswith('global_var:'):
+            return
+
+        # Validate trait exists
+        if not is_valid_trait(trait_name):
+            # Get suggestions
+            suggestions = suggest_similar_traits(trait_name, max_suggestions=3)
+
+            # Build message with suggestions
+            message = f"Unknown trait '{trait_name}'"
+            if suggestions:
+                message += f". Did you mean: {', '.join(suggestions)}?"
+
+            self.diagnostics.append(
+                create_diagnostic(
+                    message=message,
+                    range_=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3451",
                 )
-        
-        # Recurse into children
-        for child in node.children:
-            check_node(child)
-    
-    for node in ast:
-        check_node(node)
-    
-    return diagnostics
+            )
 
 
-def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[types.Diagnostic]:
+class SemanticCheck(NodeCheck):
     """
-    Check for semantic errors in the AST.
+    CK3101-CK3103: Unknown triggers/effects and effects in trigger blocks.
 
-    Validates:
-    - Unknown effects and triggers
-    - Effects in trigger blocks
-    - Triggers in effect blocks (warnings)
-    - Undefined event references
-    - Custom scripted effects/triggers (from workspace index)
-    - Trait references (CK3451)
+    The block context (trigger/effect/option) of each node is kept on a
+    stack pushed in visit() and popped in leave().
+    """
 
-    Args:
-        ast: Parsed AST
-        index: Document index for cross-file validation (optional)
+    visit_all = True
+    wants_leave = True
 
-    Returns:
-        List of semantic diagnostics
-    """
-    diagnostics = []
-    
-    # Check trait references first (fast validation)
-    diagnostics.extend(check_trait_references(ast))
-
-    # Get custom effects/triggers from workspace index
-    custom_effects = index.get_all_scripted_effects() if index else set()
-    custom_triggers = index.get_all_scripted_triggers() if index else set()
-
-    # Get custom modifiers and opinion modifiers from workspace index
-    custom_modifiers = set(index.modifiers.keys()) if index else set()
-    custom_opinion_modifiers = set(index.opinion_modifiers.keys()) if index else set()
-
-    # Combined sets for validation
-    all_known_effects = set(CK3_EFFECTS) | custom_effects
-    all_known_triggers = set(CK3_TRIGGERS) | custom_triggers
-
-    # Effect parameters - these are arguments to effects, not effects themselves
-    # Map of parent_effect -> valid parameter names
-    EFFECT_PARAMETERS = {
-        # Opinion effects
-        "add_opinion": {"target", "modifier", "opinion", "years"},
-        "reverse_add_opinion": {"target", "modifier", "opinion", "years"},
-        "remove_opinion": {"target", "modifier"},
-        # Modifier effects
-        "add_character_modifier": {"modifier", "years", "months", "days", "stacking"},
-        "remove_character_modifier": {"modifier"},
-        "add_county_modifier": {"modifier", "years", "months", "days"},
-        "add_province_modifier": {"modifier", "years", "months", "days"},
-        # Trait effects
-        "add_trait": {"trait", "track", "value"},
-        "remove_trait": {"trait"},
-        # Stress effects
-        "add_stress": {"trait"},
-        # Interaction effects
-        "open_interaction_window": {
-            "interaction",
-            "actor",
-            "recipient",
-            "secondary_actor",
-            "secondary_recipient",
-        },
-        # Event effects
-        "trigger_event": {"id", "days", "weeks", "months", "years", "on_action", "delayed"},
-        # Relation effects
-        "set_relation_lover": {"target", "reason", "copy_reason"},
-        "set_relation_friend": {"target", "reason", "copy_reason"},
-        "set_relation_rival": {"target", "reason", "copy_reason"},
-        "set_relation_best_friend": {"target", "reason", "copy_reason"},
-        "set_relation_nemesis": {"target", "reason", "copy_reason"},
-        "remove_relation_lover": {"target"},
-        "remove_relation_friend": {"target"},
-        "remove_relation_rival": {"target"},
-        # Create character effects
-        "create_character": {
-            "template",
-            "location",
-            "culture",
-            "faith",
-            "dynasty",
-            "gender",
-            "name",
-            "age",
-            "trait",
-            "employer",
-            "father",
-            "mother",
-            "save_scope_as",
-        },
-        # Scope save
-        "save_scope_as": {},  # Takes string value directly
-        "save_temporary_scope_as": {},
-        # Random effects
-        "random": {"chance", "modifier"},
-        "random_list": {},  # Children are weights
-        # Death
-        "death": {"death_reason", "killer"},
-        # Flag effects
-        "add_character_flag": {"flag", "years", "months", "days"},
-        "remove_character_flag": {"flag"},
-        # Marriage
-        "marry": {"target"},
-        "marry_matrilineal": {"target"},
-        # Title effects
-        "create_title_and_vassal_change": {"type", "save_scope_as", "add_claim_on_loss"},
-        "change_title_holder": {"holder", "change", "take_baronies"},
-        # War effects
-        "start_war": {"casus_belli", "target", "target_title", "claimant"},
-        # Duel effects
-        "duel": {"target", "skill", "value", "on_success", "on_failure"},
-        # Send interface message
-        "send_interface_message": {"type", "title", "desc", "left_icon", "right_icon", "goto"},
-        "send_interface_toast": {"type", "title", "desc", "left_icon", "right_icon"},
-        # Custom tooltip
-        "custom_tooltip": {},  # Takes string value
-        # Scheme effects
-        "start_scheme": {"type", "target"},
-        # Show as tooltip
-        "show_as_tooltip": {},  # Children are effects to show
-        # Hidden effect
-        "hidden_effect": {},  # Children are effects
-        # Every/any/random list iterators - have 'limit' as parameter
-        "every_": {
-            "limit",
-            "alternative",
-            "order_by",
-            "position",
-            "min",
-            "max",
-            "check_range_bounds",
-        },
-        "any_": {"limit", "count", "percent"},
-        "random_": {"limit", "weight", "alternative"},
-        "ordered_": {"limit", "order_by", "position", "min", "max", "check_range_bounds"},
-        # Set variable effects
-        "set_variable": {"name", "value", "days", "years", "months"},
-        "change_variable": {"name", "add", "subtract", "multiply", "divide"},
-        "clamp_variable": {"name", "min", "max"},
-        # Script values use base/add/multiply etc
-        "script_value": {"base", "add", "multiply", "divide", "min", "max", "desc"},
-    }
-
-    # Common parameters that are valid in many contexts
-    COMMON_PARAMETERS = {
-        "target",
-        "modifier",
-        "limit",
-        "weight",
-        "years",
-        "months",
-        "days",
-        "opinion",
-        "reason",
-        "save_scope_as",
-        "value",
-        "min",
-        "max",
-        "desc",
-        "title",
-        "type",
-        "name",
-        "holder",
-        "skill",
-        # Script value components
-        "base",
-        "add",
-        "subtract",
-        "multiply",
-        "divide",
-        # Random list weights
-        "modifier",
-        "trigger",
-        "effect",
-        # Common block types
-        "alternative",
-        "fallback",
-        "on_success",
-        "on_failure",
-    }
+    def __init__(self, index: Optional[DocumentIndex] = None):
+        """
+        Args:
+            index: Document index for custom effects/triggers/modifiers
+        """
+        super().__init__()
+        # Get custom effects/triggers from workspace index
+        custom_effects = index.get_all_scripted_effects() if index else set()
+        custom_triggers = index.get_all_scripted_triggers() if index else set()
+
+        # Get custom modifiers and opinion modifiers from workspace index
+        self.custom_modifiers = set(index.modifiers.keys()) if index else set()
+        self.custom_opinion_modifiers = set(index.opinion_modifiers.keys()) if index else set()
+
+        # Combined sets for validation
+        self.all_known_effects = set(CK3_EFFECTS) | custom_effects
+        self.all_known_triggers = set(CK3_TRIGGERS) | custom_triggers
+
+        # Context of the children of each enclosing node
+        self._contexts: List[str] = ["unknown"]
+
+    def visit(self, node: CK3Node, ancestors):
+        context = self._contexts[-1]
+        parent_key = ancestors[-1].key if ancestors else ""
 
-    # All uppercase words are typically effect parameters/arguments
-    def is_effect_parameter(key: str) -> bool:
-        """Check if a key looks like an effect parameter (ALL_CAPS or known param)."""
-        return key.isupper() or key in COMMON_PARAMETERS
-
-    def get_parent_effect_params(parent_key: str) -> set:
-        """Get valid parameters for a parent effect."""
-        # Direct lookup
-        if parent_key in EFFECT_PARAMETERS:
-            return EFFECT_PARAMETERS[parent_key]
-        # Check prefixes for list iterators
-        for prefix in ["every_", "any_", "random_", "ordered_"]:
-            if parent_key.startswith(prefix):
-                return EFFECT_PARAMETERS.get(prefix, set())
-        return set()
-
-    def check_node(node: CK3Node, context: str = "unknown", parent_key: str = ""):
-        """Recursively check a node and its children."""
         # Determine context from node type
         new_context = context
         if node.key == "trigger":
@@ -583,15 +579,16 @@ def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[
         elif node.key == "option":
             # Options can contain both triggers (in nested trigger blocks) and effects
             new_context = "option"
+        self._contexts.append(new_context)
 
         # Check for unknown effects/triggers based on context
         if context == "trigger":
             # In trigger context, check if this is a known trigger
-            if node.key not in all_known_triggers and node.type == "assignment":
+            if node.key not in self.all_known_triggers and node.type == "assignment":
                 # Check if it's a valid scope-specific trigger
                 # For now, just check against global trigger list
                 if node.key not in ["NOT", "OR", "AND", "NAND", "NOR"]:
-                    diagnostics.append(
+                    self.diagnostics.append(
                         create_diagnostic(
                             message=f"Unknown trigger: '{node.key}'",
                             range_=node.range,
@@ -601,8 +598,8 @@ def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[
                     )
 
             # Check if someone put an effect in a trigger block
-            if node.key in all_known_effects:
-                diagnostics.append(
+            if node.key in self.all_known_effects:
+                self.diagnostics.append(
                     create_diagnostic(
                         message=(
                             f"Effect '{node.key}' used in trigger block "
@@ -616,7 +613,7 @@ def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[
 
         elif context == "effect":
             # In effect context, check if this is a known effect
-            if node.key not in all_known_effects and node.type == "assignment":
+            if node.key not in self.all_known_effects and node.type == "assignment":
                 # Allow some control flow keywords and also triggers (used for limit blocks, etc.)
                 # Also allow scopes as they can be used to switch context
                 if node.key not in [
@@ -629,19 +626,19 @@ def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[
                     "limit",
                 ]:
                     # Don't flag triggers - they're valid in effect blocks for limit/if conditions
-                    if node.key not in all_known_triggers and node.key not in CK3_SCOPES:
+                    if node.key not in self.all_known_triggers and node.key not in CK3_SCOPES:
                         # Check if this is an effect parameter (child of an effect block)
-                        parent_params = get_parent_effect_params(parent_key)
+                        parent_params = _get_parent_effect_params(parent_key)
                         is_param = (
                             node.key in parent_params
-                            or is_effect_parameter(node.key)
-                            or node.key in custom_modifiers
-                            or node.key in custom_opinion_modifiers
+                            or _is_effect_parameter(node.key)
+                            or node.key in self.custom_modifiers
+                            or node.key in self.custom_opinion_modifiers
                         )
 
                         # Only report if NOT a parameter
                         if not is_param:
-                            diagnostics.append(
+                            self.diagnostics.append(
                                 create_diagnostic(
                                     message=f"Unknown effect: '{node.key}'",
                                     range_=node.range,
@@ -650,60 +647,37 @@ def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[
                                 )
                             )
 
-        # Recursively check children, passing current node key as parent
-        for child in node.children:
-            check_node(child, new_context, node.key)
-
-    # Check all top-level nodes
-    for node in ast:
-        check_node(node)
-
-    return diagnostics
-
+    def leave(self, node: CK3Node):
+        self._contexts.pop()
 
-def check_scopes(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[types.Diagnostic]:
-    """
-    Check for scope-related errors.
 
-    Validates:
-    - Scope chain validity (e.g., liege.primary_title.holder)
-    - Undefined saved scope references
-    - Invalid list iterations
+class ScopeCheck(NodeCheck):
+    """CK3201-CK3203: Scope chains, saved scope references, list iterators."""
 
-    Args:
-        ast: Parsed AST
-        index: Document index for saved scope tracking (optional)
+    visit_all = True
 
-    Returns:
-        List of scope-related diagnostics
-    """
-    diagnostics = []
+    def __init__(self, index: Optional[DocumentIndex] = None, current_scope: str = "character"):
+        """
+        Args:
+            index: Document index for saved scope tracking
+            current_scope: Scope the nodes are validated in
+        """
+        super().__init__()
+        self.index = index
+        self.current_scope = current_scope
 
-    def is_event_id(key: str) -> bool:
-        """Check if a key looks like an event ID (e.g., namespace.0001)."""
-        if "." not in key:
-            return False
-        parts = key.split(".")
-        # Event IDs typically have format: namespace.number (e.g., test_events.0001)
-        if len(parts) == 2:
-            # Check if second part is numeric (event ID)
-            try:
-                int(parts[1])
-                return True
-            except ValueError:
-                pass
-        return False
+    def visit(self, node: CK3Node, ancestors):
+        current_scope = self.current_scope
+        index = self.index
 
-    def check_node(node: CK3Node, current_scope: str = "character"):
-        """Recursively check scope validity."""
         # Check for scope chains (contains '.')
         if "." in node.key and not node.key.startswith("scope:"):
             # Skip event IDs (e.g., namespace.0001) - they're not scope chains
-            if not is_event_id(node.key):
+            if not _is_event_id(node.key):
                 # Validate scope chain
                 valid, result = validate_scope_chain(node.key, current_scope)
                 if not valid:
-                    diagnostics.append(
+                    self.diagnostics.append(
                         create_diagnostic(
                             message=f"Invalid scope chain: {result}",
                             range_=node.range,
@@ -716,7 +690,7 @@ def check_scopes(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[typ
         if node.key.startswith("scope:"):
             scope_name = node.key[6:]  # Remove 'scope:' prefix
             if index and scope_name not in index.saved_scopes:
-                diagnostics.append(
+                self.diagnostics.append(
                     create_diagnostic(
                         message=(
                             f"Undefined saved scope: '{scope_name}' "
@@ -733,7 +707,7 @@ def check_scopes(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[typ
         if parsed:
             prefix, base = parsed
             if not is_valid_list_base(base, current_scope):
-                diagnostics.append(
+                self.diagnostics.append(
                     create_diagnostic(
                         message=f"'{base}' is not a valid list in {current_scope} scope",
                         range_=node.range,
@@ -742,15 +716,113 @@ def check_scopes(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[typ
                     )
                 )
 
-        # Recursively check children
-        for child in node.children:
-            check_node(child, current_scope)
 
-    # Check all top-level nodes
-    for node in ast:
-        check_node(node)
+def create_semantic_checks(index: Optional[DocumentIndex] = None) -> List[NodeCheck]:
+    """
+    Build the checks run by check_semantics(), for a shared traversal.
 
-    return diagnostics
+    Args:
+        index: Document index for cross-file validation (optional)
+
+    Returns:
+        Checks in reporting order (trait references first)
+    """
+    from pychivalry.traits import is_trait_data_available
+
+    checks: List[NodeCheck] = []
+    # Skip trait validation if data not available (user hasn't extracted it)
+    if is_trait_data_available():
+        checks.append(TraitReferenceCheck())
+    else:
+        logger.debug("Trait data not available - skipping trait validation")
+    checks.append(SemanticCheck(index))
+    return checks
+
+
+def create_scope_checks(index: Optional[DocumentIndex] = None) -> List[NodeCheck]:
+    """
+    Build the checks run by check_scopes(), for a shared traversal.
+
+    Args:
+        index: Document index for saved scope tracking (optional)
+
+    Returns:
+        Checks in reporting order
+    """
+    return [ScopeCheck(index)]
+
+
+def check_trait_references(ast: List[CK3Node]) -> List[types.Diagnostic]:
+    """
+    Validate trait references in has_trait, add_trait, remove_trait.
+    
+    This validation is OPTIONAL and requires user-extracted trait data.
+    If trait data is not available, this check is silently skipped.
+    
+    Detects:
+    - CK3451: Unknown trait referenced
+    
+    Args:
+        ast: Parsed AST nodes
+        
+    Returns:
+        List of diagnostics for invalid trait references,
+        or empty list if trait data not available
+        
+    Note:
+        Trait data must be extracted by users from their own CK3 installation
+        using the VS Code command "PyChivalry: Extract Trait Data from CK3 Installation"
+        due to copyright restrictions.
+    """
+    from pychivalry.traits import is_trait_data_available
+    
+    # Skip trait validation if data not available (user hasn't extracted it)
+    if not is_trait_data_available():
+        logger.debug("Trait data not available - skipping trait validation")
+        return []
+
+    return run_checks(ast, [TraitReferenceCheck()])
+
+
+def check_semantics(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[types.Diagnostic]:
+    """
+    Check for semantic errors in the AST.
+
+    Validates:
+    - Unknown effects and triggers
+    - Effects in trigger blocks
+    - Triggers in effect blocks (warnings)
+    - Undefined event references
+    - Custom scripted effects/triggers (from workspace index)
+    - Trait references (CK3451)
+
+    Args:
+        ast: Parsed AST
+        index: Document index for cross-file validation (optional)
+
+    Returns:
+        List of semantic diagnostics
+    """
+    return run_checks(ast, create_semantic_checks(index))
+
+
+def check_scopes(ast: List[CK3Node], index: Optional[DocumentIndex]) -> List[types.Diagnostic]:
+    """
+    Check for scope-related errors.
+
+    Validates:
+    - Scope chain validity (e.g., liege.primary_title.holder)
+    - Undefined saved scope references
+    - Invalid list iterations
+
+    Args:
+        ast: Parsed AST
+        index: Document index for saved scope tracking (optional)
+
+    Returns:
+        List of scope-related diagnostics
+    """
+    return run_checks(ast, create_scope_checks(index))
 
 
 @dataclass
@@ -778,6 +850,10 @@ def collect_all_diagnostics(
     ast: List[CK3Node],
     index: Optional[DocumentIndex] = None,
     config: Optional[DiagnosticConfig] = None,
+    lines: Optional[List[str]] = None,
+    block_cache: Optional[BlockDiagnosticCache] = None,
+    cancel: Optional[CancellationToken] = None,
+    style_scanner: Optional["StyleScanner"] = None,
 ) -> List[types.Diagnostic]:
     """
     Collect all diagnostics for a document.
@@ -790,56 +866,89 @@ def collect_all_diagnostics(
         ast: Parsed AST
         index: Document index for cross-file validation (optional)
         config: Diagnostic configuration (uses defaults if None)
+        lines: ``doc.source.split("\\n")``, shared by the text-based checks
+        block_cache: Per-document cache of the AST check results; only
+            top-level blocks that changed are re-checked. ``ast`` must be
+            parsed from ``doc.source``.
+        cancel: Checked between phases and per top-level block; stale runs
+            stop early instead of finishing work nobody will read
+        style_scanner: Per-document style_checks.StyleScanner; only lines
+            that changed since its last run are style-checked again
 
     Returns:
         Combined list of all diagnostics
+
+    Raises:
+        OperationCancelled: If ``cancel`` was cancelled
     """
     config = config or DiagnosticConfig()
     diagnostics = []
+    if lines is None:
+        lines = doc.source.split("\n")
 
     try:
         # Syntax checks (always enabled)
-        diagnostics.extend(check_syntax(doc, ast))
+        diagnostics.extend(check_syntax(doc, ast, lines))
 
-        # Semantic checks (always enabled)
-        diagnostics.extend(check_semantics(ast, index))
-
-        # Scope checks (always enabled)
-        diagnostics.extend(check_scopes(ast, index))
-
-        # Style checks (CK33xx)
-        if config.style_enabled:
-            try:
-                from .style_checks import check_style
-
-                diagnostics.extend(check_style(doc))
-            except ImportError:
-                logger.warning("style_checks module not available")
-            except Exception as e:
-                logger.error(f"Error in style checks: {e}", exc_info=True)
+        # AST checks share one traversal; their diagnostics are added below
+        # in the usual order (semantics, scopes, style, paradox, timing).
+        semantic_checks = create_semantic_checks(index)
+        scope_checks = create_scope_checks(index)
 
         # Paradox convention checks (CK35xx+)
+        paradox_checks: List[NodeCheck] = []
         if config.paradox_enabled:
             try:
-                from .paradox_checks import check_paradox_conventions
+                from .paradox_checks import create_paradox_checks
 
-                diagnostics.extend(check_paradox_conventions(ast, index))
+                paradox_checks = create_paradox_checks(index)
             except ImportError:
                 logger.warning("paradox_checks module not available")
             except Exception as e:
                 logger.error(f"Error in paradox checks: {e}", exc_info=True)
 
         # Scope timing checks (CK3550-3555)
+        timing_checks: List[NodeCheck] = []
         if config.scope_timing_enabled:
             try:
-                from .scope_timing import check_scope_timing
+                from .scope_timing import ScopeTimingCheck
 
-                diagnostics.extend(check_scope_timing(ast, index))
+                timing_checks = [ScopeTimingCheck()]
             except ImportError:
                 logger.warning("scope_timing module not available")
             except Exception as e:
                 logger.error(f"Error in scope timing checks: {e}", exc_info=True)
 
+        ast_checks = semantic_checks + scope_checks + paradox_checks + timing_checks
+        if block_cache is not None:
+            block_cache.run(ast, lines, ast_checks, index, cancel)
+        else:
+            CheckDispatcher(ast_checks).run(ast, cancel)
+
+        # Semantic checks (always enabled)
+        for check in semantic_checks:
+            diagnostics.extend(check.diagnostics)
+
+        # Scope checks (always enabled)
+        for check in scope_checks:
+            diagnostics.extend(check.diagnostics)
+
+        # Style checks (CK33xx)
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        if config.style_enabled:
+            try:
+                from .style_checks import check_style
+
+                diagnostics.extend(check_style(doc, lines=lines, scanner=style_scanner))
+            except ImportError:
+                logger.warning("style_checks module not available")
+            except Exception as e:
+                logger.error(f"Error in style checks: {e}", exc_info=True)
+
+        for check in paradox_checks + timing_checks:
+            diagnostics.extend(check.diagnostics)
+
         # Story cycle validation (STORY-001+)
         if config.story_cycles_enabled:
             try:
@@ -860,16 +969,19 @@ def collect_all_diagnostics(
                 # Get file path from URI for schema matching
                 file_path = doc.uri.replace('file://', '')
                 
-                # Initialize schema system (cached after first load)
+                # Initialize schema system (cached after first load; the
+                # validator keeps the schemas' compiled rules between runs)
                 if not hasattr(collect_all_diagnostics, '_schema_loader'):
                     collect_all_diagnostics._schema_loader = SchemaLoader()
                     collect_all_diagnostics._schema_loader.load_all()
+                    collect_all_diagnostics._schema_validator = SchemaValidator(
+                        collect_all_diagnostics._schema_loader
+                    )
                 
-                loader = collect_all_diagnostics._schema_loader
-                validator = SchemaValidator(loader)
+                validator = collect_all_diagnostics._schema_validator
                 
                 # Run schema validation
-                schema_diagnostics = validator.validate(file_path, ast)
+                schema_diagnostics = validator.validate(file_path, ast, cancel)
                 diagnostics.extend(schema_diagnostics)
                 
                 logger.debug(f"Schema validation found {len(schema_diagnostics)} diagnostics")
@@ -0,0 +1,358 @@
+"""
+Incremental Document Buffers - Line-Indexed Storage for Open Documents
+
+MODULE OVERVIEW:
+    pygls applies every incremental didChange edit by re-splitting the whole
+    document into lines and rebuilding the source string, then the server
+    re-hashes and re-counts the full text. For large event files that makes
+    the per-keystroke cost proportional to the file size.
+
+    This module keeps open documents in a chunked line buffer instead:
+    - Edits replace only the lines inside the changed range
+    - Line counts are maintained as edits are applied
+    - Content hashes are combined from cached per-chunk digests, so only the
+      chunks touched since the last hash are re-digested
+    - The full source string is materialized lazily and cached until the
+      next edit
+
+ARCHITECTURE:
+    **LineBuffer**:
+    Lines are stored with their line terminators (same as
+    ``str.splitlines(keepends=True)``, which is what pygls uses) in a list of
+    chunks of about CHUNK_LINES lines each. An edit splices the affected
+    chunks, and any chunk that grows too large is split again.
+
+    **BufferedTextDocument**:
+    A pygls TextDocument whose ``source`` and ``lines`` are backed by a
+    LineBuffer. Incremental changes are converted from client position units
+    with the workspace position codec and applied to the buffer directly.
+
+    **BufferedWorkspace**:
+    A pygls Workspace that creates BufferedTextDocument instances. The server
+    installs it when the client initializes.
+
+USAGE EXAMPLES:
+    >>> buffer = LineBuffer("a = 1\\nb = 2\\n")
+    >>> buffer.replace(1, 4, 1, 5, "3")
+    >>> buffer.text
+    'a = 1\\nb = 3\\n'
+    >>> buffer.line_count
+    2
+
+SEE ALSO:
+    - server.py: Installs BufferedWorkspace and uses buffer hashes/line counts
+    - parser.py: parse_document_incremental() re-parses edited regions
+"""
+
+import bisect
+import hashlib
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+
+from lsprotocol import types
+from pygls.workspace import TextDocument, Workspace
+
+# Target number of lines per chunk. Chunks are split once they exceed twice this.
+CHUNK_LINES = 128
+
+# Characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+class LineBuffer:
+    """
+    Chunked, line-indexed text storage with incremental hashing.
+
+    Attributes:
+        line_count: Number of lines (a trailing line terminator does not start
+            a new line, matching ``str.splitlines``)
+    """
+
+    def __init__(self, text: str = ""):
+        """
+        Create a buffer holding ``text``.
+
+        Args:
+            text: Initial document text
+        """
+        self._chunks: List[List[str]] = []
+        self._digests: List[Optional[bytes]] = []
+        self._chunk_starts: Optional[List[int]] = None
+        self._text: Optional[str] = None
+        self.line_count = 0
+        self.set_text(text)
+
+    # =========================================================================
+    # Mutation
+    # =========================================================================
+
+    def set_text(self, text: str):
+        """Replace the whole buffer content."""
+        lines = text.splitlines(True)
+        self._chunks = [
+            lines[i : i + CHUNK_LINES] for i in range(0, len(lines), CHUNK_LINES)
+        ]
+        self._digests = [None] * len(self._chunks)
+        self._chunk_starts = None
+        self._text = text
+        self.line_count = len(lines)
+
+    def replace(
+        self, start_line: int, start_char: int, end_line: int, end_char: int, text: str
+    ):
+        """
+        Replace a range of the buffer with new text.
+
+        Positions are in code points (server units), with semantics identical
+        to pygls' incremental change application.
+
+        Args:
+            start_line: Zero-based start line
+            start_char: Start character within the start line
+            end_line: Zero-based end line (inclusive)
+            end_char: End character within the end line
+            text: Replacement text
+        """
+        if start_line >= self.line_count:
+            # Edit at the very end of the file: append to the source
+            if self.line_count:
+                last = self.line_count - 1
+                self._replace_lines(last, self.line_count, self.get_line(last) + text)
+            else:
+                self._replace_lines(0, 0, text)
+            return
+
+        first_line = self.get_line(start_line)
+        if end_line >= self.line_count:
+            # Range ends past the last line (e.g. select-all ending at
+            # (line_count, 0)): the whole tail is replaced
+            end_line = self.line_count - 1
+            tail = ""
+        else:
+            last_line = first_line if end_line == start_line else self.get_line(end_line)
+            tail = last_line[end_char:]
+        segment = first_line[:start_char] + text + tail
+
+        # Re-split together with the neighbouring lines whenever the edit joins
+        # them: an unterminated segment runs into the next line, and a lone
+        # "\r" followed by "\n" forms a single line break
+        if start_line > 0:
+            previous = self.get_line(start_line - 1)
+            if previous.endswith("\r"):
+                start_line -= 1
+                segment = previous + segment
+        if end_line + 1 < self.line_count and (
+            not segment or segment[-1] not in _LINE_BREAKS or segment[-1] == "\r"
+        ):
+            end_line += 1
+            segment += self.get_line(end_line)
+
+        self._replace_lines(start_line, end_line + 1, segment)
+
+    def _replace_lines(self, start: int, stop: int, segment: str):
+        """Replace lines [start, stop) with the lines of ``segment``."""
+        new_lines = segment.splitlines(True)
+        self._text = None
+
+        if not self._chunks:
+            self.set_text(segment)
+            return
+
+        starts = self._get_chunk_starts()
+        first_chunk = max(bisect.bisect_right(starts, start) - 1, 0)
+        if stop > start:
+            last_chunk = max(bisect.bisect_right(starts, stop - 1) - 1, first_chunk)
+        else:
+            last_chunk = first_chunk
+
+        base = starts[first_chunk]
+        merged: List[str] = []
+        for chunk in self._chunks[first_chunk : last_chunk + 1]:
+            merged.extend(chunk)
+        merged[start - base : stop - base] = new_lines
+
+        if len(merged) > 2 * CHUNK_LINES:
+            rebuilt = [merged[i : i + CHUNK_LINES] for i in range(0, len(merged), CHUNK_LINES)]
+        else:
+            rebuilt = [merged] if merged else []
+
+        self._chunks[first_chunk : last_chunk + 1] = rebuilt
+        self._digests[first_chunk : last_chunk + 1] = [None] * len(rebuilt)
+        self._chunk_starts = None
+        self.line_count += len(new_lines) - (stop - start)
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+
+    def _get_chunk_starts(self) -> List[int]:
+        """Line number of the first line of each chunk (rebuilt lazily)."""
+        if self._chunk_starts is None:
+            starts = []
+            total = 0
+            for chunk in self._chunks:
+                starts.append(total)
+                total += len(chunk)
+            self._chunk_starts = starts
+        return self._chunk_starts
+
+    def get_line(self, line: int) -> str:
+        """Return one line, including its line terminator."""
+        starts = self._get_chunk_starts()
+        chunk = bisect.bisect_right(starts, line) - 1
+        return self._chunks[chunk][line - starts[chunk]]
+
+    def iter_lines(self) -> Iterator[str]:
+        """Iterate over all lines, including their line terminators."""
+        for chunk in self._chunks:
+            yield from chunk
+
+    @property
+    def lines(self) -> "LineView":
+        """Read-only sequence view of the lines (no copy)."""
+        return LineView(self)
+
+    @property
+    def text(self) -> str:
+        """Full buffer text (materialized once per version)."""
+        if self._text is None:
+            self._text = "".join("".join(chunk) for chunk in self._chunks)
+        return self._text
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Hash of the buffer content.
+
+        Only chunks changed since the last call are re-digested; the result
+        combines the per-chunk digests. Equal hashes imply equal content, but
+        the same content reached through different edit histories may hash
+        differently (chunk boundaries differ), which only costs a cache miss.
+        """
+        digests = self._digests
+        for i, digest in enumerate(digests):
+            if digest is None:
+                digests[i] = hashlib.md5(
+                    "".join(self._chunks[i]).encode("utf-8", errors="replace")
+                ).digest()
+        return hashlib.md5(b"".join(digests)).hexdigest()
+
+
+class LineView(Sequence):
+    """Sequence view over the lines of a LineBuffer (as pygls ``lines``)."""
+
+    def __init__(self, buffer: LineBuffer):
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return self._buffer.line_count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return list(self._buffer.iter_lines())[index]
+        if index < 0:
+            index += self._buffer.line_count
+        if not 0 <= index < self._buffer.line_count:
+            raise IndexError("line index out of range")
+        return self._buffer.get_line(index)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._buffer.iter_lines()
+
+
+class BufferedTextDocument(TextDocument):
+    """
+    pygls TextDocument backed by a LineBuffer.
+
+    Incremental changes touch only the edited lines; ``source`` is built on
+    demand. Documents created without a source (not opened by the client)
+    keep pygls' behaviour of reading from disk until they are first edited.
+    """
+
+    def __init__(self, uri: str, source: Optional[str] = None, *args, **kwargs):
+        super().__init__(uri, source, *args, **kwargs)
+        self._buffer: Optional[LineBuffer] = None
+        if source is not None:
+            self._buffer = LineBuffer(source)
+            self._source = None  # The buffer owns the text from now on
+
+    @property
+    def buffer(self) -> LineBuffer:
+        """The underlying line buffer (created from the file on first use)."""
+        if self._buffer is None:
+            self._buffer = LineBuffer(super().source)
+        return self._buffer
+
+    @property
+    def source(self) -> str:
+        if self._buffer is None:
+            return super().source
+        return self._buffer.text
+
+    @property
+    def lines(self) -> Sequence:
+        return self.buffer.lines
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the document."""
+        return self.buffer.line_count
+
+    @property
+    def content_hash(self) -> str:
+        """Incrementally maintained content hash (see LineBuffer.content_hash)."""
+        return self.buffer.content_hash
+
+    def _apply_incremental_change(self, change: types.TextDocumentContentChangePartial) -> None:
+        """Apply an ``Incremental`` text change to the line buffer."""
+        buffer = self.buffer
+        change_range = self._position_codec.range_from_client_units(buffer.lines, change.range)
+        buffer.replace(
+            change_range.start.line,
+            change_range.start.character,
+            change_range.end.line,
+            change_range.end.character,
+            change.text,
+        )
+
+    def _apply_full_change(self, change: types.TextDocumentContentChangeEvent) -> None:
+        """Apply a ``Full`` text change to the line buffer."""
+        self.buffer.set_text(change.text)
+
+
+class BufferedWorkspace(Workspace):
+    """pygls Workspace that stores text documents in line buffers."""
+
+    @classmethod
+    def from_workspace(cls, workspace: Workspace) -> "BufferedWorkspace":
+        """
+        Create a buffered workspace with the same configuration as ``workspace``.
+
+        Args:
+            workspace: Workspace created by pygls during initialization
+
+        Returns:
+            New BufferedWorkspace (documents are not copied)
+        """
+        return cls(
+            workspace.root_uri,
+            workspace._sync_kind,
+            list(workspace.folders.values()),
+            workspace.position_encoding,
+        )
+
+    def _create_text_document(
+        self,
+        doc_uri: str,
+        source: Optional[str] = None,
+        version: Optional[int] = None,
+        language_id: Optional[str] = None,
+    ) -> TextDocument:
+        return BufferedTextDocument(
+            doc_uri,
+            source=source,
+            version=version,
+            language_id=language_id,
+            sync_kind=self._sync_kind,
+            position_codec=self._position_codec,
+        )
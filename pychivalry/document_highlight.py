@@ -146,6 +146,7 @@ SYMBOL_PATTERNS = {
 def get_symbol_at_position(
     text: str,
     position: types.Position,
+    lines: Optional[List[str]] = None,
 ) -> Optional[SymbolInfo]:
     """
     Get the symbol at a specific position in the document.
@@ -153,11 +154,13 @@ def get_symbol_at_position(
     Args:
         text: Document text
         position: Cursor position
+        lines: ``text.split("\\n")``, if the caller already has it
 
     Returns:
         SymbolInfo if a symbol is found at position, None otherwise
     """
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     if position.line >= len(lines):
         return None
@@ -292,6 +295,7 @@ def _classify_word(line: str, word: str, start: int) -> Optional[str]:
 def find_all_occurrences(
     text: str,
     symbol: SymbolInfo,
+    lines: Optional[List[str]] = None,
 ) -> List[types.DocumentHighlight]:
     """
     Find all occurrences of a symbol in the document.
@@ -299,12 +303,14 @@ def find_all_occurrences(
     Args:
         text: Document text
         symbol: The symbol to find occurrences of
+        lines: ``text.split("\\n")``, if the caller already has it
 
     Returns:
         List of DocumentHighlight objects
     """
     highlights: List[types.DocumentHighlight] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     # Build patterns based on symbol type
     patterns = _get_patterns_for_symbol(symbol)
@@ -573,6 +579,7 @@ def _get_highlight_range(
 def get_document_highlights(
     text: str,
     position: types.Position,
+    lines: Optional[List[str]] = None,
 ) -> Optional[List[types.DocumentHighlight]]:
     """
     Get document highlights for the symbol at a position.
@@ -580,12 +587,16 @@ def get_document_highlights(
     Args:
         text: Document text
         position: Cursor position
+        lines: ``text.split("\\n")``, if the caller already has it
 
     Returns:
         List of DocumentHighlight objects, or None if no symbol at position
     """
+    if lines is None:
+        lines = text.split("\n")
+
     # Get the symbol at the cursor position
-    symbol = get_symbol_at_position(text, position)
+    symbol = get_symbol_at_position(text, position, lines)
 
     if not symbol:
         return None
@@ -593,7 +604,7 @@ def get_document_highlights(
     logger.debug(f"Finding highlights for symbol: {symbol.name} ({symbol.symbol_type})")
 
     # Find all occurrences
-    highlights = find_all_occurrences(text, symbol)
+    highlights = find_all_occurrences(text, symbol, lines)
 
     if highlights:
         logger.debug(f"Found {len(highlights)} highlight(s)")
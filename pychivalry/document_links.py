@@ -202,6 +202,7 @@ def get_document_links(
     text: str,
     document_uri: str,
     workspace_folders: Optional[List[str]] = None,
+    lines: Optional[List[str]] = None,
 ) -> List[types.DocumentLink]:
     """
     Get all document links in a file.
@@ -210,12 +211,14 @@ def get_document_links(
         text: Document text
         document_uri: URI of the document
         workspace_folders: List of workspace folder paths for resolving relative paths
+        lines: ``text.split("\\n")``, if the caller already has it
 
     Returns:
         List of DocumentLink objects
     """
     links: List[types.DocumentLink] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     # Extract document path for resolving relative links
     doc_path = uri_to_path(document_uri)
@@ -0,0 +1,213 @@
+"""
+CK3 Document Snapshots - Per-Version Memoization for LSP Handlers
+
+MODULE OVERVIEW:
+    Most request handlers derive the same data from a document's text:
+    the line list, the AST, folding ranges, semantic tokens. Editors send
+    several requests per edit (folding, semantic tokens, document symbols,
+    highlights, inlay hints, links), and each one used to split and re-scan
+    the whole text on its own.
+
+    A DocumentSnapshot is the immutable state of one document version. It
+    computes each derived artifact on first use and keeps it for every
+    later request against the same version. A new version gets a new
+    snapshot; the old one is dropped with everything it memoized.
+
+ARCHITECTURE:
+    **Lazy Artifacts** (computed on first access, then shared):
+    - lines: source.split("\\n") (the line model used by all features)
+    - ast: parsed AST (or the server's AST, when built from this source)
+    - folding_ranges: folding.get_folding_ranges() result
+    - semantic_tokens(index): memoized per index version
+
+    **Generic Memoization**:
+    memoize(name, compute) stores any other per-version result (the server
+    uses it for document symbols), so features that live elsewhere can
+    share the snapshot without this module importing them.
+
+    Cursor-driven handlers (completion, hover, code actions) look nodes up
+    in the last committed AST instead (CK3LanguageServer.get_position_index),
+    so a keystroke never waits for the new text to be parsed.
+
+    **Threading**:
+    Snapshots are read by handlers running in the thread pool. Artifacts
+    are stored with a single dict assignment; two threads racing on the
+    same artifact may both compute it, but both results are equal and one
+    wins, so no lock is needed. Returned artifacts must not be mutated.
+
+    **Lifecycle** (see server.py):
+    The server keeps the latest snapshot per URI and replaces it when the
+    document version (or text) changes; didChange and didClose drop it.
+
+USAGE EXAMPLES:
+    >>> snapshot = DocumentSnapshot("file:///a.txt", 3, "a = {\\n    b = c\\n}")
+    >>> snapshot.lines
+    ['a = {', '    b = c', '}']
+    >>> snapshot.ast[0].children[0].key
+    'b'
+
+PERFORMANCE:
+    - Creating a snapshot: O(1); nothing is computed up front
+    - Repeated requests on one version: one dict lookup per artifact
+    - Memory: artifacts live only as long as the document version
+
+SEE ALSO:
+    - server.py: get_snapshot() and the handlers using it
+    - parser.py: parse_document()
+    - folding.py, semantic_tokens.py: the memoized features
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from lsprotocol import types
+
+from pychivalry.cancellation import CancellationToken
+from pychivalry.folding import get_folding_ranges
+from pychivalry.indexer import DocumentIndex
+from pychivalry.parser import CK3Node, parse_document
+from pychivalry.semantic_tokens import get_semantic_tokens
+
+
+class DocumentSnapshot:
+    """
+    Immutable view of one document version with lazily memoized artifacts.
+
+    Attributes:
+        uri: Document URI
+        version: Document version (None when the client sent none)
+        source: Document text of this version
+    """
+
+    __slots__ = ("uri", "version", "source", "_parse", "_memo")
+
+    def __init__(
+        self,
+        uri: str,
+        version: Optional[int],
+        source: str,
+        parse: Optional[Callable[[str], List[CK3Node]]] = None,
+    ):
+        """
+        Create a snapshot (nothing is computed until first accessed).
+
+        Args:
+            uri: Document URI
+            version: Document version
+            source: Document text
+            parse: Function returning the AST of a source text; defaults to
+                parse_document
+        """
+        self.uri = uri
+        self.version = version
+        self.source = source
+        self._parse = parse
+        self._memo: Dict[str, Any] = {}
+
+    def __repr__(self):
+        return f"DocumentSnapshot(uri={self.uri!r}, version={self.version!r})"
+
+    def matches(self, version: Optional[int], source: str) -> bool:
+        """
+        Whether this snapshot describes a document's current state.
+
+        Args:
+            version: Current document version
+            source: Current document text
+
+        Returns:
+            True if both the version and the text are unchanged
+        """
+        return self.version == version and (self.source is source or self.source == source)
+
+    def memoize(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return a named per-version artifact, computing it on first use.
+
+        Args:
+            name: Artifact name (unique per kind of result)
+            compute: Builds the artifact when it is not memoized yet
+
+        Returns:
+            The memoized artifact
+        """
+        try:
+            return self._memo[name]
+        except KeyError:
+            value = self._memo[name] = compute()
+            return value
+
+    def seed_ast(self, ast: List[CK3Node]):
+        """
+        Provide an AST already built from this snapshot's source.
+
+        Has no effect if the snapshot already has one, so artifacts built
+        from the existing AST stay consistent.
+
+        Args:
+            ast: AST parsed from ``source``
+        """
+        self._memo.setdefault("ast", ast)
+
+    # =========================================================================
+    # Text Artifacts
+    # =========================================================================
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the source, split on "\\n" (line terminators removed)."""
+        return self.memoize("lines", lambda: self.source.split("\n"))
+
+    # =========================================================================
+    # Syntax Tree Artifacts
+    # =========================================================================
+
+    @property
+    def ast(self) -> List[CK3Node]:
+        """Top-level AST nodes of the source."""
+
+        def compute() -> List[CK3Node]:
+            if self._parse is not None:
+                return self._parse(self.source)
+            return parse_document(self.source)
+
+        return self.memoize("ast", compute)
+
+    # =========================================================================
+    # Feature Artifacts
+    # =========================================================================
+
+    @property
+    def folding_ranges(self) -> List[types.FoldingRange]:
+        """Folding ranges of the document."""
+        return self.memoize(
+            "folding_ranges", lambda: get_folding_ranges(self.source, lines=self.lines)
+        )
+
+    def semantic_tokens(
+        self,
+        index: Optional[DocumentIndex] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> types.SemanticTokens:
+        """
+        Semantic tokens of the document.
+
+        Tokens depend on the custom effects and triggers in the index, so the
+        result is kept for one index version (index versions are immutable,
+        see DocumentIndex.copy) and recomputed when a newer one is passed.
+
+        Args:
+            index: Document index for custom definitions
+            cancel: Stops the computation (nothing is memoized then)
+
+        Returns:
+            SemanticTokens with encoded data
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
+        """
+        cached = self._memo.get("semantic_tokens")
+        if cached is not None and cached[0] is index:
+            return cached[1]
+        result = get_semantic_tokens(self.source, index, lines=self.lines, cancel=cancel)
+        self._memo["semantic_tokens"] = (index, result)
+        return result
@@ -145,6 +145,7 @@ IMPORTANT_BLOCKS = {
 def get_folding_ranges(
     text: str,
     line_folding_only: bool = True,
+    lines: Optional[List[str]] = None,
 ) -> List[types.FoldingRange]:
     """
     Get all folding ranges in a document.
@@ -152,20 +153,23 @@ def get_folding_ranges(
     Args:
         text: Document text
         line_folding_only: If True, only return line-based folding (most editors)
+        lines: ``text.split("\n")``, if the caller already has it
 
     Returns:
         List of FoldingRange objects
     """
     ranges: List[types.FoldingRange] = []
+    if lines is None:
+        lines = text.split("\n")
 
     # Get block-based folding from braces
-    ranges.extend(_get_brace_folding_ranges(text))
+    ranges.extend(_get_brace_folding_ranges(text, lines))
 
     # Get comment block folding
-    ranges.extend(_get_comment_folding_ranges(text))
+    ranges.extend(_get_comment_folding_ranges(text, lines))
 
     # Get region-based folding
-    ranges.extend(_get_region_folding_ranges(text))
+    ranges.extend(_get_region_folding_ranges(text, lines))
 
     # Sort by start line, then by end line (larger ranges first for same start)
     ranges.sort(key=lambda r: (r.start_line, -r.end_line))
@@ -182,14 +186,17 @@ def get_folding_ranges(
     return unique_ranges
 
 
-def _get_brace_folding_ranges(text: str) -> List[types.FoldingRange]:
+def _get_brace_folding_ranges(
+    text: str, lines: Optional[List[str]] = None
+) -> List[types.FoldingRange]:
     """
     Get folding ranges based on brace matching.
 
     Handles CK3's `key = { ... }` block syntax.
     """
     ranges: List[types.FoldingRange] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     # Stack of (line_number, character, block_name)
     brace_stack: List[Tuple[int, int, Optional[str]]] = []
@@ -304,14 +311,17 @@ def _get_folding_kind(block_name: Optional[str]) -> Optional[str]:
     return None
 
 
-def _get_comment_folding_ranges(text: str) -> List[types.FoldingRange]:
+def _get_comment_folding_ranges(
+    text: str, lines: Optional[List[str]] = None
+) -> List[types.FoldingRange]:
     """
     Get folding ranges for consecutive comment blocks.
 
     Groups of 2+ consecutive comment lines can be folded.
     """
     ranges: List[types.FoldingRange] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     comment_start: Optional[int] = None
 
@@ -351,7 +361,9 @@ def _get_comment_folding_ranges(text: str) -> List[types.FoldingRange]:
     return ranges
 
 
-def _get_region_folding_ranges(text: str) -> List[types.FoldingRange]:
+def _get_region_folding_ranges(
+    text: str, lines: Optional[List[str]] = None
+) -> List[types.FoldingRange]:
     """
     Get folding ranges for explicit region markers.
 
@@ -361,7 +373,8 @@ def _get_region_folding_ranges(text: str) -> List[types.FoldingRange]:
         # endregion
     """
     ranges: List[types.FoldingRange] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     # Stack of (line_number, region_name)
     region_stack: List[Tuple[int, str]] = []
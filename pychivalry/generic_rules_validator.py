@@ -11,6 +11,10 @@ ARCHITECTURE:
     3. Check if pattern appears in invalid context
     4. Emit diagnostic if rule violated
 
+    The rules run as one NodeCheck (GenericRulesCheck), so they can share a
+    traversal with the other checks (see ast_visitor.py and
+    paradox_checks.create_paradox_checks).
+
 RULE TYPES:
     - effect_usage: Detect effects in wrong contexts
     - trigger_usage: Detect triggers in wrong contexts
@@ -35,6 +39,7 @@ SEE ALSO:
     - data/schemas/generic_rules.yaml: Rule definitions
     - data/diagnostics.yaml: Diagnostic code registry
     - paradox_checks.py: Legacy hardcoded validation (being deprecated)
+    - ast_visitor.py: Single-traversal check dispatch
 """
 
 import logging
@@ -48,6 +53,7 @@ from lsprotocol import types
 from .parser import CK3Node
 from .indexer import DocumentIndex
 from .ck3_language import CK3_EFFECTS, CK3_TRIGGERS
+from .ast_visitor import NodeCheck, run_checks
 
 logger = logging.getLogger(__name__)
 
@@ -279,61 +285,96 @@ def _check_iterator_rule(
             ))
 
 
-def _traverse_and_validate(
-    nodes: List[CK3Node],
-    rules: Dict[str, Dict[str, Any]],
-    all_effects: Set[str],
-    all_triggers: Set[str],
-    diagnostics: List[types.Diagnostic],
-    node_path: Optional[List[str]] = None,
-):
+def _enabled_rules(config: Optional[Dict[str, bool]]) -> Dict[str, Dict[str, Any]]:
     """
-    Traverse AST and apply validation rules.
-    
+    Rules from the schema, filtered by the category configuration.
+
     Args:
-        nodes: AST nodes to validate
-        rules: Validation rules from schema
-        all_effects: Set of all known effects
-        all_triggers: Set of all known triggers
-        diagnostics: List to append diagnostics to
-        node_path: Path of parent block keys (for context tracking)
+        config: Configuration dict for enabling/disabling rule categories
+
+    Returns:
+        Enabled rules by name
     """
-    if node_path is None:
-        node_path = []
-    
-    for node in nodes:
-        # Build path for context checking
-        current_path = node_path + [node.key]
-        
-        # Apply each enabled rule to this node
-        for rule_name, rule in rules.items():
-            if not rule.get("enabled", True):
-                continue
-            
-            pattern_type = rule.get("pattern", {}).get("type")
-            
+    schema = _load_generic_rules()
+    rules = schema.get("rules", {})
+
+    if rules and config:
+        config_mapping = schema.get("configuration", {})
+        enabled_rules = set()
+
+        for category, category_config in config_mapping.items():
+            if config.get(category, True):  # Default to enabled
+                enabled_rules.update(category_config.get("rules", []))
+
+        # Filter rules to only enabled ones
+        rules = {
+            name: rule_def
+            for name, rule_def in rules.items()
+            if name in enabled_rules
+        }
+
+    return rules
+
+
+class GenericRulesCheck(NodeCheck):
+    """
+    Applies the schema's generic rules to every node in a dispatcher traversal.
+
+    Keeps the path of enclosing block keys (for context tracking) on a stack
+    maintained through visit()/leave().
+    """
+
+    visit_all = True
+    wants_leave = True
+
+    def __init__(
+        self,
+        index: Optional[DocumentIndex] = None,
+        config: Optional[Dict[str, bool]] = None,
+    ):
+        """
+        Args:
+            index: Document index for looking up scripted effects/triggers
+            config: Configuration dict for enabling/disabling rule categories
+        """
+        super().__init__()
+        rules = _enabled_rules(config)
+        if not _load_generic_rules().get("rules"):
+            logger.warning("No generic rules loaded from schema")
+
+        # Resolve each rule's handler once instead of per node
+        self._rules = [
+            (rule.get("pattern", {}).get("type"), rule)
+            for rule in rules.values()
+            if rule.get("enabled", True)
+        ]
+        self._all_effects = _get_all_effects(index) if self._rules else set()
+        self._all_triggers = _get_all_triggers(index) if self._rules else set()
+        self._path: List[str] = []
+
+    def visit(self, node: CK3Node, ancestors):
+        node_path = self._path
+        diagnostics = self.diagnostics
+
+        for pattern_type, rule in self._rules:
             if pattern_type == "effect_usage":
-                _check_effect_usage_rule(node, node_path, rule, all_effects, diagnostics)
-            
+                _check_effect_usage_rule(node, node_path, rule, self._all_effects, diagnostics)
+
             elif pattern_type == "trigger_usage":
-                _check_trigger_usage_rule(node, node_path, rule, all_triggers, diagnostics)
-            
+                _check_trigger_usage_rule(
+                    node, node_path, rule, self._all_triggers, diagnostics
+                )
+
             elif pattern_type == "redundant_check":
                 _check_redundant_check_rule(node, rule, diagnostics)
-            
+
             elif pattern_type in ("iterator_check", "iterator_with_effects"):
-                _check_iterator_rule(node, rule, all_effects, diagnostics)
-        
-        # Recurse into children with updated path
-        if node.children:
-            _traverse_and_validate(
-                node.children,
-                rules,
-                all_effects,
-                all_triggers,
-                diagnostics,
-                current_path,
-            )
+                _check_iterator_rule(node, rule, self._all_effects, diagnostics)
+
+        node_path.append(node.key)
+
+    def leave(self, node: CK3Node):
+        self._path.pop()
 
 
 def validate_generic_rules(
@@ -353,40 +394,7 @@ def validate_generic_rules(
     Returns:
         List of diagnostics for rule violations
     """
-    diagnostics = []
-    
-    # Load rules schema
-    schema = _load_generic_rules()
-    rules = schema.get("rules", {})
-    
-    if not rules:
-        logger.warning("No generic rules loaded from schema")
-        return diagnostics
-    
-    # Apply configuration to filter rules
-    if config:
-        config_mapping = schema.get("configuration", {})
-        enabled_rules = set()
-        
-        for category, category_config in config_mapping.items():
-            if config.get(category, True):  # Default to enabled
-                enabled_rules.update(category_config.get("rules", []))
-        
-        # Filter rules to only enabled ones
-        rules = {
-            name: rule_def
-            for name, rule_def in rules.items()
-            if name in enabled_rules
-        }
-    
-    # Get all known effects and triggers
-    all_effects = _get_all_effects(index)
-    all_triggers = _get_all_triggers(index)
-    
-    # Traverse AST and apply rules
-    _traverse_and_validate(ast, rules, all_effects, all_triggers, diagnostics)
-    
-    return diagnostics
+    return run_checks(ast, [GenericRulesCheck(index, config)])
 
 
 # Compatibility function for existing code
@@ -104,7 +104,7 @@ from typing import Optional
 from lsprotocol import types
 from pygls.workspace import TextDocument
 
-from .parser import CK3Node, get_node_at_position
+from .parser import CK3Node, PositionIndex, get_node_at_position
 from .indexer import DocumentIndex
 from .ck3_language import CK3_EFFECTS, CK3_TRIGGERS, CK3_SCOPES, CK3_KEYWORDS, CK3_CONTEXT_FIELDS, CK3_STORY_CYCLE_FIELDS
 from .scopes import get_scope_links
@@ -758,7 +758,11 @@ def get_hover_content(
 
 
 def create_hover_response(
-    doc: TextDocument, position: types.Position, ast: list[CK3Node], index: Optional[DocumentIndex]
+    doc: TextDocument,
+    position: types.Position,
+    ast: list[CK3Node],
+    index: Optional[DocumentIndex],
+    position_index: Optional[PositionIndex] = None,
 ) -> Optional[types.Hover]:
     """
     Create a hover response for a position in a document.
@@ -768,6 +772,7 @@ def create_hover_response(
         position: Cursor position
         ast: Parsed AST
         index: Document index (optional)
+        position_index: Cursor lookup index for ``ast`` (optional, avoids a tree walk)
 
     Returns:
         Hover response with documentation, or None if no hover available
@@ -778,7 +783,10 @@ def create_hover_response(
         return None
 
     # Get AST node at position (for context)
-    node = get_node_at_position(ast, position)
+    if position_index is not None:
+        node = position_index.node_at(position)
+    else:
+        node = get_node_at_position(ast, position)
 
     # Build hover content
     content = get_hover_content(word, node, index)
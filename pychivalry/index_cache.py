@@ -0,0 +1,290 @@
+"""
+CK3 Index Cache - Persistent Per-File Workspace Scan Results
+
+MODULE OVERVIEW:
+    Scanning a large mod workspace reads and extracts every file under
+    common/, events/ and localization/. This module persists the per-file
+    extraction results of DocumentIndex._scan_file() in a SQLite database
+    inside the workspace, so a restart (or ck3.rescanWorkspace) only reads
+    and extracts files that changed since the previous scan.
+
+ARCHITECTURE:
+    **Storage**:
+    One database per workspace root at ``<root>/.pychivalry/index.sqlite3``:
+    - ``meta``: cache format and pychivalry version; a mismatch discards
+      every cached result, since extraction logic may have changed
+    - ``files``: path → (mtime_ns, size, content MD5, result JSON)
+
+    Subclasses keep other per-file results in the same way, in their own
+    database file (lint.py: LintCache for ``pychivalry lint`` results).
+
+    Results are stored as JSON rather than pickles: the cache lives in the
+    workspace, and loading it must never execute code from a mod someone
+    downloaded.
+
+    **Validation** (per file, on lookup):
+    1. mtime and size match the cached fingerprint → reuse without reading
+    2. Size matches but mtime differs → read and hash; reuse if the hash
+       matches (files touched by git checkout, copies, etc.)
+    3. Otherwise → miss, the caller scans the file and stores the result
+
+    Files modified within the last couple of seconds are stored without a
+    trusted mtime, because a second write in the same timestamp tick would
+    otherwise go unnoticed; their next lookup compares content hashes.
+
+    **Lifecycle**:
+    open() loads every row in one query, lookup()/store() work in memory,
+    and close() writes new rows and prunes files that no longer exist in a
+    single transaction. Any SQLite or file system error disables the cache
+    for that scan instead of failing it.
+
+USAGE EXAMPLES:
+    >>> cache = IndexCache(workspace_root)
+    >>> if cache.open():
+    ...     result = cache.lookup(file_path)
+    ...     if result is None:
+    ...         result = index._scan_file(file_path, "events")
+    ...         cache.store(file_path, result)
+    ...     cache.close()
+
+PERFORMANCE:
+    - Warm start: one stat() per file plus JSON decoding of its result
+    - Cold start: scan cost plus one batched insert
+
+SEE ALSO:
+    - indexer.py: DocumentIndex.scan_workspace(use_cache=True)
+    - lint.py: LintCache (diagnostics of unchanged files)
+    - server.py: Enables the cache for workspace scans
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the structure of cached scan results changes
+INDEX_CACHE_FORMAT = 2
+
+CACHE_DIR_NAME = ".pychivalry"
+CACHE_FILE_NAME = "index.sqlite3"
+
+# Files modified more recently than this are re-hashed on their next lookup
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+
+def _cache_version() -> str:
+    """Version string stored in the cache; results from other versions are discarded."""
+    from pychivalry import __version__
+
+    return f"{INDEX_CACHE_FORMAT}:{__version__}"
+
+
+class IndexCache:
+    """
+    On-disk cache of workspace scan results for one workspace root.
+
+    Subclasses cache other per-file results in their own database by
+    overriding FILE_NAME and version().
+
+    Attributes:
+        root: Workspace root folder
+        path: Path of the SQLite database
+        hits: Number of lookups answered from the cache
+    """
+
+    # Database file name inside <root>/.pychivalry/
+    FILE_NAME = CACHE_FILE_NAME
+
+    def __init__(self, root: Union[str, Path], path: Optional[Path] = None):
+        """
+        Create a cache for a workspace root (nothing is opened yet).
+
+        Args:
+            root: Workspace root folder
+            path: Database path (defaults to <root>/.pychivalry/<FILE_NAME>)
+        """
+        self.root = Path(root)
+        self.path = path or self.root / CACHE_DIR_NAME / self.FILE_NAME
+        self.hits = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries: Dict[str, Tuple[int, int, str, str]] = {}
+        self._pending: List[Tuple[str, int, int, str, str]] = []
+        self._seen: Set[str] = set()
+        self._meta: Dict[str, str] = {}
+        self._pending_meta: Dict[str, str] = {}
+
+    def version(self) -> str:
+        """Version stored in the database; entries of other versions are discarded."""
+        return _cache_version()
+
+    def open(self) -> bool:
+        """
+        Open the database and load all cached entries.
+
+        The cache folder is created if missing, but never its parents: a
+        root that does not exist leaves the cache unavailable.
+
+        Returns:
+            True if the cache is usable, False if it could not be opened
+        """
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            gitignore = self.path.parent / ".gitignore"
+            if self.path.parent.name == CACHE_DIR_NAME and not gitignore.exists():
+                # Keep the cache out of the mod's version control
+                gitignore.write_text("*\n", encoding="utf-8")
+
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT, result TEXT)"
+            )
+
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            version = self.version()
+            if row is None or row[0] != version:
+                self._conn.execute("DELETE FROM files")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,)
+                )
+                self._conn.commit()
+
+            self._meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+
+            self._entries = {
+                path: (mtime_ns, size, digest, result)
+                for path, mtime_ns, size, digest, result in self._conn.execute(
+                    "SELECT path, mtime_ns, size, digest, result FROM files"
+                )
+            }
+            return True
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Index cache unavailable at {self.path}: {e}")
+            self._close_connection()
+            return False
+
+    def lookup(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached scan result for a file if it is still valid.
+
+        Args:
+            file_path: File to look up
+
+        Returns:
+            Cached result, or None if the file is new or changed
+        """
+        key = str(file_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        mtime_ns, size, digest, result = entry
+        try:
+            stat = file_path.stat()
+            if stat.st_size != size:
+                return None
+            if stat.st_mtime_ns != mtime_ns:
+                if hashlib.md5(file_path.read_bytes()).hexdigest() != digest:
+                    return None
+                # Unchanged content with a new timestamp: refresh the fingerprint
+                self._pending.append(
+                    (key, self._trusted_mtime(stat.st_mtime_ns), size, digest, result)
+                )
+            decoded = json.loads(result)
+        except (OSError, ValueError):
+            return None
+
+        self.hits += 1
+        return decoded
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """
+        Return a value stored with set_meta() by a previous run.
+
+        Args:
+            key: Metadata key
+
+        Returns:
+            Stored value, or None
+        """
+        return self._meta.get(key)
+
+    def set_meta(self, key: str, value: str):
+        """
+        Record a metadata value (written on close(), discarded with the entries).
+
+        Args:
+            key: Metadata key ("version" is reserved)
+            value: Value to store
+        """
+        self._pending_meta[key] = value
+
+    def store(self, file_path: Path, result: Dict[str, Any]):
+        """
+        Record the scan result of a file (written on close()).
+
+        Args:
+            file_path: Scanned file
+            result: Scan result including its ``fingerprint`` [mtime_ns, size, md5]
+        """
+        key = str(file_path)
+        self._seen.add(key)
+        mtime_ns, size, digest = result["fingerprint"]
+        self._pending.append(
+            (key, self._trusted_mtime(mtime_ns), size, digest, json.dumps(result))
+        )
+
+    def close(self, prune: bool = True):
+        """
+        Write pending entries and close the database.
+
+        Args:
+            prune: Remove entries for files that were not looked up or
+                stored since open() (deleted files)
+        """
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest, result) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+                if prune:
+                    stale = [(path,) for path in self._entries if path not in self._seen]
+                    self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    list(self._pending_meta.items()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update index cache at {self.path}: {e}")
+        finally:
+            self._close_connection()
+
+    def _close_connection(self):
+        """Close the connection and drop in-memory state."""
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._entries = {}
+        self._pending = []
+        self._seen = set()
+        self._meta = {}
+        self._pending_meta = {}
+
+    @staticmethod
+    def _trusted_mtime(mtime_ns: int) -> int:
+        """Return mtime_ns, or -1 if it is too recent to prove the file is unchanged."""
+        if time.time_ns() - mtime_ns < _RACY_MTIME_WINDOW_NS:
+            return -1
+        return mtime_ns
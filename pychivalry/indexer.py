@@ -52,6 +52,20 @@ ARCHITECTURE:
     10. **Modifiers/Interactions**: name → Location
         - Character interactions, modifiers, etc.
 
+    11. **References**: name → [(uri, line, start, end, kind)]
+        - Uses of events, scripted effects/triggers, saved scopes, character
+          flags and script values, in open and closed files
+        - Found by a text pass over each file (strings and comments
+          blanked); effect/trigger calls and value uses are kept only if
+          they name a known definition
+        - Answers find_references() / count_references() without scanning
+
+    **Copy-on-Write Versions**:
+    copy() returns a new version of the index that shares every table with
+    the original; a table is copied the first time either version writes
+    to it. The server never modifies a published index: writers build the
+    next version and publish it atomically, so readers need no lock.
+
 INDEXING PIPELINE:
     **Initial Workspace Scan** (startup):
     1. Discover all CK3 script files recursively
@@ -96,6 +110,21 @@ WORKSPACE SCANNING:
     Uses ThreadPoolExecutor for parallel parsing.
     Typical: 4-8 threads, 100+ files/second.
 
+    Extraction is pure Python, so threads mostly overlap I/O. With
+    process_workers > 0, file paths are shipped in batches to a
+    ProcessPoolExecutor instead (--scan-workers / indexing.scanWorkers),
+    which scales with CPU cores on large mods.
+
+    Top-level definitions (events, namespaces, scripted effects/triggers,
+    ...) come from the skeleton parser (parser.parse_outline), which skips
+    block bodies instead of building an AST.
+
+    Each file is scanned independently into a compact, JSON-serializable
+    result (locations as [line, start, end] spans), and results are merged in
+    a fixed file order. With use_cache=True these per-file results are kept
+    in <root>/.pychivalry/index.sqlite3 (see index_cache.py), so restarts and
+    rescans only read files whose mtime/size/hash changed.
+
 USAGE EXAMPLES:
     >>> # Create and populate index
     >>> index = DocumentIndex()
@@ -117,10 +146,13 @@ PERFORMANCE:
     - Initial scan: ~500ms for 1000 files (parallel)
     - Incremental update: ~10ms per file
     - Symbol lookup: O(1) hash map
+    - Workspace symbol search: prefix arrays + trigram index (symbol_search.py)
+    - References / usage counts: one dict lookup, O(number of references)
     - Memory: ~50MB for 10k files (~5KB per file)
     
     Optimizations:
     - Parallel scanning with ThreadPoolExecutor
+    - Persistent per-file scan cache (warm start reads no unchanged files)
     - Cached parse results (AST)
     - Lazy localization parsing (on-demand)
     - Incremental updates (don't rescan workspace)
@@ -138,7 +170,7 @@ FILE WATCHING:
     - workspace/didChangeWatchedFiles: Update index
     - textDocument/didOpen: Add to index
     - textDocument/didChange: Update in index
-    - textDocument/didClose: Keep in index (workspace symbol)
+    - textDocument/didClose: Re-index the saved file (keeps references)
 
 SEE ALSO:
     - navigation.py: Go-to-definition using index
@@ -146,19 +178,245 @@ SEE ALSO:
     - symbols.py: Document symbols (single file)
     - completions.py: Custom symbol completions from index
     - hover.py: Custom symbol documentation from index
+    - symbol_search.py: Ranked name search behind search_symbols()
 """
 
-from typing import Dict, List, Optional, Set, Callable
+from typing import Any, Dict, List, Optional, Set, Callable, Tuple
 from lsprotocol import types
-from pychivalry.parser import CK3Node, parse_document
+from pychivalry.cancellation import CancellationToken, OperationCancelled
+from pychivalry.ck3_language import CK3_EFFECTS, CK3_KEYWORDS, CK3_SCOPES, CK3_TRIGGERS
+from pychivalry.parser import CK3Node, OutlineNode, parse_document, parse_outline
+from pychivalry.index_cache import IndexCache
+from pychivalry.overlay_table import OverlayTable
+from pychivalry.symbol_search import DEFAULT_SEARCH_LIMIT, SymbolSearchIndex
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from bisect import bisect_right
+from urllib.parse import unquote
+import gc
+import hashlib
 import logging
+import math
+import multiprocessing
 import os
 import re
+import string
 
 logger = logging.getLogger(__name__)
 
+# Folders scanned for workspace symbols: (path under the root, scan type, glob)
+_SCAN_FOLDERS = (
+    (("common", "scripted_effects"), "scripted_effects", "**/*.txt"),
+    (("common", "scripted_triggers"), "scripted_triggers", "**/*.txt"),
+    (("common", "character_interactions"), "character_interactions", "**/*.txt"),
+    (("common", "modifiers"), "modifiers", "**/*.txt"),
+    (("common", "on_action"), "on_actions", "**/*.txt"),
+    (("common", "opinion_modifiers"), "opinion_modifiers", "**/*.txt"),
+    (("common", "scripted_guis"), "scripted_guis", "**/*.txt"),
+    (("common", "script_values"), "script_values", "**/*.txt"),
+    (("localization",), "localization", "**/*.yml"),
+    (("events",), "events", "**/*.txt"),
+)
+
+# Definition scan types -> the symbol table their top-level definitions go to
+_DEFINITION_TABLES = {
+    "scripted_effects": "scripted_effects",
+    "scripted_triggers": "scripted_triggers",
+    "character_interactions": "character_interactions",
+    "modifiers": "modifiers",
+    "on_actions": "on_action_definitions",
+    "opinion_modifiers": "opinion_modifiers",
+    "scripted_guis": "scripted_guis",
+    "script_values": "script_values",
+}
+
+# Definition folders as URI path fragments ("/common/scripted_effects/" -> type)
+_DEFINITION_FOLDERS = tuple(
+    ("/" + "/".join(folder_parts) + "/", scan_type)
+    for folder_parts, scan_type, _ in _SCAN_FOLDERS
+    if scan_type in _DEFINITION_TABLES
+)
+
+# Symbol tables consulted by diagnostics (unknown effect/trigger/modifier
+# checks); with saved scopes (as "scope:<name>") these are the symbols whose
+# definition changes require re-validating the documents using them
+DEPENDENCY_TABLES = ("scripted_effects", "scripted_triggers", "modifiers", "opinion_modifiers")
+
+# Scan types whose files are also scanned for character flags, in merge order
+_FLAG_SCAN_TYPES = ("events", "scripted_effects", "scripted_triggers")
+
+# Symbol tables whose entries belong to a single document (namespace values
+# are URIs, all other values are Locations); cleared by _remove_document_entries
+_DOCUMENT_TABLES = (
+    "namespaces",
+    "events",
+    "scripted_effects",
+    "scripted_triggers",
+    "scripted_lists",
+    "script_values",
+    "saved_scopes",
+    "character_interactions",
+    "modifiers",
+    "on_action_definitions",
+    "opinion_modifiers",
+    "scripted_guis",
+)
+
+# Symbol tables searched by workspace/symbol (see search_symbols)
+_SEARCH_TABLES = (
+    "events",
+    "scripted_effects",
+    "scripted_triggers",
+    "script_values",
+    "on_action_definitions",
+)
+
+# Tables shared between copy-on-write versions of the index (see DocumentIndex.copy)
+_COW_TABLES = _DOCUMENT_TABLES + (
+    "localization",
+    "character_flags",
+    "references",
+    "_document_keys",
+    "symbol_search",
+)
+
+# Reference kinds stored in DocumentIndex.references
+REFERENCE_KINDS = (
+    "event",
+    "scripted_effect",
+    "scripted_trigger",
+    "saved_scope",
+    "flag",
+    "script_value",
+)
+
+# Top-level keys that are event definitions / other definitions (parse_outline keys)
+_EVENT_ID = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*\.\d+")
+_DEFINITION_NAME = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+
+# Block keys that are never definition names, even at the top level
+_NON_DEFINITION_KEYS = frozenset(
+    (
+        "if",
+        "else",
+        "else_if",
+        "trigger",
+        "effect",
+        "limit",
+        "modifier",
+        "hidden_effect",
+        "show_as_tooltip",
+        "random_list",
+        "switch",
+    )
+)
+
+# Strings and comments, blanked out (keeping columns) before finding references
+_STRING_OR_COMMENT = re.compile(r'"[^"\n]*"|#[^\n]*')
+
+# Event IDs used anywhere except as a key (keys are the event definitions)
+_EVENT_REFERENCE = re.compile(r"(?<![\w.:@$])([A-Za-z_]\w*\.\d+)(?![\w.])(?!\s*=)")
+
+# Saved scope uses and saves, and character flag actions. Patterns start with a
+# literal so the regex engine can skip ahead; word boundaries are checked by hand
+_SCOPE_REFERENCE = re.compile(r"scope:(\w+)")
+_SAVE_SCOPE_REFERENCE = re.compile(r"save_(?:temporary_)?scope_as\s*=\s*(\w+)")
+_FLAG_REFERENCE = re.compile(
+    r"(?:add|has|remove)_character_flag\s*=\s*(?:\{\s*flag\s*=\s*)?(\w+)"
+)
+_WORD_OR_PATH_CHARS = frozenset(string.ascii_letters + string.digits + "_.:@$")
+
+# Braces (to track depth), and keys assigned yes/no/a block: candidate calls of
+# scripted effects and triggers, resolved against the definitions when merged
+_CALL_OR_BRACE = re.compile(r"([{}])|(?<![\w.:@$])([A-Za-z_]\w*)\s*\??=\s*(?:yes\b|no\b|(\{))")
+
+# Identifier values: candidate uses of script values
+_VALUE_REFERENCE = re.compile(r"[=<>][ \t]*([A-Za-z_]\w*)(?![\w.:@$])")
+
+# Built-in keys, which are never calls of scripted effects or triggers
+_BUILTIN_KEYS = frozenset(CK3_KEYWORDS + CK3_EFFECTS + CK3_TRIGGERS + CK3_SCOPES)
+
+# Upper bound on files shipped to a worker process per task
+_PROCESS_BATCH_MAX = 64
+
+# Encodings tried in order for script files (localization must be UTF-8)
+_SCRIPT_ENCODINGS = ("utf-8-sig", "utf-8", "latin-1", "cp1252")
+
+
+def _definition_scan_type(uri: str) -> Optional[str]:
+    """Definition scan type of a file from its folder (None for other files)."""
+    path = unquote(uri).replace("\\", "/")
+    for folder, scan_type in _DEFINITION_FOLDERS:
+        if folder in path:
+            return scan_type
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a node value is a number literal."""
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _decode_file(data: bytes, fallback_encodings: bool = True) -> Optional[str]:
+    """
+    Decode file bytes like Path.read_text() would (universal newlines).
+
+    Tries UTF-8 (with BOM) first, then legacy encodings if allowed.
+    """
+    encodings = _SCRIPT_ENCODINGS if fallback_encodings else _SCRIPT_ENCODINGS[:1]
+    for encoding in encodings:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+    return None
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause cyclic garbage collection while bulk-building the index.
+
+    A scan allocates hundreds of thousands of long-lived objects (Locations,
+    tuples), which triggers repeated full collections that find nothing to
+    free; pausing roughly halves the time to load a cached index.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _location_spans(locations: Dict[str, types.Location]) -> Dict[str, List[int]]:
+    """Convert single-line Locations to compact [line, start, end] spans."""
+    return {
+        name: [loc.range.start.line, loc.range.start.character, loc.range.end.character]
+        for name, loc in locations.items()
+    }
+
+
+def _span_location(uri: str, span: List[int]) -> types.Location:
+    """Rebuild a Location from a compact [line, start, end] span."""
+    line, start, end = span
+    return types.Location(
+        uri=uri,
+        range=types.Range(
+            start=types.Position(line=line, character=start),
+            end=types.Position(line=line, character=end),
+        ),
+    )
+
 
 class DocumentIndex:
     """
@@ -175,36 +433,105 @@ class DocumentIndex:
 
     def __init__(self):
         """Initialize empty index."""
-        self.namespaces: Dict[str, str] = {}  # namespace -> file uri
-        self.events: Dict[str, types.Location] = {}  # event_id -> Location
-        self.scripted_effects: Dict[str, types.Location] = {}  # name -> Location
-        self.scripted_triggers: Dict[str, types.Location] = {}  # name -> Location
-        self.scripted_lists: Dict[str, types.Location] = {}  # name -> Location
-        self.script_values: Dict[str, types.Location] = {}  # name -> Location
+        self.namespaces: Dict[str, str] = OverlayTable()  # namespace -> file uri
+        self.events: Dict[str, types.Location] = OverlayTable()  # event_id -> Location
+        self.scripted_effects: Dict[str, types.Location] = OverlayTable()  # name -> Location
+        self.scripted_triggers: Dict[str, types.Location] = OverlayTable()  # name -> Location
+        self.scripted_lists: Dict[str, types.Location] = OverlayTable()  # name -> Location
+        self.script_values: Dict[str, types.Location] = OverlayTable()  # name -> Location
         self.on_actions: Dict[str, List[str]] = {}  # on_action -> event list
-        self.saved_scopes: Dict[str, types.Location] = {}  # scope_name -> save Location
+        self.saved_scopes: Dict[str, types.Location] = OverlayTable()  # scope_name -> save Location
 
         # Localization: key -> (text, file_uri, line_number)
-        self.localization: Dict[str, tuple] = {}
+        self.localization: Dict[str, tuple] = OverlayTable()
 
         # Character flags: flag_name -> list of (action, file_uri, line_number)
         # action is 'set' (add_character_flag) or 'check' (has_character_flag)
-        self.character_flags: Dict[str, List[tuple]] = {}
+        self.character_flags: Dict[str, List[tuple]] = OverlayTable()
 
         # New common/ folder indexes
-        self.character_interactions: Dict[str, types.Location] = {}  # name -> Location
-        self.modifiers: Dict[str, types.Location] = {}  # name -> Location
+        self.character_interactions: Dict[str, types.Location] = OverlayTable()  # name -> Location
+        self.modifiers: Dict[str, types.Location] = OverlayTable()  # name -> Location
         self.on_action_definitions: Dict[str, types.Location] = (
-            {}
+            OverlayTable()
         )  # name -> Location (actual definitions)
-        self.opinion_modifiers: Dict[str, types.Location] = {}  # name -> Location
-        self.scripted_guis: Dict[str, types.Location] = {}  # name -> Location
+        self.opinion_modifiers: Dict[str, types.Location] = OverlayTable()  # name -> Location
+        self.scripted_guis: Dict[str, types.Location] = OverlayTable()  # name -> Location
+
+        # References: symbol name -> list of (uri, line, start, end, kind), with
+        # kind one of REFERENCE_KINDS; lists are replaced, never appended to,
+        # outside of workspace scans
+        self.references: Dict[str, List[Tuple[str, int, int, int, str]]] = OverlayTable()
 
         # Track workspace roots for rescanning
         self._workspace_roots: List[str] = []
 
+        # Reverse index: uri -> table name -> keys the document contributed,
+        # so removing a document touches only its own keys
+        self._document_keys: Dict[str, Dict[str, Set[str]]] = OverlayTable()
+
+        # Name search over _SEARCH_TABLES for workspace/symbol
+        self.symbol_search = SymbolSearchIndex()
+
+        # Tables still shared with another version of the index (copy-on-write)
+        self._shared_tables: Set[str] = set()
+
+    def copy(self) -> "DocumentIndex":
+        """
+        Create a copy-on-write version of the index.
+
+        The copy shares every symbol table with this index, and whichever side
+        modifies a table first takes a private copy of that table. Creating
+        the copy is O(1), and the tables are OverlayTables whose copies share
+        the bulk of their contents (see overlay_table.py), so a write costs
+        time proportional to the edit rather than to the workspace. A writer
+        can build the next version of the index while readers keep using the
+        current one unchanged.
+
+        Returns:
+            New DocumentIndex with the same contents
+        """
+        clone = DocumentIndex.__new__(DocumentIndex)
+        clone.__dict__.update(self.__dict__)
+        clone._workspace_roots = list(self._workspace_roots)
+        clone._shared_tables = set(_COW_TABLES)
+        self._shared_tables = set(_COW_TABLES)
+        return clone
+
+    @property
+    def workspace_roots(self) -> List[str]:
+        """Workspace roots of the last scan (see scan_workspace)."""
+        return self._workspace_roots
+
+    def _own_table(self, table_name: str, bulk: bool = False):
+        """
+        Take a private copy of a table that is shared with another index version.
+
+        Copies share their contents and copy only their recent changes (see
+        overlay_table.py). Inner reverse-index sets and reference lists are
+        replaced wholesale outside of scans, never mutated.
+
+        Args:
+            table_name: Attribute name of the table (one of _COW_TABLES)
+            bulk: Also give the table a private base dict, before many writes
+                (a workspace scan) that then run at plain dict speed
+        """
+        table = getattr(self, table_name)
+        if table_name in self._shared_tables:
+            self._shared_tables.discard(table_name)
+            table = table.copy()
+            setattr(self, table_name, table)
+        if bulk and table_name != "symbol_search" and not table.owns_base:
+            # Scans append to flag usage lists in place, so they are copied too
+            table.compact(list if table_name == "character_flags" else None)
+
     def scan_workspace(
-        self, workspace_roots: List[str], executor: Optional[ThreadPoolExecutor] = None
+        self,
+        workspace_roots: List[str],
+        executor: Optional[ThreadPoolExecutor] = None,
+        use_cache: bool = False,
+        process_workers: int = 0,
+        cancel: Optional[CancellationToken] = None,
     ):
         """
         Scan workspace folders for scripted effects, triggers, localization, events, and flags.
@@ -213,228 +540,335 @@ class DocumentIndex:
         localization/, and events/ folders in each workspace root and indexes all definitions found.
 
         If an executor is provided, scanning is parallelized for 2-4x faster indexing.
+        If use_cache is set, per-file results are persisted in each root's
+        .pychivalry/ folder and only files that changed since the last scan
+        are read and extracted again.
+
+        Extraction is pure Python, so threads are serialized by the GIL. With
+        process_workers > 0, files are instead shipped in batches to a pool
+        of worker processes (created for this scan), which return compact
+        results that are merged here; the thread executor is then unused.
+
+        A cancelled scan stops after the files being scanned and leaves the
+        index partially updated; callers scan into a copy (see
+        CK3LanguageServer.scan_index) and drop it.
 
         Args:
             workspace_roots: List of workspace folder paths
             executor: Optional ThreadPoolExecutor for parallel scanning
+            use_cache: Use the persistent index cache (see index_cache.py)
+            process_workers: Number of worker processes (0 = no processes)
+            cancel: Checked between files
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
         """
         self._workspace_roots = workspace_roots
+        for table_name in _COW_TABLES:
+            self._own_table(table_name, bulk=True)
+        # References are collected from scratch; open documents add theirs on update
+        self.references = OverlayTable()
+
+        with _gc_paused():
+            if process_workers > 0:
+                # Spawn (not fork): the server process runs threads, and
+                # forking while another thread holds a lock can deadlock
+                with ProcessPoolExecutor(
+                    max_workers=process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as process_pool:
+                    file_references = self._scan_workspace_parallel(
+                        workspace_roots, process_pool, use_cache, cancel, process_workers
+                    )
+            elif executor or use_cache or cancel is not None:
+                file_references = self._scan_workspace_parallel(
+                    workspace_roots, executor, use_cache, cancel
+                )
+            else:
+                file_references = self._scan_workspace_sequential(workspace_roots)
 
-        if executor:
-            self._scan_workspace_parallel(workspace_roots, executor)
-        else:
-            self._scan_workspace_sequential(workspace_roots)
+            # Resolved once all roots are merged, so calls can refer to
+            # definitions in any file
+            for uri, raw_references in file_references:
+                self._add_references(uri, raw_references, in_place=True)
+            self._rebuild_document_keys()
+            self._rebuild_symbol_search()
 
         logger.info(
             f"Workspace scan complete: {len(self.scripted_effects)} effects, {len(self.scripted_triggers)} triggers, "
             f"{len(self.character_interactions)} interactions, {len(self.modifiers)} modifiers, "
             f"{len(self.on_action_definitions)} on_actions, {len(self.opinion_modifiers)} opinion_mods, "
             f"{len(self.scripted_guis)} GUIs, {len(self.localization)} loc keys, "
-            f"{len(self.events)} events, {len(self.character_flags)} flags"
+            f"{len(self.events)} events, {len(self.character_flags)} flags, "
+            f"{len(self.references)} referenced symbols"
         )
 
-    def _scan_workspace_parallel(self, workspace_roots: List[str], executor: ThreadPoolExecutor):
+    def _scan_workspace_parallel(
+        self,
+        workspace_roots: List[str],
+        executor: Optional[Executor] = None,
+        use_cache: bool = False,
+        cancel: Optional[CancellationToken] = None,
+        process_workers: int = 1,
+    ) -> List[Tuple[str, Dict[str, List[List]]]]:
         """
-        Scan workspace folders in parallel using thread pool.
+        Scan workspace folders file by file, in parallel and/or from the cache.
 
-        Parallelizes file I/O and parsing across multiple threads for 2-4x speedup.
+        Every file is scanned independently by _scan_file() into a compact
+        result; results are then merged in a fixed order so the index does
+        not depend on task completion order. With ``use_cache``, files whose
+        fingerprint matches the persistent index cache are not read at all.
 
         Args:
             workspace_roots: List of workspace folder paths
-            executor: ThreadPoolExecutor for parallel execution
-        """
-        # Collect all scan tasks
-        scan_tasks = []
+            executor: Thread or process pool for parallel execution (inline if None)
+            use_cache: Reuse and update the on-disk cache of each root
+            cancel: Checked between files (between batches in processes)
+            process_workers: Worker count of ``executor`` if it is a process pool
 
+        Returns:
+            List of (uri, unresolved references) per file, for _add_references()
+        """
+        file_references = []
         for root in workspace_roots:
             root_path = Path(root)
+            scan_files = self._collect_scan_files(root_path)
 
-            # Collect all folders to scan with their target dicts and types
-            folder_configs = [
-                (
-                    root_path / "common" / "scripted_effects",
-                    self.scripted_effects,
-                    "scripted_effects",
-                ),
-                (
-                    root_path / "common" / "scripted_triggers",
-                    self.scripted_triggers,
-                    "scripted_triggers",
-                ),
-                (
-                    root_path / "common" / "character_interactions",
-                    self.character_interactions,
-                    "character_interactions",
-                ),
-                (root_path / "common" / "modifiers", self.modifiers, "modifiers"),
-                (root_path / "common" / "on_action", self.on_action_definitions, "on_actions"),
-                (
-                    root_path / "common" / "opinion_modifiers",
-                    self.opinion_modifiers,
-                    "opinion_modifiers",
-                ),
-                (root_path / "common" / "scripted_guis", self.scripted_guis, "scripted_guis"),
-            ]
-
-            # Submit file scanning tasks
-            for folder_path, target_dict, folder_type in folder_configs:
-                if folder_path.exists() and folder_path.is_dir():
-                    for file_path in folder_path.glob("**/*.txt"):
-                        scan_tasks.append(
-                            executor.submit(self._scan_single_file, file_path, folder_type)
-                        )
-
-            # Localization (different format)
-            loc_path = root_path / "localization"
-            if loc_path.exists() and loc_path.is_dir():
-                loc_files = list(loc_path.glob("**/*.yml"))
-                logger.info(f"Found {len(loc_files)} localization files in {loc_path}")
-                for file_path in loc_files:
-                    scan_tasks.append(
-                        executor.submit(self._scan_localization_file_parallel, file_path)
-                    )
-            else:
-                logger.debug(f"No localization folder at {loc_path} (not a CK3 mod)")
-
-            # Events
-            events_path = root_path / "events"
-            if events_path.exists() and events_path.is_dir():
-                for file_path in events_path.glob("**/*.txt"):
-                    scan_tasks.append(executor.submit(self._scan_events_file_parallel, file_path))
+            # Only roots with files to scan get a cache (and its .pychivalry folder)
+            cache = None
+            if use_cache and scan_files and root_path.is_dir():
+                cache = IndexCache(root_path)
+            if cache is not None and not cache.open():
+                cache = None
 
-        # Collect results
-        for future in as_completed(scan_tasks):
             try:
-                result = future.result()
+                results: List[Optional[Dict]] = [None] * len(scan_files)
+                misses = []
+                for i, (file_path, scan_type) in enumerate(scan_files):
+                    cached = cache.lookup(file_path) if cache is not None else None
+                    if cached is not None:
+                        results[i] = cached
+                    else:
+                        misses.append(i)
+
+                if isinstance(executor, ProcessPoolExecutor) and len(misses) > 1:
+                    scanned = self._scan_files_in_processes(
+                        [scan_files[i] for i in misses], executor, process_workers, cancel
+                    )
+                    for i, result in zip(misses, scanned):
+                        results[i] = result
+                elif executor is not None and len(misses) > 1:
+                    futures = {
+                        executor.submit(self._scan_file, *scan_files[i]): i for i in misses
+                    }
+                    try:
+                        for future in as_completed(futures):
+                            if cancel is not None:
+                                cancel.raise_if_cancelled()
+                            try:
+                                results[futures[future]] = future.result()
+                            except Exception as e:
+                                logger.warning(f"Error in parallel scan task: {e}")
+                    except OperationCancelled:
+                        for future in futures:
+                            future.cancel()
+                        raise
+                else:
+                    for i in misses:
+                        if cancel is not None:
+                            cancel.raise_if_cancelled()
+                        results[i] = self._scan_file(*scan_files[i])
+
+                if cache is not None:
+                    for i in misses:
+                        if results[i] is not None:
+                            cache.store(scan_files[i][0], results[i])
+                    cache.close()
+            except BaseException:
+                if cache is not None:
+                    cache.close(prune=False)
+                raise
+
+            for result in results:
                 if result:
                     self._merge_scan_result(result)
-            except Exception as e:
-                logger.warning(f"Error in parallel scan task: {e}")
+                    if result.get("refs"):
+                        file_references.append((result["uri"], result["refs"]))
+
+            # Character flags are merged last, in the order of the sequential scan
+            for flag_type in _FLAG_SCAN_TYPES:
+                for (_, scan_type), result in zip(scan_files, results):
+                    if result and scan_type == flag_type:
+                        self._merge_flag_result(result)
+
+            if cache is not None:
+                logger.info(
+                    f"Index cache for {root}: {cache.hits} files reused, "
+                    f"{len(scan_files) - cache.hits} scanned"
+                )
 
-        # Scan character flags (depends on having events/effects indexed)
-        for root in workspace_roots:
-            self._scan_character_flags(Path(root))
+        return file_references
 
-    def _scan_single_file(self, file_path: Path, folder_type: str) -> Optional[Dict]:
+    def _scan_files_in_processes(
+        self,
+        scan_files: List[Tuple[Path, str]],
+        process_pool: ProcessPoolExecutor,
+        workers: int,
+        cancel: Optional[CancellationToken] = None,
+    ) -> List[Optional[Dict]]:
         """
-        Scan a single file and return results for merging.
+        Scan files in worker processes, in batches to amortize IPC overhead.
 
         Args:
-            file_path: Path to the file to scan
-            folder_type: Type of definitions to extract
+            scan_files: List of (file path, scan type)
+            process_pool: Process pool to run _scan_file_batch() in
+            workers: Number of worker processes of the pool (sizes the batches)
+            cancel: Checked before waiting for each batch
 
         Returns:
-            Dictionary with scan results or None on error
+            Scan results in the order of scan_files (None for failed files)
         """
-        try:
-            content = file_path.read_text(encoding="utf-8-sig")
-            uri = file_path.as_uri()
+        batch_size = max(1, min(_PROCESS_BATCH_MAX, math.ceil(len(scan_files) / (workers * 4))))
+        batches = [
+            [(str(path), scan_type) for path, scan_type in scan_files[i : i + batch_size]]
+            for i in range(0, len(scan_files), batch_size)
+        ]
 
-            definitions = self._extract_top_level_definitions(content, uri)
+        results: List[Optional[Dict]] = []
+        futures = [process_pool.submit(_scan_file_batch, batch) for batch in batches]
+        for batch, future in zip(batches, futures):
+            if cancel is not None and cancel.cancelled:
+                for pending in futures:
+                    pending.cancel()
+                raise OperationCancelled()
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                logger.warning(f"Error in process scan task: {e}")
+                results.extend([None] * len(batch))
+        return results
 
-            return {
-                "type": folder_type,
-                "definitions": definitions,
-                "file": str(file_path),
-            }
-        except Exception as e:
-            logger.warning(f"Error scanning {file_path}: {e}")
-            return None
+    def _collect_scan_files(self, root_path: Path) -> List[Tuple[Path, str]]:
+        """
+        List the files of a workspace root that the scan extracts symbols from.
 
-    def _scan_localization_file_parallel(self, file_path: Path) -> Optional[Dict]:
-        """Scan a localization file in parallel."""
-        try:
-            content = file_path.read_text(encoding="utf-8-sig")
-            uri = file_path.as_uri()
+        Args:
+            root_path: Workspace root folder
 
-            entries = self._parse_localization_file(content, uri)
+        Returns:
+            List of (file path, scan type) in scan order
+        """
+        scan_files = []
+        for folder_parts, scan_type, pattern in _SCAN_FOLDERS:
+            folder_path = root_path.joinpath(*folder_parts)
+            if folder_path.exists() and folder_path.is_dir():
+                scan_files.extend(
+                    (file_path, scan_type) for file_path in sorted(folder_path.glob(pattern))
+                )
+            elif scan_type == "localization":
+                logger.debug(f"No localization folder at {folder_path} (not a CK3 mod)")
+        return scan_files
 
-            return {
-                "type": "localization",
-                "entries": entries,
-                "uri": uri,
-            }
-        except Exception as e:
-            logger.warning(f"Error scanning localization {file_path}: {e}")
-            return None
+    def _scan_file(self, file_path: Path, scan_type: str) -> Optional[Dict]:
+        """
+        Scan a single workspace file and return a compact result for merging.
 
-    def _scan_events_file_parallel(self, file_path: Path) -> Optional[Dict]:
-        """Scan an events file in parallel."""
-        try:
-            # Try multiple encodings
-            content = None
-            for encoding in ["utf-8-sig", "utf-8", "latin-1", "cp1252"]:
-                try:
-                    content = file_path.read_text(encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
+        Locations are stored as ``[line, start_character, end_character]``
+        spans and everything else as plain lists/dicts, so results can be
+        written to the index cache as JSON and rebuilt by _merge_scan_result().
 
+        Args:
+            file_path: Path to the file to scan
+            scan_type: Type of definitions to extract (see _SCAN_FOLDERS)
+
+        Returns:
+            Dictionary with scan results or None on error
+        """
+        try:
+            stat = file_path.stat()
+            data = file_path.read_bytes()
+            content = _decode_file(data, scan_type != "localization")
             if content is None:
+                logger.warning(f"Could not decode {file_path}")
                 return None
 
             uri = file_path.as_uri()
-
-            return {
-                "type": "events",
-                "namespaces": self._extract_namespaces(content, uri),
-                "events": self._extract_event_definitions(content, uri),
-                "scopes": self._extract_saved_scopes(content, uri),
+            result: Dict[str, Any] = {
+                "type": scan_type,
+                "uri": uri,
+                "fingerprint": [stat.st_mtime_ns, stat.st_size, hashlib.md5(data).hexdigest()],
             }
+
+            if scan_type == "localization":
+                entries = self._parse_localization_file(content, uri)
+                result["entries"] = {key: list(entry) for key, entry in entries.items()}
+            elif scan_type == "events":
+                outline = parse_outline(content)
+                result["namespaces"] = list(self._extract_namespaces(content, uri, outline))
+                result["events"] = _location_spans(
+                    self._extract_event_definitions(content, uri, outline)
+                )
+                result["scopes"] = _location_spans(self._extract_saved_scopes(content, uri))
+            else:
+                result["definitions"] = _location_spans(
+                    self._extract_top_level_definitions(
+                        content, uri, scalar_values=scan_type == "script_values"
+                    )
+                )
+
+            if scan_type in _FLAG_SCAN_TYPES:
+                result["flags"] = [list(flag) for flag in self._collect_character_flags(content)]
+            if scan_type != "localization":
+                result["refs"] = self._collect_references(content)
+
+            return result
         except Exception as e:
-            logger.warning(f"Error scanning events {file_path}: {e}")
+            logger.warning(f"Error scanning {file_path}: {e}")
             return None
 
     def _merge_scan_result(self, result: Dict):
-        """Merge scan result into the index."""
+        """Merge a _scan_file() result (except character flags) into the index."""
         result_type = result.get("type")
+        uri = result.get("uri", "")
 
         if result_type == "localization":
-            entries = result.get("entries", {})
-            uri = result.get("uri", "")
-            for key, (text, line_num) in entries.items():
+            for key, (text, line_num) in result.get("entries", {}).items():
                 self.localization[key] = (text, uri, line_num)
 
         elif result_type == "events":
-            for ns_name, ns_uri in result.get("namespaces", {}).items():
+            for ns_name in result.get("namespaces", []):
                 if ns_name not in self.namespaces:
-                    self.namespaces[ns_name] = ns_uri
-            for event_id, location in result.get("events", {}).items():
-                self.events[event_id] = location
-            for scope_name, location in result.get("scopes", {}).items():
+                    self.namespaces[ns_name] = uri
+            for event_id, span in result.get("events", {}).items():
+                self.events[event_id] = _span_location(uri, span)
+            for scope_name, span in result.get("scopes", {}).items():
                 if scope_name not in self.saved_scopes:
-                    self.saved_scopes[scope_name] = location
-
-        elif result_type in (
-            "scripted_effects",
-            "scripted_triggers",
-            "character_interactions",
-            "modifiers",
-            "on_actions",
-            "opinion_modifiers",
-            "scripted_guis",
-        ):
-            target_dict = {
-                "scripted_effects": self.scripted_effects,
-                "scripted_triggers": self.scripted_triggers,
-                "character_interactions": self.character_interactions,
-                "modifiers": self.modifiers,
-                "on_actions": self.on_action_definitions,
-                "opinion_modifiers": self.opinion_modifiers,
-                "scripted_guis": self.scripted_guis,
-            }.get(result_type)
-
-            if target_dict is not None:
-                for name, location in result.get("definitions", {}).items():
-                    target_dict[name] = location
+                    self.saved_scopes[scope_name] = _span_location(uri, span)
+
+        elif result_type in _DEFINITION_TABLES:
+            target_dict = getattr(self, _DEFINITION_TABLES[result_type])
+            for name, span in result.get("definitions", {}).items():
+                target_dict[name] = _span_location(uri, span)
 
-    def _scan_workspace_sequential(self, workspace_roots: List[str]):
+    def _merge_flag_result(self, result: Dict):
+        """Merge the character flag usages of a _scan_file() result into the index."""
+        uri = result.get("uri", "")
+        for flag_name, action, line_num in result.get("flags", []):
+            self.character_flags.setdefault(flag_name, []).append((action, uri, line_num))
+
+    def _scan_workspace_sequential(
+        self, workspace_roots: List[str]
+    ) -> List[Tuple[str, Dict[str, List[List]]]]:
         """
         Scan workspace folders sequentially (fallback when no executor provided).
 
         Args:
             workspace_roots: List of workspace folder paths
+
+        Returns:
+            List of (uri, unresolved references) per file, for _add_references()
         """
+        file_references = []
         for root in workspace_roots:
             root_path = Path(root)
 
@@ -475,6 +909,13 @@ class DocumentIndex:
             if guis_path.exists() and guis_path.is_dir():
                 self._scan_common_folder(guis_path, self.scripted_guis, "scripted GUI")
 
+            # Scan script values
+            values_path = root_path / "common" / "script_values"
+            if values_path.exists() and values_path.is_dir():
+                self._scan_common_folder(
+                    values_path, self.script_values, "script value", scalar_values=True
+                )
+
             # Scan localization
             loc_path = root_path / "localization"
             if loc_path.exists() and loc_path.is_dir():
@@ -488,6 +929,11 @@ class DocumentIndex:
             # Scan for character flags in events and scripted effects
             self._scan_character_flags(root_path)
 
+            # Collect references from all script files
+            file_references.extend(self._scan_references(root_path))
+
+        return file_references
+
     def _scan_scripted_effects_folder(self, folder_path: Path):
         """
         Scan a scripted_effects folder for effect definitions.
@@ -515,18 +961,24 @@ class DocumentIndex:
                 logger.warning(f"Error scanning {file_path}: {e}")
 
     def _scan_common_folder(
-        self, folder_path: Path, target_dict: Dict[str, types.Location], def_type: str
+        self,
+        folder_path: Path,
+        target_dict: Dict[str, types.Location],
+        def_type: str,
+        scalar_values: bool = False,
     ):
         """
         Generic scanner for common/ subfolders with top-level definitions.
 
         Scans .txt files for top-level block definitions and stores them in the target dict.
-        Works for: character_interactions, modifiers, on_action, opinion_modifiers, scripted_guis
+        Works for: character_interactions, modifiers, on_action, opinion_modifiers, scripted_guis,
+        script_values
 
         Args:
             folder_path: Path to the common/ subfolder
             target_dict: Dictionary to store definitions (name -> Location)
             def_type: Type name for logging (e.g., "modifier", "character interaction")
+            scalar_values: Also index numeric definitions (script values)
         """
         for file_path in folder_path.glob("**/*.txt"):
             try:
@@ -534,7 +986,7 @@ class DocumentIndex:
                 uri = file_path.as_uri()
 
                 # Parse top-level definitions
-                definitions = self._extract_top_level_definitions(content, uri)
+                definitions = self._extract_top_level_definitions(content, uri, scalar_values)
                 for name, location in definitions.items():
                     target_dict[name] = location
                     logger.debug(f"Indexed {def_type}: {name} in {file_path.name}")
@@ -679,14 +1131,17 @@ class DocumentIndex:
 
                 uri = file_path.as_uri()
 
+                # Top-level statements only, bodies are skipped
+                outline = parse_outline(content)
+
                 # Extract namespace declarations
-                namespaces = self._extract_namespaces(content, uri)
+                namespaces = self._extract_namespaces(content, uri, outline)
                 for ns_name, ns_uri in namespaces.items():
                     if ns_name not in self.namespaces:
                         self.namespaces[ns_name] = ns_uri
 
                 # Parse event definitions
-                events = self._extract_event_definitions(content, uri)
+                events = self._extract_event_definitions(content, uri, outline)
                 for event_id, location in events.items():
                     self.events[event_id] = location
 
@@ -704,76 +1159,53 @@ class DocumentIndex:
             except Exception as e:
                 logger.warning(f"Error scanning events {file_path}: {e}")
 
-    def _extract_event_definitions(self, content: str, uri: str) -> Dict[str, types.Location]:
+    def _extract_event_definitions(
+        self, content: str, uri: str, outline: Optional[List[OutlineNode]] = None
+    ) -> Dict[str, types.Location]:
         """
         Extract event definitions from file content.
 
-        Event format: namespace.number = { ... }
+        Event format: namespace.number = { ... } at the top level
 
         Args:
             content: File content
             uri: File URI
+            outline: parse_outline(content), if already computed
 
         Returns:
             Dictionary of event_id -> Location
         """
-        events = {}
-        lines = content.split("\n")
-
-        # Pattern for event definition: namespace.number = { at start of line
-        # Event IDs have format: word.digits (e.g., rq_nts_daughter.0001)
-        pattern = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*\.\d+)\s*=\s*\{")
-
-        for line_num, line in enumerate(lines):
-            stripped = line.lstrip()
-            leading_ws = len(line) - len(stripped)
-
-            # Events should be at top level (no/minimal indentation)
-            if leading_ws > 1:
-                continue
-
-            match = pattern.match(stripped)
-            if match:
-                event_id = match.group(1)
-                char_start = line.find(event_id)
-
-                location = types.Location(
-                    uri=uri,
-                    range=types.Range(
-                        start=types.Position(line=line_num, character=char_start),
-                        end=types.Position(line=line_num, character=char_start + len(event_id)),
-                    ),
-                )
-                events[event_id] = location
-
-        return events
+        if outline is None:
+            outline = parse_outline(content)
+        return {
+            node.key: types.Location(uri=uri, range=node.key_range)
+            for node in outline
+            if node.value is None and _EVENT_ID.fullmatch(node.key)
+        }
 
-    def _extract_namespaces(self, content: str, uri: str) -> Dict[str, str]:
+    def _extract_namespaces(
+        self, content: str, uri: str, outline: Optional[List[OutlineNode]] = None
+    ) -> Dict[str, str]:
         """
         Extract namespace declarations from file content.
 
-        Pattern: namespace = name_here
+        Pattern: namespace = name_here (at the top level)
 
         Args:
             content: File content
             uri: File URI
+            outline: parse_outline(content), if already computed
 
         Returns:
             Dictionary of namespace_name -> file_uri
         """
-        namespaces = {}
-        lines = content.split("\n")
-
-        # Pattern for namespace = name
-        pattern = re.compile(r"^\s*namespace\s*=\s*([a-zA-Z_][a-zA-Z0-9_]*)")
-
-        for line in lines:
-            match = pattern.match(line)
-            if match:
-                ns_name = match.group(1)
-                namespaces[ns_name] = uri
-
-        return namespaces
+        if outline is None:
+            outline = parse_outline(content)
+        return {
+            node.value: uri
+            for node in outline
+            if node.key == "namespace" and node.value_type == "identifier"
+        }
 
     def _extract_saved_scopes(self, content: str, uri: str) -> Dict[str, types.Location]:
         """
@@ -876,6 +1308,24 @@ class DocumentIndex:
             content: File content
             uri: File URI
         """
+        for flag_name, action, line_num in self._collect_character_flags(content):
+            # Add to index
+            if flag_name not in self.character_flags:
+                self.character_flags[flag_name] = []
+
+            self.character_flags[flag_name].append((action, uri, line_num))
+
+    def _collect_character_flags(self, content: str) -> List[Tuple[str, str, int]]:
+        """
+        Find character flag usages in file content without touching the index.
+
+        Args:
+            content: File content
+
+        Returns:
+            List of (flag_name, action, line_number) in file order
+        """
+        flags = []
         lines = content.split("\n")
 
         # Patterns for flag operations
@@ -894,13 +1344,170 @@ class DocumentIndex:
             for pattern, action in patterns:
                 match = pattern.search(line)
                 if match:
-                    flag_name = match.group(1)
+                    flags.append((match.group(1), action, line_num))
+
+        return flags
+
+    def _scan_references(self, root_path: Path) -> List[Tuple[str, Dict[str, List[List]]]]:
+        """
+        Collect references from every script file the workspace scan reads.
+
+        Args:
+            root_path: Root path of the workspace
+
+        Returns:
+            List of (uri, unresolved references) per file
+        """
+        file_references = []
+        for file_path, scan_type in self._collect_scan_files(root_path):
+            if scan_type == "localization":
+                continue
+            try:
+                content = _decode_file(file_path.read_bytes())
+                if content is not None:
+                    file_references.append(
+                        (file_path.as_uri(), self._collect_references(content))
+                    )
+            except Exception as e:
+                logger.warning(f"Error scanning references in {file_path}: {e}")
+        return file_references
 
-                    # Add to index
-                    if flag_name not in self.character_flags:
-                        self.character_flags[flag_name] = []
+    def _collect_references(self, content: str) -> Dict[str, List[List]]:
+        """
+        Find symbol references in file content without touching the index.
+
+        Finds event IDs, saved scopes (scope:x and save_scope_as), character
+        flags, and candidate scripted effect/trigger calls (``name = yes``,
+        ``name = { ... }`` below the top level) and script value uses
+        (identifier values). Candidates are kept as kinds "call" and "value"
+        and resolved against the definitions by _add_references().
+
+        Args:
+            content: File content
+
+        Returns:
+            Symbol name -> list of [line, start_character, end_character, kind]
+        """
+        text = _STRING_OR_COMMENT.sub(lambda m: " " * len(m.group()), content)
+        line_starts = [0]
+        line_starts.extend(m.end() for m in re.finditer("\n", text))
+        references: Dict[str, List[List]] = {}
+
+        def add(name: str, start: int, kind: str):
+            line = bisect_right(line_starts, start) - 1
+            column = start - line_starts[line]
+            references.setdefault(name, []).append([line, column, column + len(name), kind])
+
+        for match in _EVENT_REFERENCE.finditer(text):
+            add(match.group(1), match.start(1), "event")
+        for pattern, kind in (
+            (_SCOPE_REFERENCE, "saved_scope"),
+            (_SAVE_SCOPE_REFERENCE, "saved_scope"),
+            (_FLAG_REFERENCE, "flag"),
+        ):
+            for match in pattern.finditer(text):
+                start = match.start()
+                if start == 0 or text[start - 1] not in _WORD_OR_PATH_CHARS:
+                    add(match.group(1), match.start(1), kind)
+
+        depth = 0
+        for match in _CALL_OR_BRACE.finditer(text):
+            brace = match.group(1)
+            if brace == "{":
+                depth += 1
+            elif brace == "}":
+                depth = max(0, depth - 1)
+            else:
+                name = match.group(2)
+                # Top-level keys are definitions, not calls
+                if depth > 0 and name not in _BUILTIN_KEYS:
+                    add(name, match.start(2), "call")
+                if match.group(3):
+                    depth += 1
+
+        for match in _VALUE_REFERENCE.finditer(text):
+            name = match.group(1)
+            if name != "yes" and name != "no":
+                add(name, match.start(1), "value")
+
+        return references
+
+    def _resolve_reference_kind(self, name: str, kind: str) -> Optional[str]:
+        """Resolve a "call"/"value" candidate to a reference kind (None if not a symbol)."""
+        if kind == "call":
+            if name in self.scripted_effects:
+                return "scripted_effect"
+            if name in self.scripted_triggers:
+                return "scripted_trigger"
+            return None
+        if kind == "value":
+            return "script_value" if name in self.script_values else None
+        return kind
+
+    def _add_references(self, uri: str, raw_references: Dict[str, List[List]], in_place: bool):
+        """
+        Resolve a file's references and add them to the reference index.
 
-                    self.character_flags[flag_name].append((action, uri, line_num))
+        Args:
+            uri: File URI
+            raw_references: Result of _collect_references()
+            in_place: Extend existing lists (only while a scan builds a new
+                table); otherwise lists are replaced, as they may be shared
+                with other index versions
+        """
+        for name, entries in raw_references.items():
+            resolved = []
+            for line, start, end, kind in entries:
+                kind = self._resolve_reference_kind(name, kind)
+                if kind is not None:
+                    resolved.append((uri, line, start, end, kind))
+            if not resolved:
+                continue
+
+            existing = self.references.get(name)
+            if existing is None:
+                self.references[name] = resolved
+            elif in_place:
+                existing.extend(resolved)
+            else:
+                self.references[name] = existing + resolved
+            if not in_place:
+                self._record_document_key(uri, "references", name)
+
+    def find_references(
+        self, name: str, kinds: Optional[Set[str]] = None
+    ) -> List[types.Location]:
+        """
+        Find all references to a symbol across the workspace (closed files included).
+
+        Args:
+            name: Symbol name (event ID, effect, trigger, scope name, flag, script value)
+            kinds: Only include these kinds (see REFERENCE_KINDS); all if None
+
+        Returns:
+            List of reference Locations in index order
+        """
+        return [
+            _span_location(uri, [line, start, end])
+            for uri, line, start, end, kind in self.references.get(name, ())
+            if kinds is None or kind in kinds
+        ]
+
+    def count_references(self, name: str, kinds: Optional[Set[str]] = None) -> int:
+        """
+        Count references to a symbol without building Locations.
+
+        Args:
+            name: Symbol name
+            kinds: Only count these kinds (see REFERENCE_KINDS); all if None
+
+        Returns:
+            Number of references
+        """
+        references = self.references.get(name, ())
+        if kinds is None:
+            return len(references)
+        return sum(1 for reference in references if reference[4] in kinds)
 
     def find_character_flag(self, flag_name: str) -> Optional[types.Location]:
         """
@@ -958,77 +1565,42 @@ class DocumentIndex:
         """
         return set(self.character_flags.keys())
 
-    def _extract_top_level_definitions(self, content: str, uri: str) -> Dict[str, types.Location]:
+    def _extract_top_level_definitions(
+        self,
+        content: str,
+        uri: str,
+        scalar_values: bool = False,
+        outline: Optional[List[OutlineNode]] = None,
+    ) -> Dict[str, types.Location]:
         """
         Extract top-level block definitions from file content.
 
-        Uses regex to find patterns like:
+        Uses the skeleton parser (parse_outline) to find patterns like:
             definition_name = {
 
-        Only extracts definitions at brace depth 0 (true top-level).
+        at brace depth 0 (true top-level), without parsing block bodies.
 
         Args:
             content: File content
             uri: File URI for location
+            scalar_values: Also accept numeric definitions (``my_value = 100``),
+                as used by script values
+            outline: parse_outline(content), if already computed
 
         Returns:
             Dictionary of definition_name -> Location
         """
+        if outline is None:
+            outline = parse_outline(content)
         definitions = {}
-        lines = content.split("\n")
-
-        # Track brace depth to ensure we're at top level
-        brace_depth = 0
-
-        for line_num, line in enumerate(lines):
-            # Calculate brace depth at the START of this line (before any braces on this line)
-            current_depth = brace_depth
-
-            # First check for definition at current depth (before counting this line's braces)
-            if current_depth == 0:
-                stripped = line.lstrip()
-                # Match pattern: name = { (with optional content before brace)
-                match = re.match(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*\{", stripped)
-                if match:
-                    name = match.group(1)
-                    # Skip special keywords that aren't definition names
-                    if name not in (
-                        "if",
-                        "else",
-                        "else_if",
-                        "trigger",
-                        "effect",
-                        "limit",
-                        "modifier",
-                        "hidden_effect",
-                        "show_as_tooltip",
-                        "random_list",
-                        "switch",
-                    ):
-                        # Create location for this definition
-                        char_start = line.find(name)
-                        location = types.Location(
-                            uri=uri,
-                            range=types.Range(
-                                start=types.Position(line=line_num, character=char_start),
-                                end=types.Position(line=line_num, character=char_start + len(name)),
-                            ),
-                        )
-                        definitions[name] = location
-
-            # Now count braces on this line for the NEXT line's depth
-            in_string = False
-            for i, char in enumerate(line):
-                if char == '"' and (i == 0 or line[i - 1] != "\\"):
-                    in_string = not in_string
-                elif not in_string:
-                    if char == "#":
-                        break  # Rest is comment
-                    elif char == "{":
-                        brace_depth += 1
-                    elif char == "}":
-                        brace_depth = max(0, brace_depth - 1)
-
+        for node in outline:
+            if node.value is not None and not (scalar_values and node.value_type == "number"):
+                continue
+            name = node.key
+            # Skip special keywords that aren't definition names
+            if name in _NON_DEFINITION_KEYS or not _DEFINITION_NAME.fullmatch(name):
+                continue
+            definitions[name] = types.Location(uri=uri, range=node.key_range)
         return definitions
 
     def get_all_scripted_effects(self) -> Set[str]:
@@ -1133,14 +1705,26 @@ class DocumentIndex:
         """
         return self.scripted_guis.get(name)
 
-    def update_from_ast(self, uri: str, ast: List[CK3Node]):
+    def update_from_ast(self, uri: str, ast: List[CK3Node], source: Optional[str] = None):
         """
         Extract and index all symbols from an AST.
 
         Args:
             uri: Document URI
             ast: List of top-level AST nodes
-        """
+            source: Document text; when given, the document's references are
+                re-indexed from it (the AST does not keep value positions)
+        """
+        for table_name in (
+            "namespaces",
+            "events",
+            "saved_scopes",
+            "references",
+            "_document_keys",
+            "symbol_search",
+        ):
+            self._own_table(table_name)
+
         # Remove existing entries for this document first
         self._remove_document_entries(uri)
 
@@ -1148,47 +1732,191 @@ class DocumentIndex:
         for node in ast:
             self._index_node(uri, node)
 
-    def _remove_document_entries(self, uri: str):
-        """Remove all entries from a specific document."""
-        # Remove namespaces from this document
-        self.namespaces = {k: v for k, v in self.namespaces.items() if v != uri}
+        # Definitions of common/ files (scripted effects, modifiers, ...)
+        scan_type = _definition_scan_type(uri)
+        if scan_type is not None:
+            self._index_definitions(uri, scan_type, ast, source)
 
-        # Remove events from this document
-        self.events = {k: v for k, v in self.events.items() if v.uri != uri}
+        if source is not None:
+            self._add_references(uri, self._collect_references(source), in_place=False)
 
-        # Remove scripted effects from this document
-        self.scripted_effects = {k: v for k, v in self.scripted_effects.items() if v.uri != uri}
+    def _index_definitions(
+        self, uri: str, scan_type: str, ast: List[CK3Node], source: Optional[str]
+    ):
+        """
+        Index the top-level definitions of an open common/ file.
 
-        # Remove scripted triggers from this document
-        self.scripted_triggers = {k: v for k, v in self.scripted_triggers.items() if v.uri != uri}
+        Uses the workspace scan's extraction when the source is known, so
+        editing a file indexes exactly what a rescan would.
 
-        # Remove scripted lists from this document
-        self.scripted_lists = {k: v for k, v in self.scripted_lists.items() if v.uri != uri}
+        Args:
+            uri: Document URI
+            scan_type: Definition scan type of the file (see _SCAN_FOLDERS)
+            ast: Top-level AST nodes
+            source: Document text, if known
+        """
+        scalar_values = scan_type == "script_values"
+        if source is not None:
+            definitions = self._extract_top_level_definitions(source, uri, scalar_values)
+        else:
+            definitions = {}
+            for node in ast:
+                if node.value is not None and not (scalar_values and _is_number(node.value)):
+                    continue
+                name = node.key
+                if name in _NON_DEFINITION_KEYS or not _DEFINITION_NAME.fullmatch(name):
+                    continue
+                start = node.range.start
+                definitions[name] = types.Location(
+                    uri=uri,
+                    range=types.Range(
+                        start=start,
+                        end=types.Position(line=start.line, character=start.character + len(name)),
+                    ),
+                )
 
-        # Remove script values from this document
-        self.script_values = {k: v for k, v in self.script_values.items() if v.uri != uri}
+        table_name = _DEFINITION_TABLES[scan_type]
+        self._own_table(table_name)
+        table = getattr(self, table_name)
+        for name, location in definitions.items():
+            table[name] = location
+            self._record_document_key(uri, table_name, name)
+            if table_name in _SEARCH_TABLES:
+                self._own_table("symbol_search")
+                self.symbol_search.add(table_name, name)
 
-        # Remove saved scopes from this document
-        self.saved_scopes = {k: v for k, v in self.saved_scopes.items() if v.uri != uri}
+    def dependency_symbols(self) -> Set[str]:
+        """
+        All defined symbols that diagnostics depend on.
 
-        # Remove character interactions from this document
-        self.character_interactions = {
-            k: v for k, v in self.character_interactions.items() if v.uri != uri
-        }
+        Returns:
+            Names in DEPENDENCY_TABLES, plus saved scopes as "scope:<name>"
+        """
+        names = set()
+        for table_name in DEPENDENCY_TABLES:
+            names.update(getattr(self, table_name))
+        names.update("scope:" + name for name in self.saved_scopes)
+        return names
 
-        # Remove modifiers from this document
-        self.modifiers = {k: v for k, v in self.modifiers.items() if v.uri != uri}
+    def document_dependency_symbols(self, uri: str) -> Set[str]:
+        """
+        Symbols diagnostics depend on that a document defines.
 
-        # Remove on_action definitions from this document
-        self.on_action_definitions = {
-            k: v for k, v in self.on_action_definitions.items() if v.uri != uri
-        }
+        Args:
+            uri: Document URI
+
+        Returns:
+            Names in DEPENDENCY_TABLES, plus saved scopes as "scope:<name>"
+        """
+        tables = self._document_keys.get(uri, {})
+        names = set()
+        for table_name in DEPENDENCY_TABLES:
+            names.update(tables.get(table_name, ()))
+        names.update("scope:" + name for name in tables.get("saved_scopes", ()))
+        return names
+
+    def has_dependency_symbol(self, name: str) -> bool:
+        """
+        Whether a symbol returned by dependency_symbols() is defined.
+
+        Args:
+            name: Symbol name (saved scopes as "scope:<name>")
+
+        Returns:
+            True if defined in any document
+        """
+        if name.startswith("scope:"):
+            return name[6:] in self.saved_scopes
+        return any(name in getattr(self, table_name) for table_name in DEPENDENCY_TABLES)
+
+    def _remove_document_entries(self, uri: str):
+        """
+        Remove all entries from a specific document.
+
+        Uses the reverse index, so the cost is proportional to the number of
+        symbols the document contributed, not to the size of the workspace.
+        Keys that another document has redefined since are left alone.
+        """
+        if uri not in self._document_keys:
+            return
+        self._own_table("_document_keys")
+        tables = self._document_keys.pop(uri)
+
+        for table_name, keys in tables.items():
+            self._own_table(table_name)
+            table = getattr(self, table_name)
+            if table_name == "references":
+                for key in keys:
+                    remaining = [ref for ref in table.get(key, ()) if ref[0] != uri]
+                    if remaining:
+                        table[key] = remaining
+                    else:
+                        table.pop(key, None)
+                continue
+            for key in keys:
+                value = table.get(key)
+                if value is None:
+                    continue
+                owner = value if table_name == "namespaces" else value.uri
+                if owner == uri:
+                    del table[key]
+                    if table_name in _SEARCH_TABLES:
+                        self._own_table("symbol_search")
+                        self.symbol_search.remove(table_name, key)
+
+    def _record_document_key(self, uri: str, table_name: str, key: str):
+        """Record in the reverse index that a document defines ``key`` in a table."""
+        tables = self._document_keys.get(uri)
+        if tables is None:
+            tables = self._document_keys[uri] = {}
+        keys = tables.get(table_name)
+        if keys is None:
+            keys = tables[table_name] = set()
+        keys.add(key)
+
+    def _rebuild_document_keys(self):
+        """Rebuild the reverse index from the symbol tables (after a workspace scan)."""
+        self._document_keys = OverlayTable()
+        for table_name in _DOCUMENT_TABLES:
+            for key, value in getattr(self, table_name).items():
+                uri = value if table_name == "namespaces" else value.uri
+                self._record_document_key(uri, table_name, key)
+        for name, references in self.references.items():
+            for reference in references:
+                self._record_document_key(reference[0], "references", name)
+
+    def _rebuild_symbol_search(self):
+        """Rebuild the workspace symbol search index (after a workspace scan)."""
+        self.symbol_search = SymbolSearchIndex(
+            (table_name, name)
+            for table_name in _SEARCH_TABLES
+            for name in getattr(self, table_name)
+        )
+
+    def search_symbols(
+        self, query: str, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> List[Tuple[str, str, types.Location]]:
+        """
+        Find workspace symbols by name, best matches first.
 
-        # Remove opinion modifiers from this document
-        self.opinion_modifiers = {k: v for k, v in self.opinion_modifiers.items() if v.uri != uri}
+        Matches names by prefix, word prefix, substring, word initials and
+        fuzzy subsequence (see symbol_search.py), without scanning every
+        symbol table.
 
-        # Remove scripted GUIs from this document
-        self.scripted_guis = {k: v for k, v in self.scripted_guis.items() if v.uri != uri}
+        Args:
+            query: Search text (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            List of (table name, symbol name, Location), e.g.
+            ("scripted_effects", "my_effect", Location)
+        """
+        results = []
+        for table_name, name in self.symbol_search.search(query, limit):
+            location = getattr(self, table_name).get(name)
+            if location is not None:
+                results.append((table_name, name, location))
+        return results
 
     def _index_node(self, uri: str, node: CK3Node):
         """
@@ -1202,12 +1930,15 @@ class DocumentIndex:
         if node.type == "namespace":
             if node.value:
                 self.namespaces[node.value] = uri
+                self._record_document_key(uri, "namespaces", node.value)
                 logger.debug(f"Indexed namespace: {node.value} in {uri}")
 
         # Index events (identified by type == 'event')
         elif node.type == "event":
             location = types.Location(uri=uri, range=node.range)
             self.events[node.key] = location
+            self._record_document_key(uri, "events", node.key)
+            self.symbol_search.add("events", node.key)
             logger.debug(f"Indexed event: {node.key} in {uri}")
 
         # Index saved scopes
@@ -1215,6 +1946,7 @@ class DocumentIndex:
             if node.value:
                 location = types.Location(uri=uri, range=node.range)
                 self.saved_scopes[node.value] = location
+                self._record_document_key(uri, "saved_scopes", node.value)
                 logger.debug(f"Indexed saved scope: {node.value} in {uri}")
 
         # Recursively index children
@@ -1319,3 +2051,17 @@ class DocumentIndex:
             text, _, _ = loc_info
             return text
         return None
+
+
+def _scan_file_batch(batch: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+    """
+    Worker process entry point: scan a batch of files.
+
+    Args:
+        batch: List of (file path, scan type)
+
+    Returns:
+        List of DocumentIndex._scan_file() results in batch order
+    """
+    index = DocumentIndex()
+    return [index._scan_file(Path(path), scan_type) for path, scan_type in batch]
@@ -401,6 +401,7 @@ def get_inlay_hints(
     range_: types.Range,
     index: Optional[DocumentIndex] = None,
     config: Optional[InlayHintConfig] = None,
+    lines: Optional[List[str]] = None,
 ) -> List[types.InlayHint]:
     """
     Generate inlay hints for a document range.
@@ -410,6 +411,7 @@ def get_inlay_hints(
         range_: Range to generate hints for
         index: Document index for saved scope lookup
         config: Configuration options
+        lines: ``text.split("\\n")``, if the caller already has it
 
     Returns:
         List of InlayHint objects
@@ -418,7 +420,8 @@ def get_inlay_hints(
         config = InlayHintConfig()
 
     hints: List[types.InlayHint] = []
-    lines = text.split("\n")
+    if lines is None:
+        lines = text.split("\n")
 
     # Determine range to process
     start_line = range_.start.line
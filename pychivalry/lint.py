@@ -0,0 +1,469 @@
+"""
+CK3 Lint - Headless Workspace Validation for CI
+
+MODULE OVERVIEW:
+    The language server needs an editor. This module is a batch command
+    line interface running the same diagnostics over whole mods, for
+    continuous integration:
+
+        pychivalry lint path/to/mod [path/to/other_mod ...]
+
+    Each mod is scanned into its own DocumentIndex, every script file is
+    validated with collect_all_diagnostics (in worker processes, see
+    workspace_validation.py), and the results are printed as text, JSON or
+    SARIF. The exit code tells whether any diagnostic reached the
+    --fail-on severity.
+
+ARCHITECTURE:
+    **Result Cache**:
+    Results are kept per file in ``<mod>/.pychivalry/lint.sqlite3``
+    (LintCache, an IndexCache with its own database), so a second run only
+    validates files that changed. A file's diagnostics also depend on
+    symbols defined in other files (scripted effects/triggers, modifiers,
+    opinion modifiers, saved scopes; DocumentIndex.dependency_symbols). The
+    cache stores the symbol names of the run and, per file, the node keys
+    of the file; a cached result is reused only if the file is unchanged
+    and none of its keys was defined or undefined since.
+
+    Entries are discarded when pychivalry or the enabled check categories
+    change (both are part of the cache version).
+
+    **Output Formats**:
+    - text: ``path:line:column: severity code: message`` (1-based)
+    - json: one object per mod with its files, diagnostics and a summary
+    - sarif: SARIF 2.1.0, one run per mod, for code scanning services
+
+    **Exit Codes**:
+    - 0: no diagnostic at or above the --fail-on severity
+    - 1: at least one such diagnostic
+    - 2: invalid arguments
+
+USAGE EXAMPLES:
+    $ pychivalry lint my_mod --format sarif --output lint.sarif
+    $ pychivalry lint mod_a mod_b --fail-on warning --workers 8
+    $ python -m pychivalry.lint my_mod --no-cache --disable style
+
+PERFORMANCE:
+    - Cold run: workspace scan plus validation of every file in parallel
+    - Warm run: cached index scan, one stat() per file, and validation of
+      the changed files and the files using changed definitions only
+
+SEE ALSO:
+    - workspace_validation.py: validate_files() (the parallel validation)
+    - index_cache.py: IndexCache (the cache storage)
+    - server.py: ck3.validateWorkspace (the same validation in the editor)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, TextIO
+
+from lsprotocol import converters, types
+
+from .diagnostics import DiagnosticConfig
+from .index_cache import IndexCache
+from .indexer import DocumentIndex
+from .workspace_validation import (
+    FileValidation,
+    WorkspaceValidationResult,
+    find_script_files,
+    validate_files,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the structure of cached lint results changes
+LINT_CACHE_FORMAT = 1
+
+# --fail-on / --disable choices
+_SEVERITIES = {
+    "error": types.DiagnosticSeverity.Error,
+    "warning": types.DiagnosticSeverity.Warning,
+    "information": types.DiagnosticSeverity.Information,
+    "hint": types.DiagnosticSeverity.Hint,
+}
+_CATEGORIES = ("style", "paradox", "scope_timing", "story_cycles", "schema")
+
+# SARIF result levels by severity
+_SARIF_LEVELS = {
+    types.DiagnosticSeverity.Error: "error",
+    types.DiagnosticSeverity.Warning: "warning",
+    types.DiagnosticSeverity.Information: "note",
+    types.DiagnosticSeverity.Hint: "note",
+}
+
+_converter = converters.get_converter()
+
+
+class LintCache(IndexCache):
+    """
+    On-disk cache of lint results for one mod (see the module docstring).
+
+    Cached results are dictionaries with the file's ``fingerprint``,
+    ``symbols`` (node keys) and ``diagnostics`` (LSP JSON).
+    """
+
+    FILE_NAME = "lint.sqlite3"
+
+    def __init__(self, root, config: DiagnosticConfig, path: Optional[Path] = None):
+        """
+        Create a lint cache for a mod (nothing is opened yet).
+
+        Args:
+            root: Mod folder
+            config: Enabled check categories (part of the cache version)
+            path: Database path (defaults to <root>/.pychivalry/lint.sqlite3)
+        """
+        super().__init__(root, path)
+        self.config = config
+
+    def version(self) -> str:
+        """Cache version: format, pychivalry version and enabled categories."""
+        categories = ",".join(
+            category for category in _CATEGORIES if getattr(self.config, f"{category}_enabled")
+        )
+        return f"lint{LINT_CACHE_FORMAT}:{super().version()}:{categories}"
+
+    def symbols(self) -> Optional[FrozenSet[str]]:
+        """Index symbols of the previous run (None if unknown)."""
+        stored = self.get_meta("symbols")
+        return frozenset(json.loads(stored)) if stored is not None else None
+
+    def set_symbols(self, symbols: FrozenSet[str]):
+        """Record the index symbols of this run (written on close())."""
+        self.set_meta("symbols", json.dumps(sorted(symbols)))
+
+
+def lint_workspace(
+    root: str,
+    workers: int = 0,
+    config: Optional[DiagnosticConfig] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Lint every script file of a mod.
+
+    Args:
+        root: Mod folder
+        workers: Number of worker processes (0 = validate inline)
+        config: Enabled check categories (defaults if None)
+        use_cache: Reuse and update the index and lint caches in <root>/.pychivalry/
+
+    Returns:
+        Dictionary with ``root``, ``files`` (path relative to the root ->
+        list of diagnostics, sorted by path), ``summary``
+        (WorkspaceValidationResult.to_dict() plus ``cached`` files)
+    """
+    config = config or DiagnosticConfig()
+    root_path = Path(root).resolve()
+
+    index = DocumentIndex()
+    index.scan_workspace([str(root_path)], use_cache=use_cache, process_workers=workers)
+    symbols = frozenset(index.dependency_symbols())
+
+    cache = LintCache(root_path, config) if use_cache else None
+    if cache is not None and not cache.open():
+        cache = None
+
+    results: Dict[Path, List[types.Diagnostic]] = {}
+    paths = find_script_files([str(root_path)])
+    try:
+        misses = paths
+        if cache is not None:
+            previous = cache.symbols()
+            changed = symbols ^ previous if previous is not None else None
+            misses = []
+            for path in paths:
+                cached = cache.lookup(path)
+                if cached is None or changed is None or not changed.isdisjoint(cached["symbols"]):
+                    misses.append(path)
+                    continue
+                results[path] = [
+                    _converter.structure(diagnostic, types.Diagnostic)
+                    for diagnostic in cached["diagnostics"]
+                ]
+
+        uris = {path.as_uri(): path for path in misses}
+
+        def on_batch(batch: List[FileValidation]):
+            for file_result in batch:
+                path = uris[file_result.uri]
+                results[path] = file_result.diagnostics
+                if cache is not None:
+                    cache.store(
+                        path,
+                        {
+                            "fingerprint": file_result.fingerprint,
+                            "symbols": sorted(file_result.symbols),
+                            "diagnostics": _converter.unstructure(file_result.diagnostics),
+                        },
+                    )
+
+        validated = validate_files(misses, index, workers, config, on_batch=on_batch)
+        if cache is not None:
+            cache.set_symbols(symbols)
+            cache.close()
+    except BaseException:
+        if cache is not None:
+            cache.close(prune=False)
+        raise
+
+    summary = WorkspaceValidationResult(failed=validated.failed)
+    for path in paths:
+        if path in results:
+            summary.add(results[path])
+    cached = summary.files - validated.files
+
+    logger.info(f"Linted {root_path}: {summary.files} files, {cached} from the cache")
+    return {
+        "root": str(root_path),
+        "files": {
+            path.relative_to(root_path).as_posix(): results[path]
+            for path in sorted(results)
+        },
+        "summary": dict(summary.to_dict(), cached=cached),
+    }
+
+
+def _severity_name(diagnostic: types.Diagnostic) -> str:
+    """Lower-case severity name ("error", ...); missing severities count as errors."""
+    severity = diagnostic.severity or types.DiagnosticSeverity.Error
+    return severity.name.lower()
+
+
+def _diagnostic_dict(diagnostic: types.Diagnostic) -> Dict[str, Any]:
+    """JSON output of one diagnostic (1-based lines and columns)."""
+    start = diagnostic.range.start
+    end = diagnostic.range.end
+    return {
+        "line": start.line + 1,
+        "column": start.character + 1,
+        "end_line": end.line + 1,
+        "end_column": end.character + 1,
+        "severity": _severity_name(diagnostic),
+        "code": str(diagnostic.code) if diagnostic.code is not None else None,
+        "message": diagnostic.message,
+        "source": diagnostic.source,
+    }
+
+
+def format_text(reports: Sequence[Dict[str, Any]]) -> str:
+    """Format lint reports as ``path:line:column: severity code: message`` lines."""
+    lines = []
+    for report in reports:
+        root = Path(report["root"])
+        for relative, diagnostics in report["files"].items():
+            for diagnostic in diagnostics:
+                item = _diagnostic_dict(diagnostic)
+                lines.append(
+                    f"{root / relative}:{item['line']}:{item['column']}: "
+                    f"{item['severity']} {item['code'] or ''}: {item['message']}"
+                )
+        summary = report["summary"]
+        lines.append(
+            f"{root}: {summary['diagnostics']} issues in {summary['files']} files "
+            f"({summary['cached']} cached, {summary['failed']} failed)"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def format_json(reports: Sequence[Dict[str, Any]]) -> str:
+    """Format lint reports as JSON."""
+    return json.dumps(
+        [
+            {
+                "root": report["root"],
+                "files": [
+                    {
+                        "path": relative,
+                        "diagnostics": [_diagnostic_dict(d) for d in diagnostics],
+                    }
+                    for relative, diagnostics in report["files"].items()
+                    if diagnostics
+                ],
+                "summary": report["summary"],
+            }
+            for report in reports
+        ],
+        indent=2,
+    )
+
+
+def format_sarif(reports: Sequence[Dict[str, Any]]) -> str:
+    """Format lint reports as a SARIF 2.1.0 log (one run per mod)."""
+    from pychivalry import __version__
+
+    runs = []
+    for report in reports:
+        rules: Dict[str, Dict[str, Any]] = {}
+        results = []
+        for relative, diagnostics in report["files"].items():
+            for diagnostic in diagnostics:
+                item = _diagnostic_dict(diagnostic)
+                rule_id = item["code"] or "unknown"
+                rules.setdefault(rule_id, {"id": rule_id})
+                results.append(
+                    {
+                        "ruleId": rule_id,
+                        "level": _SARIF_LEVELS.get(diagnostic.severity, "error"),
+                        "message": {"text": item["message"]},
+                        "locations": [
+                            {
+                                "physicalLocation": {
+                                    "artifactLocation": {"uri": relative, "uriBaseId": "ROOT"},
+                                    "region": {
+                                        "startLine": item["line"],
+                                        "startColumn": item["column"],
+                                        "endLine": item["end_line"],
+                                        "endColumn": item["end_column"],
+                                    },
+                                }
+                            }
+                        ],
+                    }
+                )
+        runs.append(
+            {
+                "tool": {
+                    "driver": {
+                        "name": "pychivalry",
+                        "version": __version__,
+                        "rules": [rules[rule_id] for rule_id in sorted(rules)],
+                    }
+                },
+                "originalUriBaseIds": {"ROOT": {"uri": Path(report["root"]).as_uri() + "/"}},
+                "results": results,
+            }
+        )
+    return json.dumps(
+        {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": runs,
+        },
+        indent=2,
+    )
+
+
+_FORMATTERS = {"text": format_text, "json": format_json, "sarif": format_sarif}
+
+
+def exceeds_threshold(reports: Sequence[Dict[str, Any]], fail_on: str) -> bool:
+    """
+    Whether any diagnostic is at least as severe as ``fail_on``.
+
+    Args:
+        reports: Results of lint_workspace()
+        fail_on: Severity name, or "never"
+
+    Returns:
+        True if the run should fail
+    """
+    if fail_on == "never":
+        return False
+    threshold = _SEVERITIES[fail_on]
+    return any(
+        (diagnostic.severity or types.DiagnosticSeverity.Error) <= threshold
+        for report in reports
+        for diagnostics in report["files"].values()
+        for diagnostic in diagnostics
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Command line arguments of ``pychivalry lint``."""
+    parser = argparse.ArgumentParser(
+        prog="pychivalry lint",
+        description="Validate CK3 mods without an editor (exit code 1 on failures)",
+    )
+    parser.add_argument("paths", nargs="+", metavar="MOD", help="Mod folders to lint")
+    parser.add_argument(
+        "--format", choices=sorted(_FORMATTERS), default="text", help="Output format"
+    )
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the output to FILE")
+    parser.add_argument(
+        "--fail-on",
+        choices=[*_SEVERITIES, "never"],
+        default="error",
+        help="Exit with 1 if a diagnostic has this severity or worse (default: error)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Worker processes (default: one per CPU, 0: no processes)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and don't update <mod>/.pychivalry/"
+    )
+    parser.add_argument(
+        "--disable",
+        action="append",
+        choices=_CATEGORIES,
+        default=[],
+        help="Disable a check category (repeatable)",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["debug", "info", "warning", "error"],
+        default="warning",
+        help="Logging level on stderr (default: warning)",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, stdout: Optional[TextIO] = None) -> int:
+    """
+    Run ``pychivalry lint``.
+
+    Args:
+        argv: Arguments after "lint" (defaults to sys.argv[1:])
+        stdout: Stream for the output when --output is not given
+
+    Returns:
+        Exit code (0: passed, 1: a diagnostic reached --fail-on, 2: bad arguments)
+    """
+    parser = _build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return int(e.code or 0)
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(levelname)s: %(message)s",
+        stream=sys.stderr,
+    )
+
+    for path in args.paths:
+        if not Path(path).is_dir():
+            parser.print_usage(sys.stderr)
+            print(f"pychivalry lint: error: not a folder: {path}", file=sys.stderr)
+            return 2
+
+    config = DiagnosticConfig(
+        **{f"{category}_enabled": False for category in args.disable}
+    )
+    reports = [
+        lint_workspace(
+            path, workers=max(0, args.workers), config=config, use_cache=not args.no_cache
+        )
+        for path in args.paths
+    ]
+
+    output = _FORMATTERS[args.format](reports)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        (stdout or sys.stdout).write(output)
+
+    return 1 if exceeds_threshold(reports, args.fail_on) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -85,6 +85,11 @@ VALIDATION APPROACH:
     3. Emits diagnostic with specific CK3xxx code if violation found
     4. Provides fix suggestion in diagnostic message
 
+    Checks are NodeCheck classes (see ast_visitor.py) that declare the node
+    keys they inspect. check_paradox_conventions() runs all enabled checks
+    in one AST traversal; each public check_* function runs its single check
+    and is kept for callers and tests that want one category.
+
 USAGE EXAMPLES:
     >>> # Validate event structure
     >>> diagnostics = validate_paradox_conventions(event_ast, config)
@@ -95,6 +100,7 @@ USAGE EXAMPLES:
 
 PERFORMANCE:
     - Full file validation: ~20ms per 1000 lines
+    - One traversal for all checks (was one per check)
     - Incremental validation: ~5ms for edited region
     - Checks run on file save and during typing (with debouncing)
 
@@ -107,6 +113,7 @@ CONFIGURATION:
 
 SEE ALSO:
     - diagnostics.py: General validation engine (calls this module)
+    - ast_visitor.py: NodeCheck / CheckDispatcher traversal engine
     - ck3_language.py: Effect/trigger definitions (used to classify constructs)
     - style_checks.py: Code style validation (formatting, not semantics)
 """
@@ -121,11 +128,13 @@ from lsprotocol import types
 from .parser import CK3Node
 from .indexer import DocumentIndex
 from .ck3_language import CK3_EFFECTS, CK3_TRIGGERS
+from .ast_visitor import NodeCheck, run_checks
+from .cancellation import CancellationToken
 from . import events
 
 # NEW: Import generic rules validator for schema-driven validation
 try:
-    from .generic_rules_validator import validate_generic_rules
+    from .generic_rules_validator import GenericRulesCheck
     GENERIC_RULES_AVAILABLE = True
 except ImportError:
     logger.warning("generic_rules_validator not available, using legacy validation")
@@ -178,63 +187,70 @@ def _get_all_triggers(index: Optional[DocumentIndex]) -> Set[str]:
     return triggers
 
 
-def check_effect_in_trigger_context(
-    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
-) -> List[types.Diagnostic]:
-    """
-    Check for effects used in trigger contexts.
+def _is_event_id(key: str) -> bool:
+    """Check if a key is an event ID (namespace.number, e.g. my_mod.0001)."""
+    parts = key.split(".")
+    if len(parts) != 2:
+        return False
+    try:
+        int(parts[1])  # Event ID should be numeric
+    except ValueError:
+        return False
+    return True
 
-    Detects:
-    - CK3870: Effect used in trigger block
-    - CK3871: Effect used in limit block
-    """
-    diagnostics = []
 
-    if not config.effect_trigger_context:
-        return diagnostics
+# =============================================================================
+# CHECK CLASSES
+# =============================================================================
+#
+# Every check is a NodeCheck (see ast_visitor.py) declaring the node keys it
+# is interested in, so check_paradox_conventions() runs all of them in one
+# AST traversal. The check_* functions below run a single check and are
+# kept as the per-check API.
+
 
-    all_effects = _get_all_effects(index)
+class EffectInTriggerContextCheck(NodeCheck):
+    """CK3870/CK3871: Effects used in trigger or limit blocks."""
+
+    visit_all = True
+    wants_leave = True
 
     # Keywords that indicate trigger-only context
-    trigger_contexts = {"trigger", "limit", "can_send", "is_shown", "is_valid", "is_highlighted"}
+    TRIGGER_CONTEXTS = frozenset(
+        {"trigger", "limit", "can_send", "is_shown", "is_valid", "is_highlighted"}
+    )
 
     # Control flow keywords allowed in any context
-    control_flow = {
-        "if",
-        "else_if",
-        "else",
-        "AND",
-        "OR",
-        "NOT",
-        "NOR",
-        "NAND",
-        "switch",
-        "trigger_if",
-        "trigger_else",
-    }
-
-    def check_node(node: CK3Node, in_trigger_context: bool, context_name: str):
-        """Recursively check nodes for context violations."""
-        # Update context based on node key
-        new_context = in_trigger_context
-        new_context_name = context_name
+    CONTROL_FLOW = frozenset(
+        {
+            "if",
+            "else_if",
+            "else",
+            "AND",
+            "OR",
+            "NOT",
+            "NOR",
+            "NAND",
+            "switch",
+            "trigger_if",
+            "trigger_else",
+        }
+    )
 
-        if node.key in trigger_contexts:
-            new_context = True
-            new_context_name = node.key
-        elif node.key in ("immediate", "effect", "on_accept", "on_decline"):
-            new_context = False
-            new_context_name = node.key
-        elif node.key == "option":
-            # Options can have both - effects at root, triggers in nested trigger/limit
-            new_context = False
-            new_context_name = "option"
+    def __init__(self, index: Optional[DocumentIndex]):
+        super().__init__()
+        self.all_effects = _get_all_effects(index)
+        # (in trigger context, context name) for the children of each open node
+        self.contexts = [(False, "root")]
+
+    def visit(self, node: CK3Node, ancestors):
+        in_trigger_context, context_name = self.contexts[-1]
 
         # Check if this node is an effect in trigger context
-        if in_trigger_context and node.key in all_effects:
-            if node.key not in control_flow:
+        if in_trigger_context and node.key in self.all_effects:
+            if node.key not in self.CONTROL_FLOW:
                 code = "CK3871" if context_name == "limit" else "CK3870"
-                diagnostics.append(
+                self.diagnostics.append(
                     create_paradox_diagnostic(
                         message=f"Effect '{node.key}' used in {context_name} block. Effects cannot be used in trigger contexts.",
                         node_range=node.range,
@@ -243,40 +259,47 @@ def check_effect_in_trigger_context(
                     )
                 )
 
-        # Recurse into children
-        for child in node.children:
-            check_node(child, new_context, new_context_name)
+        # Update context based on node key
+        if node.key in self.TRIGGER_CONTEXTS:
+            self.contexts.append((True, node.key))
+        elif node.key in ("immediate", "effect", "on_accept", "on_decline"):
+            self.contexts.append((False, node.key))
+        elif node.key == "option":
+            # Options can have both - effects at root, triggers in nested trigger/limit
+            self.contexts.append((False, "option"))
+        else:
+            self.contexts.append(self.contexts[-1])
 
-    for node in ast:
-        check_node(node, False, "root")
+    def leave(self, node: CK3Node):
+        self.contexts.pop()
 
-    return diagnostics
 
+class ListIteratorMisuseCheck(NodeCheck):
+    """CK3976/CK3977/CK3875: any_ with effects, every_/random_ without limit."""
 
-def check_list_iterator_misuse(
-    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
-) -> List[types.Diagnostic]:
-    """
-    Check for list iterator misuse.
+    prefixes = ("any_", "every_", "random_")
 
-    Detects:
-    - CK3976: Effect in any_ iterator (any_ is trigger-only)
-    - CK3977: every_ without limit (affects all entries - intentional?)
-    - CK3875: Missing limit in random_ iterator
-    """
-    diagnostics = []
+    CONTROL_FLOW = frozenset(
+        {"if", "else_if", "else", "AND", "OR", "NOT", "limit", "alternative", "weight"}
+    )
 
-    if not config.list_iterators:
-        return diagnostics
+    def __init__(self, index: Optional[DocumentIndex]):
+        super().__init__()
+        self.all_effects = _get_all_effects(index)
 
-    all_effects = _get_all_effects(index)
-    control_flow = {"if", "else_if", "else", "AND", "OR", "NOT", "limit", "alternative", "weight"}
+    def visit(self, node: CK3Node, ancestors):
+        if node.key.startswith("any_"):
+            self._check_any_iterator(node)
+        elif node.key.startswith("every_"):
+            self._check_every_iterator(node)
+        elif node.key != "random_list":
+            self._check_random_iterator(node)
 
-    def check_any_iterator(node: CK3Node):
+    def _check_any_iterator(self, node: CK3Node):
         """Check any_ iterator for effects (not allowed)."""
         for child in node.children:
-            if child.key in all_effects and child.key not in control_flow:
-                diagnostics.append(
+            if child.key in self.all_effects and child.key not in self.CONTROL_FLOW:
+                self.diagnostics.append(
                     create_paradox_diagnostic(
                         message=f"Effect '{child.key}' used in '{node.key}' iterator. any_* iterators are trigger-only; use every_* or random_* for effects.",
                         node_range=child.range,
@@ -286,15 +309,15 @@ def check_list_iterator_misuse(
                 )
             # Recurse but stay in any_ context
             if child.key not in ("limit",):  # limit blocks are OK
-                check_any_iterator(child)
+                self._check_any_iterator(child)
 
-    def check_every_iterator(node: CK3Node):
+    def _check_every_iterator(self, node: CK3Node):
         """Check every_ iterator for missing limit."""
         has_limit = any(child.key == "limit" for child in node.children)
         has_content = any(child.key not in ("limit", "alternative") for child in node.children)
 
         if not has_limit and has_content:
-            diagnostics.append(
+            self.diagnostics.append(
                 create_paradox_diagnostic(
                     message=f"'{node.key}' without limit - this affects ALL entries. Add a limit or comment if intentional.",
                     node_range=node.range,
@@ -303,7 +326,7 @@ def check_list_iterator_misuse(
                 )
             )
 
-    def check_random_iterator(node: CK3Node):
+    def _check_random_iterator(self, node: CK3Node):
         """Check random_ iterator for missing limit."""
         has_limit = any(child.key == "limit" for child in node.children)
         has_content = any(
@@ -311,7 +334,7 @@ def check_list_iterator_misuse(
         )
 
         if not has_limit and has_content:
-            diagnostics.append(
+            self.diagnostics.append(
                 create_paradox_diagnostic(
                     message=f"'{node.key}' without limit - selection is completely random. Consider adding a limit.",
                     node_range=node.range,
@@ -320,696 +343,946 @@ def check_list_iterator_misuse(
                 )
             )
 
-    def walk_ast(node: CK3Node):
-        """Walk AST looking for list iterators."""
-        if node.key.startswith("any_"):
-            check_any_iterator(node)
-        elif node.key.startswith("every_"):
-            check_every_iterator(node)
-        elif node.key.startswith("random_") and node.key != "random_list" and node.key != "random":
-            check_random_iterator(node)
 
-        for child in node.children:
-            walk_ast(child)
+class OpinionModifierCheck(NodeCheck):
+    """CK3656: Inline opinion values in add_opinion."""
 
-    for node in ast:
-        walk_ast(node)
+    keys = frozenset({"add_opinion", "reverse_add_opinion"})
 
-    return diagnostics
+    def visit(self, node: CK3Node, ancestors):
+        for child in node.children:
+            if child.key == "opinion":
+                # Inline opinion value - this is CW262
+                self.diagnostics.append(
+                    create_paradox_diagnostic(
+                        message=f"Inline opinion value in {node.key}. Define opinion modifier in common/opinion_modifiers/ and reference by name with 'modifier = your_modifier_name'.",
+                        node_range=node.range,
+                        severity=types.DiagnosticSeverity.Error,
+                        code="CK3656",
+                    )
+                )
+                break
 
 
-def check_opinion_modifiers(
-    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
-) -> List[types.Diagnostic]:
-    """
-    Check for opinion modifier issues.
+class EventStructureCheck(NodeCheck):
+    """CK3760/CK3763/CK3768: Event type, options and immediate blocks."""
 
-    Detects:
-    - CK3656: Inline opinion value (should use predefined modifier)
-    """
-    diagnostics = []
+    top_level = True
 
-    if not config.opinion_modifiers:
-        return diagnostics
-
-    def walk_ast(node: CK3Node):
-        """Walk AST looking for opinion issues."""
-        # Check for add_opinion with inline opinion value
-        if node.key in ("add_opinion", "reverse_add_opinion"):
-            for child in node.children:
-                if child.key == "opinion":
-                    # Inline opinion value - this is CW262
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message=f"Inline opinion value in {node.key}. Define opinion modifier in common/opinion_modifiers/ and reference by name with 'modifier = your_modifier_name'.",
-                            node_range=node.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3656",
-                        )
-                    )
-                    break
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+
+        has_type = False
+        has_option = False
+        immediate_count = 0
 
         for child in node.children:
-            walk_ast(child)
+            if child.key == "type":
+                has_type = True
+            elif child.key == "option":
+                has_option = True
+            elif child.key == "immediate":
+                immediate_count += 1
+
+        # CK3760: Missing type
+        if not has_type:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' missing 'type' declaration (e.g., type = character_event)",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3760",
+                )
+            )
 
-    for node in ast:
-        walk_ast(node)
+        # CK3763: No options
+        if not has_option:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' has no option blocks - player cannot interact with or dismiss this event",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3763",
+                )
+            )
 
-    return diagnostics
+        # CK3768: Multiple immediate blocks
+        if immediate_count > 1:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' has {immediate_count} immediate blocks - only the first will execute",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3768",
+                )
+            )
 
 
-def check_event_structure(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check event structure for common issues.
+class RedundantTriggerCheck(NodeCheck):
+    """CK3872/CK3873: trigger = { always = yes/no }."""
 
-    Detects:
-    - CK3760: Event missing type declaration
-    - CK3763: Event with no option blocks
-    - CK3768: Multiple immediate blocks
-    """
-    diagnostics = []
+    keys = frozenset({"trigger"})
 
-    if not config.event_structure:
-        return diagnostics
-
-    for node in ast:
-        # Check if this looks like an event (namespace.XXXX = { ... })
-        if "." in node.key and node.children:
-            # Likely an event definition
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # This is an event
-
-                    has_type = False
-                    has_option = False
-                    immediate_count = 0
-
-                    for child in node.children:
-                        if child.key == "type":
-                            has_type = True
-                        elif child.key == "option":
-                            has_option = True
-                        elif child.key == "immediate":
-                            immediate_count += 1
-
-                    # CK3760: Missing type
-                    if not has_type:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' missing 'type' declaration (e.g., type = character_event)",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Error,
-                                code="CK3760",
-                            )
-                        )
+    def visit(self, node: CK3Node, ancestors):
+        if not node.children:
+            return
+        # Check if only child is always = yes/no
+        non_comment_children = [c for c in node.children if c.type != "comment"]
+        if len(non_comment_children) != 1:
+            return
+        child = non_comment_children[0]
+        if child.key != "always":
+            return
+        if child.value == "yes" or child.value == True:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="'trigger = { always = yes }' is redundant - remove the trigger block entirely",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Information,
+                    code="CK3872",
+                )
+            )
+        elif child.value == "no" or child.value == False:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="'trigger = { always = no }' makes this event impossible to fire - is this intentional?",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3873",
+                )
+            )
 
-                    # CK3763: No options
-                    if not has_option:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' has no option blocks - player cannot interact with or dismiss this event",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3763",
-                            )
-                        )
 
-                    # CK3768: Multiple immediate blocks
-                    if immediate_count > 1:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' has {immediate_count} immediate blocks - only the first will execute",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Error,
-                                code="CK3768",
-                            )
-                        )
+class CommonGotchasCheck(NodeCheck):
+    """CK5142: Character comparison with = instead of this."""
 
-                except ValueError:
-                    pass  # Not an event ID
+    prefixes = ("scope:",)
 
-    return diagnostics
+    def visit(self, node: CK3Node, ancestors):
+        # Pattern: scope:a = scope:b (should be scope:a = { this = scope:b })
+        if isinstance(node.value, str) and node.value.startswith("scope:"):
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Character comparison '{node.key} = {node.value}' may not work as expected. Use '{node.key} = {{ this = {node.value} }}' for character comparison.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK5142",
+                )
+            )
 
+        # CK5137 (is_alive without exists) needs exists checks tracked in
+        # context; not implemented yet
 
-def check_redundant_triggers(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for redundant trigger patterns.
 
-    Detects:
-    - CK3872: trigger = { always = yes } is redundant
-    - CK3873: trigger = { always = no } makes event impossible
-    """
-    diagnostics = []
+class EventTypeValidCheck(NodeCheck):
+    """CK3761: Invalid event type."""
 
-    if not config.redundant_triggers:
-        return diagnostics
+    top_level = True
 
-    def check_always_patterns(node: CK3Node, parent_key: str = ""):
-        """Check for always = yes/no patterns."""
-        if node.key == "trigger" and node.children:
-            # Check if only child is always = yes/no
-            non_comment_children = [c for c in node.children if c.type != "comment"]
-            if len(non_comment_children) == 1:
-                child = non_comment_children[0]
-                if child.key == "always":
-                    if child.value == "yes" or child.value == True:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message="'trigger = { always = yes }' is redundant - remove the trigger block entirely",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Information,
-                                code="CK3872",
-                            )
-                        )
-                    elif child.value == "no" or child.value == False:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message="'trigger = { always = no }' makes this event impossible to fire - is this intentional?",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3873",
-                            )
+    def visit(self, node: CK3Node, ancestors):
+        if "." not in node.key:
+            return
+        for child in node.children:
+            if child.key == "type" and child.value:
+                event_type = str(child.value)
+                if not events.is_valid_event_type(event_type):
+                    self.diagnostics.append(
+                        create_paradox_diagnostic(
+                            message=f"Invalid event type '{event_type}'. Valid types: {', '.join(sorted(events.EVENT_TYPES))}",
+                            node_range=child.range,
+                            severity=types.DiagnosticSeverity.Error,
+                            code="CK3761",
                         )
+                    )
 
-        for child in node.children:
-            check_always_patterns(child, node.key)
 
-    for node in ast:
-        check_always_patterns(node)
+class EventHasDescCheck(NodeCheck):
+    """CK3764: Non-hidden event missing desc."""
 
-    return diagnostics
+    top_level = True
 
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+        has_desc = False
+        is_hidden = False
 
-def check_common_gotchas(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for common CK3 gotchas.
+        for child in node.children:
+            if child.key == "desc":
+                has_desc = True
+            elif child.key == "hidden" and child.value in ("yes", True):
+                is_hidden = True
+
+        # Warn if not hidden and missing desc
+        if not has_desc and not is_hidden:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' is missing 'desc' field. Events need descriptions for players to understand what's happening.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3764",
+                )
+            )
 
-    Detects:
-    - CK5137: is_alive without prior exists check
-    - CK5142: Character comparison with = instead of this
-    """
-    diagnostics = []
 
-    if not config.common_gotchas:
-        return diagnostics
+class OptionHasNameCheck(NodeCheck):
+    """CK3450: Option missing name."""
 
-    def walk_ast(node: CK3Node, context: Dict[str, Any]):
-        """Walk AST looking for gotchas."""
-        # CK5142: Character comparison with = instead of this
-        # Pattern: scope:a = scope:b (should be scope:a = { this = scope:b })
-        if (
-            node.key.startswith("scope:")
-            and isinstance(node.value, str)
-            and node.value.startswith("scope:")
-        ):
-            diagnostics.append(
+    keys = frozenset({"option"})
+
+    def visit(self, node: CK3Node, ancestors):
+        if not any(child.key == "name" for child in node.children):
+            self.diagnostics.append(
                 create_paradox_diagnostic(
-                    message=f"Character comparison '{node.key} = {node.value}' may not work as expected. Use '{node.key} = {{ this = {node.value} }}' for character comparison.",
+                    message="Option block is missing required 'name' field for localization",
                     node_range=node.range,
                     severity=types.DiagnosticSeverity.Error,
-                    code="CK5142",
+                    code="CK3450",
                 )
             )
 
-        # CK5137: is_alive without exists (simplified check)
-        # This is a heuristic - we look for is_alive on scoped targets
-        if node.key == "is_alive" and node.value in ("yes", True):
-            # Check if parent is a scope reference that might not exist
-            parent_key = context.get("parent_key", "")
-            if parent_key.startswith("scope:") or parent_key in (
-                "mother",
-                "father",
-                "spouse",
-                "killer",
-                "betrothed",
-            ):
-                # This might need an exists check
-                pass  # TODO: Track exists checks in context
-
-        # Recurse
-        new_context = context.copy()
-        new_context["parent_key"] = node.key
 
-        for child in node.children:
-            walk_ast(child, new_context)
+class TriggeredDescStructureCheck(NodeCheck):
+    """CK3440/CK3441: triggered_desc missing trigger or desc."""
 
-    for node in ast:
-        walk_ast(node, {})
+    keys = frozenset({"triggered_desc"})
 
-    return diagnostics
+    def visit(self, node: CK3Node, ancestors):
+        has_trigger = False
+        has_desc = False
 
+        for child in node.children:
+            if child.key == "trigger":
+                has_trigger = True
+            elif child.key == "desc":
+                has_desc = True
 
-# =============================================================================
-# PHASE 1 QUICK WINS - Event Validation Checks
-# =============================================================================
+        if not has_trigger:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="triggered_desc block is missing required 'trigger' field",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3440",
+                )
+            )
 
+        if not has_desc:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="triggered_desc block is missing required 'desc' field",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3441",
+                )
+            )
 
-def check_event_type_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for invalid event types.
 
-    Detects:
-    - CK3761: Invalid event type (not in EVENT_TYPES)
-    """
-    diagnostics = []
+class PortraitPositionCheck(NodeCheck):
+    """CK3420: Invalid portrait position."""
 
-    if not config.event_structure:
-        return diagnostics
-
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            for child in node.children:
-                if child.key == "type" and child.value:
-                    event_type = str(child.value)
-                    if not events.is_valid_event_type(event_type):
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Invalid event type '{event_type}'. Valid types: {', '.join(sorted(events.EVENT_TYPES))}",
-                                node_range=child.range,
-                                severity=types.DiagnosticSeverity.Error,
-                                code="CK3761",
-                            )
-                        )
+    suffixes = ("_portrait",)
 
-    return diagnostics
+    def visit(self, node: CK3Node, ancestors):
+        if not events.is_valid_portrait_position(node.key):
+            valid_positions = ", ".join(sorted(events.PORTRAIT_POSITIONS))
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Invalid portrait position '{node.key}'. Valid positions: {valid_positions}",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3420",
+                )
+            )
 
 
-def check_event_has_desc(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for missing desc in non-hidden events.
+class PortraitHasCharacterCheck(NodeCheck):
+    """CK3421: Portrait missing character."""
 
-    Detects:
-    - CK3764: Non-hidden event missing desc field
-    """
-    diagnostics = []
+    keys = frozenset(events.PORTRAIT_POSITIONS)
 
-    if not config.event_structure:
-        return diagnostics
+    def visit(self, node: CK3Node, ancestors):
+        has_character = any(child.key == "character" for child in node.children)
+        if not has_character and node.children:  # Has content but no character
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Portrait '{node.key}' is missing required 'character' field",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3421",
+                )
+            )
 
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # This is an event
-                    has_desc = False
-                    is_hidden = False
-
-                    for child in node.children:
-                        if child.key == "desc":
-                            has_desc = True
-                        elif child.key == "hidden" and child.value in ("yes", True):
-                            is_hidden = True
-
-                    # Warn if not hidden and missing desc
-                    if not has_desc and not is_hidden:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' is missing 'desc' field. Events need descriptions for players to understand what's happening.",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3764",
-                            )
-                        )
 
-                except ValueError:
-                    pass
+class AnimationValidCheck(NodeCheck):
+    """CK3422: Invalid animation."""
 
-    return diagnostics
+    keys = frozenset({"animation"})
 
+    def visit(self, node: CK3Node, ancestors):
+        if not node.value:
+            return
+        animation = str(node.value)
+        if not events.is_valid_portrait_animation(animation):
+            valid_animations = ", ".join(sorted(events.PORTRAIT_ANIMATIONS))
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Invalid animation '{animation}'. Valid animations: {valid_animations}",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3422",
+                )
+            )
 
-def check_option_has_name(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for options missing name field.
 
-    Detects:
-    - CK3450: Option missing 'name' field for localization
-    """
-    diagnostics = []
+class ThemeValidCheck(NodeCheck):
+    """CK3430: Invalid theme."""
 
-    if not config.event_structure:
-        return diagnostics
-
-    def check_option_node(node: CK3Node):
-        """Check if an option node has a name."""
-        if node.key == "option":
-            has_name = any(child.key == "name" for child in node.children)
-            if not has_name:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="Option block is missing required 'name' field for localization",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Error,
-                        code="CK3450",
-                    )
-                )
+    keys = frozenset({"theme"})
 
-        # Recurse into children
-        for child in node.children:
-            check_option_node(child)
+    def visit(self, node: CK3Node, ancestors):
+        if not node.value:
+            return
+        theme = str(node.value)
+        if not events.is_valid_theme(theme):
+            valid_themes = ", ".join(sorted(events.EVENT_THEMES))
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Invalid theme '{theme}'. Valid themes: {valid_themes}",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3430",
+                )
+            )
 
-    for node in ast:
-        check_option_node(node)
 
-    return diagnostics
+class HiddenEventOptionsCheck(NodeCheck):
+    """CK3762: Hidden event with options."""
 
+    top_level = True
 
-def check_triggered_desc_structure(
-    ast: List[CK3Node], config: ParadoxConfig
-) -> List[types.Diagnostic]:
-    """
-    Check triggered_desc block structure.
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+        is_hidden = False
+        has_options = False
 
-    Detects:
-    - CK3440: triggered_desc missing trigger
-    - CK3441: triggered_desc missing desc
-    """
-    diagnostics = []
+        for child in node.children:
+            if child.key == "hidden" and child.value in ("yes", True):
+                is_hidden = True
+            elif child.key == "option":
+                has_options = True
 
-    if not config.event_structure:
-        return diagnostics
-
-    def check_node(node: CK3Node):
-        """Recursively check for triggered_desc blocks."""
-        if node.key == "triggered_desc":
-            has_trigger = False
-            has_desc = False
-
-            for child in node.children:
-                if child.key == "trigger":
-                    has_trigger = True
-                elif child.key == "desc":
-                    has_desc = True
-
-            if not has_trigger:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="triggered_desc block is missing required 'trigger' field",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Error,
-                        code="CK3440",
-                    )
+        if is_hidden and has_options:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Hidden event '{node.key}' has option blocks, but options are ignored in hidden events",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3762",
                 )
+            )
 
-            if not has_desc:
-                diagnostics.append(
+
+class MultipleAfterBlocksCheck(NodeCheck):
+    """CK3766: Multiple after blocks."""
+
+    top_level = True
+
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+        after_count = sum(1 for child in node.children if child.key == "after")
+
+        if after_count > 1:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' has {after_count} after blocks - only the first will execute",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3766",
+                )
+            )
+
+
+class EmptyEventCheck(NodeCheck):
+    """CK3767: Empty event block."""
+
+    top_level = True
+
+    def visit(self, node: CK3Node, ancestors):
+        if not _is_event_id(node.key):
+            return
+        # Check if event has any non-comment children
+        if not any(child.type != "comment" for child in node.children):
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' is empty - it has no fields or content",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3767",
+                )
+            )
+
+
+class EventHasPortraitsCheck(NodeCheck):
+    """CK3769: Non-hidden character event without portraits."""
+
+    top_level = True
+
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+        is_character_event = False
+        is_hidden = False
+        has_portraits = False
+
+        for child in node.children:
+            if child.key == "type" and child.value == "character_event":
+                is_character_event = True
+            elif child.key == "hidden" and child.value in ("yes", True):
+                is_hidden = True
+            elif events.is_valid_portrait_position(child.key):
+                has_portraits = True
+
+        # Warn if character event, not hidden, and no portraits
+        if is_character_event and not is_hidden and not has_portraits:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Character event '{node.key}' has no portrait positions defined. Consider adding left_portrait, right_portrait, etc.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Information,
+                    code="CK3769",
+                )
+            )
+
+
+class TriggerExtensionCheck(NodeCheck):
+    """CK3510-CK3513: trigger_if / trigger_else_if / trigger_else chains."""
+
+    keys = frozenset({"trigger_if", "trigger_else_if", "trigger_else"})
+
+    def __init__(self):
+        super().__init__()
+        # Per parent block: [trigger_if seen, trigger_else count]
+        self.chains: Dict[int, List[Any]] = {}
+
+    def visit(self, node: CK3Node, ancestors):
+        if not ancestors:
+            return  # Chains are checked among the children of a block
+        chain = self.chains.setdefault(id(ancestors[-1]), [False, 0])
+
+        if node.key == "trigger_if":
+            chain[0] = True
+            chain[1] = 0  # Reset for new trigger_if chain
+
+            # CK3512: Check if trigger_if has limit
+            has_limit = any(c.key == "limit" for c in node.children)
+            if not has_limit:
+                self.diagnostics.append(
                     create_paradox_diagnostic(
-                        message="triggered_desc block is missing required 'desc' field",
+                        message="trigger_if block is missing required 'limit' field. Add a condition for when this should apply.",
                         node_range=node.range,
                         severity=types.DiagnosticSeverity.Error,
-                        code="CK3441",
+                        code="CK3512",
                     )
                 )
+            else:
+                # CK3513: Check if limit is empty
+                for c in node.children:
+                    if c.key == "limit":
+                        limit_children = [lc for lc in c.children if lc.type != "comment"]
+                        if len(limit_children) == 0:
+                            self.diagnostics.append(
+                                create_paradox_diagnostic(
+                                    message="trigger_if limit is empty - condition always passes. Add a trigger condition or remove the trigger_if.",
+                                    node_range=c.range,
+                                    severity=types.DiagnosticSeverity.Warning,
+                                    code="CK3513",
+                                )
+                            )
+                        break
 
-        # Recurse
-        for child in node.children:
-            check_node(child)
-
-    for node in ast:
-        check_node(node)
-
-    return diagnostics
+        elif node.key == "trigger_else_if":
+            # trigger_else_if needs a preceding trigger_if
+            if not chain[0]:
+                self.diagnostics.append(
+                    create_paradox_diagnostic(
+                        message="trigger_else_if without preceding trigger_if - this block will never execute.",
+                        node_range=node.range,
+                        severity=types.DiagnosticSeverity.Error,
+                        code="CK3510",
+                    )
+                )
 
+            # Check for limit
+            has_limit = any(c.key == "limit" for c in node.children)
+            if not has_limit:
+                self.diagnostics.append(
+                    create_paradox_diagnostic(
+                        message="trigger_else_if block is missing required 'limit' field.",
+                        node_range=node.range,
+                        severity=types.DiagnosticSeverity.Error,
+                        code="CK3512",
+                    )
+                )
 
-def check_portrait_position(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
-    """
-    Check for invalid portrait positions.
+        else:
+            chain[1] += 1
 
-    Detects:
-    - CK3420: Invalid portrait position
-    """
-    diagnostics = []
+            # CK3510: trigger_else without trigger_if
+            if not chain[0]:
+                self.diagnostics.append(
+                    create_paradox_diagnostic(
+                        message="trigger_else without preceding trigger_if - this block will never execute correctly.",
+                        node_range=node.range,
+                        severity=types.DiagnosticSeverity.Error,
+                        code="CK3510",
+                    )
+                )
 
-    if not config.event_structure:
-        return diagnostics
-
-    def check_node(node: CK3Node):
-        """Check if node is a portrait position."""
-        if node.key.endswith("_portrait"):
-            if not events.is_valid_portrait_position(node.key):
-                valid_positions = ", ".join(sorted(events.PORTRAIT_POSITIONS))
-                diagnostics.append(
+            # CK3511: Multiple trigger_else blocks
+            if chain[1] > 1:
+                self.diagnostics.append(
                     create_paradox_diagnostic(
-                        message=f"Invalid portrait position '{node.key}'. Valid positions: {valid_positions}",
+                        message="Multiple trigger_else blocks - only the first will execute. Remove duplicate trigger_else blocks.",
                         node_range=node.range,
                         severity=types.DiagnosticSeverity.Error,
-                        code="CK3420",
+                        code="CK3511",
                     )
                 )
 
-        # Recurse
+        # Other content between trigger_if and trigger_else doesn't reset the chain
+
+
+class AfterBlockCheck(NodeCheck):
+    """CK3520/CK3521: after blocks in hidden events or events without options."""
+
+    top_level = True
+
+    def visit(self, node: CK3Node, ancestors):
+        if not (node.children and _is_event_id(node.key)):
+            return
+        is_hidden = False
+        has_after = False
+        has_option = False
+        after_range = None
+
         for child in node.children:
-            check_node(child)
+            if child.key == "hidden" and child.value in ("yes", True):
+                is_hidden = True
+            elif child.key == "after":
+                has_after = True
+                after_range = child.range
+            elif child.key == "option":
+                has_option = True
+
+        # CK3520: after in hidden event
+        if is_hidden and has_after and after_range:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Hidden event '{node.key}' has an 'after' block - after blocks only run after player chooses an option, so this won't execute in hidden events.",
+                    node_range=after_range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3520",
+                )
+            )
 
-    for node in ast:
-        check_node(node)
+        # CK3521: after without options
+        if has_after and not has_option and not is_hidden and after_range:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Event '{node.key}' has 'after' block but no options - after blocks only run after player chooses an option.",
+                    node_range=after_range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3521",
+                )
+            )
 
-    return diagnostics
 
+class AiChanceCheck(NodeCheck):
+    """CK3610-CK3614: ai_chance base values and unconditional modifiers."""
 
-def check_portrait_has_character(
-    ast: List[CK3Node], config: ParadoxConfig
-) -> List[types.Diagnostic]:
-    """
-    Check that portrait blocks have character field.
+    keys = frozenset({"ai_chance"})
 
-    Detects:
-    - CK3421: Portrait missing character
-    """
-    diagnostics = []
+    def visit(self, node: CK3Node, ancestors):
+        base_value = None
+        has_modifier = False
+        modifier_without_trigger = False
 
-    if not config.event_structure:
-        return diagnostics
-
-    def check_node(node: CK3Node):
-        """Check if portrait node has character."""
-        if events.is_valid_portrait_position(node.key):
-            # This is a portrait position - check if it has a character
-            has_character = any(child.key == "character" for child in node.children)
-            if not has_character and node.children:  # Has content but no character
-                diagnostics.append(
+        for child in node.children:
+            if child.key == "base":
+                try:
+                    base_value = float(child.value) if child.value else None
+                except (ValueError, TypeError):
+                    pass
+
+            elif child.key == "modifier":
+                has_modifier = True
+                # Check if modifier has a trigger
+                has_trigger = any(
+                    c.key in ("trigger", "limit", "is_ai", "is_adult", "has_trait")
+                    or c.key.startswith("is_") or c.key.startswith("has_")
+                    for c in child.children
+                )
+                # Also check for common trigger patterns at top level
+                has_condition = any(
+                    c.key not in ("add", "factor", "mult", "multiply")
+                    for c in child.children
+                )
+
+                if not has_trigger and not has_condition:
+                    # Check if it's just add/factor without condition
+                    only_math = all(
+                        c.key in ("add", "factor", "mult", "multiply")
+                        for c in child.children
+                    )
+                    if only_math and len(child.children) > 0:
+                        modifier_without_trigger = True
+
+        # CK3610: Negative base
+        if base_value is not None and base_value < 0:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"ai_chance has negative base ({base_value}) - AI will never select this option unless modifiers bring it positive.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3610",
+                )
+            )
+
+        # CK3612: Zero base with no modifiers
+        elif base_value == 0 and not has_modifier:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="ai_chance has base = 0 with no modifiers - AI will never select this option.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3612",
+                )
+            )
+
+        # CK3611: Very high base (info only)
+        elif base_value is not None and base_value > 100:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"ai_chance has high base ({base_value}) - this heavily weights this option. Is this intentional?",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Information,
+                    code="CK3611",
+                )
+            )
+
+        # CK3614: Modifier without trigger
+        if modifier_without_trigger:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="ai_chance modifier has no trigger condition - it applies unconditionally. Consider adding a trigger.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Information,
+                    code="CK3614",
+                )
+            )
+
+
+class DescIssuesCheck(NodeCheck):
+    """CK3443: Empty desc blocks and desc without a value, inside events."""
+
+    keys = frozenset({"desc"})
+
+    def visit(self, node: CK3Node, ancestors):
+        if not any(_is_event_id(ancestor.key) for ancestor in ancestors):
+            return
+        if node.children:
+            # desc = { ... } form
+            non_comment_children = [c for c in node.children if c.type != "comment"]
+            if len(non_comment_children) == 0:
+                self.diagnostics.append(
                     create_paradox_diagnostic(
-                        message=f"Portrait '{node.key}' is missing required 'character' field",
+                        message="Empty desc block - event needs a description for players.",
                         node_range=node.range,
                         severity=types.DiagnosticSeverity.Warning,
-                        code="CK3421",
+                        code="CK3443",
                     )
                 )
+        elif node.value is None or (isinstance(node.value, str) and node.value.strip() == ""):
+            # desc = without value
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="desc field has no value - provide a localization key.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3443",
+                )
+            )
 
-        # Recurse
-        for child in node.children:
-            check_node(child)
 
-    for node in ast:
-        check_node(node)
+class OptionIssuesCheck(NodeCheck):
+    """CK3453/CK3456: Options with several names or no content."""
 
-    return diagnostics
+    keys = frozenset({"option"})
 
+    def visit(self, node: CK3Node, ancestors):
+        name_count = sum(1 for child in node.children if child.key == "name")
+        non_comment_children = [c for c in node.children if c.type != "comment"]
 
-def check_animation_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+        # CK3453: Multiple names
+        if name_count > 1:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message=f"Option has {name_count} 'name' fields - only the first will be used. Remove duplicate names.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3453",
+                )
+            )
+
+        # CK3456: Empty option
+        if len(non_comment_children) == 0:
+            self.diagnostics.append(
+                create_paradox_diagnostic(
+                    message="Empty option block - options need at least a 'name' field for localization.",
+                    node_range=node.range,
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3456",
+                )
+            )
+
+
+# =============================================================================
+# CHECK FUNCTIONS (one check per call)
+# =============================================================================
+
+
+def check_effect_in_trigger_context(
+    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
+) -> List[types.Diagnostic]:
     """
-    Check for invalid animation names.
+    Check for effects used in trigger contexts.
 
     Detects:
-    - CK3422: Invalid animation
+    - CK3870: Effect used in trigger block
+    - CK3871: Effect used in limit block
     """
-    diagnostics = []
+    if not config.effect_trigger_context:
+        return []
+    return run_checks(ast, [EffectInTriggerContextCheck(index)])
+
+
+def check_list_iterator_misuse(
+    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
+) -> List[types.Diagnostic]:
+    """
+    Check for list iterator misuse.
+
+    Detects:
+    - CK3976: Effect in any_ iterator (any_ is trigger-only)
+    - CK3977: every_ without limit (affects all entries - intentional?)
+    - CK3875: Missing limit in random_ iterator
+    """
+    if not config.list_iterators:
+        return []
+    return run_checks(ast, [ListIteratorMisuseCheck(index)])
+
+
+def check_opinion_modifiers(
+    ast: List[CK3Node], index: Optional[DocumentIndex], config: ParadoxConfig
+) -> List[types.Diagnostic]:
+    """
+    Check for opinion modifier issues.
+
+    Detects:
+    - CK3656: Inline opinion value (should use predefined modifier)
+    """
+    if not config.opinion_modifiers:
+        return []
+    return run_checks(ast, [OpinionModifierCheck()])
+
 
+def check_event_structure(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check event structure for common issues.
+
+    Detects:
+    - CK3760: Event missing type declaration
+    - CK3763: Event with no option blocks
+    - CK3768: Multiple immediate blocks
+    """
     if not config.event_structure:
-        return diagnostics
-
-    def check_node(node: CK3Node):
-        """Check if animation is valid."""
-        if node.key == "animation" and node.value:
-            animation = str(node.value)
-            if not events.is_valid_portrait_animation(animation):
-                valid_animations = ", ".join(sorted(events.PORTRAIT_ANIMATIONS))
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message=f"Invalid animation '{animation}'. Valid animations: {valid_animations}",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3422",
-                    )
-                )
+        return []
+    return run_checks(ast, [EventStructureCheck()])
 
-        # Recurse
-        for child in node.children:
-            check_node(child)
 
-    for node in ast:
-        check_node(node)
+def check_redundant_triggers(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for redundant trigger patterns.
 
-    return diagnostics
+    Detects:
+    - CK3872: trigger = { always = yes } is redundant
+    - CK3873: trigger = { always = no } makes event impossible
+    """
+    if not config.redundant_triggers:
+        return []
+    return run_checks(ast, [RedundantTriggerCheck()])
 
 
-def check_theme_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+def check_common_gotchas(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
     """
-    Check for invalid theme names.
+    Check for common CK3 gotchas.
 
     Detects:
-    - CK3430: Invalid theme
+    - CK5142: Character comparison with = instead of this
     """
-    diagnostics = []
+    if not config.common_gotchas:
+        return []
+    return run_checks(ast, [CommonGotchasCheck()])
+
+
+# =============================================================================
+# PHASE 1 QUICK WINS - Event Validation Checks
+# =============================================================================
+
 
+def check_event_type_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for invalid event types.
+
+    Detects:
+    - CK3761: Invalid event type (not in EVENT_TYPES)
+    """
     if not config.event_structure:
-        return diagnostics
-
-    def check_node(node: CK3Node):
-        """Check if theme is valid."""
-        if node.key == "theme" and node.value:
-            theme = str(node.value)
-            if not events.is_valid_theme(theme):
-                valid_themes = ", ".join(sorted(events.EVENT_THEMES))
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message=f"Invalid theme '{theme}'. Valid themes: {valid_themes}",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3430",
-                    )
-                )
+        return []
+    return run_checks(ast, [EventTypeValidCheck()])
 
-        # Recurse
-        for child in node.children:
-            check_node(child)
 
-    for node in ast:
-        check_node(node)
+def check_event_has_desc(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for missing desc in non-hidden events.
 
-    return diagnostics
+    Detects:
+    - CK3764: Non-hidden event missing desc field
+    """
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [EventHasDescCheck()])
 
 
-def check_hidden_event_options(
+def check_option_has_name(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for options missing name field.
+
+    Detects:
+    - CK3450: Option missing 'name' field for localization
+    """
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [OptionHasNameCheck()])
+
+
+def check_triggered_desc_structure(
     ast: List[CK3Node], config: ParadoxConfig
 ) -> List[types.Diagnostic]:
     """
-    Check for hidden events with option blocks.
+    Check triggered_desc block structure.
 
     Detects:
-    - CK3762: Hidden event with options (options are ignored)
+    - CK3440: triggered_desc missing trigger
+    - CK3441: triggered_desc missing desc
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
+        return []
+    return run_checks(ast, [TriggeredDescStructureCheck()])
 
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # This is an event
-                    is_hidden = False
-                    has_options = False
-
-                    for child in node.children:
-                        if child.key == "hidden" and child.value in ("yes", True):
-                            is_hidden = True
-                        elif child.key == "option":
-                            has_options = True
-
-                    if is_hidden and has_options:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Hidden event '{node.key}' has option blocks, but options are ignored in hidden events",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3762",
-                            )
-                        )
 
-                except ValueError:
-                    pass
+def check_portrait_position(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for invalid portrait positions.
 
-    return diagnostics
+    Detects:
+    - CK3420: Invalid portrait position
+    """
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [PortraitPositionCheck()])
 
 
-def check_multiple_after_blocks(
+def check_portrait_has_character(
     ast: List[CK3Node], config: ParadoxConfig
 ) -> List[types.Diagnostic]:
     """
-    Check for multiple after blocks in events.
+    Check that portrait blocks have character field.
 
     Detects:
-    - CK3766: Multiple after blocks (only first executes)
+    - CK3421: Portrait missing character
     """
-    diagnostics = []
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [PortraitHasCharacterCheck()])
+
 
+def check_animation_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for invalid animation names.
+
+    Detects:
+    - CK3422: Invalid animation
+    """
     if not config.event_structure:
-        return diagnostics
+        return []
+    return run_checks(ast, [AnimationValidCheck()])
 
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # Count after blocks
-                    after_count = sum(1 for child in node.children if child.key == "after")
-
-                    if after_count > 1:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' has {after_count} after blocks - only the first will execute",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Error,
-                                code="CK3766",
-                            )
-                        )
 
-                except ValueError:
-                    pass
+def check_theme_valid(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for invalid theme names.
 
-    return diagnostics
+    Detects:
+    - CK3430: Invalid theme
+    """
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [ThemeValidCheck()])
 
 
-def check_empty_event(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+def check_hidden_event_options(
+    ast: List[CK3Node], config: ParadoxConfig
+) -> List[types.Diagnostic]:
     """
-    Check for empty event blocks.
+    Check for hidden events with option blocks.
 
     Detects:
-    - CK3767: Empty event block (no meaningful content)
+    - CK3762: Hidden event with options (options are ignored)
     """
-    diagnostics = []
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [HiddenEventOptionsCheck()])
 
+
+def check_multiple_after_blocks(
+    ast: List[CK3Node], config: ParadoxConfig
+) -> List[types.Diagnostic]:
+    """
+    Check for multiple after blocks in events.
+
+    Detects:
+    - CK3766: Multiple after blocks (only first executes)
+    """
     if not config.event_structure:
-        return diagnostics
+        return []
+    return run_checks(ast, [MultipleAfterBlocksCheck()])
 
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # Check if event has any non-comment children
-                    has_content = any(
-                        child.type != "comment" for child in node.children
-                    ) if node.children else False
-
-                    if not has_content:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' is empty - it has no fields or content",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3767",
-                            )
-                        )
 
-                except ValueError:
-                    pass
+def check_empty_event(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
+    """
+    Check for empty event blocks.
 
-    return diagnostics
+    Detects:
+    - CK3767: Empty event block (no meaningful content)
+    """
+    if not config.event_structure:
+        return []
+    return run_checks(ast, [EmptyEventCheck()])
 
 
 def check_event_has_portraits(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
@@ -1019,46 +1292,9 @@ def check_event_has_portraits(ast: List[CK3Node], config: ParadoxConfig) -> List
     Detects:
     - CK3769: Non-hidden character event has no portraits
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
-
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # Check event properties
-                    is_character_event = False
-                    is_hidden = False
-                    has_portraits = False
-
-                    for child in node.children:
-                        if child.key == "type" and child.value == "character_event":
-                            is_character_event = True
-                        elif child.key == "hidden" and child.value in ("yes", True):
-                            is_hidden = True
-                        elif events.is_valid_portrait_position(child.key):
-                            has_portraits = True
-
-                    # Warn if character event, not hidden, and no portraits
-                    if is_character_event and not is_hidden and not has_portraits:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Character event '{node.key}' has no portrait positions defined. Consider adding left_portrait, right_portrait, etc.",
-                                node_range=node.range,
-                                severity=types.DiagnosticSeverity.Information,
-                                code="CK3769",
-                            )
-                        )
-
-                except ValueError:
-                    pass
-
-    return diagnostics
+        return []
+    return run_checks(ast, [EventHasPortraitsCheck()])
 
 
 # =============================================================================
@@ -1076,108 +1312,9 @@ def check_trigger_extensions(ast: List[CK3Node], config: ParadoxConfig) -> List[
     - CK3512: trigger_if missing limit
     - CK3513: Empty trigger_if limit (condition always passes)
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
-
-    def check_trigger_if_else(parent_node: CK3Node):
-        """Check trigger_if/trigger_else patterns within a parent node."""
-        # Track trigger_if and trigger_else blocks in sequence
-        trigger_if_seen = False
-        trigger_else_count = 0
-
-        for child in parent_node.children:
-            if child.key == "trigger_if":
-                trigger_if_seen = True
-                trigger_else_count = 0  # Reset for new trigger_if chain
-
-                # CK3512: Check if trigger_if has limit
-                has_limit = any(c.key == "limit" for c in child.children)
-                if not has_limit:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="trigger_if block is missing required 'limit' field. Add a condition for when this should apply.",
-                            node_range=child.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3512",
-                        )
-                    )
-                else:
-                    # CK3513: Check if limit is empty
-                    for c in child.children:
-                        if c.key == "limit":
-                            limit_children = [lc for lc in c.children if lc.type != "comment"]
-                            if len(limit_children) == 0:
-                                diagnostics.append(
-                                    create_paradox_diagnostic(
-                                        message="trigger_if limit is empty - condition always passes. Add a trigger condition or remove the trigger_if.",
-                                        node_range=c.range,
-                                        severity=types.DiagnosticSeverity.Warning,
-                                        code="CK3513",
-                                    )
-                                )
-                            break
-
-            elif child.key == "trigger_else_if":
-                # trigger_else_if needs a preceding trigger_if
-                if not trigger_if_seen:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="trigger_else_if without preceding trigger_if - this block will never execute.",
-                            node_range=child.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3510",
-                        )
-                    )
-
-                # Check for limit
-                has_limit = any(c.key == "limit" for c in child.children)
-                if not has_limit:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="trigger_else_if block is missing required 'limit' field.",
-                            node_range=child.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3512",
-                        )
-                    )
-
-            elif child.key == "trigger_else":
-                trigger_else_count += 1
-
-                # CK3510: trigger_else without trigger_if
-                if not trigger_if_seen:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="trigger_else without preceding trigger_if - this block will never execute correctly.",
-                            node_range=child.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3510",
-                        )
-                    )
-
-                # CK3511: Multiple trigger_else blocks
-                if trigger_else_count > 1:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="Multiple trigger_else blocks - only the first will execute. Remove duplicate trigger_else blocks.",
-                            node_range=child.range,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3511",
-                        )
-                    )
-
-            # If we encounter something else, don't reset trigger_if_seen
-            # (blocks can have other content between trigger_if and trigger_else)
-
-            # Recurse into children
-            check_trigger_if_else(child)
-
-    for node in ast:
-        check_trigger_if_else(node)
-
-    return diagnostics
+        return []
+    return run_checks(ast, [TriggerExtensionCheck()])
 
 
 # =============================================================================
@@ -1193,59 +1330,9 @@ def check_after_block_issues(ast: List[CK3Node], config: ParadoxConfig) -> List[
     - CK3520: after block in hidden event (won't execute as expected)
     - CK3521: after block without options (won't execute)
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
-
-    for node in ast:
-        # Check if this looks like an event
-        if "." in node.key and node.children:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])  # Event ID should be numeric
-                    # This is an event - check for after block issues
-                    is_hidden = False
-                    has_after = False
-                    has_option = False
-                    after_range = None
-
-                    for child in node.children:
-                        if child.key == "hidden" and child.value in ("yes", True):
-                            is_hidden = True
-                        elif child.key == "after":
-                            has_after = True
-                            after_range = child.range
-                        elif child.key == "option":
-                            has_option = True
-
-                    # CK3520: after in hidden event
-                    if is_hidden and has_after and after_range:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Hidden event '{node.key}' has an 'after' block - after blocks only run after player chooses an option, so this won't execute in hidden events.",
-                                node_range=after_range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3520",
-                            )
-                        )
-
-                    # CK3521: after without options
-                    if has_after and not has_option and not is_hidden and after_range:
-                        diagnostics.append(
-                            create_paradox_diagnostic(
-                                message=f"Event '{node.key}' has 'after' block but no options - after blocks only run after player chooses an option.",
-                                node_range=after_range,
-                                severity=types.DiagnosticSeverity.Warning,
-                                code="CK3521",
-                            )
-                        )
-
-                except ValueError:
-                    pass
-
-    return diagnostics
+        return []
+    return run_checks(ast, [AfterBlockCheck()])
 
 
 # =============================================================================
@@ -1263,100 +1350,9 @@ def check_ai_chance_issues(ast: List[CK3Node], config: ParadoxConfig) -> List[ty
     - CK3612: ai_chance = 0 (AI will never select)
     - CK3614: modifier without trigger (applies unconditionally)
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
-
-    def check_ai_chance_node(node: CK3Node):
-        """Check ai_chance block for issues."""
-        if node.key == "ai_chance":
-            base_value = None
-            has_modifier = False
-            modifier_without_trigger = False
-
-            for child in node.children:
-                if child.key == "base":
-                    try:
-                        base_value = float(child.value) if child.value else None
-                    except (ValueError, TypeError):
-                        pass
-
-                elif child.key == "modifier":
-                    has_modifier = True
-                    # Check if modifier has a trigger
-                    has_trigger = any(
-                        c.key in ("trigger", "limit", "is_ai", "is_adult", "has_trait")
-                        or c.key.startswith("is_") or c.key.startswith("has_")
-                        for c in child.children
-                    )
-                    # Also check for common trigger patterns at top level
-                    has_condition = any(
-                        c.key not in ("add", "factor", "mult", "multiply")
-                        for c in child.children
-                    )
-
-                    if not has_trigger and not has_condition:
-                        # Check if it's just add/factor without condition
-                        only_math = all(
-                            c.key in ("add", "factor", "mult", "multiply")
-                            for c in child.children
-                        )
-                        if only_math and len(child.children) > 0:
-                            modifier_without_trigger = True
-
-            # CK3610: Negative base
-            if base_value is not None and base_value < 0:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message=f"ai_chance has negative base ({base_value}) - AI will never select this option unless modifiers bring it positive.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3610",
-                    )
-                )
-
-            # CK3612: Zero base with no modifiers
-            elif base_value == 0 and not has_modifier:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="ai_chance has base = 0 with no modifiers - AI will never select this option.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3612",
-                    )
-                )
-
-            # CK3611: Very high base (info only)
-            elif base_value is not None and base_value > 100:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message=f"ai_chance has high base ({base_value}) - this heavily weights this option. Is this intentional?",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Information,
-                        code="CK3611",
-                    )
-                )
-
-            # CK3614: Modifier without trigger
-            if modifier_without_trigger:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="ai_chance modifier has no trigger condition - it applies unconditionally. Consider adding a trigger.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Information,
-                        code="CK3614",
-                    )
-                )
-
-        # Recurse
-        for child in node.children:
-            check_ai_chance_node(child)
-
-    for node in ast:
-        check_ai_chance_node(node)
-
-    return diagnostics
+        return []
+    return run_checks(ast, [AiChanceCheck()])
 
 
 # =============================================================================
@@ -1372,57 +1368,9 @@ def check_desc_issues(ast: List[CK3Node], config: ParadoxConfig) -> List[types.D
     - CK3442: desc without localization key reference
     - CK3443: Empty desc block
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
-
-    def check_desc_node(node: CK3Node, in_event: bool = False):
-        """Check desc blocks for issues."""
-        if node.key == "desc" and in_event:
-            # Check for empty desc
-            if node.children:
-                # desc = { ... } form
-                non_comment_children = [c for c in node.children if c.type != "comment"]
-                if len(non_comment_children) == 0:
-                    diagnostics.append(
-                        create_paradox_diagnostic(
-                            message="Empty desc block - event needs a description for players.",
-                            node_range=node.range,
-                            severity=types.DiagnosticSeverity.Warning,
-                            code="CK3443",
-                        )
-                    )
-            elif node.value is None or (isinstance(node.value, str) and node.value.strip() == ""):
-                # desc = without value
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="desc field has no value - provide a localization key.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3443",
-                    )
-                )
-
-        # Check if we're entering an event
-        is_event = False
-        if "." in node.key:
-            parts = node.key.split(".")
-            if len(parts) == 2:
-                try:
-                    int(parts[1])
-                    is_event = True
-                except ValueError:
-                    pass
-
-        # Recurse
-        for child in node.children:
-            check_desc_node(child, in_event or is_event)
-
-    for node in ast:
-        check_desc_node(node)
-
-    return diagnostics
+        return []
+    return run_checks(ast, [DescIssuesCheck()])
 
 
 def check_option_issues(ast: List[CK3Node], config: ParadoxConfig) -> List[types.Diagnostic]:
@@ -1433,58 +1381,93 @@ def check_option_issues(ast: List[CK3Node], config: ParadoxConfig) -> List[types
     - CK3453: Option with multiple names
     - CK3456: Empty option block
     """
-    diagnostics = []
-
     if not config.event_structure:
-        return diagnostics
+        return []
+    return run_checks(ast, [OptionIssuesCheck()])
 
-    def check_option_node(node: CK3Node):
-        """Check option blocks for issues."""
-        if node.key == "option":
-            name_count = sum(1 for child in node.children if child.key == "name")
-            non_comment_children = [c for c in node.children if c.type != "comment"]
-
-            # CK3453: Multiple names
-            if name_count > 1:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message=f"Option has {name_count} 'name' fields - only the first will be used. Remove duplicate names.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3453",
-                    )
-                )
 
-            # CK3456: Empty option
-            if len(non_comment_children) == 0:
-                diagnostics.append(
-                    create_paradox_diagnostic(
-                        message="Empty option block - options need at least a 'name' field for localization.",
-                        node_range=node.range,
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3456",
-                    )
-                )
+def create_paradox_checks(
+    index: Optional[DocumentIndex] = None,
+    config: Optional[ParadoxConfig] = None,
+) -> List[NodeCheck]:
+    """
+    Build the checks run by check_paradox_conventions(), for one traversal.
 
-        # Recurse
-        for child in node.children:
-            check_option_node(child)
+    Callers running other checks over the same AST (collect_all_diagnostics)
+    add these to their own CheckDispatcher instead of walking twice.
 
-    for node in ast:
-        check_option_node(node)
+    Args:
+        index: Document index for cross-file validation
+        config: Paradox configuration (uses defaults if None)
 
-    return diagnostics
+    Returns:
+        Enabled checks, in reporting order
+    """
+    config = config or ParadoxConfig()
+    checks: List[NodeCheck] = []
+
+    # Schema-driven generic rules (Phase 6.9)
+    if GENERIC_RULES_AVAILABLE:
+        generic_config = {
+            "effect_trigger_context": config.effect_trigger_context,
+            "list_iterators": config.list_iterators,
+            "common_gotchas": config.common_gotchas,
+            "opinion_modifiers": config.opinion_modifiers,
+        }
+        checks.append(GenericRulesCheck(index, generic_config))
+    else:
+        # LEGACY: Fallback to hardcoded checks if schema system unavailable
+        if config.effect_trigger_context:
+            checks.append(EffectInTriggerContextCheck(index))
+        if config.list_iterators:
+            checks.append(ListIteratorMisuseCheck(index))
+        if config.opinion_modifiers:
+            checks.append(OpinionModifierCheck())
+        if config.redundant_triggers:
+            checks.append(RedundantTriggerCheck())
+        if config.common_gotchas:
+            checks.append(CommonGotchasCheck())
+
+    # File-type-specific checks
+    if config.event_structure:
+        checks.extend(
+            [
+                EventStructureCheck(),
+                # Phase 1 Quick Wins - Event validation checks
+                EventTypeValidCheck(),
+                EventHasDescCheck(),
+                OptionHasNameCheck(),
+                TriggeredDescStructureCheck(),
+                PortraitPositionCheck(),
+                PortraitHasCharacterCheck(),
+                AnimationValidCheck(),
+                ThemeValidCheck(),
+                HiddenEventOptionsCheck(),
+                MultipleAfterBlocksCheck(),
+                EmptyEventCheck(),
+                EventHasPortraitsCheck(),
+                # Trigger extensions, After blocks, AI chance
+                TriggerExtensionCheck(),
+                AfterBlockCheck(),
+                AiChanceCheck(),
+                DescIssuesCheck(),
+                OptionIssuesCheck(),
+            ]
+        )
+    return checks
 
 
 def check_paradox_conventions(
     ast: List[CK3Node],
     index: Optional[DocumentIndex] = None,
     config: Optional[ParadoxConfig] = None,
+    cancel: Optional[CancellationToken] = None,
 ) -> List[types.Diagnostic]:
     """
     Collect all Paradox convention diagnostics for an AST.
 
-    This is the main entry point for Paradox convention checking.
+    This is the main entry point for Paradox convention checking. All checks
+    (see create_paradox_checks) run in a single AST traversal.
     
     ARCHITECTURE UPDATE (Phase 6.9):
         Generic validation rules are now schema-driven via generic_rules.yaml.
@@ -1502,55 +1485,18 @@ def check_paradox_conventions(
         ast: Parsed AST
         index: Document index for cross-file validation
         config: Paradox configuration (uses defaults if None)
+        cancel: Checked before each top-level block
 
     Returns:
         List of Paradox convention diagnostics
+
+    Raises:
+        OperationCancelled: If ``cancel`` was cancelled
     """
-    config = config or ParadoxConfig()
     diagnostics = []
 
     try:
-        # NEW: Schema-driven generic rules (Phase 6.9)
-        if GENERIC_RULES_AVAILABLE:
-            generic_config = {
-                "effect_trigger_context": config.effect_trigger_context,
-                "list_iterators": config.list_iterators,
-                "common_gotchas": config.common_gotchas,
-                "opinion_modifiers": config.opinion_modifiers,
-            }
-            diagnostics.extend(validate_generic_rules(ast, index, generic_config))
-        else:
-            # LEGACY: Fallback to hardcoded checks if schema system unavailable
-            diagnostics.extend(check_effect_in_trigger_context(ast, index, config))
-            diagnostics.extend(check_list_iterator_misuse(ast, index, config))
-            diagnostics.extend(check_opinion_modifiers(ast, index, config))
-            diagnostics.extend(check_redundant_triggers(ast, config))
-            diagnostics.extend(check_common_gotchas(ast, config))
-        
-        # File-type-specific checks (still using legacy approach)
-        diagnostics.extend(check_event_structure(ast, config))
-
-        # Phase 1 Quick Wins - Event validation checks
-        diagnostics.extend(check_event_type_valid(ast, config))
-        diagnostics.extend(check_event_has_desc(ast, config))
-        diagnostics.extend(check_option_has_name(ast, config))
-        diagnostics.extend(check_triggered_desc_structure(ast, config))
-        diagnostics.extend(check_portrait_position(ast, config))
-        diagnostics.extend(check_portrait_has_character(ast, config))
-        diagnostics.extend(check_animation_valid(ast, config))
-        diagnostics.extend(check_theme_valid(ast, config))
-        diagnostics.extend(check_hidden_event_options(ast, config))
-        diagnostics.extend(check_multiple_after_blocks(ast, config))
-        diagnostics.extend(check_empty_event(ast, config))
-        diagnostics.extend(check_event_has_portraits(ast, config))
-
-        # New validation checks - Trigger extensions, After blocks, AI chance
-        diagnostics.extend(check_trigger_extensions(ast, config))
-        diagnostics.extend(check_after_block_issues(ast, config))
-        diagnostics.extend(check_ai_chance_issues(ast, config))
-        diagnostics.extend(check_desc_issues(ast, config))
-        diagnostics.extend(check_option_issues(ast, config))
-
+        diagnostics = run_checks(ast, create_paradox_checks(index, config), cancel)
         logger.debug(f"Paradox convention checks found {len(diagnostics)} issues")
 
     except Exception as e:
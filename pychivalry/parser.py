@@ -38,7 +38,8 @@ PARSER CHARACTERISTICS:
     - Position-preserving: Every node includes LSP Range for precise location
     - Memory-efficient: Uses __slots__ to reduce memory footprint by 30-50%
     - Fast: Parses typical 1000-line file in <50ms
-    - Recursive descent: Hand-written parser for predictable behavior
+    - Explicit stack: Hand-written parser without recursion, so nesting depth is
+      unlimited (parse_document_reference() keeps the recursive original)
 
 AST STRUCTURE:
     The AST is a tree of CK3Node objects with these relationships:
@@ -47,6 +48,13 @@ AST STRUCTURE:
     - Each node tracks its parent for upward traversal
     - Position information enables cursor-based operations
 
+    PositionIndex answers repeated cursor lookups on one AST with binary
+    searches over per-level sorted offsets instead of a tree walk.
+
+    parse_outline() is a skeleton mode for background indexing: it returns
+    the top-level statements with their text spans and skips block bodies
+    by brace matching; OutlineNode.parse() parses a body when it is needed.
+
 USAGE EXAMPLES:
     >>> # Parse a document
     >>> ast = parse_document("trigger = { is_adult = yes }")
@@ -56,6 +64,8 @@ USAGE EXAMPLES:
     >>> # Find node at cursor position
     >>> node = get_node_at_position(ast, types.Position(line=0, character=10))
     >>> node.key  # 'trigger'
+    >>> PositionIndex(ast).node_at(types.Position(line=0, character=10)) is node
+    True
     
     >>> # Tokenize text
     >>> tokens = tokenize("gold = 100")
@@ -90,7 +100,7 @@ SEE ALSO:
 from dataclasses import dataclass, field
 
 # typing: Type hints for better code documentation
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 # lsprotocol.types: LSP type definitions for positions and ranges
 from lsprotocol import types
@@ -98,6 +108,9 @@ from lsprotocol import types
 # re: Regular expressions for pattern matching (used sparingly)
 import re
 
+# bisect: Binary search over sorted node offsets (PositionIndex)
+from bisect import bisect_left, bisect_right
+
 
 # =============================================================================
 # AST NODE DEFINITIONS
@@ -246,6 +259,46 @@ class CK3Token:
         return f"Token({self.type}, {self.value!r}, {self.line}:{self.character})"
 
 
+# Master token pattern for the regex tokenizer.
+# Each match consumes leading horizontal whitespace and then exactly one token.
+# The alternatives start with disjoint characters, so their order only matters
+# for speed: common ASCII identifiers and punctuation are tried first, Unicode
+# identifiers last. Newlines are matched explicitly for parse_outline()'s
+# line/column bookkeeping (tokenize() matches one line at a time), and the
+# trailing \S swallows unknown characters (lastindex is None) exactly like the
+# "skip it" branch in tokenize_reference().
+_TOKEN_PATTERN = re.compile(
+    r"""
+    [^\S\n]*
+    (?:
+        ([A-Za-z_.:@$][\w.:@$-]*)                   # 1: identifier (ASCII start)
+        |([><!=]=|[=<>])                            # 2: operator
+        |([{}])                                     # 3: brace
+        |(\n)                                       # 4: newline
+        |(-?\d+(?:\.\d*)?)                          # 5: number
+        |("(?:[^"\\\n]|\\[^\n])*"|"[^\n]*)         # 6: string (unclosed runs to EOL)
+        |(\#[^\n]*)                                 # 7: comment
+        |([^\W\d][\w.:@$-]*)                        # 8: identifier (Unicode start)
+        |\S                                         # unknown character - skipped
+    )
+    """,
+    re.VERBOSE,
+)
+
+# Token type for each capture group of _TOKEN_PATTERN (index = group number)
+_TOKEN_KINDS = (
+    None,
+    "identifier",
+    "operator",
+    "brace",
+    None,
+    "number",
+    "string",
+    "comment",
+    "identifier",
+)
+
+
 def tokenize(text: str) -> List[CK3Token]:
     """
     Tokenize CK3 script text into a list of tokens.
@@ -253,6 +306,60 @@ def tokenize(text: str) -> List[CK3Token]:
     This is the lexical analysis phase that breaks the input text into meaningful
     units (tokens) that the parser can work with.
 
+    Each line is scanned with the compiled _TOKEN_PATTERN, so identifiers,
+    strings and comments are consumed by the regex engine instead of a
+    per-character Python loop, and a token's column is its match offset.
+    Blank and comment-only lines (most of a heavily commented file) skip the
+    regex entirely. The token stream is identical to the one produced by
+    tokenize_reference() (numbers are matched with \\d, so exotic Unicode
+    digits such as superscripts are lexed as identifiers rather than
+    numbers; these never occur in real CK3 script).
+
+    Args:
+        text: The CK3 script text to tokenize
+
+    Returns:
+        List of CK3Token objects representing the lexical structure
+    """
+    tokens = []
+    append = tokens.append
+    kinds = _TOKEN_KINDS
+    finditer = _TOKEN_PATTERN.finditer
+
+    for line_num, line in enumerate(text.split("\n")):
+        stripped = line.strip()
+        if not stripped:
+            # Blank line
+            continue
+
+        if stripped[0] == "#":
+            # Comment line - the whole line is one token, no regex needed
+            append(CK3Token("comment", stripped, line_num, line.index("#")))
+            continue
+
+        for match in finditer(line):
+            group = match.lastindex
+            if group is None:
+                # Unknown character - skip it
+                continue
+
+            value = match.group(group)
+            if group == 7:
+                value = value.strip()
+
+            append(CK3Token(kinds[group], value, line_num, match.start(group)))
+
+    return tokens
+
+
+def tokenize_reference(text: str) -> List[CK3Token]:
+    """
+    Reference character-by-character tokenizer.
+
+    This is the original straightforward implementation of tokenize(). It is
+    kept as the specification for the regex-based tokenizer: tests assert that
+    both produce identical token streams, and the benchmarks compare them.
+
     Args:
         text: The CK3 script text to tokenize
 
@@ -357,6 +464,44 @@ def parse_document(text: str) -> List[CK3Node]:
     hierarchical node structure. The resulting AST can be used for validation,
     completion, navigation, and other language server features.
 
+    Args:
+        text: The CK3 script text to parse
+
+    Returns:
+        List of top-level CK3Node objects representing the script structure
+    """
+    return parse_tokens(tokenize(text))
+
+
+def parse_tokens(tokens: List[CK3Token]) -> List[CK3Node]:
+    """
+    Parse an already tokenized document (see tokenize()).
+
+    Lets callers that keep the token stream around (document snapshots)
+    parse without tokenizing the text a second time.
+
+    Args:
+        tokens: Tokens of the whole document
+
+    Returns:
+        List of top-level CK3Node objects representing the script structure
+    """
+    if not tokens:
+        return []
+
+    nodes, _ = _parse_tokens(tokens)
+    return nodes
+
+
+def parse_document_reference(text: str) -> List[CK3Node]:
+    """
+    Reference recursive-descent parser.
+
+    This is the original implementation of parse_document(). It is kept as the
+    specification for the explicit-stack parser: tests assert that both build
+    identical trees, and the benchmarks compare them. It recurses once per
+    nesting level, so very deep nesting can hit the recursion limit.
+
     Args:
         text: The CK3 script text to parse
 
@@ -367,8 +512,141 @@ def parse_document(text: str) -> List[CK3Node]:
     if not tokens:
         return []
 
+    nodes, _ = _parse_tokens_reference(tokens)
+    return nodes
+
+
+def _parse_tokens(tokens: List[CK3Token]) -> Tuple[List[CK3Node], bool]:
+    """
+    Build top-level AST nodes from a token stream.
+
+    Blocks still open are kept on an explicit stack, so nesting depth costs
+    no Python recursion, and the token loop uses plain locals. Builds the
+    same trees as _parse_tokens_reference():
+
+    - ``key = {`` opens a block (type namespace/event/block); the matching
+      ``}`` closes it and extends its range to include the brace
+    - ``key = value`` (string, number or identifier) is an assignment
+    - Anything else is skipped: comments, stray braces and values, keys
+      followed by a non-``=`` operator or by no operator, ``key =`` followed
+      by a non-value
+
+    Args:
+        tokens: Tokens produced by tokenize()
+
+    Returns:
+        Tuple of (top-level nodes, truncated). ``truncated`` is True when the
+        tokens ran out in the middle of a statement (unclosed block, missing
+        value, dangling key), i.e. the parser did not finish at a clean
+        top-level boundary. Incremental parsing uses this to decide whether a
+        re-parsed span can be spliced into an existing AST.
+    """
+    Position = types.Position
+    Range = types.Range
+    nodes: List[CK3Node] = []
+    open_blocks: List[CK3Node] = []  # Innermost block last
+    siblings = nodes  # Children list of the innermost open block
+    count = len(tokens)
+    i = 0
+
+    while i < count:
+        token = tokens[i]
+        token_type = token.type
+
+        if token_type == "brace":
+            if token.value == "}" and open_blocks:
+                block = open_blocks.pop()
+                block.range = Range(
+                    start=block.range.start,
+                    end=Position(line=token.line, character=token.character + 1),
+                )
+                siblings = open_blocks[-1].children if open_blocks else nodes
+            i += 1
+            continue
+
+        if token_type != "identifier":
+            i += 1  # Comment or stray value
+            continue
+
+        # key
+        i += 1
+        if i >= count:
+            return nodes, True  # Dangling key
+        operator = tokens[i]
+        if operator.type != "operator" or operator.value != "=":
+            continue  # Not a statement; the next token is looked at again
+
+        # key =
+        i += 1
+        if i >= count:
+            return nodes, True  # Missing value
+        value_token = tokens[i]
+        value_type = value_token.type
+        key = token.value
+        start = Position(line=token.line, character=token.character)
+        parent = open_blocks[-1] if open_blocks else None
+
+        if value_type == "brace" and value_token.value == "{":
+            # key = { opens a block
+            i += 1
+            node_type = "block"
+            if key == "namespace":
+                node_type = "namespace"
+            elif "." in key and any(char.isdigit() for char in key):
+                node_type = "event"
+            block = CK3Node(
+                type=node_type,
+                key=key,
+                value=None,
+                range=Range(
+                    start=start,
+                    end=Position(line=value_token.line, character=value_token.character + 1),
+                ),
+                parent=parent,
+            )
+            siblings.append(block)
+            open_blocks.append(block)
+            siblings = block.children
+        elif value_type == "string" or value_type == "number" or value_type == "identifier":
+            # key = value
+            i += 1
+            siblings.append(
+                CK3Node(
+                    type="namespace" if key == "namespace" else "assignment",
+                    key=key,
+                    value=value_token.value,
+                    range=Range(
+                        start=start,
+                        end=Position(line=token.line, character=token.character + len(key)),
+                    ),
+                    parent=parent,
+                )
+            )
+        # Otherwise the value token is looked at again as a statement start
+
+    return nodes, bool(open_blocks)
+
+
+def _parse_tokens_reference(tokens: List[CK3Token]) -> Tuple[List[CK3Node], bool]:
+    """
+    Reference recursive-descent implementation of _parse_tokens().
+
+    Kept as the specification for the explicit-stack parser (see
+    parse_document_reference()). Uses one Python call per nesting level.
+
+    Args:
+        tokens: Tokens produced by tokenize()
+
+    Returns:
+        Tuple of (top-level nodes, truncated). ``truncated`` is True when the
+        tokens ran out in the middle of a statement (unclosed block, missing
+        value, dangling key), i.e. the parser did not finish at a clean
+        top-level boundary. Incremental parsing uses this to decide whether a
+        re-parsed span can be spliced into an existing AST.
+    """
     nodes = []
     index = [0]  # Use list to make it mutable in nested function
+    truncated = [False]  # Set when tokens run out mid-statement
 
     def peek() -> Optional[CK3Token]:
         """Look at current token without consuming it."""
@@ -388,6 +666,7 @@ def parse_document(text: str) -> List[CK3Node]:
         """Parse a value (string, number, or identifier)."""
         token = peek()
         if not token:
+            truncated[0] = True
             return None
 
         if token.type in ("string", "number", "identifier"):
@@ -456,6 +735,7 @@ def parse_document(text: str) -> List[CK3Node]:
         while True:
             token = peek()
             if not token:
+                truncated[0] = True  # Unclosed block
                 break
 
             if token.type == "brace" and token.value == "}":
@@ -492,6 +772,7 @@ def parse_document(text: str) -> List[CK3Node]:
         # Look ahead to determine if this is a block or assignment
         next_token = peek()
         if not next_token:
+            truncated[0] = True
             return None
 
         if next_token.type == "operator":
@@ -516,7 +797,459 @@ def parse_document(text: str) -> List[CK3Node]:
         else:
             consume()  # Skip unexpected token
 
-    return nodes
+    return nodes, truncated[0]
+
+
+# =============================================================================
+# OUTLINE (SKELETON) PARSING
+# =============================================================================
+
+# Inside a block body only braces matter: strings and comments are matched
+# whole (exactly like the tokenizer) so braces inside them are skipped
+_BODY_SCAN = re.compile(r'[{}]|"(?:[^"\\\n]|\\[^\n])*"|"[^\n]*|#[^\n]*')
+
+# "key = {" with the key an ASCII-start identifier token, on one line: the
+# common top-level statement, matched in one step instead of three tokens
+_OUTLINE_BLOCK = re.compile(r"[^\S\n]*([A-Za-z_.:@$][\w.:@$-]*)[^\S\n]*=[^\S\n]*\{")
+
+
+class OutlineNode:
+    """
+    Top-level statement found by parse_outline(), with its body left unparsed.
+
+    Attributes:
+        type: 'block', 'event', 'namespace' or 'assignment' (as for CK3Node)
+        key: Statement key (e.g. 'my_mod.0001', 'my_effect')
+        value: Value of an assignment, None for blocks
+        value_type: Token type of the value ('number', 'string', 'identifier'),
+            None for blocks
+        line: Zero-based line of the key
+        character: Zero-based character of the key on its line
+        start: Offset of the key in the text
+        end: Offset just past the statement (past the closing brace for
+            blocks; the end of the text for unclosed blocks)
+        closed: False for a block whose closing brace is missing
+    """
+
+    __slots__ = (
+        "type",
+        "key",
+        "value",
+        "value_type",
+        "line",
+        "character",
+        "start",
+        "end",
+        "closed",
+        "_text",
+        "_node",
+    )
+
+    def __init__(
+        self,
+        text: str,
+        type: str,
+        key: str,
+        value: Optional[str],
+        value_type: Optional[str],
+        line: int,
+        character: int,
+        start: int,
+        end: int,
+        closed: bool = True,
+    ):
+        self._text = text
+        self._node: Optional[CK3Node] = None
+        self.type = type
+        self.key = key
+        self.value = value
+        self.value_type = value_type
+        self.line = line
+        self.character = character
+        self.start = start
+        self.end = end
+        self.closed = closed
+
+    def __repr__(self):
+        return f"OutlineNode({self.type}, {self.key!r}, {self.line}:{self.character})"
+
+    @property
+    def key_range(self) -> types.Range:
+        """LSP Range of the key (the range CK3Node gives assignments)."""
+        return types.Range(
+            start=types.Position(line=self.line, character=self.character),
+            end=types.Position(line=self.line, character=self.character + len(self.key)),
+        )
+
+    def parse(self) -> Optional[CK3Node]:
+        """
+        Fully parse this statement (once; the result is cached).
+
+        Only the statement's span is tokenized, with positions shifted to the
+        statement's place in the document.
+
+        Returns:
+            The CK3Node for the statement, or None if it does not parse
+        """
+        if self._node is None:
+            tokens = tokenize(self._text[self.start : self.end])
+            for token in tokens:
+                if token.line == 0:
+                    token.character += self.character
+                token.line += self.line
+            nodes, _ = _parse_tokens(tokens)
+            self._node = nodes[0] if nodes else None
+        return self._node
+
+
+def _skip_body(text: str, pos: int) -> Tuple[int, int]:
+    """
+    Find the brace closing a block body that starts at ``pos``.
+
+    Braces are counted with str.find/str.count; only if the body contains a
+    string or comment (which may hide braces) is it rescanned with a regex.
+
+    Returns:
+        (offset past the closing brace, 0), or (len(text), depth still open)
+    """
+    find = text.find
+    depth = 1
+    scan = pos
+    while True:
+        close = find("}", scan)
+        if close < 0:
+            end = len(text)
+            depth += text.count("{", scan)
+            break
+        depth += text.count("{", scan, close) - 1
+        scan = close + 1
+        if depth <= 0:
+            end = scan
+            break
+
+    if (find('"', pos, end) < 0 and find("#", pos, end) < 0) and depth == 0:
+        return end, 0
+
+    depth = 1
+    for match in _BODY_SCAN.finditer(text, pos):
+        brace = match.group()
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth -= 1
+            if depth == 0:
+                return match.end(), 0
+    return len(text), depth
+
+
+def parse_outline(text: str) -> List[OutlineNode]:
+    """
+    Find the top-level statements of a script without parsing block bodies.
+
+    Top-level tokens are read like parse_document() reads them (same rules
+    for what forms a statement), with the common ``key = {`` line matched by
+    a single regex; once a block opens, the body is skipped by jumping from
+    brace to brace, ignoring braces in strings and comments. Bodies are
+    parsed later, if at all, with OutlineNode.parse().
+
+    Braces inside a body are matched pairwise, as the game does. This gives
+    the same blocks as parse_document() unless a body contains anonymous
+    ``{ }`` blocks, which parse_document() does not nest.
+
+    Args:
+        text: The CK3 script text
+
+    Returns:
+        Top-level statements in document order (blocks and assignments)
+    """
+    outline: List[OutlineNode] = []
+    token_match = _TOKEN_PATTERN.match
+    block_match = _OUTLINE_BLOCK.match
+    kinds = _TOKEN_KINDS
+    length = len(text)
+    pos = 0
+    line = 0
+    line_start = 0
+    # Statement state: 0 = expecting a key, 1 = after key, 2 = after "key ="
+    state = 0
+    key = ""
+    key_line = key_character = key_start = 0
+
+    while pos < length:
+        match = block_match(text, pos) if state == 0 else None
+        if match is not None:
+            # Fast path: "key = {" on one line
+            key = match.group(1)
+            key_start = match.start(1)
+            key_line = line
+            key_character = key_start - line_start
+            pos = match.end()
+            state = 2
+            kind = "brace"
+            value = "{"
+        else:
+            match = token_match(text, pos)
+            if match is None:
+                break  # Only trailing whitespace left
+            group = match.lastindex
+            if group == 4:
+                line += 1
+                line_start = pos = match.end()
+                continue
+            pos = match.end()
+            if group is None:
+                continue  # Unknown character (not a token)
+            kind = kinds[group]
+            value = match.group(group)
+
+            if state == 1:
+                if kind == "operator" and value == "=":
+                    state = 2
+                    continue
+                state = 0  # Not a statement; look at this token again as a key
+
+        if state == 2:
+            state = 0
+            if kind == "brace" and value == "{":
+                node_type = "block"
+                if key == "namespace":
+                    node_type = "namespace"
+                elif "." in key and any(char.isdigit() for char in key):
+                    node_type = "event"
+                end, depth = _skip_body(text, pos)
+                outline.append(
+                    OutlineNode(
+                        text,
+                        type=node_type,
+                        key=key,
+                        value=None,
+                        value_type=None,
+                        line=key_line,
+                        character=key_character,
+                        start=key_start,
+                        end=end,
+                        closed=depth == 0,
+                    )
+                )
+                # Continue after the body with line bookkeeping
+                line += text.count("\n", pos, end)
+                line_start = text.rfind("\n", 0, end) + 1
+                pos = end
+                continue
+            if kind == "string" or kind == "number" or kind == "identifier":
+                outline.append(
+                    OutlineNode(
+                        text,
+                        type="namespace" if key == "namespace" else "assignment",
+                        key=key,
+                        value=value,
+                        value_type=kind,
+                        line=key_line,
+                        character=key_character,
+                        start=key_start,
+                        end=pos,
+                    )
+                )
+                continue
+            # Not a value; look at this token again as a key
+
+        if kind == "identifier":
+            state = 1
+            key = value
+            key_start = match.start(group)
+            key_line = line
+            key_character = key_start - line_start
+
+    return outline
+
+
+# =============================================================================
+# INCREMENTAL PARSING
+# =============================================================================
+
+# Tokens never span lines (strings and comments end at the newline), so the
+# token stream of any run of whole lines is independent of the surrounding text.
+# An edit can therefore be handled by re-parsing only the lines between the last
+# untouched top-level block before it and the first untouched top-level
+# statement after it, as long as that span parses to a clean top-level boundary.
+
+
+def parse_document_incremental(
+    old_nodes: List[CK3Node], text: str, changes: Sequence[Any]
+) -> List[CK3Node]:
+    """
+    Re-parse only the top-level blocks touched by a set of text edits.
+
+    The changes are LSP content-change events (objects with ``range`` and
+    ``text``), applied in order, that turned the document parsed into
+    ``old_nodes`` into ``text``. The smallest span of whole lines enclosing the
+    affected top-level nodes is re-parsed and spliced between the untouched
+    prefix and suffix nodes; suffix nodes are shifted by the change in line
+    count. Untouched nodes are shared with ``old_nodes`` when no shift is
+    needed, so callers must treat AST nodes as immutable.
+
+    Falls back to a full parse_document() when a change replaces the whole
+    document, or when the re-parsed span does not end at a clean statement
+    boundary (e.g. an edit removed a closing brace), so the result is always
+    identical to parse_document(text).
+
+    Args:
+        old_nodes: Top-level nodes of the document before the changes
+        text: Full document text after the changes
+        changes: Content changes in the order they were applied
+
+    Returns:
+        List of top-level CK3Node objects for the new text
+    """
+    window = _changed_line_window(changes)
+    if window is None or not old_nodes:
+        return parse_document(text)
+
+    first_line, last_line, line_delta = window
+    last_old_line = last_line - line_delta
+    lines = text.split("\n")
+    node_count = len(old_nodes)
+
+    # Prefix: nodes that end before the edit and finish their statement on their line
+    prefix_end = 0
+    while prefix_end < node_count and old_nodes[prefix_end].range.end.line < first_line:
+        prefix_end += 1
+    while prefix_end > 0 and not _ends_at_line_boundary(old_nodes[prefix_end - 1], lines):
+        prefix_end -= 1
+
+    # Suffix: nodes that start after the edit at the beginning of a line
+    suffix_start = prefix_end
+    while (
+        suffix_start < node_count
+        and old_nodes[suffix_start].range.start.line <= last_old_line
+    ):
+        suffix_start += 1
+    while suffix_start < node_count and not _starts_at_line_boundary(
+        old_nodes[suffix_start], lines, line_delta
+    ):
+        suffix_start += 1
+
+    region_start = old_nodes[prefix_end - 1].range.end.line + 1 if prefix_end else 0
+    if suffix_start < node_count:
+        region_end = old_nodes[suffix_start].range.start.line + line_delta
+    else:
+        region_end = len(lines)
+
+    tokens = tokenize("\n".join(lines[region_start:region_end]))
+    for token in tokens:
+        token.line += region_start
+    region_nodes, truncated = _parse_tokens(tokens) if tokens else ([], False)
+
+    if truncated and suffix_start < node_count:
+        # The edit changed how the following statements are grouped
+        return parse_document(text)
+
+    suffix = old_nodes[suffix_start:]
+    if line_delta:
+        suffix = [_shift_node(node, line_delta) for node in suffix]
+
+    return old_nodes[:prefix_end] + region_nodes + suffix
+
+
+def _changed_line_window(changes: Sequence[Any]) -> Optional[Tuple[int, int, int]]:
+    """
+    Compute the line window touched by a sequence of content changes.
+
+    Args:
+        changes: LSP content-change events in application order
+
+    Returns:
+        Tuple of (first_line, last_line, line_delta) where the window is given in
+        post-change line numbers and line_delta is the net change in line count,
+        or None if a change has no range (full document replacement)
+    """
+    first_line = last_line = None
+    line_delta = 0
+
+    for change in changes:
+        change_range = getattr(change, "range", None)
+        if change_range is None:
+            return None
+
+        start_line = change_range.start.line
+        end_line = change_range.end.line
+        added_lines = change.text.count("\n")
+        delta = added_lines - (end_line - start_line)
+        new_end_line = start_line + added_lines
+
+        if first_line is None:
+            first_line, last_line = start_line, new_end_line
+        else:
+            # Map the existing window through this change
+            if first_line > end_line:
+                first_line += delta
+            if last_line > end_line:
+                last_line += delta
+            elif last_line >= start_line:
+                last_line = new_end_line
+            first_line = min(first_line, start_line)
+            last_line = max(last_line, new_end_line)
+
+        line_delta += delta
+
+    if first_line is None:
+        return None
+    return first_line, last_line, line_delta
+
+
+def _ends_at_line_boundary(node: CK3Node, lines: List[str]) -> bool:
+    """
+    Check that a node's last token is the last statement token on its line.
+
+    Blocks must be closed by their ``}``; assignments only record the key's
+    range, so the operator and value must follow on the same line. In both
+    cases only a comment may follow.
+    """
+    end = node.range.end
+    if end.line >= len(lines):
+        return False
+    line = lines[end.line]
+
+    if node.value is None:
+        if end.character < 1 or line[end.character - 1 : end.character] != "}":
+            return False
+        rest = line[end.character :].strip()
+        return not rest or rest.startswith("#")
+
+    rest_tokens = [t for t in tokenize(line[end.character :]) if t.type != "comment"]
+    return (
+        len(rest_tokens) == 2
+        and rest_tokens[0].type == "operator"
+        and rest_tokens[1].value == node.value
+    )
+
+
+def _starts_at_line_boundary(node: CK3Node, lines: List[str], line_delta: int) -> bool:
+    """Check that only whitespace precedes a node on its (shifted) start line."""
+    start = node.range.start
+    line_num = start.line + line_delta
+    if line_num >= len(lines):
+        return False
+    return not lines[line_num][: start.character].strip()
+
+
+def _shift_node(node: CK3Node, line_delta: int, parent: Optional[CK3Node] = None) -> CK3Node:
+    """Copy a subtree with every range moved by line_delta lines."""
+    start = node.range.start
+    end = node.range.end
+    shifted = CK3Node(
+        type=node.type,
+        key=node.key,
+        value=node.value,
+        range=types.Range(
+            start=types.Position(line=start.line + line_delta, character=start.character),
+            end=types.Position(line=end.line + line_delta, character=end.character),
+        ),
+        parent=parent,
+        scope_type=node.scope_type,
+    )
+    shifted.children = [_shift_node(child, line_delta, shifted) for child in node.children]
+    return shifted
 
 
 def get_node_at_position(nodes: List[CK3Node], position: types.Position) -> Optional[CK3Node]:
@@ -566,3 +1299,129 @@ def get_node_at_position(nodes: List[CK3Node], position: types.Position) -> Opti
             return result
 
     return None
+
+
+# =============================================================================
+# POSITION INDEX
+# =============================================================================
+
+# Positions are compared as single integers: line * _LINE_STRIDE + character
+_LINE_STRIDE = 1 << 20
+
+
+def _position_key(line: int, character: int) -> int:
+    """Combine a line and character into one sortable integer."""
+    return line * _LINE_STRIDE + min(character, _LINE_STRIDE - 1)
+
+
+class PositionIndex:
+    """
+    Cursor → innermost node lookup for one AST, in O(depth · log width).
+
+    get_node_at_position() walks the tree and compares Range objects at every
+    node. This index is built once per AST and answers the same question
+    with binary searches: for every list of siblings it keeps the sorted
+    start offsets and the running maximum of the end offsets, so the first
+    sibling containing the cursor is found with two bisections, and the
+    search descends into it.
+
+    Results are identical to get_node_at_position(), including its choice of
+    the first containing sibling when ranges touch or overlap.
+
+    Attributes:
+        nodes: The top-level nodes the index was built from
+    """
+
+    __slots__ = ("nodes", "_roots", "_levels")
+
+    def __init__(self, nodes: List[CK3Node]):
+        """
+        Index an AST.
+
+        Args:
+            nodes: Top-level AST nodes, as returned by parse_document()
+        """
+        self.nodes = nodes
+        # id(parent node) -> sibling level of its children
+        self._levels = {}
+        self._roots = self._build_level(nodes)
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node.children:
+                self._levels[id(node)] = self._build_level(node.children)
+                stack.extend(node.children)
+
+    @staticmethod
+    def _build_level(siblings: List[CK3Node]):
+        """
+        Build the search arrays for one list of siblings.
+
+        Returns:
+            (starts, running max of ends, siblings), with starts None when the
+            siblings are not ordered by start (searched linearly instead)
+        """
+        starts = []
+        max_ends = []
+        max_end = -1
+        for node in siblings:
+            node_range = node.range
+            starts.append(_position_key(node_range.start.line, node_range.start.character))
+            end = _position_key(node_range.end.line, node_range.end.character)
+            if end > max_end:
+                max_end = end
+            max_ends.append(max_end)
+        if any(starts[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            return (None, None, siblings)
+        return (starts, max_ends, siblings)
+
+    def node_at(self, position: types.Position) -> Optional[CK3Node]:
+        """
+        Find the most specific node containing a position.
+
+        Args:
+            position: LSP Position to look up
+
+        Returns:
+            Same node as get_node_at_position(nodes, position), or None
+        """
+        key = _position_key(position.line, position.character)
+        node = None
+        level = self._roots
+        while level is not None:
+            starts, max_ends, siblings = level
+            if starts is None:
+                child = _first_node_containing(siblings, position)
+                if child is None:
+                    break
+            else:
+                high = bisect_right(starts, key)
+                # First sibling whose end reaches the cursor; it starts before it
+                index = bisect_left(max_ends, key, 0, high)
+                if index >= high:
+                    break
+                child = siblings[index]
+            node = child
+            level = self._levels.get(id(node))
+        return node
+
+
+def _first_node_containing(siblings: List[CK3Node], position: types.Position) -> Optional[CK3Node]:
+    """
+    Find the first of a list of sibling nodes whose range contains a position.
+
+    Args:
+        siblings: Nodes to test, in order
+        position: LSP Position to look up
+
+    Returns:
+        The first sibling containing the position (children are not searched)
+    """
+    key = _position_key(position.line, position.character)
+    for node in siblings:
+        node_range = node.range
+        start = _position_key(node_range.start.line, node_range.start.character)
+        end = _position_key(node_range.end.line, node_range.end.character)
+        if start <= key <= end:
+            return node
+    return None
@@ -0,0 +1,260 @@
+"""
+CK3 Pull Diagnostics - Diagnostic Results with Result IDs
+
+MODULE OVERVIEW:
+    With push diagnostics the server sends textDocument/publishDiagnostics
+    whenever it has validated a document: twice per edit (syntax errors
+    first, then the full list), and again after every re-validation, even
+    when nothing changed. Each push serializes the whole diagnostic list.
+
+    LSP 3.17 pull diagnostics let the client ask instead
+    (textDocument/diagnostic, workspace/diagnostic), when it needs the
+    result. Every result carries a result ID; a client sending the ID of
+    the result it already has gets an "unchanged" report without any
+    diagnostics. DiagnosticResultStore keeps the latest result of each
+    document and file, and hands out those IDs.
+
+ARCHITECTURE:
+    **Result IDs**:
+    store() compares new diagnostics with the stored ones. Equal lists keep
+    their result ID, so a re-validation that finds the same problems (the
+    usual case after editing another file) is reported as unchanged. IDs
+    are "<session>:<counter>": an ID from an earlier server process never
+    matches.
+
+    **Open Documents**:
+    Results of open documents record the server's document version they
+    were computed for; a result is current only while that version is.
+    invalidate() marks results as outdated (after definitions they use
+    changed) without forgetting their ID, so the next pull can still
+    answer "unchanged".
+
+    **Closed Files**:
+    Results of closed files (workspace/diagnostic) record the file's
+    fingerprint, its node keys and the index symbols it was validated
+    against, like the lint cache (lint.py). reusable() returns the results
+    that are still valid without reading any file: same mtime and size,
+    and none of the file's keys was defined or undefined since.
+
+    **Threading**:
+    All methods take an internal lock; results are stored from the event
+    loop and from worker threads.
+
+USAGE EXAMPLES:
+    >>> store = DiagnosticResultStore()
+    >>> result, changed = store.store(uri, diagnostics, version=3)
+    >>> document_report(result, previous_result_id=result.result_id).kind
+    'unchanged'
+
+PERFORMANCE:
+    - Unchanged results cost no serialization and no transfer
+    - Reusing a closed file's result costs one stat()
+    - store(): one list comparison (stops at the first difference)
+
+SEE ALSO:
+    - server.py: textDocument/diagnostic and workspace/diagnostic handlers
+    - workspace_validation.py: validate_files() (validating closed files)
+    - lint.py: the same reuse rule, persisted on disk
+"""
+
+import itertools
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from lsprotocol import types
+
+
+class DiagnosticResult(NamedTuple):
+    """
+    Latest diagnostics of one document or file.
+
+    Attributes:
+        result_id: ID of this result (kept while the diagnostics are equal)
+        diagnostics: The diagnostics
+        version: Server document version validated (open documents; None
+            for closed files and outdated results)
+        fingerprint: [mtime_ns, size, content MD5] of the validated file
+            (closed files)
+        keys: Node keys of the file (closed files)
+        symbols: Index dependency symbols the file was validated against
+            (closed files; shared by all files of a run)
+    """
+
+    result_id: str
+    diagnostics: List[types.Diagnostic]
+    version: Optional[int] = None
+    fingerprint: Optional[List] = None
+    keys: FrozenSet[str] = frozenset()
+    symbols: FrozenSet[str] = frozenset()
+
+
+class DiagnosticResultStore:
+    """
+    Latest diagnostic result per URI, with result IDs (see the module docstring).
+    """
+
+    def __init__(self):
+        self._results: Dict[str, DiagnosticResult] = {}
+        self._session = uuid.uuid4().hex[:8]
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, uri: str) -> Optional[DiagnosticResult]:
+        """Stored result of a URI (None if there is none)."""
+        return self._results.get(uri)
+
+    def store(
+        self,
+        uri: str,
+        diagnostics: List[types.Diagnostic],
+        version: Optional[int] = None,
+        fingerprint: Optional[List] = None,
+        keys: FrozenSet[str] = frozenset(),
+        symbols: FrozenSet[str] = frozenset(),
+    ) -> Tuple[DiagnosticResult, bool]:
+        """
+        Store the diagnostics of a URI.
+
+        Args:
+            uri: Document or file URI
+            diagnostics: Its diagnostics
+            version: Server document version validated (open documents)
+            fingerprint: File fingerprint (closed files)
+            keys: Node keys of the file (closed files)
+            symbols: Index dependency symbols validated against (closed files)
+
+        Returns:
+            The stored result, and whether its diagnostics changed (a new result ID)
+        """
+        with self._lock:
+            previous = self._results.get(uri)
+            changed = previous is None or previous.diagnostics != diagnostics
+            result_id = f"{self._session}:{next(self._ids)}" if changed else previous.result_id
+            result = self._results[uri] = DiagnosticResult(
+                result_id, diagnostics, version, fingerprint, keys, symbols
+            )
+        return result, changed
+
+    def invalidate(self, uris: Iterable[str]):
+        """
+        Mark the results of documents as outdated (they are validated again
+        when pulled, and keep their ID if nothing changed).
+
+        Args:
+            uris: Document URIs
+        """
+        with self._lock:
+            for uri in uris:
+                result = self._results.get(uri)
+                if result is not None and result.version is not None:
+                    self._results[uri] = result._replace(version=None)
+
+    def discard(self, uri: str):
+        """Forget the result of a URI (a closed document's result is of the editor content)."""
+        with self._lock:
+            self._results.pop(uri, None)
+
+    def prune(self, uris: Iterable[str]):
+        """
+        Forget closed-file results of files that no longer exist.
+
+        Args:
+            uris: URIs of the existing files
+        """
+        keep = set(uris)
+        with self._lock:
+            for uri in [
+                uri
+                for uri, result in self._results.items()
+                if result.fingerprint is not None and uri not in keep
+            ]:
+                del self._results[uri]
+
+    def reusable(
+        self, paths: Sequence[Path], symbols: FrozenSet[str]
+    ) -> Dict[Path, DiagnosticResult]:
+        """
+        Closed-file results that are still valid (blocking: one stat() per file).
+
+        Args:
+            paths: Files to look up
+            symbols: Current index dependency symbols
+
+        Returns:
+            Valid results by path (files without one must be validated)
+        """
+        reusable: Dict[Path, DiagnosticResult] = {}
+        changed_since: Dict[int, FrozenSet[str]] = {}
+        for path in paths:
+            result = self._results.get(path.as_uri())
+            if result is None or result.fingerprint is None:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if [stat.st_mtime_ns, stat.st_size] != result.fingerprint[:2]:
+                continue
+            # Files of one run share their symbols: diff each set once
+            changed = changed_since.get(id(result.symbols))
+            if changed is None:
+                changed = changed_since[id(result.symbols)] = result.symbols ^ symbols
+            if changed.isdisjoint(result.keys):
+                reusable[path] = result
+        return reusable
+
+
+def document_report(
+    result: DiagnosticResult, previous_result_id: Optional[str]
+) -> Union[
+    types.RelatedFullDocumentDiagnosticReport, types.RelatedUnchangedDocumentDiagnosticReport
+]:
+    """
+    textDocument/diagnostic report of a result.
+
+    Args:
+        result: The document's current result
+        previous_result_id: Result ID the client has
+
+    Returns:
+        "unchanged" report if the client has this result, else the full report
+    """
+    if previous_result_id == result.result_id:
+        return types.RelatedUnchangedDocumentDiagnosticReport(result_id=result.result_id)
+    return types.RelatedFullDocumentDiagnosticReport(
+        items=result.diagnostics, result_id=result.result_id
+    )
+
+
+def workspace_report(
+    uri: str,
+    result: DiagnosticResult,
+    previous_result_id: Optional[str],
+    version: Optional[int] = None,
+) -> Union[
+    types.WorkspaceFullDocumentDiagnosticReport, types.WorkspaceUnchangedDocumentDiagnosticReport
+]:
+    """
+    workspace/diagnostic report of a result.
+
+    Args:
+        uri: Document or file URI
+        result: Its current result
+        previous_result_id: Result ID the client has for the URI
+        version: Client version of an open document (None for closed files)
+
+    Returns:
+        "unchanged" report if the client has this result, else the full report
+    """
+    if previous_result_id == result.result_id:
+        return types.WorkspaceUnchangedDocumentDiagnosticReport(
+            uri=uri, version=version, result_id=result.result_id
+        )
+    return types.WorkspaceFullDocumentDiagnosticReport(
+        uri=uri, version=version, items=result.diagnostics, result_id=result.result_id
+    )
@@ -0,0 +1,158 @@
+"""
+Schema Conditions - Compile schema condition expressions into closures.
+
+Schemas describe cross-field checks with small condition expressions
+(``hidden.value == yes AND option.count > 0``). SchemaValidator used to
+re-parse each expression, by splitting on ' AND ', ' OR ' and the comparison
+operators, every time it evaluated it on a node. This module parses each
+expression once into a tree of closures; evaluating a condition is then a
+few function calls and dictionary lookups.
+
+Responsibilities:
+- Compile condition strings (cached per expression string)
+- Evaluate compiled conditions against a node's evaluation context
+- Keep the exact semantics of the original string evaluator
+
+Semantics (unchanged from the string evaluator):
+- A leading ``NOT `` negates the whole rest of the expression
+- Otherwise the expression is split on ``' AND '``, then on ``' OR '``
+- Comparisons (==, !=, >=, <=, >, <; first operator found wins) compare
+  resolved values: integer literals, ``field.property`` paths into the
+  context, or the literal text
+- ``field.exists`` and ``field.count`` test the context directly
+- Anything else is false
+
+The evaluation context is the dictionary SchemaValidator builds for a node:
+``{'children': {'count': n}, key: {'exists', 'count', 'value', 'nodes'}}``.
+"""
+
+import functools
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Compiled condition: evaluation context -> truthy result
+Condition = Callable[[Dict[str, Any]], Any]
+
+# Operators in the order the string evaluator looked for them
+_OPERATORS = ('==', '!=', '>=', '<=', '>', '<')
+
+
+def _ordered(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Wrap an ordering comparison: false for missing operands or type mismatches."""
+
+    def ordered(left: Any, right: Any) -> bool:
+        if left is None or right is None:
+            return False
+        try:
+            return compare(left, right)
+        except TypeError:
+            return False
+
+    return ordered
+
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    '==': lambda left, right: left == right,
+    '!=': lambda left, right: left != right,
+    '>': _ordered(lambda left, right: left > right),
+    '<': _ordered(lambda left, right: left < right),
+    '>=': _ordered(lambda left, right: left >= right),
+    '<=': _ordered(lambda left, right: left <= right),
+}
+
+
+def _always_false(context: Dict[str, Any]) -> bool:
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def compile_condition(expr: str) -> Condition:
+    """
+    Compile a condition expression.
+
+    Args:
+        expr: The condition expression (see the module docstring)
+
+    Returns:
+        Function evaluating the condition against an evaluation context
+    """
+    expr = expr.strip()
+
+    if expr.startswith('NOT '):
+        operand = compile_condition(expr[4:])
+        return lambda context: not operand(context)
+
+    if ' AND ' in expr:
+        operands = tuple(compile_condition(part.strip()) for part in expr.split(' AND '))
+        return lambda context: all(operand(context) for operand in operands)
+
+    if ' OR ' in expr:
+        operands = tuple(compile_condition(part.strip()) for part in expr.split(' OR '))
+        return lambda context: any(operand(context) for operand in operands)
+
+    for op in _OPERATORS:
+        if op in expr:
+            left, right = expr.split(op, 1)
+            left_value = _compile_value(left.strip())
+            right_value = _compile_value(right.strip())
+            compare = _COMPARISONS[op]
+            return lambda context: compare(left_value(context), right_value(context))
+
+    if '.exists' in expr:
+        field = expr.replace('.exists', '')
+        return lambda context: field in context and context[field].get('exists', False)
+
+    if '.count' in expr:
+        field = expr.split('.')[0]
+        return lambda context: context.get(field, {}).get('count', 0)
+
+    return _always_false
+
+
+def _compile_value(expr: str) -> Callable[[Dict[str, Any]], Any]:
+    """Compile one side of a comparison into a value resolver."""
+    # Integer literal
+    if expr.isdigit() or (expr.startswith('-') and expr[1:].isdigit()):
+        number = int(expr)
+        return lambda context: number
+
+    # Property access (field.property)
+    if '.' in expr:
+        path: Tuple[str, ...] = tuple(expr.split('.'))
+
+        def resolve(context: Dict[str, Any]) -> Any:
+            obj: Any = context
+            for part in path:
+                if isinstance(obj, dict) and part in obj:
+                    obj = obj[part]
+                else:
+                    return None
+            return obj
+
+        return resolve
+
+    # yes/no and other words are compared as the strings the AST stores
+    return lambda context: expr
+
+
+def evaluate(condition: Optional[Condition], context: Dict[str, Any], expr: str = '') -> bool:
+    """
+    Evaluate a compiled condition, treating errors as false.
+
+    Args:
+        condition: Compiled condition (None for an empty expression)
+        context: Evaluation context of the node
+        expr: Source expression, for the log message
+
+    Returns:
+        True if the condition is met
+    """
+    if condition is None:
+        return False
+    try:
+        return bool(condition(context))
+    except Exception as e:
+        logger.warning(f"Failed to evaluate condition '{expr}': {e}")
+        return False
@@ -10,15 +10,22 @@ Responsibilities:
 - Resolve inheritance ($extends)
 - Resolve variable references ($variable_name)
 - Cache parsed schemas for performance
-- Provide schema lookup by file type and path
+- Provide schema lookup by file type and path (all path patterns compiled
+  into one regex; lookups cached in a bounded LRU)
 - Load centralized diagnostic definitions
+- Compile schema condition expressions once, at load time
 """
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Pattern, Tuple
 import yaml
 import logging
 import fnmatch
+import os
+import re
+
+from .schema_conditions import Condition, compile_condition
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +34,9 @@ SCHEMAS_DIR = Path(__file__).parent / "data" / "schemas"
 DIAGNOSTICS_FILE = Path(__file__).parent / "data" / "diagnostics.yaml"
 TYPES_FILE = SCHEMAS_DIR / "_types.yaml"
 
+# Largest number of file paths whose schema lookup is remembered
+FILE_TYPE_CACHE_SIZE = 4096
+
 
 class SchemaLoader:
     """Load and cache validation schemas from YAML files."""
@@ -36,7 +46,12 @@ class SchemaLoader:
         self._schemas: Dict[str, Dict[str, Any]] = {}
         self._diagnostics: Dict[str, Dict[str, Any]] = {}
         self._types: Dict[str, Dict[str, Any]] = {}  # Type definitions from _types.yaml
-        self._file_type_cache: Dict[str, str] = {}  # path -> schema_name
+        # path -> schema_name (None: no schema), least recently used first
+        self._file_type_cache: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+        # All path patterns as one regex; group i matches schema _path_schema_names[i]
+        self._path_matcher: Optional[Pattern[str]] = None
+        self._path_schema_names: List[str] = []
+        self._path_matcher_schemas: Tuple[int, ...] = ()
         self._loaded = False
 
     def load_all(self) -> None:
@@ -47,6 +62,8 @@ class SchemaLoader:
         self._load_diagnostics()
         self._load_types()
         self._load_schemas()
+        self._compile_conditions()
+        self._compile_path_patterns()
         self._loaded = True
         logger.info(f"Loaded {len(self._schemas)} schemas, {len(self._diagnostics)} diagnostics, and {len(self._types)} type definitions")
 
@@ -155,27 +172,87 @@ class SchemaLoader:
         if not self._loaded:
             self.load_all()
 
+        # Schemas replaced since the patterns were compiled invalidate the lookups
+        if self._path_matcher_schemas != tuple(map(id, self._schemas.values())):
+            self._compile_path_patterns()
+
         # Check cache first for performance
         if file_path in self._file_type_cache:
+            self._file_type_cache.move_to_end(file_path)
             schema_name = self._file_type_cache[file_path]
-            return self._schemas.get(schema_name)
+            return self._schemas.get(schema_name) if schema_name is not None else None
 
         # Normalize path separators for cross-platform matching
-        normalized_path = file_path.replace('\\', '/')
+        normalized_path = os.path.normcase(file_path.replace('\\', '/'))
+
+        # Find matching schema by path pattern (first schema, first pattern wins)
+        schema_name = None
+        match = self._path_matcher.match(normalized_path) if self._path_matcher else None
+        if match is not None:
+            schema_name = self._path_schema_names[match.lastindex - 1]
+            logger.debug(f"Matched {file_path} to schema {schema_name}")
+        else:
+            logger.debug(f"No schema found for {file_path}")
+
+        self._file_type_cache[file_path] = schema_name
+        if len(self._file_type_cache) > FILE_TYPE_CACHE_SIZE:
+            self._file_type_cache.popitem(last=False)
+        return self._schemas.get(schema_name) if schema_name is not None else None
+
+    def _compile_path_patterns(self) -> None:
+        """
+        Compile the path_patterns of all schemas into one regex.
 
-        # Find matching schema by path pattern
+        Each schema's patterns become one capturing group, in schema order, so
+        the group that matches names the schema fnmatch would have found first.
+        Clears the file type cache, which may refer to replaced schemas.
+        """
+        groups = []
+        self._path_schema_names = []
         for schema_name, schema in self._schemas.items():
             patterns = schema.get('identification', {}).get('path_patterns', [])
-            for pattern in patterns:
-                if fnmatch.fnmatch(normalized_path, pattern):
-                    # Cache the result
-                    self._file_type_cache[file_path] = schema_name
-                    logger.debug(f"Matched {file_path} to schema {schema_name}")
-                    return schema
-
-        # No matching schema found
-        logger.debug(f"No schema found for {file_path}")
-        return None
+            if not patterns:
+                continue
+            # fnmatch semantics: normcase'd glob, anchored at both ends
+            translated = '|'.join(
+                fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns
+            )
+            groups.append(f'({translated})')
+            self._path_schema_names.append(schema_name)
+        self._path_matcher = re.compile('|'.join(groups)) if groups else None
+        self._path_matcher_schemas = tuple(map(id, self._schemas.values()))
+        self._file_type_cache.clear()
+
+    def _compile_conditions(self) -> None:
+        """Compile every condition expression of the loaded schemas."""
+        pending: List[Any] = list(self._schemas.values())
+        while pending:
+            obj = pending.pop()
+            if isinstance(obj, dict):
+                condition = obj.get('condition')
+                if isinstance(condition, str) and condition:
+                    self.get_condition(condition)
+                pending.extend(obj.values())
+            elif isinstance(obj, list):
+                pending.extend(obj)
+
+    def get_condition(self, expr: str) -> Optional[Condition]:
+        """
+        Get the compiled form of a condition expression.
+
+        Args:
+            expr: Condition expression from a schema (e.g., 'option.count > 0')
+
+        Returns:
+            The compiled condition, or None for an empty expression
+        """
+        if not expr:
+            return None
+        try:
+            return compile_condition(expr)
+        except Exception as e:
+            logger.warning(f"Failed to compile condition '{expr}': {e}")
+            return None
 
     def get_diagnostic(self, code: str) -> Optional[Dict[str, Any]]:
         """
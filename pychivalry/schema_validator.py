@@ -11,6 +11,13 @@ Responsibilities:
 - Validate field types and values
 - Evaluate cross-field conditions
 - Generate diagnostics with proper codes and messages
+
+Performance:
+- Each schema is compiled once per validator into pre-extracted field rules
+  and compiled conditions (see schema_conditions.py); validating a block
+  does no schema dictionary lookups or condition parsing
+- Child-key maps of a node are built on first use and shared by all of its
+  checks; nodes without conditions never build an evaluation context
 """
 
 from dataclasses import dataclass
@@ -19,7 +26,9 @@ from lsprotocol.types import Diagnostic, DiagnosticSeverity, Range
 import re
 import logging
 
+from .cancellation import CancellationToken
 from .parser import CK3Node
+from .schema_conditions import compile_condition, evaluate
 from .schema_loader import SchemaLoader
 
 logger = logging.getLogger(__name__)
@@ -34,6 +43,158 @@ SEVERITY_MAP = {
 }
 
 
+class _ConditionRule:
+    """A compiled schema condition with the diagnostic it reports."""
+
+    __slots__ = ('expr', 'condition', 'diagnostic', 'severity')
+
+    def __init__(self, rule: Dict[str, Any], loader: SchemaLoader) -> None:
+        self.expr = rule.get('condition', '')
+        self.condition = loader.get_condition(self.expr)
+        self.diagnostic = rule.get('diagnostic')
+        self.severity = rule.get('severity', 'warning')
+
+
+class _FieldRule:
+    """Pre-extracted checks of one field definition."""
+
+    __slots__ = (
+        'name', 'definition', 'required', 'diagnostic', 'max_count', 'min_count',
+        'min_count_unless', 'count_diagnostic', 'enum_values', 'invalid_diagnostic',
+        'type', 'nested', 'warnings',
+    )
+
+    def __init__(self, name: str, field_def: Dict[str, Any], loader: SchemaLoader) -> None:
+        self.name = name
+        self.definition = field_def
+        self.required = bool(field_def.get('required') or field_def.get('required_when'))
+        self.diagnostic = field_def.get('diagnostic')
+        self.max_count = field_def.get('max_count')
+        self.min_count = field_def.get('min_count')
+        self.min_count_unless = field_def.get('min_count_unless', [])
+        self.count_diagnostic = field_def.get('count_diagnostic', self.diagnostic)
+        self.type = field_def.get('type')
+        self.enum_values = field_def.get('values', []) if self.type == 'enum' else None
+        self.invalid_diagnostic = field_def.get('invalid_diagnostic', self.diagnostic)
+        self.nested = field_def.get('schema')
+        self.warnings = [_ConditionRule(w, loader) for w in field_def.get('warnings', [])]
+
+
+class _BlockRules:
+    """Compiled field rules and validations of one block level."""
+
+    __slots__ = ('fields', 'validations')
+
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        validations: List[Dict[str, Any]],
+        loader: SchemaLoader,
+    ) -> None:
+        self.fields = [
+            _FieldRule(name, field_def, loader) for name, field_def in fields.items()
+        ]
+        self.validations = [_ConditionRule(v, loader) for v in validations]
+
+
+class _SchemaRules:
+    """A schema compiled for validation (built once per schema)."""
+
+    __slots__ = (
+        'schema', 'loader', 'block_pattern', 'pattern_invalid', 'field_order', 'top', '_nested',
+    )
+
+    def __init__(self, schema: Dict[str, Any], loader: SchemaLoader) -> None:
+        self.schema = schema
+        self.loader = loader
+        pattern = schema.get('identification', {}).get('block_pattern')
+        self.block_pattern = None
+        self.pattern_invalid = False
+        if pattern:
+            try:
+                self.block_pattern = re.compile(pattern)
+            except re.error:
+                logger.warning(f"Invalid regex pattern: {pattern}")
+                self.pattern_invalid = True
+        field_order = schema.get('field_order', {})
+        self.field_order = field_order if field_order.get('enabled', False) else None
+        self.top = _BlockRules(schema.get('fields', {}), schema.get('validations', []), loader)
+        # Nested schema name -> compiled rules (None when not a usable schema)
+        self._nested: Dict[str, Optional[_BlockRules]] = {}
+
+    def nested(self, name: str) -> Optional[_BlockRules]:
+        """Compiled rules of a nested schema a field references, compiled on first use.
+
+        Entries that are not mappings (e.g. ``options: pass`` placeholders)
+        have no rules to apply.
+        """
+        if name in self._nested:
+            return self._nested[name]
+        nested = self.schema.get('nested_schemas', {}).get(name)
+        rules = None
+        if isinstance(nested, dict):
+            rules = _BlockRules(
+                nested.get('fields', {}), nested.get('validations', []), self.loader
+            )
+        self._nested[name] = rules
+        return rules
+
+    def matches(self, key: str) -> bool:
+        """Whether a top-level key is a block this schema validates."""
+        if self.block_pattern is not None:
+            return self.block_pattern.match(key) is not None
+        return not self.pattern_invalid
+
+
+class _NodeFields:
+    """Child-key maps of a node, built on first use and shared by its checks."""
+
+    __slots__ = ('node', '_present', '_context')
+
+    def __init__(self, node: CK3Node) -> None:
+        self.node = node
+        self._present: Optional[Dict[str, List[CK3Node]]] = None
+        self._context: Optional[Dict[str, Any]] = None
+
+    @property
+    def present(self) -> Dict[str, List[CK3Node]]:
+        """Children grouped by key, in source order."""
+        if self._present is None:
+            present: Dict[str, List[CK3Node]] = {}
+            for child in self.node.children:
+                nodes = present.get(child.key)
+                if nodes is None:
+                    present[child.key] = [child]
+                else:
+                    nodes.append(child)
+            self._present = present
+        return self._present
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Condition evaluation context (see _build_evaluation_context)."""
+        if self._context is None:
+            context: Dict[str, Any] = {'children': {'count': len(self.node.children)}}
+            for key, nodes in self.present.items():
+                if key == 'children':
+                    # The reserved key clashes; fail as _build_evaluation_context does
+                    raise KeyError('nodes')
+                context[key] = {
+                    'exists': True,
+                    'count': len(nodes),
+                    'value': nodes[0].value,
+                    'nodes': nodes,
+                }
+            self._context = context
+        return self._context
+
+    def evaluate(self, rule: _ConditionRule) -> bool:
+        """Evaluate a compiled condition against this node."""
+        if not rule.expr:
+            return False
+        return evaluate(rule.condition, self.context, rule.expr)
+
+
 class SchemaValidator:
     """Validate CK3 files against YAML schemas."""
 
@@ -45,17 +206,35 @@ class SchemaValidator:
             schema_loader: Schema loader instance for accessing schemas and diagnostics
         """
         self.loader = schema_loader
+        # id(schema) -> compiled rules (holding the schema keeps its id unique)
+        self._rules: Dict[int, _SchemaRules] = {}
 
-    def validate(self, file_path: str, ast: List[CK3Node]) -> List[Diagnostic]:
+    def _rules_for(self, schema: Dict[str, Any]) -> _SchemaRules:
+        """Compiled rules of a schema, compiled on first use."""
+        rules = self._rules.get(id(schema))
+        if rules is None or rules.schema is not schema:
+            rules = self._rules[id(schema)] = _SchemaRules(schema, self.loader)
+        return rules
+
+    def validate(
+        self,
+        file_path: str,
+        ast: List[CK3Node],
+        cancel: Optional[CancellationToken] = None,
+    ) -> List[Diagnostic]:
         """
         Validate AST against the appropriate schema for the file.
 
         Args:
             file_path: Path to the file being validated
             ast: Parsed AST nodes from the file
+            cancel: Checked before each top-level block
 
         Returns:
             List of diagnostic messages for validation errors/warnings
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
         """
         schema = self.loader.get_schema_for_file(file_path)
         if not schema:
@@ -63,26 +242,25 @@ class SchemaValidator:
             return []
 
         diagnostics: List[Diagnostic] = []
+        rules = self._rules_for(schema)
 
-        # Get block pattern for identifying top-level blocks to validate
-        block_pattern = schema.get('identification', {}).get('block_pattern')
-
-        # Validate each top-level node
+        # Validate each top-level node matching the block pattern
         for node in ast:
-            if self._matches_block_pattern(node.key, block_pattern):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            if rules.matches(node.key):
+                fields = _NodeFields(node)
                 # Validate this block against the schema
-                diagnostics.extend(
-                    self._validate_block(node, schema, schema.get('fields', {}))
-                )
+                diagnostics.extend(self._check_block(fields, rules, rules.top))
 
                 # Run top-level validations (cross-field checks)
-                for validation in schema.get('validations', []):
-                    if self._evaluate_condition(node, validation.get('condition', '')):
+                for validation in rules.top.validations:
+                    if fields.evaluate(validation):
                         diagnostics.append(
                             self._create_diagnostic(
-                                validation['diagnostic'],
+                                validation.diagnostic,
                                 node.range,
-                                validation.get('severity', 'warning'),
+                                validation.severity,
                                 **self._get_template_vars(node)
                             )
                         )
@@ -125,35 +303,45 @@ class SchemaValidator:
         Returns:
             List of diagnostics for this block
         """
-        diagnostics: List[Diagnostic] = []
-        present_fields: Dict[str, List[CK3Node]] = {}
+        rules = self._rules_for(schema)
+        block = rules.top if fields is schema.get('fields') else _BlockRules(fields, [], self.loader)
+        return self._check_block(_NodeFields(node), rules, block)
 
-        # Group children by field name
-        for child in node.children:
-            if child.key not in present_fields:
-                present_fields[child.key] = []
-            present_fields[child.key].append(child)
+    def _check_block(
+        self, fields: _NodeFields, rules: _SchemaRules, block: _BlockRules
+    ) -> List[Diagnostic]:
+        """
+        Validate a block node against compiled field rules.
+
+        Args:
+            fields: The block node and its child-key maps
+            rules: The compiled schema (for field order and nested schemas)
+            block: Compiled rules for this level
+
+        Returns:
+            List of diagnostics for this block
+        """
+        diagnostics: List[Diagnostic] = []
+        node = fields.node
+        present_fields = fields.present
 
         # Phase 8.3: Field order validation
-        field_order_config = schema.get('field_order', {})
-        if field_order_config.get('enabled', False):
-            order_diags = self._validate_field_order(
-                node,
-                field_order_config,
-                present_fields
+        if rules.field_order is not None:
+            diagnostics.extend(
+                self._validate_field_order(node, rules.field_order, present_fields)
             )
-            diagnostics.extend(order_diags)
 
         # Validate each field definition
-        for field_name, field_def in fields.items():
+        for rule in block.fields:
+            field_name = rule.name
             field_nodes = present_fields.get(field_name, [])
 
             # Check required field (including conditional requirements)
-            if field_def.get('required') or field_def.get('required_when'):
-                if not self._check_required(node, field_name, field_def, present_fields):
+            if rule.required:
+                if not self._check_required(node, field_name, rule.definition, present_fields):
                     diagnostics.append(
                         self._create_diagnostic(
-                            field_def.get('diagnostic', 'UNKNOWN'),
+                            rule.diagnostic or 'UNKNOWN',
                             node.range,
                             'error',
                             field_name=field_name,
@@ -162,11 +350,10 @@ class SchemaValidator:
                     )
 
             # Check max_count constraint
-            if 'max_count' in field_def and len(field_nodes) > field_def['max_count']:
-                diag_code = field_def.get('count_diagnostic', field_def.get('diagnostic'))
+            if rule.max_count is not None and len(field_nodes) > rule.max_count:
                 diagnostics.append(
                     self._create_diagnostic(
-                        diag_code,
+                        rule.count_diagnostic,
                         node.range,
                         'error',
                         count=len(field_nodes),
@@ -175,24 +362,19 @@ class SchemaValidator:
                 )
 
             # Check min_count constraint
-            if 'min_count' in field_def:
-                min_count = field_def['min_count']
-                unless_fields = field_def.get('min_count_unless', [])
-
+            if rule.min_count is not None:
                 # Check if any "unless" field is present and truthy
                 skip_check = False
-                for unless_field in unless_fields:
-                    if unless_field in present_fields:
-                        unless_nodes = present_fields[unless_field]
-                        if unless_nodes and unless_nodes[0].value in ('yes', True, 'true'):
-                            skip_check = True
-                            break
-
-                if not skip_check and len(field_nodes) < min_count:
-                    diag_code = field_def.get('count_diagnostic', field_def.get('diagnostic'))
+                for unless_field in rule.min_count_unless:
+                    unless_nodes = present_fields.get(unless_field)
+                    if unless_nodes and unless_nodes[0].value in ('yes', True, 'true'):
+                        skip_check = True
+                        break
+
+                if not skip_check and len(field_nodes) < rule.min_count:
                     diagnostics.append(
                         self._create_diagnostic(
-                            diag_code,
+                            rule.count_diagnostic,
                             node.range,
                             'warning',
                             count=len(field_nodes),
@@ -200,17 +382,19 @@ class SchemaValidator:
                         )
                     )
 
+            if not field_nodes:
+                continue
+
             # Enum type validation
-            if field_def.get('type') == 'enum' and field_nodes:
-                valid_values = field_def.get('values', [])
+            if rule.enum_values is not None:
+                valid_values = rule.enum_values
                 for field_node in field_nodes:
                     if field_node.value and field_node.value not in valid_values:
-                        diag_code = field_def.get('invalid_diagnostic', field_def.get('diagnostic'))
                         template_vars = self._get_template_vars(field_node)
                         template_vars['valid_values'] = ', '.join(str(v) for v in valid_values)
                         diagnostics.append(
                             self._create_diagnostic(
-                                diag_code,
+                                rule.invalid_diagnostic,
                                 field_node.range,
                                 'error',
                                 **template_vars
@@ -218,12 +402,12 @@ class SchemaValidator:
                         )
 
             # Pattern validation (Phase 8.1)
-            if field_nodes and field_def.get('type'):
+            if rule.type:
                 for field_node in field_nodes:
                     if field_node.value:  # Only validate if there's a value
                         pattern_diag = self._validate_pattern(
                             field_node.value,
-                            field_def.get('type'),
+                            rule.type,
                             field_name
                         )
                         if pattern_diag:
@@ -239,44 +423,38 @@ class SchemaValidator:
                             )
 
             # Nested schema validation
-            if 'schema' in field_def:
-                nested_schema_name = field_def['schema']
-                nested_schemas = schema.get('nested_schemas', {})
-                if nested_schema_name in nested_schemas:
-                    nested_schema = nested_schemas[nested_schema_name]
-                    for field_node in field_nodes:
-                        # Validate nested block
-                        diagnostics.extend(
-                            self._validate_block(
-                                field_node,
-                                schema,
-                                nested_schema.get('fields', {})
-                            )
-                        )
-                        # Run nested validations
-                        for validation in nested_schema.get('validations', []):
-                            if self._evaluate_condition(field_node, validation.get('condition', '')):
-                                diagnostics.append(
-                                    self._create_diagnostic(
-                                        validation['diagnostic'],
-                                        field_node.range,
-                                        validation.get('severity', 'warning'),
-                                        **self._get_template_vars(field_node)
-                                    )
+            nested = rules.nested(rule.nested) if rule.nested is not None else None
+            if nested is not None:
+                for field_node in field_nodes:
+                    nested_fields = _NodeFields(field_node)
+                    # Validate nested block
+                    diagnostics.extend(self._check_block(nested_fields, rules, nested))
+                    # Run nested validations
+                    for validation in nested.validations:
+                        if nested_fields.evaluate(validation):
+                            diagnostics.append(
+                                self._create_diagnostic(
+                                    validation.diagnostic,
+                                    field_node.range,
+                                    validation.severity,
+                                    **self._get_template_vars(field_node)
                                 )
+                            )
 
             # Field-level warnings
-            for warning in field_def.get('warnings', []):
-                for field_node in field_nodes:
-                    if self._evaluate_condition(field_node, warning.get('condition', '')):
-                        diagnostics.append(
-                            self._create_diagnostic(
-                                warning['diagnostic'],
-                                field_node.range,
-                                warning.get('severity', 'warning'),
-                                **self._get_template_vars(field_node)
+            if rule.warnings:
+                node_fields = [_NodeFields(field_node) for field_node in field_nodes]
+                for warning in rule.warnings:
+                    for field_node_fields in node_fields:
+                        if field_node_fields.evaluate(warning):
+                            diagnostics.append(
+                                self._create_diagnostic(
+                                    warning.diagnostic,
+                                    field_node_fields.node.range,
+                                    warning.severity,
+                                    **self._get_template_vars(field_node_fields.node)
+                                )
                             )
-                        )
 
         return diagnostics
 
@@ -448,16 +626,11 @@ class SchemaValidator:
         """
         if not condition:
             return False
-
-        # Build context for evaluation
-        context = self._build_evaluation_context(node)
-
-        # Evaluate the expression
-        try:
-            return self._eval_expr(condition, context)
-        except Exception as e:
-            logger.warning(f"Failed to evaluate condition '{condition}': {e}")
-            return False
+        return evaluate(
+            self.loader.get_condition(condition),
+            self._build_evaluation_context(node),
+            condition,
+        )
 
     def _build_evaluation_context(self, node: CK3Node) -> Dict[str, Any]:
         """
@@ -489,7 +662,7 @@ class SchemaValidator:
 
     def _eval_expr(self, expr: str, context: Dict[str, Any]) -> bool:
         """
-        Simple expression evaluator for condition expressions.
+        Evaluate a condition expression (compiled once per expression string).
 
         Args:
             expr: The expression to evaluate
@@ -498,102 +671,7 @@ class SchemaValidator:
         Returns:
             Boolean result of the expression
         """
-        expr = expr.strip()
-
-        # Handle NOT
-        if expr.startswith('NOT '):
-            return not self._eval_expr(expr[4:], context)
-
-        # Handle AND
-        if ' AND ' in expr:
-            parts = expr.split(' AND ')
-            return all(self._eval_expr(p.strip(), context) for p in parts)
-
-        # Handle OR
-        if ' OR ' in expr:
-            parts = expr.split(' OR ')
-            return any(self._eval_expr(p.strip(), context) for p in parts)
-
-        # Handle comparisons
-        for op in ['==', '!=', '>=', '<=', '>', '<']:
-            if op in expr:
-                left, right = expr.split(op, 1)
-                left_val = self._resolve_value(left.strip(), context)
-                right_val = self._resolve_value(right.strip(), context)
-                return self._compare(left_val, op, right_val)
-
-        # Handle field.exists
-        if '.exists' in expr:
-            field = expr.replace('.exists', '')
-            return field in context and context[field].get('exists', False)
-
-        # Handle field.count
-        if '.count' in expr:
-            field = expr.split('.')[0]
-            return context.get(field, {}).get('count', 0)
-
-        return False
-
-    def _resolve_value(self, expr: str, context: Dict[str, Any]) -> Any:
-        """
-        Resolve a value expression to its actual value.
-
-        Args:
-            expr: The value expression
-            context: Evaluation context
-
-        Returns:
-            The resolved value
-        """
-        # Integer literal
-        if expr.isdigit() or (expr.startswith('-') and expr[1:].isdigit()):
-            return int(expr)
-
-        # Property access (field.property)
-        if '.' in expr:
-            parts = expr.split('.')
-            obj = context
-            for part in parts:
-                if isinstance(obj, dict) and part in obj:
-                    obj = obj[part]
-                else:
-                    return None
-            return obj
-
-        # For CK3, keep yes/no/true/false as strings for comparisons
-        # since that's how they're stored in the AST
-        # (Users can do explicit boolean conversion if needed)
-        return expr
-
-    def _compare(self, left: Any, op: str, right: Any) -> bool:
-        """
-        Perform a comparison operation.
-
-        Args:
-            left: Left operand
-            op: Comparison operator
-            right: Right operand
-
-        Returns:
-            Result of the comparison
-        """
-        try:
-            if op == '==':
-                return left == right
-            if op == '!=':
-                return left != right
-            if op == '>':
-                return left > right if left is not None and right is not None else False
-            if op == '<':
-                return left < right if left is not None and right is not None else False
-            if op == '>=':
-                return left >= right if left is not None and right is not None else False
-            if op == '<=':
-                return left <= right if left is not None and right is not None else False
-        except TypeError:
-            # Type mismatch in comparison
-            return False
-        return False
+        return compile_condition(expr)(context)
 
     def _validate_pattern(
         self,
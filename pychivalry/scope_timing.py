@@ -117,6 +117,7 @@ from lsprotocol import types
 
 from .parser import CK3Node
 from .indexer import DocumentIndex
+from .ast_visitor import NodeCheck, run_checks
 
 logger = logging.getLogger(__name__)
 
@@ -476,6 +477,47 @@ def check_temporary_scope_usage(event_node: CK3Node) -> List[types.Diagnostic]:
     return diagnostics
 
 
+class ScopeTimingCheck(NodeCheck):
+    """
+    Runs the per-event timing checks on each top-level event definition.
+    """
+
+    top_level = True
+
+    def __init__(self, config: Optional[ScopeTimingConfig] = None):
+        """
+        Args:
+            config: Scope timing configuration
+        """
+        super().__init__()
+        self.config = config or ScopeTimingConfig()
+
+    def visit(self, node: CK3Node, ancestors):
+        config = self.config
+        # Check if this looks like an event definition
+        if "." in node.key and node.children:
+            parts = node.key.split(".")
+            if len(parts) == 2:
+                try:
+                    int(parts[1])  # Event ID should be numeric
+                except ValueError:
+                    return  # Not an event
+
+                # This is an event - run timing checks
+                if (
+                    config.check_trigger_block
+                    or config.check_desc_block
+                    or config.check_triggered_desc
+                ):
+                    self.diagnostics.extend(check_event_scope_timing(node))
+
+                if config.check_variables:
+                    self.diagnostics.extend(check_variable_timing(node))
+
+                if config.check_temporary_scopes:
+                    self.diagnostics.extend(check_temporary_scope_usage(node))
+
+
 def check_scope_timing(
     ast: List[CK3Node],
     index: Optional[DocumentIndex] = None,
@@ -494,35 +536,10 @@ def check_scope_timing(
     Returns:
         List of scope timing diagnostics
     """
-    config = config or ScopeTimingConfig()
     diagnostics = []
 
     try:
-        for node in ast:
-            # Check if this looks like an event definition
-            if "." in node.key and node.children:
-                parts = node.key.split(".")
-                if len(parts) == 2:
-                    try:
-                        int(parts[1])  # Event ID should be numeric
-
-                        # This is an event - run timing checks
-                        if (
-                            config.check_trigger_block
-                            or config.check_desc_block
-                            or config.check_triggered_desc
-                        ):
-                            diagnostics.extend(check_event_scope_timing(node))
-
-                        if config.check_variables:
-                            diagnostics.extend(check_variable_timing(node))
-
-                        if config.check_temporary_scopes:
-                            diagnostics.extend(check_temporary_scope_usage(node))
-
-                    except ValueError:
-                        pass  # Not an event
-
+        diagnostics = run_checks(ast, [ScopeTimingCheck(config)])
         logger.debug(f"Scope timing checks found {len(diagnostics)} issues")
 
     except Exception as e:
@@ -145,6 +145,7 @@ from lsprotocol import types
 
 from .parser import CK3Node, parse_document
 from .indexer import DocumentIndex
+from .cancellation import CancellationToken
 from .ck3_language import (
     CK3_KEYWORDS,
     CK3_EFFECTS,
@@ -160,6 +161,9 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Lines analyzed between two cancellation checks in analyze_document()
+_CANCEL_CHECK_LINES = 64
+
 
 # Token type definitions - order matters for encoding
 TOKEN_TYPES = [
@@ -696,6 +700,8 @@ def tokenize_line(
 def analyze_document(
     source: str,
     index: Optional[DocumentIndex] = None,
+    lines: Optional[List[str]] = None,
+    cancel: Optional[CancellationToken] = None,
 ) -> List[SemanticToken]:
     """
     Analyze a document and extract all semantic tokens.
@@ -703,12 +709,18 @@ def analyze_document(
     Args:
         source: Document source text
         index: Document index for custom definitions
+        lines: ``source.split("\\n")``, if the caller already has it
+        cancel: Checked every _CANCEL_CHECK_LINES lines
 
     Returns:
         List of SemanticToken objects
+
+    Raises:
+        OperationCancelled: If ``cancel`` was cancelled
     """
     tokens = []
-    lines = source.split("\n")
+    if lines is None:
+        lines = source.split("\n")
 
     # Get custom effects and triggers from index
     custom_effects = index.get_all_scripted_effects() if index else set()
@@ -720,6 +732,9 @@ def analyze_document(
     context_stack = []
 
     for line_num, line in enumerate(lines):
+        if cancel is not None and line_num % _CANCEL_CHECK_LINES == 0:
+            cancel.raise_if_cancelled()
+
         # Update context based on block keywords
         stripped = line.strip()
 
@@ -765,6 +780,8 @@ def analyze_document(
 def get_semantic_tokens(
     source: str,
     index: Optional[DocumentIndex] = None,
+    lines: Optional[List[str]] = None,
+    cancel: Optional[CancellationToken] = None,
 ) -> types.SemanticTokens:
     """
     Get semantic tokens for a document in LSP format.
@@ -772,12 +789,17 @@ def get_semantic_tokens(
     Args:
         source: Document source text
         index: Document index for custom definitions
+        lines: ``source.split("\\n")``, if the caller already has it
+        cancel: Stops the analysis when cancelled (see analyze_document)
 
     Returns:
         SemanticTokens object with encoded data
+
+    Raises:
+        OperationCancelled: If ``cancel`` was cancelled
     """
     try:
-        tokens = analyze_document(source, index)
+        tokens = analyze_document(source, index, lines, cancel)
         data = encode_tokens(tokens)
         return types.SemanticTokens(data=data)
     except Exception as e:
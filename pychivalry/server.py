@@ -84,6 +84,8 @@ LSP FEATURES IMPLEMENTED:
     15. textDocument/semanticTokens: Syntax highlighting (semantic_tokens.py)
     16. textDocument/inlayHint: Inline annotations (inlay_hints.py)
     17. textDocument/publishDiagnostics: Error/warning display (diagnostics.py)
+    18. textDocument/diagnostic, workspace/diagnostic: Pulled diagnostics
+        with result IDs, for clients that support them (pull_diagnostics.py)
     ... plus workspace features, configuration, and more
 
 HANDLER REGISTRATION:
@@ -104,16 +106,29 @@ DOCUMENT MANAGEMENT:
     - document_versions: Version numbers for incremental sync
     - parse_cache: Cached ASTs for performance
     - index: Cross-document symbol index
+    - snapshots: Per-version DocumentSnapshot (document_snapshot.py)
+    - block caches: Per-document BlockDiagnosticCache (diagnostic_cache.py),
+      so diagnostics re-check only the top-level blocks an edit changed
+    - dependencies: DependencyGraph (dependency_graph.py) from the symbols
+      each open document uses to its URI; when an index update defines or
+      undefines a scripted effect/trigger, modifier or saved scope, the open
+      documents using it are re-validated in a debounced background batch
     
     Documents are automatically parsed on open/change,
-    with results cached for subsequent requests.
+    with results cached for subsequent requests. Request handlers read a
+    document through get_snapshot(), which memoizes lines, AST, folding
+    ranges, semantic tokens and symbols until the next version arrives.
 
 PERFORMANCE OPTIMIZATIONS:
-    1. **Parse Caching**: AST cached until document changes
+    1. **Parse Caching**: ASTs cached by content hash; entries no open
+       document holds are compacted into array form (compact_ast.py) in the
+       background lane, so reopened and closed files cost little memory
     2. **Incremental Parsing**: Only reparse changed regions
     3. **Debouncing**: Delay validation 200ms after typing
     4. **Lazy Evaluation**: Resolve code lenses on-demand
-    5. **Parallel Processing**: Use ThreadPoolExecutor for workspace scan
+    5. **Parallel Processing**: Use ThreadPoolExecutor for workspace scan, in
+       separate interactive, diagnostics and background lanes (scheduler.py)
+       so indexing never delays completions
     6. **Incremental Index**: Update index incrementally, not full rebuild
     
     Typical response times:
@@ -186,18 +201,22 @@ SEE ALSO:
 """
 
 import asyncio
+import functools
 import hashlib
 import logging
 import os
 import threading
 import uuid
 from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Any, Set, Tuple
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Any, Set, Tuple, Union
 
 # Import the LanguageServer class from pygls
 # This is the core class that handles LSP protocol communication
+from pygls.exceptions import JsonRpcContentModified, JsonRpcRequestCancelled
 from pygls.lsp.server import LanguageServer
+from pygls.protocol import LanguageServerProtocol, lsp_method
 from pygls.workspace import TextDocument
 from pygls.uris import to_fs_path
 
@@ -223,11 +242,44 @@ from .ck3_language import (
 )
 
 # Import parser and indexer
-from .parser import parse_document, CK3Node, get_node_at_position
+from .parser import (
+    parse_document,
+    parse_document_incremental,
+    CK3Node,
+    PositionIndex,
+)
+from .cancellation import CancellationToken, OperationCancelled
+from .compact_ast import CompactAST
+from .document_snapshot import DocumentSnapshot
+from .diagnostic_cache import BlockDiagnosticCache
+from .dependency_graph import DependencyGraph
+from .pull_diagnostics import (
+    DiagnosticResult,
+    DiagnosticResultStore,
+    document_report,
+    workspace_report,
+)
+from .scheduler import LaneScheduler
+from .style_checks import StyleScanner
+from .workspace_validation import (
+    FileValidation,
+    WorkspaceValidationResult,
+    find_script_files,
+    validate_files,
+)
 from .indexer import DocumentIndex
 
+# Import incremental document storage
+from .document_buffer import BufferedTextDocument, BufferedWorkspace
+
 # Import diagnostics
-from .diagnostics import collect_all_diagnostics, check_syntax, check_semantics, check_scopes
+from .diagnostics import (
+    collect_all_diagnostics,
+    check_syntax,
+    create_scope_checks,
+    create_semantic_checks,
+)
+from .ast_visitor import run_checks
 
 # Import hover
 from .hover import create_hover_response, get_word_at_position
@@ -239,7 +291,7 @@ from .completions import get_context_aware_completions, detect_context
 from .code_actions import get_all_code_actions, convert_to_lsp_code_action
 
 # Import semantic tokens
-from .semantic_tokens import get_semantic_tokens, TOKEN_TYPES, TOKEN_MODIFIERS
+from .semantic_tokens import TOKEN_TYPES, TOKEN_MODIFIERS
 
 # Import code lens
 from .code_lens import get_code_lenses, resolve_code_lens
@@ -267,8 +319,6 @@ from .document_links import get_document_links, resolve_document_link
 # Import rename
 from .rename import prepare_rename as do_prepare_rename, perform_rename
 
-# Import folding
-from .folding import get_folding_ranges
 
 # Logger will be configured in main() after parsing arguments
 logger = logging.getLogger(__name__)
@@ -295,6 +345,70 @@ def configure_logging(level: str = "info") -> None:
     )
 
 
+class CK3LanguageServerProtocol(LanguageServerProtocol):
+    """
+    LSP protocol that keeps open documents in incremental line buffers.
+
+    pygls creates its Workspace while handling ``initialize``; this protocol
+    replaces it with a BufferedWorkspace before any document is opened, so
+    didChange edits are applied to a BufferedTextDocument line by line instead
+    of rebuilding the whole source string.
+
+    It also gives every request a CancellationToken, cancelled by
+    ``$/cancelRequest``. pygls can only cancel requests that have not
+    started; handlers pass the token (see CK3LanguageServer.cancellation_token)
+    into long-running work, which then stops early. A request stopped by
+    OperationCancelled is answered with RequestCancelled, or ContentModified
+    when it stopped because its document changed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Token of each request being handled, by message id
+        self._request_tokens: Dict[Any, CancellationToken] = {}
+
+    @lsp_method(types.INITIALIZE)
+    def lsp_initialize(self, params: types.InitializeParams):
+        """Initialize the server, then switch to the buffered workspace."""
+        options = params.initialization_options
+        if isinstance(options, dict) and options.get("workspaceDiagnostics"):
+            # Registered before pygls derives the capabilities from the features
+            self._server.enable_workspace_diagnostics()
+        result = yield from super().lsp_initialize(params)
+        self._workspace = BufferedWorkspace.from_workspace(self._workspace)
+        return result
+
+    def request_token(self) -> Optional[CancellationToken]:
+        """Cancellation token of the request being handled (None outside requests)."""
+        msg_id = self.msg_id
+        return self._request_tokens.get(msg_id) if msg_id is not None else None
+
+    def _handle_request(self, msg_id, method_name, params):
+        self._request_tokens[msg_id] = CancellationToken()
+        super()._handle_request(msg_id, method_name, params)
+        if msg_id not in self._request_futures:
+            # Answered synchronously, or failed before it started
+            self._request_tokens.pop(msg_id, None)
+
+    def _handle_cancel_notification(self, msg_id):
+        token = self._request_tokens.get(msg_id)
+        if token is not None:
+            token.cancel()
+        super()._handle_cancel_notification(msg_id)
+
+    def _send_handler_result(self, future, *, msg_id):
+        token = self._request_tokens.pop(msg_id, None)
+        if not future.cancelled() and isinstance(future.exception(), OperationCancelled):
+            self._request_futures.pop(msg_id, None)
+            if token is not None and token.cancelled:
+                error = JsonRpcRequestCancelled(f'Request with id "{msg_id}" is canceled')
+            else:
+                error = JsonRpcContentModified(f'Document changed during request "{msg_id}"')
+            self._send_response(msg_id, error=error.to_response_error())
+            return
+        super()._send_handler_result(future, msg_id=msg_id)
+
+
 class CK3LanguageServer(LanguageServer):
     """
     Extended language server with CK3-specific state.
@@ -311,6 +425,7 @@ class CK3LanguageServer(LanguageServer):
 
     def __init__(self, *args, **kwargs):
         """Initialize the CK3 language server."""
+        kwargs.setdefault("protocol_cls", CK3LanguageServerProtocol)
         super().__init__(*args, **kwargs)
 
         # Document ASTs (updated on open/change)
@@ -322,6 +437,21 @@ class CK3LanguageServer(LanguageServer):
         # Track whether workspace has been scanned
         self._workspace_scanned = False
 
+        # Persist per-file scan results in <workspace>/.pychivalry/ so restarts
+        # and rescans only re-extract changed files (see index_cache.py)
+        self._use_index_cache = True
+
+        # Worker processes for workspace scans (0 = scan in the thread pool).
+        # Set from --scan-workers; processes avoid the GIL on multi-core machines
+        self._scan_process_workers = 0
+
+        # Worker processes for ck3.validateWorkspace (0 = validate in a thread).
+        # Set from --validate-workers; defaults to one per CPU core
+        self._validate_process_workers = os.cpu_count() or 1
+        # Closed files with diagnostics published by workspace validation
+        # (cleared by the next run if they are clean by then)
+        self._workspace_diagnostic_uris: Set[str] = set()
+
         # User configuration cache
         self._config_cache: Dict[str, Any] = {}
 
@@ -329,15 +459,39 @@ class CK3LanguageServer(LanguageServer):
         # Threading Infrastructure
         # =====================================================================
 
-        # Thread pool for CPU-bound operations (parsing, diagnostics, etc.)
-        # Use 2-4 workers to balance parallelism without overwhelming the system
-        self._thread_pool = ThreadPoolExecutor(
-            max_workers=min(4, (os.cpu_count() or 1) + 1), thread_name_prefix="ck3-worker"
-        )
+        # Thread pools for CPU-bound operations, one lane per kind of work so
+        # workspace scans never queue ahead of requests (see scheduler.py):
+        # interactive (handlers, the edited document), diagnostics, background
+        self._scheduler = LaneScheduler()
+        # pygls runs @server.thread() handlers and its stdin reader in
+        # self.thread_pool, i.e. this attribute
+        self._thread_pool = self._scheduler.interactive
+        # Serializes workspace scans: a scan waits in a background worker for
+        # its per-file tasks in the same lane
+        self._scan_lock = asyncio.Lock()
+        # Token of the running workspace scan (cancelled by a rescan or shutdown)
+        self._scan_token: Optional[CancellationToken] = None
 
         # Thread-safety locks for shared data structures
         self._ast_lock = threading.RLock()  # Protects document_asts
-        self._index_lock = threading.RLock()  # Protects index operations
+        # Cursor lookup index per document, built on first use for each AST
+        self._position_indexes: Dict[str, PositionIndex] = {}
+        # Source text each document_asts entry was parsed from (when known),
+        # so that snapshots of the same text can reuse the AST
+        self._ast_sources: Dict[str, str] = {}
+        # Latest DocumentSnapshot per open document (see get_snapshot)
+        self._snapshots: Dict[str, DocumentSnapshot] = {}
+        # Per-block diagnostics of each open document (see get_block_cache)
+        self._block_caches: Dict[str, BlockDiagnosticCache] = {}
+        # Incremental style checker of each open document (see get_style_scanner)
+        self._style_scanners: Dict[str, StyleScanner] = {}
+        # Serializes index writers; readers use the published self.index
+        # snapshot without locking (see update_index)
+        self._index_lock = threading.RLock()
+
+        # Index changes made while a workspace scan is running, replayed onto
+        # the scanned index before it is published (one journal per scan)
+        self._index_scan_journals: List[List[Callable[[DocumentIndex], None]]] = []
 
         # =====================================================================
         # Async Document Update Infrastructure
@@ -350,9 +504,37 @@ class CK3LanguageServer(LanguageServer):
         # Document versions to detect stale updates
         self._document_versions: Dict[str, int] = {}
 
+        # Content changes received since document_asts[uri] was built
+        # Consumed by incremental re-parsing once the new AST is committed
+        self._pending_changes: Dict[str, List[Any]] = {}
+
         # Base debounce delay in seconds (150ms is good for typing)
         self._debounce_delay = 0.15
 
+        # =====================================================================
+        # Cross-File Revalidation
+        # =====================================================================
+
+        # Open documents using each symbol (fed by the diagnostics runs)
+        self._dependencies = DependencyGraph()
+        # Open documents to re-validate because symbols they use were
+        # (un)defined; drained in batches by one low-priority task
+        self._revalidation_pending: Set[str] = set()
+        self._revalidation_scheduled = False
+        self._revalidation_lock = threading.Lock()
+        # Delay before a batch runs, so bursts of index updates coalesce
+        self._revalidation_delay = 0.5
+        # Event loop of the server, for scheduling from worker threads
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # =====================================================================
+        # Pull Diagnostics
+        # =====================================================================
+
+        # Latest diagnostics with result IDs, for clients pulling diagnostics
+        # (textDocument/diagnostic, workspace/diagnostic); see pull_diagnostics.py
+        self._diagnostic_results = DiagnosticResultStore()
+
         # =====================================================================
         # Log Watcher Infrastructure
         # =====================================================================
@@ -367,18 +549,122 @@ class CK3LanguageServer(LanguageServer):
         # =====================================================================
 
         # Cache ASTs by content hash to avoid re-parsing unchanged content
-        # Uses OrderedDict for LRU eviction
-        self._ast_cache: OrderedDict[str, List[CK3Node]] = OrderedDict()
-        self._ast_cache_max = 50  # Maximum cached ASTs
+        # Uses OrderedDict for LRU eviction. Entries no document holds are
+        # compacted into array form (~1/15 the memory of CK3Node trees) in the
+        # background lane and materialized on hit (see compact_ast_cache)
+        self._ast_cache: OrderedDict[str, Union[List[CK3Node], CompactAST]] = OrderedDict()
+        self._ast_cache_max = 200  # Maximum cached ASTs
         self._ast_cache_lock = threading.Lock()
+        self._ast_compaction_scheduled = False
 
         # =====================================================================
         # Pre-emptive Parsing Infrastructure (Tier 4 Optimization)
         # =====================================================================
 
-        # Queue of files to pre-parse (low priority background work)
+        # Queue of files to pre-parse (low priority background work): files
+        # related to opened documents, parsed into the AST cache when the
+        # interactive and diagnostics lanes are idle so opening them is instant
         self._preparse_queue: List[str] = []
         self._preparse_lock = threading.Lock()
+        self._preparse_scheduled = False
+        # Delay before re-checking for idleness while other work is waiting
+        self._preparse_idle_delay = 0.2
+        # Most related files queued per opened document
+        self._preparse_max_related = 20
+
+    # =====================================================================
+    # Index Snapshots (Copy-on-Write)
+    # =====================================================================
+
+    def update_index(self, mutate: Callable[[DocumentIndex], None]):
+        """
+        Apply a change to the document index and publish the new version.
+
+        Published index versions are never modified: the change is applied to
+        a copy-on-write version (DocumentIndex.copy) that is then published by
+        rebinding ``self.index``, which is atomic. Readers therefore just take
+        ``self.index`` once and use it without locking, even while a write or a
+        workspace scan is in progress.
+
+        Args:
+            mutate: Function applying the change to the new index version
+        """
+        with self._index_lock:
+            new_index = self.index.copy()
+            mutate(new_index)
+            self.index = new_index
+            for journal in self._index_scan_journals:
+                journal.append(mutate)
+
+    def scan_index(self, workspace_folders: List[str], fresh: bool = False, **scan_kwargs):
+        """
+        Scan the workspace into a new index version and publish it (blocking).
+
+        The scan runs without holding the writer lock, so document updates
+        continue meanwhile; they are recorded and replayed onto the scanned
+        index before it replaces the current one.
+
+        Args:
+            workspace_folders: Workspace folder paths to scan
+            fresh: Start from an empty index instead of the current one
+            **scan_kwargs: Passed to DocumentIndex.scan_workspace()
+
+        Raises:
+            OperationCancelled: If the scan's ``cancel`` token was cancelled
+                (the current index is kept)
+        """
+        journal: List[Callable[[DocumentIndex], None]] = []
+        with self._index_lock:
+            scanned = DocumentIndex() if fresh else self.index.copy()
+            self._index_scan_journals.append(journal)
+
+        try:
+            scanned.scan_workspace(
+                workspace_folders,
+                use_cache=self._use_index_cache,
+                process_workers=self._scan_process_workers,
+                **scan_kwargs,
+            )
+        finally:
+            with self._index_lock:
+                self._index_scan_journals.remove(journal)
+
+        with self._index_lock:
+            for mutate in journal:
+                mutate(scanned)
+            previous = self.index
+            self.index = scanned
+
+        # Definitions found by the scan clear (or cause) unknown symbol errors
+        self.revalidate_dependents(previous.dependency_symbols() ^ scanned.dependency_symbols())
+
+    def index_document(self, uri: str, ast: List[CK3Node], source: Optional[str] = None):
+        """
+        Index a document and re-validate the open documents its change affects.
+
+        Publishes a new index version with the document's symbols, then
+        schedules re-validation of the open documents that use a symbol the
+        document added or removed (see revalidate_dependents).
+
+        Args:
+            uri: Document URI
+            ast: Document AST
+            source: Document text (re-indexes its references)
+        """
+        previous = self.index
+        self.update_index(lambda index: index.update_from_ast(uri, ast, source))
+        self.revalidate_dependents(_changed_symbols(previous, self.index, uri), exclude=uri)
+
+    def unindex_document(self, uri: str):
+        """
+        Remove a document from the index, re-validating the documents it affects.
+
+        Args:
+            uri: Document URI
+        """
+        previous = self.index
+        self.update_index(lambda index: index.remove_document(uri))
+        self.revalidate_dependents(_changed_symbols(previous, self.index, uri), exclude=uri)
 
     # =====================================================================
     # Thread-Safe Document Access
@@ -397,16 +683,31 @@ class CK3LanguageServer(LanguageServer):
         with self._ast_lock:
             return self.document_asts.get(uri, [])
 
-    def set_ast(self, uri: str, ast: List[CK3Node]):
+    def set_ast(self, uri: str, ast: List[CK3Node], source: Optional[str] = None):
         """
         Thread-safe update of document AST.
 
         Args:
             uri: Document URI
             ast: New AST nodes
+            source: Text the AST was parsed from; lets the document snapshot
+                of that text use this AST instead of parsing again
         """
         with self._ast_lock:
+            previous = self.document_asts.get(uri)
             self.document_asts[uri] = ast
+            self._position_indexes.pop(uri, None)
+            if source is None:
+                self._ast_sources.pop(uri, None)
+                snapshot = None
+            else:
+                self._ast_sources[uri] = source
+                snapshot = self._snapshots.get(uri)
+        if previous is not None and previous is not ast:
+            # The replaced AST can be compacted in the AST cache now
+            self._schedule_ast_compaction()
+        if snapshot is not None and snapshot.source == source:
+            snapshot.seed_ast(ast)
 
     def remove_ast(self, uri: str):
         """
@@ -417,6 +718,120 @@ class CK3LanguageServer(LanguageServer):
         """
         with self._ast_lock:
             self.document_asts.pop(uri, None)
+            self._position_indexes.pop(uri, None)
+            self._ast_sources.pop(uri, None)
+            self._snapshots.pop(uri, None)
+            self._block_caches.pop(uri, None)
+            self._style_scanners.pop(uri, None)
+        self._dependencies.remove(uri)
+        self._schedule_ast_compaction()
+
+    def get_position_index(self, uri: str) -> Optional[PositionIndex]:
+        """
+        Cursor → node lookup index for a document's current AST (thread-safe).
+
+        Built once per AST, on the first cursor-driven request after a parse,
+        and shared by completion, hover and code action handlers.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            PositionIndex for the document, or None if it has no AST
+        """
+        with self._ast_lock:
+            ast = self.document_asts.get(uri)
+            position_index = self._position_indexes.get(uri)
+        if not ast:
+            return None
+        if position_index is not None and position_index.nodes is ast:
+            return position_index
+
+        position_index = PositionIndex(ast)
+        with self._ast_lock:
+            # Don't store an index for an AST replaced while building it
+            if self.document_asts.get(uri) is ast:
+                self._position_indexes[uri] = position_index
+        return position_index
+
+    def get_snapshot(self, uri: str, doc: Optional[TextDocument] = None) -> DocumentSnapshot:
+        """
+        Snapshot of a document's current version, shared by all handlers.
+
+        The snapshot is reused while the document version and text are
+        unchanged, so artifacts derived from the text (lines, AST, folding
+        ranges, semantic tokens, symbols) are computed once per version no
+        matter how many requests need them. A snapshot of the text the
+        current AST was parsed from starts out with that AST.
+
+        Args:
+            uri: Document URI
+            doc: The open document, if the caller already has it
+
+        Returns:
+            DocumentSnapshot of the document's current content
+        """
+        if doc is None:
+            doc = self.workspace.get_text_document(uri)
+        source = doc.source
+        version = doc.version
+        with self._ast_lock:
+            snapshot = self._snapshots.get(uri)
+            if snapshot is not None and snapshot.matches(version, source):
+                return snapshot
+            snapshot = DocumentSnapshot(uri, version, source, parse=self.get_or_parse_ast)
+            if self._ast_sources.get(uri) == source:
+                snapshot.seed_ast(self.document_asts[uri])
+            self._snapshots[uri] = snapshot
+        return snapshot
+
+    def get_block_cache(self, uri: str) -> BlockDiagnosticCache:
+        """
+        Block diagnostic cache of a document (created on first use).
+
+        Shared by the semantic diagnostics phase and full diagnostic runs;
+        dropped with the document's AST on close.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            BlockDiagnosticCache for the document
+        """
+        with self._ast_lock:
+            cache = self._block_caches.get(uri)
+            if cache is None:
+                cache = self._block_caches[uri] = BlockDiagnosticCache()
+        return cache
+
+    def get_style_scanner(self, uri: str) -> StyleScanner:
+        """
+        Style scanner of a document (created on first use).
+
+        Unlike the block cache it works on the text alone, so it is used
+        whether or not the AST is current; dropped on close.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            StyleScanner for the document
+        """
+        with self._ast_lock:
+            scanner = self._style_scanners.get(uri)
+            if scanner is None:
+                scanner = self._style_scanners[uri] = StyleScanner()
+        return scanner
+
+    def discard_snapshot(self, uri: str):
+        """
+        Drop a document's snapshot (called when a new version arrives).
+
+        Args:
+            uri: Document URI
+        """
+        with self._ast_lock:
+            self._snapshots.pop(uri, None)
 
     def get_document_version(self, uri: str) -> int:
         """Get the current document version for staleness detection."""
@@ -444,8 +859,18 @@ class CK3LanguageServer(LanguageServer):
         Returns:
             Debounce delay in seconds
         """
-        line_count = source.count("\n")
+        return self.get_debounce_delay_for_lines(source.count("\n"))
+
+    def get_debounce_delay_for_lines(self, line_count: int) -> float:
+        """
+        Calculate debounce delay from a document line count.
 
+        Args:
+            line_count: Number of lines in the document
+
+        Returns:
+            Debounce delay in seconds
+        """
         if line_count < 500:
             return 0.08  # 80ms for small files - faster feedback
         elif line_count < 2000:
@@ -463,66 +888,198 @@ class CK3LanguageServer(LanguageServer):
         """Compute MD5 hash of document content for cache lookup."""
         return hashlib.md5(source.encode("utf-8", errors="replace")).hexdigest()
 
-    def get_cached_ast(self, source: str) -> Optional[List[CK3Node]]:
+    def get_document_content_hash(self, doc: TextDocument) -> str:
+        """
+        Content hash of an open document for AST cache lookup.
+
+        Buffered documents maintain their hash incrementally, so only the
+        chunks edited since the last call are hashed again.
+
+        Args:
+            doc: The text document
+
+        Returns:
+            Hex digest identifying the document content
+        """
+        if isinstance(doc, BufferedTextDocument):
+            return doc.content_hash
+        return self._compute_content_hash(doc.source)
+
+    def get_cached_ast(
+        self, source: str, content_hash: Optional[str] = None
+    ) -> Optional[List[CK3Node]]:
         """
         Get AST from content hash cache if available.
 
         Args:
             source: Document source text
+            content_hash: Precomputed content hash (computed from source if None)
 
         Returns:
-            Cached AST or None if not in cache
+            Cached AST or None if not in cache. ASTs are never modified, so a
+            cached AST may be shared with documents holding the same content;
+            compacted entries are materialized as new CK3Node objects.
         """
-        content_hash = self._compute_content_hash(source)
+        if content_hash is None:
+            content_hash = self._compute_content_hash(source)
         with self._ast_cache_lock:
-            if content_hash in self._ast_cache:
-                # Move to end for LRU behavior
-                self._ast_cache.move_to_end(content_hash)
-                logger.debug(f"AST cache hit for hash {content_hash[:8]}...")
-                return self._ast_cache[content_hash]
-        return None
+            entry = self._ast_cache.get(content_hash)
+            if entry is None:
+                return None
+            # Move to end for LRU behavior
+            self._ast_cache.move_to_end(content_hash)
+        logger.debug(f"AST cache hit for hash {content_hash[:8]}...")
+        if not isinstance(entry, CompactAST):
+            return entry
+
+        ast = entry.to_nodes()
+        with self._ast_cache_lock:
+            # Keep the nodes until they are compacted again, so repeated hits
+            # (undo/redo, reopening) materialize them only once
+            if self._ast_cache.get(content_hash) is entry:
+                self._ast_cache[content_hash] = ast
+        return ast
 
-    def cache_ast(self, source: str, ast: List[CK3Node]):
+    def cache_ast(
+        self,
+        source: str,
+        ast: List[CK3Node],
+        content_hash: Optional[str] = None,
+        compact: bool = False,
+    ):
         """
         Store AST in content hash cache.
 
+        The AST is stored as is and compacted later in the background lane
+        once no document holds it (see compact_ast_cache), so caching costs
+        nothing on the interactive lane.
+
         Args:
             source: Document source text
             ast: Parsed AST to cache
+            content_hash: Precomputed content hash (computed from source if None)
+            compact: Store the AST in compact form right away (for callers
+                already off the interactive lane, caching ASTs of closed files)
         """
-        content_hash = self._compute_content_hash(source)
+        if content_hash is None:
+            content_hash = self._compute_content_hash(source)
+        entry = CompactAST.from_nodes(ast) if compact else ast
         with self._ast_cache_lock:
             # Evict oldest if at capacity
             while len(self._ast_cache) >= self._ast_cache_max:
                 self._ast_cache.popitem(last=False)
 
-            self._ast_cache[content_hash] = ast
+            self._ast_cache[content_hash] = entry
             logger.debug(
                 f"AST cached with hash {content_hash[:8]}... (cache size: {len(self._ast_cache)})"
             )
 
-    def get_or_parse_ast(self, source: str) -> List[CK3Node]:
+    def compact_ast_cache(self):
+        """
+        Compact the cached ASTs that no open document holds (for the background lane).
+
+        Compacting a large document takes tens of milliseconds, so it happens
+        here rather than when the AST is cached. ASTs held by set_ast stay
+        as nodes: they are in memory anyway, and a hit returns them as is.
+        """
+        with self._ast_cache_lock:
+            self._ast_compaction_scheduled = False
+            entries = [
+                (content_hash, entry)
+                for content_hash, entry in self._ast_cache.items()
+                if not isinstance(entry, CompactAST)
+            ]
+        if not entries:
+            return
+        with self._ast_lock:
+            live = {id(ast) for ast in self.document_asts.values()}
+
+        for content_hash, ast in entries:
+            if id(ast) in live:
+                continue
+            compact = CompactAST.from_nodes(ast)
+            with self._ast_cache_lock:
+                # Skip entries evicted or replaced in the meantime
+                if self._ast_cache.get(content_hash) is ast:
+                    self._ast_cache[content_hash] = compact
+
+    def _schedule_ast_compaction(self):
+        """Queue one compact_ast_cache() run in the background lane."""
+        with self._ast_cache_lock:
+            if self._ast_compaction_scheduled:
+                return
+            self._ast_compaction_scheduled = True
+        try:
+            self._scheduler.background.submit(self.compact_ast_cache)
+        except RuntimeError:
+            # Shut down
+            with self._ast_cache_lock:
+                self._ast_compaction_scheduled = False
+
+    def get_or_parse_ast(
+        self,
+        source: str,
+        previous_ast: Optional[List[CK3Node]] = None,
+        changes: Optional[List[Any]] = None,
+        content_hash: Optional[str] = None,
+        compact: bool = False,
+    ) -> List[CK3Node]:
         """
         Get AST from cache or parse if not cached.
 
-        This is the primary method for obtaining an AST with caching.
+        This is the primary method for obtaining an AST with caching. When the
+        previous AST and the content changes applied since it was built are
+        given, only the top-level blocks touched by those changes are re-parsed.
 
         Args:
             source: Document source text
+            previous_ast: AST of the document before ``changes`` were applied
+            changes: LSP content changes applied since ``previous_ast``
+            content_hash: Precomputed content hash (computed from source if None)
+            compact: Cache a freshly parsed AST in compact form right away
+                (see cache_ast)
 
         Returns:
-            Parsed AST (from cache or freshly parsed)
+            Parsed AST (from cache, incrementally or freshly parsed)
         """
+        if content_hash is None:
+            content_hash = self._compute_content_hash(source)
+
         # Check cache first
-        cached = self.get_cached_ast(source)
+        cached = self.get_cached_ast(source, content_hash)
         if cached is not None:
             return cached
 
         # Parse and cache
-        ast = parse_document(source)
-        self.cache_ast(source, ast)
+        if previous_ast and changes:
+            ast = parse_document_incremental(previous_ast, source, changes)
+        else:
+            ast = parse_document(source)
+        self.cache_ast(source, ast, content_hash, compact)
         return ast
 
+    def add_pending_changes(self, uri: str, changes: List[Any]):
+        """
+        Record content changes that are not yet reflected in the document AST.
+
+        Args:
+            uri: Document URI
+            changes: LSP content changes from a didChange notification
+        """
+        self._pending_changes.setdefault(uri, []).extend(changes)
+
+    def consume_pending_changes(self, uri: str, count: int):
+        """
+        Drop the first ``count`` pending changes once an AST including them is stored.
+
+        Args:
+            uri: Document URI
+            count: Number of changes reflected in the committed AST
+        """
+        pending = self._pending_changes.get(uri)
+        if pending:
+            del pending[:count]
+
     # =====================================================================
     # Server Communication: Show Message
     # =====================================================================
@@ -610,9 +1167,14 @@ class CK3LanguageServer(LanguageServer):
 
         Args:
             title: Title of the progress notification
-            task_func: Async function that takes (report_progress) callback
+            task_func: Async function that takes (report_progress) callback;
+                cancellable tasks also get an is_cancelled() callback, true
+                once the user cancelled
             cancellable: Whether the user can cancel the operation
 
+        Returns:
+            The result of task_func
+
         Example:
             async def do_scan(report_progress):
                 report_progress("Scanning events...", 25)
@@ -650,7 +1212,14 @@ class CK3LanguageServer(LanguageServer):
                 )
 
             # Execute the task
-            await task_func(report_progress)
+            if cancellable:
+                cancel_future = self.progress.tokens.get(token)
+
+                def is_cancelled() -> bool:
+                    return cancel_future is not None and cancel_future.cancelled()
+
+                return await task_func(report_progress, is_cancelled)
+            return await task_func(report_progress)
 
         finally:
             # End progress
@@ -823,7 +1392,33 @@ class CK3LanguageServer(LanguageServer):
     # Async Document Update Scheduling
     # =====================================================================
 
-    async def schedule_document_update(self, uri: str, doc_source: str):
+    def cancellation_token(self, uri: Optional[str] = None) -> CancellationToken:
+        """
+        Cancellation token for work on behalf of the current request.
+
+        The token is cancelled by the client's ``$/cancelRequest`` for the
+        request being handled, and, if a URI is given, once that document
+        is edited (its result would be stale).
+
+        Args:
+            uri: Document the work is for
+
+        Returns:
+            Token to pass into long-running work
+        """
+        request = self.protocol.request_token()
+        version = self.get_document_version(uri) if uri is not None else None
+
+        def cancelled() -> bool:
+            if request is not None and request.cancelled:
+                return True
+            return uri is not None and self.get_document_version(uri) != version
+
+        return CancellationToken(cancelled)
+
+    async def schedule_document_update(
+        self, uri: str, doc_source: Optional[str] = None, line_count: Optional[int] = None
+    ):
         """
         Schedule document parsing with debouncing.
 
@@ -833,15 +1428,25 @@ class CK3LanguageServer(LanguageServer):
         3. Runs parsing and diagnostics in the thread pool
         4. Publishes diagnostics when complete
 
+        Clients pulling diagnostics ask for them when they need them (see
+        pull_document_diagnostics), so the update only parses and indexes.
+
+        The source text is only read once the debounce delay has passed, so
+        callers with a buffered document pass its line count instead of
+        materializing the text on every keystroke.
+
         Args:
             uri: Document URI
-            doc_source: Current document source text
+            doc_source: Current document source text (used for the line count)
+            line_count: Current document line count, if already known
         """
         # Increment version to track this update
         version = self.increment_document_version(uri)
 
         # Calculate adaptive debounce delay based on document size
-        debounce_delay = self.get_adaptive_debounce_delay(doc_source)
+        if line_count is None:
+            line_count = doc_source.count("\n") if doc_source else 0
+        debounce_delay = self.get_debounce_delay_for_lines(line_count)
 
         # Cancel any pending update for this document
         if uri in self._pending_updates:
@@ -865,15 +1470,29 @@ class CK3LanguageServer(LanguageServer):
                 # Get current document content
                 try:
                     doc = self.workspace.get_text_document(uri)
-                    current_source = doc.source
+                    snapshot = self.get_snapshot(uri, doc)
+                    current_source = snapshot.source
+                    content_hash = self.get_document_content_hash(doc)
                 except Exception:
                     # Document may have been closed
                     return
 
+                # Diagnostics of this version stop as soon as a newer one exists
+                stale = CancellationToken(lambda: self.get_document_version(uri) != version)
+
+                # Changes since the stored AST, for incremental re-parsing
+                changes = list(self._pending_changes.get(uri, ()))
+                previous_ast = self.get_ast(uri)
+
                 # Try to get AST from content hash cache first
                 loop = asyncio.get_event_loop()
                 ast = await loop.run_in_executor(
-                    self._thread_pool, self.get_or_parse_ast, current_source
+                    self._scheduler.interactive,
+                    self.get_or_parse_ast,
+                    current_source,
+                    previous_ast,
+                    changes,
+                    content_hash,
                 )
 
                 # Check again if still current before updating
@@ -881,23 +1500,28 @@ class CK3LanguageServer(LanguageServer):
                     logger.debug(f"Skipping stale AST update for {uri}")
                     return
 
-                # Update AST (thread-safe)
-                self.set_ast(uri, ast)
+                # Update AST (thread-safe); also seeds the snapshot
+                self.set_ast(uri, ast, current_source)
+                self.consume_pending_changes(uri, len(changes))
 
-                # Update index (thread-safe)
-                with self._index_lock:
-                    self.index.update_from_ast(uri, ast)
+                # Publish a new index version (readers are never blocked);
+                # documents using symbols this edit (un)defined are re-validated
+                self.index_document(uri, ast, current_source)
+
+                if self.pulls_diagnostics:
+                    return  # The client pulls the diagnostics of this version
 
                 # =========================================================
                 # Streaming Diagnostics (Tier 3 Optimization)
                 # =========================================================
                 # Phase 1: Publish syntax errors immediately for fast feedback
                 syntax_diags = await loop.run_in_executor(
-                    self._thread_pool,
+                    self._scheduler.diagnostics,
                     self._collect_syntax_diagnostics_sync,
                     uri,
                     current_source,
                     ast,
+                    snapshot.lines,
                 )
 
                 # Check if still current
@@ -915,7 +1539,12 @@ class CK3LanguageServer(LanguageServer):
 
                 # Phase 2: Run semantic analysis in background
                 semantic_diags = await loop.run_in_executor(
-                    self._thread_pool, self._collect_semantic_diagnostics_sync, uri, ast
+                    self._scheduler.diagnostics,
+                    self._collect_semantic_diagnostics_sync,
+                    uri,
+                    ast,
+                    snapshot.lines,
+                    stale,
                 )
 
                 # Check again before final publish
@@ -939,6 +1568,8 @@ class CK3LanguageServer(LanguageServer):
             except asyncio.CancelledError:
                 logger.debug(f"Update cancelled for {uri}")
                 raise
+            except OperationCancelled:
+                logger.debug(f"Stale diagnostics for {uri} stopped (version {version})")
             except Exception as e:
                 logger.error(f"Error in async document update for {uri}: {e}", exc_info=True)
 
@@ -963,9 +1594,8 @@ class CK3LanguageServer(LanguageServer):
             # Create a minimal document object for the diagnostics function
             doc = TextDocument(uri=uri, source=source)
 
-            # Get index with lock
-            with self._index_lock:
-                index = self.index
+            # Current index snapshot (immutable, no lock needed)
+            index = self.index
 
             return collect_all_diagnostics(doc, ast, index)
         except Exception as e:
@@ -973,7 +1603,7 @@ class CK3LanguageServer(LanguageServer):
             return []
 
     def _collect_syntax_diagnostics_sync(
-        self, uri: str, source: str, ast: List[CK3Node]
+        self, uri: str, source: str, ast: List[CK3Node], lines: Optional[List[str]] = None
     ) -> List[types.Diagnostic]:
         """
         Collect only syntax diagnostics for fast initial feedback.
@@ -985,19 +1615,24 @@ class CK3LanguageServer(LanguageServer):
             uri: Document URI
             source: Document source text
             ast: Parsed AST
+            lines: Source lines from the document snapshot, if available
 
         Returns:
             List of syntax diagnostics only
         """
         try:
             doc = TextDocument(uri=uri, source=source)
-            return check_syntax(doc, ast)
+            return check_syntax(doc, ast, lines)
         except Exception as e:
             logger.error(f"Error collecting syntax diagnostics: {e}", exc_info=True)
             return []
 
     def _collect_semantic_diagnostics_sync(
-        self, uri: str, ast: List[CK3Node]
+        self,
+        uri: str,
+        ast: List[CK3Node],
+        lines: Optional[List[str]] = None,
+        cancel: Optional[CancellationToken] = None,
     ) -> List[types.Diagnostic]:
         """
         Collect semantic diagnostics (effects, triggers, scopes).
@@ -1007,28 +1642,245 @@ class CK3LanguageServer(LanguageServer):
         Args:
             uri: Document URI
             ast: Parsed AST
+            lines: Lines of the text the AST was parsed from; enables the
+                document's block cache (only changed blocks are re-checked)
+            cancel: Stops the checks (per top-level block) when cancelled
 
         Returns:
             List of semantic and scope diagnostics
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
         """
         try:
-            diagnostics = []
-
-            # Get index with lock
-            with self._index_lock:
-                index = self.index
-
-            # Check semantics (effects, triggers, etc.)
-            diagnostics.extend(check_semantics(ast, index))
-
-            # Check scopes
-            diagnostics.extend(check_scopes(ast, index))
+            # Current index snapshot (immutable, no lock needed)
+            index = self.index
 
+            # Semantics (effects, triggers, etc.) and scopes in one traversal
+            checks = create_semantic_checks(index) + create_scope_checks(index)
+            if lines is None:
+                return run_checks(ast, checks, cancel)
+            diagnostics = []
+            block_cache = self.get_block_cache(uri)
+            for check_diagnostics in block_cache.run(ast, lines, checks, index, cancel):
+                diagnostics.extend(check_diagnostics)
+            self._dependencies.update(uri, block_cache.keys)
             return diagnostics
         except Exception as e:
             logger.error(f"Error collecting semantic diagnostics: {e}", exc_info=True)
             return []
 
+    # =====================================================================
+    # Cross-File Revalidation
+    # =====================================================================
+
+    def revalidate_dependents(self, symbols: Set[str], exclude: Optional[str] = None):
+        """
+        Schedule re-validation of the open documents using any of the symbols.
+
+        Args:
+            symbols: Symbols that were defined or undefined (see
+                DocumentIndex.dependency_symbols)
+            exclude: Document not to re-validate (the one that changed,
+                which its own update validates)
+        """
+        if not symbols:
+            return
+        uris = self._dependencies.dependents(symbols)
+        uris.discard(exclude)
+        if uris:
+            logger.debug(f"Symbols {sorted(symbols)[:5]} changed; re-validating {len(uris)} documents")
+            self.schedule_revalidation(uris)
+
+    def schedule_revalidation(self, uris: Set[str]):
+        """
+        Queue open documents for low-priority re-validation (thread-safe).
+
+        Documents queued within the revalidation delay are validated in one
+        batch, each once, one at a time.
+
+        Args:
+            uris: Document URIs
+        """
+        with self._revalidation_lock:
+            self._revalidation_pending.update(uris)
+            if self._revalidation_scheduled:
+                return  # The running batch task picks them up
+            self._revalidation_scheduled = True
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._event_loop = loop
+            loop.create_task(self._run_revalidation())
+        elif self._event_loop is not None and self._event_loop.is_running():
+            # Called from a worker thread
+            self._event_loop.call_soon_threadsafe(
+                lambda: self._event_loop.create_task(self._run_revalidation())
+            )
+        else:
+            # No event loop (yet): keep the documents queued
+            with self._revalidation_lock:
+                self._revalidation_scheduled = False
+
+    async def _run_revalidation(self):
+        """
+        Drain the revalidation queue in batches, publishing new diagnostics.
+
+        Clients pulling diagnostics are asked to pull again instead.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self._revalidation_delay)
+            with self._revalidation_lock:
+                batch = self._revalidation_pending
+                self._revalidation_pending = set()
+                if not batch:
+                    self._revalidation_scheduled = False
+                    return
+
+            if self.pulls_diagnostics:
+                # The client validates them again when it pulls
+                self._diagnostic_results.invalidate(batch)
+                self.request_diagnostic_refresh()
+                continue
+
+            for uri in sorted(batch):
+                pending_update = self._pending_updates.get(uri)
+                if pending_update is not None and not pending_update.done():
+                    continue  # The edit's own update validates it
+                if uri not in self.workspace.text_documents:
+                    continue  # Closed meanwhile
+
+                version = self.get_document_version(uri)
+                stale = CancellationToken(
+                    lambda uri=uri, version=version: self.get_document_version(uri) != version
+                )
+                try:
+                    doc = self.workspace.get_text_document(uri)
+                    diagnostics = await loop.run_in_executor(
+                        self._scheduler.diagnostics,
+                        self.collect_document_diagnostics,
+                        doc,
+                        stale,
+                    )
+                except OperationCancelled:
+                    continue  # Edited meanwhile; its update publishes
+                except Exception as e:
+                    logger.error(f"Error re-validating {uri}: {e}", exc_info=True)
+                    continue
+
+                if self.get_document_version(uri) != version:
+                    continue  # Edited meanwhile; its update publishes
+                self.text_document_publish_diagnostics(
+                    types.PublishDiagnosticsParams(uri=uri, diagnostics=diagnostics)
+                )
+
+    # =====================================================================
+    # Workspace Validation
+    # =====================================================================
+
+    async def validate_workspace_files(
+        self,
+        workspace_folders: List[str],
+        report_progress: Optional[Callable[[str, Optional[int]], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> WorkspaceValidationResult:
+        """
+        Validate every script file of the workspace and publish the results.
+
+        Closed files are validated from disk in worker processes (see
+        workspace_validation.py) against the current index; their
+        diagnostics are published as batches finish, at most
+        _VALIDATION_PUBLISH_CHUNK files at a time so the client and other
+        requests keep up. Open documents are validated from their editor
+        content and counted, but not re-published.
+
+        Args:
+            workspace_folders: Workspace folder paths
+            report_progress: Progress callback (message, percentage)
+            is_cancelled: Polled between batches; stops the run when true
+
+        Returns:
+            Summary of the run
+        """
+        loop = asyncio.get_running_loop()
+        open_uris = set(self.workspace.text_documents)
+        paths = await loop.run_in_executor(
+            self._scheduler.background, find_script_files, workspace_folders
+        )
+        paths = [path for path in paths if path.as_uri() not in open_uris]
+        total = len(paths)
+        logger.info(f"Validating {total} workspace files")
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_batch(batch):
+            # Called in the validating thread
+            loop.call_soon_threadsafe(queue.put_nowait, batch)
+
+        validation = loop.run_in_executor(
+            self._scheduler.background,
+            functools.partial(
+                validate_files,
+                paths,
+                self.index,
+                workers=self._validate_process_workers,
+                on_batch=on_batch,
+                is_cancelled=is_cancelled,
+            ),
+        )
+        validation.add_done_callback(lambda _: queue.put_nowait(None))
+
+        published = self._workspace_diagnostic_uris
+        validated: Set[str] = set()
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            for start in range(0, len(batch), _VALIDATION_PUBLISH_CHUNK):
+                for uri, diagnostics, *_ in batch[start : start + _VALIDATION_PUBLISH_CHUNK]:
+                    validated.add(uri)
+                    if uri in self.workspace.text_documents:
+                        continue  # Opened meanwhile: live diagnostics win
+                    if diagnostics or uri in published:
+                        self.text_document_publish_diagnostics(
+                            types.PublishDiagnosticsParams(uri=uri, diagnostics=diagnostics)
+                        )
+                    if diagnostics:
+                        published.add(uri)
+                    else:
+                        published.discard(uri)
+                # Let other handlers and the client catch up
+                await asyncio.sleep(0)
+            if report_progress is not None and total:
+                percentage = min(99, len(validated) * 100 // total)
+                report_progress(f"Validated {len(validated)}/{total} files", percentage)
+
+        result = await validation
+
+        if not result.cancelled:
+            # Files deleted since the last run (or now open) keep no stale results
+            for uri in published - validated:
+                self.text_document_publish_diagnostics(
+                    types.PublishDiagnosticsParams(uri=uri, diagnostics=[])
+                )
+            published &= validated
+
+            for uri in sorted(open_uris):
+                if uri not in self.workspace.text_documents:
+                    continue
+                doc = self.workspace.get_text_document(uri)
+                result.add(
+                    await loop.run_in_executor(
+                        self._scheduler.diagnostics, self.collect_document_diagnostics, doc
+                    )
+                )
+
+        return result
+
     # =====================================================================
     # Lifecycle Management
     # =====================================================================
@@ -1039,7 +1891,7 @@ class CK3LanguageServer(LanguageServer):
 
         This method:
         1. Cancels all pending document updates
-        2. Shuts down the thread pool gracefully
+        2. Shuts down the thread pools gracefully
         """
         logger.info("Shutting down CK3 Language Server...")
 
@@ -1050,67 +1902,85 @@ class CK3LanguageServer(LanguageServer):
 
         self._pending_updates.clear()
 
-        # Shutdown thread pool
-        self._thread_pool.shutdown(wait=True, cancel_futures=True)
-        logger.info("Thread pool shut down")
+        # Stop a running workspace scan at its next file
+        if self._scan_token is not None:
+            self._scan_token.cancel()
+
+        with self._preparse_lock:
+            self._preparse_queue.clear()
+
+        # Shutdown thread pools
+        self._scheduler.shutdown(wait=True, cancel_futures=True)
+        logger.info("Thread pools shut down")
 
     # =====================================================================
     # Workspace Scanning with Progress
     # =====================================================================
 
-    async def _scan_workspace_folders_async(self):
+    async def _scan_workspace_folders_async(self, fresh: bool = False):
         """
         Scan all workspace folders for scripted effects and triggers with progress.
 
         This is called on first document open to index all custom effects
         and triggers in the mod's common/ folder. Shows progress to the user.
+
+        A fresh scan (ck3.rescanWorkspace) cancels a scan that is still
+        running; the old index serves requests until the new one is done.
+
+        Args:
+            fresh: Build the index from scratch instead of updating the current one
         """
         if self._workspace_scanned:
             logger.debug("Workspace already scanned, skipping")
             return
+        if fresh and self._scan_token is not None:
+            self._scan_token.cancel()
 
         logger.info("Starting workspace scan...")
         try:
             # Get workspace folders
-            workspace_folders = []
-            if self.workspace.folders:
-                for folder in self.workspace.folders:
-                    # Convert URI to path
-                    folder_uri = folder.uri if hasattr(folder, "uri") else folder
-                    if folder_uri.startswith("file:///"):
-                        # Convert file URI to path
-                        from urllib.parse import unquote
-
-                        path = unquote(folder_uri[8:])  # Remove 'file:///'
-                        # On Windows, handle drive letter
-                        if len(path) > 2 and path[0] == "/" and path[2] == ":":
-                            path = path[1:]  # Remove leading slash
-                        workspace_folders.append(path)
-                    else:
-                        workspace_folders.append(folder_uri)
+            workspace_folders = _get_workspace_folder_paths(self)
 
             if workspace_folders:
                 folder_count = len(workspace_folders)
                 logger.info(f"Scanning {folder_count} workspace folder(s): {workspace_folders}")
 
-                # Perform the actual scan in thread pool with lock
-                # Pass the executor for parallel scanning (2-4x faster)
+                # Perform the actual scan in the background lane; the scanned
+                # index is published when done, so handlers keep answering
+                # meanwhile. Pass the executor for parallel scanning (2-4x faster)
                 loop = asyncio.get_event_loop()
-
-                def scan_with_lock():
-                    with self._index_lock:
-                        self.index.scan_workspace(workspace_folders, executor=self._thread_pool)
-
-                await loop.run_in_executor(self._thread_pool, scan_with_lock)
-
-                # Notify user of scan results (thread-safe access)
-                with self._index_lock:
-                    stats = (
-                        f"Indexed {len(self.index.events)} events, "
-                        f"{len(self.index.scripted_effects)} effects, "
-                        f"{len(self.index.scripted_triggers)} triggers, "
-                        f"{len(self.index.localization)} localization keys"
-                    )
+                # The scan schedules revalidation from the worker thread
+                self._event_loop = loop
+                async with self._scan_lock:
+                    if self._workspace_scanned:
+                        return  # Scanned while waiting for the running scan
+                    token = self._scan_token = CancellationToken()
+                    try:
+                        await loop.run_in_executor(
+                            self._scheduler.background,
+                            functools.partial(
+                                self.scan_index,
+                                workspace_folders,
+                                fresh=fresh,
+                                executor=self._scheduler.background,
+                                cancel=token,
+                            ),
+                        )
+                    except OperationCancelled:
+                        logger.info("Workspace scan cancelled")
+                        return
+                    finally:
+                        if self._scan_token is token:
+                            self._scan_token = None
+
+                # Notify user of scan results
+                index = self.index
+                stats = (
+                    f"Indexed {len(index.events)} events, "
+                    f"{len(index.scripted_effects)} effects, "
+                    f"{len(index.scripted_triggers)} triggers, "
+                    f"{len(index.localization)} localization keys"
+                )
                 logger.info(stats)
                 self.log_message(stats, types.MessageType.Info)
             else:
@@ -1125,79 +1995,276 @@ class CK3LanguageServer(LanguageServer):
 
     def _scan_workspace_folders(self):
         """
-        Scan all workspace folders for scripted effects and triggers.
+        Scan all workspace folders for scripted effects and triggers.
+
+        This is called on first document open to index all custom effects
+        and triggers in the mod's common/ folder.
+
+        Note: This is the synchronous fallback. The async version with
+        progress reporting is preferred.
+        """
+        if self._workspace_scanned:
+            return
+
+        try:
+            # Get workspace folders
+            workspace_folders = _get_workspace_folder_paths(self)
+
+            if workspace_folders:
+                logger.info(
+                    f"Scanning {len(workspace_folders)} workspace folder(s) for "
+                    f"scripted effects/triggers"
+                )
+                self.scan_index(workspace_folders)
+            else:
+                logger.warning("No workspace folders found for scanning")
+
+            self._workspace_scanned = True
+
+        except Exception as e:
+            logger.error(f"Error scanning workspace folders: {e}", exc_info=True)
+            self._workspace_scanned = True  # Don't retry on error
+
+    def parse_and_index_document(self, doc: TextDocument) -> List[CK3Node]:
+        """
+        Parse a document and update the index (thread-safe).
+
+        This is called whenever a document is opened or changed.
+
+        Args:
+            doc: The text document to parse
+
+        Returns:
+            The parsed AST
+        """
+        try:
+            source = doc.source
+            # Reopened files usually hit the AST cache (see reindex_closed_document)
+            ast = self.get_or_parse_ast(source, content_hash=self.get_document_content_hash(doc))
+
+            # Thread-safe AST update
+            self.set_ast(doc.uri, ast, source)
+            self._pending_changes.pop(doc.uri, None)
+
+            # Publish a new index version
+            self.index_document(doc.uri, ast, source)
+
+            logger.debug(f"Parsed and indexed document: {doc.uri}")
+            return ast
+        except Exception as e:
+            logger.error(f"Error parsing document {doc.uri}: {e}")
+            # Return empty AST on parse error
+            return []
+
+    def is_workspace_file(self, path: str) -> bool:
+        """
+        Whether a file lies in a workspace folder or a scanned workspace root.
+
+        Args:
+            path: File system path
+
+        Returns:
+            True if the file is inside one of the folders
+        """
+        file_path = os.path.normcase(os.path.abspath(path))
+        for root in _get_workspace_folder_paths(self) + self.index.workspace_roots:
+            root_path = os.path.normcase(os.path.abspath(root))
+            try:
+                if os.path.commonpath([file_path, root_path]) == root_path:
+                    return True
+            except ValueError:
+                pass  # Different drives
+        return False
+
+    def reindex_closed_document(self, uri: str):
+        """
+        Re-index a closed document from its file on disk.
+
+        The index keeps closed workspace files (for references, workspace
+        symbols and validation), so closing a document replaces its possibly
+        unsaved content with the saved file. Documents without a file on disk
+        and files outside the workspace (which a scan would not index) are
+        removed from the index.
+
+        Args:
+            uri: URI of the closed document
+        """
+        if uri in self._document_versions:
+            return  # Reopened in the meantime
+
+        path = to_fs_path(uri)
+        if path is None or not self.is_workspace_file(path):
+            self.unindex_document(uri)
+            return
+
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                source = f.read()
+        except (OSError, TypeError, UnicodeDecodeError):
+            self.unindex_document(uri)
+            return
+
+        try:
+            # Cached (compactly) so that reopening the file needs no parse
+            ast = self.get_or_parse_ast(source, compact=True)
+            if uri not in self._document_versions:
+                self.index_document(uri, ast, source)
+        except Exception as e:
+            logger.error(f"Error re-indexing closed document {uri}: {e}")
+
+    # =====================================================================
+    # Pre-emptive Parsing
+    # =====================================================================
+
+    def related_files(self, uri: str, ast: List[CK3Node]) -> List[str]:
+        """
+        Find the files a document refers to, which are likely opened next.
+
+        These are the files defining the scripted effects and triggers the
+        document uses and the events it mentions (by value, e.g. in
+        trigger_event), in order of first use.
+
+        Args:
+            uri: Document URI (excluded from the result)
+            ast: Parsed AST of the document
+
+        Returns:
+            URIs of at most _preparse_max_related closed files
+        """
+        index = self.index
+        related: Dict[str, None] = {}
+        stack = list(reversed(ast))
+        while stack and len(related) < self._preparse_max_related:
+            node = stack.pop()
+            location = index.scripted_effects.get(node.key) or index.scripted_triggers.get(
+                node.key
+            )
+            if location is None and isinstance(node.value, str):
+                location = index.events.get(node.value)
+            if (
+                location is not None
+                and location.uri != uri
+                and location.uri not in self.workspace.text_documents
+            ):
+                related[location.uri] = None
+            stack.extend(reversed(node.children))
+        return list(related)
+
+    def queue_preparse(self, uris: List[str]):
+        """
+        Queue files to be parsed into the AST cache when the server is idle.
 
-        This is called on first document open to index all custom effects
-        and triggers in the mod's common/ folder.
+        Must be called on the event loop.
 
-        Note: This is the synchronous fallback. The async version with
-        progress reporting is preferred.
+        Args:
+            uris: File URIs, most wanted first
         """
-        if self._workspace_scanned:
+        if not uris:
             return
+        with self._preparse_lock:
+            queued = set(self._preparse_queue)
+            self._preparse_queue.extend(uri for uri in uris if uri not in queued)
+            if self._preparse_scheduled:
+                return
+            self._preparse_scheduled = True
+        asyncio.get_running_loop().create_task(self._drain_preparse_queue())
+
+    async def _drain_preparse_queue(self):
+        """
+        Parse queued files one at a time in the background lane.
 
-        try:
-            # Get workspace folders
-            workspace_folders = []
-            if self.workspace.folders:
-                for folder in self.workspace.folders:
-                    # Convert URI to path
-                    folder_uri = folder.uri if hasattr(folder, "uri") else folder
-                    if folder_uri.startswith("file:///"):
-                        # Convert file URI to path
-                        from urllib.parse import unquote
-
-                        path = unquote(folder_uri[8:])  # Remove 'file:///'
-                        # On Windows, handle drive letter
-                        if len(path) > 2 and path[0] == "/" and path[2] == ":":
-                            path = path[1:]  # Remove leading slash
-                        workspace_folders.append(path)
-                    else:
-                        workspace_folders.append(folder_uri)
-
-            if workspace_folders:
-                logger.info(
-                    f"Scanning {len(workspace_folders)} workspace folder(s) for "
-                    f"scripted effects/triggers"
-                )
-                self.index.scan_workspace(workspace_folders)
-            else:
-                logger.warning("No workspace folders found for scanning")
-
-            self._workspace_scanned = True
+        A file is only started when no interactive or diagnostics work is
+        waiting and no document update is pending (the user is not typing).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._scheduler.is_idle() or any(
+                not task.done() for task in self._pending_updates.values()
+            ):
+                await asyncio.sleep(self._preparse_idle_delay)
+                continue
 
-        except Exception as e:
-            logger.error(f"Error scanning workspace folders: {e}", exc_info=True)
-            self._workspace_scanned = True  # Don't retry on error
+            with self._preparse_lock:
+                if not self._preparse_queue:
+                    self._preparse_scheduled = False
+                    return
+                uri = self._preparse_queue.pop(0)
 
-    def parse_and_index_document(self, doc: TextDocument) -> List[CK3Node]:
+            try:
+                await loop.run_in_executor(self._scheduler.background, self.preparse_file, uri)
+            except RuntimeError:
+                # Shutting down
+                with self._preparse_lock:
+                    self._preparse_queue.clear()
+                    self._preparse_scheduled = False
+                return
+
+    def preparse_file(self, uri: str) -> bool:
         """
-        Parse a document and update the index (thread-safe).
+        Parse a closed file into the AST cache (for the background lane).
 
-        This is called whenever a document is opened or changed.
+        Opening the file then reuses the cached AST (see get_or_parse_ast).
 
         Args:
-            doc: The text document to parse
+            uri: File URI
 
         Returns:
-            The parsed AST
+            True if the file was read and is now cached
         """
+        if uri in self.workspace.text_documents:
+            return False  # Opened in the meantime
+
         try:
-            ast = parse_document(doc.source)
+            path = to_fs_path(uri)
+            with open(path, encoding="utf-8-sig") as f:
+                source = f.read()
+            self.get_or_parse_ast(source, compact=True)
+        except (OSError, TypeError, UnicodeDecodeError):
+            return False
+        except Exception as e:
+            logger.error(f"Error pre-parsing {uri}: {e}")
+            return False
 
-            # Thread-safe AST update
-            self.set_ast(doc.uri, ast)
+        logger.debug(f"Pre-parsed {uri}")
+        return True
 
-            # Thread-safe index update
-            with self._index_lock:
-                self.index.update_from_ast(doc.uri, ast)
+    def collect_document_diagnostics(
+        self, doc: TextDocument, cancel: Optional[CancellationToken] = None
+    ) -> List[types.Diagnostic]:
+        """
+        Collect all diagnostics for an open document (thread-safe).
 
-            logger.debug(f"Parsed and indexed document: {doc.uri}")
-            return ast
-        except Exception as e:
-            logger.error(f"Error parsing document {doc.uri}: {e}")
-            # Return empty AST on parse error
-            return []
+        Args:
+            doc: The text document to validate
+            cancel: Stops the run early when cancelled
+
+        Returns:
+            List of diagnostics
+
+        Raises:
+            OperationCancelled: If ``cancel`` was cancelled
+        """
+        # Thread-safe AST access
+        ast = self.get_ast(doc.uri)
+        snapshot = self.get_snapshot(doc.uri, doc)
+        with self._ast_lock:
+            ast_is_current = self._ast_sources.get(doc.uri) == snapshot.source
+        # The block cache needs the AST of the text being checked
+        block_cache = self.get_block_cache(doc.uri) if ast_is_current else None
+
+        # Index snapshot access (no lock needed)
+        diagnostics = collect_all_diagnostics(
+            doc,
+            ast,
+            self.index,
+            lines=snapshot.lines,
+            block_cache=block_cache,
+            cancel=cancel,
+            style_scanner=self.get_style_scanner(doc.uri),
+        )
+        if block_cache is not None:
+            self._dependencies.update(doc.uri, block_cache.keys)
+        return diagnostics
 
     def publish_diagnostics_for_document(self, doc: TextDocument):
         """
@@ -1205,17 +2272,18 @@ class CK3LanguageServer(LanguageServer):
 
         This collects all validation errors and warnings for the document
         and sends them to the client via LSP's PublishDiagnostics notification.
+        A client pulling diagnostics is asked to pull again instead.
 
         Args:
             doc: The text document to validate
         """
-        try:
-            # Thread-safe AST access
-            ast = self.get_ast(doc.uri)
+        if self.pulls_diagnostics:
+            self._diagnostic_results.invalidate([doc.uri])
+            self.request_diagnostic_refresh()
+            return
 
-            # Thread-safe index access
-            with self._index_lock:
-                diagnostics = collect_all_diagnostics(doc, ast, self.index)
+        try:
+            diagnostics = self.collect_document_diagnostics(doc)
 
             # Publish diagnostics to client
             self.text_document_publish_diagnostics(
@@ -1228,13 +2296,283 @@ class CK3LanguageServer(LanguageServer):
         except Exception as e:
             logger.error(f"Error publishing diagnostics for {doc.uri}: {e}", exc_info=True)
 
+    # =====================================================================
+    # Pull Diagnostics
+    # =====================================================================
+
+    @property
+    def pulls_diagnostics(self) -> bool:
+        """Whether the client pulls diagnostics (textDocument/diagnostic) instead of pushes."""
+        capabilities = getattr(self.protocol, "client_capabilities", None)
+        text_document = capabilities.text_document if capabilities is not None else None
+        return text_document is not None and text_document.diagnostic is not None
+
+    def enable_workspace_diagnostics(self):
+        """
+        Serve workspace/diagnostic (opt-in with the ``workspaceDiagnostics``
+        initialization option).
+
+        Off by default: clients re-send workspace/diagnostic continually, and
+        every request walks and stats the whole mod (the first one validates
+        all of it), while textDocument/diagnostic already covers the documents
+        the user has open. ck3.validateWorkspace validates the mod on demand.
+        """
+        if types.WORKSPACE_DIAGNOSTIC not in self.protocol.fm.features:
+            self.feature(types.WORKSPACE_DIAGNOSTIC)(workspace_diagnostic)
+
+    def request_diagnostic_refresh(self):
+        """Ask a pulling client to pull diagnostics again, if it supports being asked."""
+        capabilities = getattr(self.protocol, "client_capabilities", None)
+        workspace = capabilities.workspace if capabilities is not None else None
+        diagnostics = workspace.diagnostics if workspace is not None else None
+        if diagnostics is not None and diagnostics.refresh_support:
+            self.workspace_diagnostic_refresh(None)
+
+    async def pull_document_diagnostics(self, uri: str) -> DiagnosticResult:
+        """
+        Current diagnostics of a document (textDocument/diagnostic).
+
+        Waits for the pending update of an edited document (which parses and
+        indexes its latest version), then returns the stored result if it is
+        of that version, or validates the document. The validation stops if
+        the document is edited meanwhile, and starts over on the new version.
+        Documents that are not open are validated from disk.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            The document's result (with its result ID)
+
+        Raises:
+            OperationCancelled: If the request was cancelled
+        """
+        loop = asyncio.get_running_loop()
+        request = self.protocol.request_token()
+        while True:
+            pending = self._pending_updates.get(uri)
+            if pending is not None and not pending.done():
+                try:
+                    await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    if not pending.cancelled():
+                        raise  # This request was cancelled
+                continue  # Superseded by a newer edit
+
+            if uri not in self.workspace.text_documents:
+                return await self._pull_file_diagnostics(uri)
+
+            version = self.get_document_version(uri)
+            result = self._diagnostic_results.get(uri)
+            if result is not None and result.version == version:
+                return result
+
+            doc = self.workspace.get_text_document(uri)
+            try:
+                diagnostics = await loop.run_in_executor(
+                    self._scheduler.diagnostics,
+                    self.collect_document_diagnostics,
+                    doc,
+                    self.cancellation_token(uri),
+                )
+            except OperationCancelled:
+                if request is not None and request.cancelled:
+                    raise
+                continue  # Edited meanwhile
+
+            if self.get_document_version(uri) == version and uri in self.workspace.text_documents:
+                result, _ = self._diagnostic_results.store(uri, diagnostics, version)
+                return result
+
+    async def _pull_file_diagnostics(self, uri: str) -> DiagnosticResult:
+        """Result of a file that is not open: stored if still valid, else validated from disk."""
+        loop = asyncio.get_running_loop()
+        index = self.index
+        path = Path(to_fs_path(uri))
+        symbols = await loop.run_in_executor(
+            self._scheduler.diagnostics, lambda: frozenset(index.dependency_symbols())
+        )
+        result = self._diagnostic_results.reusable([path], symbols).get(path)
+        if result is not None:
+            return result
+
+        validated: List[FileValidation] = []
+        await loop.run_in_executor(
+            self._scheduler.diagnostics,
+            functools.partial(validate_files, [path], index, on_batch=validated.extend),
+        )
+        if not validated:
+            # Unreadable: nothing to report
+            result, _ = self._diagnostic_results.store(uri, [])
+            return result
+        return self._store_file_result(validated[0], symbols)
+
+    def _store_file_result(
+        self, file_result: FileValidation, symbols: FrozenSet[str]
+    ) -> DiagnosticResult:
+        """Store the result of validating a closed file against an index with ``symbols``."""
+        result, _ = self._diagnostic_results.store(
+            file_result.uri,
+            file_result.diagnostics,
+            fingerprint=file_result.fingerprint,
+            keys=file_result.symbols,
+            symbols=symbols,
+        )
+        return result
+
+    async def pull_workspace_diagnostics(
+        self,
+        workspace_folders: List[str],
+        previous_result_ids: Dict[str, str],
+        on_reports: Callable[[List[types.WorkspaceDocumentDiagnosticReport]], None],
+    ) -> int:
+        """
+        Report the diagnostics of every script file of the workspace (workspace/diagnostic).
+
+        Open documents are reported first, from their current results (see
+        pull_document_diagnostics). Closed files reuse their stored result
+        if neither the file nor a definition it uses changed since; the
+        others are validated from disk in worker processes, as by
+        ck3.validateWorkspace. Reports are handed to on_reports in batches
+        as they are ready; files whose result ID the client already has are
+        reported as unchanged.
+
+        Args:
+            workspace_folders: Workspace folder paths
+            previous_result_ids: Result ID the client has, by URI
+            on_reports: Called with each batch of reports
+
+        Returns:
+            Number of files reported
+
+        Raises:
+            OperationCancelled: If the request was cancelled
+        """
+        if not self._workspace_scanned:
+            await self._scan_workspace_folders_async()
+
+        loop = asyncio.get_running_loop()
+        cancel = self.cancellation_token()
+        reported = 0
+
+        def report(reports: List[types.WorkspaceDocumentDiagnosticReport]):
+            nonlocal reported
+            if reports:
+                reported += len(reports)
+                on_reports(reports)
+
+        reports = []
+        for uri in sorted(self.workspace.text_documents):
+            result = await self.pull_document_diagnostics(uri)
+            doc = self.workspace.text_documents.get(uri)
+            version = doc.version if doc is not None else None
+            reports.append(workspace_report(uri, result, previous_result_ids.get(uri), version))
+        report(reports)
+
+        index = self.index
+
+        def find_files() -> Tuple[List[Path], FrozenSet[str]]:
+            return find_script_files(workspace_folders), frozenset(index.dependency_symbols())
+
+        paths, symbols = await loop.run_in_executor(self._scheduler.background, find_files)
+        self._diagnostic_results.prune(path.as_uri() for path in paths)
+        paths = [path for path in paths if path.as_uri() not in self.workspace.text_documents]
+        reusable = await loop.run_in_executor(
+            self._scheduler.background, self._diagnostic_results.reusable, paths, symbols
+        )
+
+        reused = [(path.as_uri(), result) for path, result in reusable.items()]
+        for start in range(0, len(reused), _VALIDATION_PUBLISH_CHUNK):
+            report(
+                [
+                    workspace_report(uri, result, previous_result_ids.get(uri))
+                    for uri, result in reused[start : start + _VALIDATION_PUBLISH_CHUNK]
+                ]
+            )
+            await asyncio.sleep(0)
+        cancel.raise_if_cancelled()
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_batch(batch):
+            # Called in the validating thread
+            loop.call_soon_threadsafe(queue.put_nowait, batch)
+
+        validation = loop.run_in_executor(
+            self._scheduler.background,
+            functools.partial(
+                validate_files,
+                [path for path in paths if path not in reusable],
+                index,
+                workers=self._validate_process_workers,
+                on_batch=on_batch,
+                is_cancelled=cancel,
+            ),
+        )
+        validation.add_done_callback(lambda _: queue.put_nowait(None))
+
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            report(
+                [
+                    workspace_report(
+                        file_result.uri,
+                        self._store_file_result(file_result, symbols),
+                        previous_result_ids.get(file_result.uri),
+                    )
+                    for file_result in batch
+                    if file_result.uri not in self.workspace.text_documents
+                ]
+            )
+            # Let other handlers and the client catch up
+            await asyncio.sleep(0)
+
+        if (await validation).cancelled:
+            raise OperationCancelled()
+        return reported
+
+
+# Files published per event loop turn while streaming workspace validation
+_VALIDATION_PUBLISH_CHUNK = 100
+
+
+def _changed_symbols(previous: DocumentIndex, current: DocumentIndex, uri: str) -> Set[str]:
+    """
+    Dependency symbols a document update defined or undefined.
+
+    Only names the document defines before or after the update can change,
+    and of those only the ones whose definedness differs (a name another
+    document still defines did not change).
+
+    Args:
+        previous: Index before the update
+        current: Index after the update
+        uri: URI of the updated document
+
+    Returns:
+        Changed symbol names (saved scopes as "scope:<name>")
+    """
+    candidates = previous.document_dependency_symbols(uri)
+    candidates |= current.document_dependency_symbols(uri)
+    return {
+        name
+        for name in candidates
+        if previous.has_dependency_symbol(name) != current.has_dependency_symbol(name)
+    }
+
 
 # Create the CK3 language server instance
 # This is the main server object that will handle all LSP communication
 # Parameters:
 #   - name: Identifier for this language server
 #   - version: Server version (should match package version)
-server = CK3LanguageServer("ck3-language-server", "v0.1.0")
+server = CK3LanguageServer(
+    "ck3-language-server",
+    "v0.1.0",
+    text_document_sync_kind=types.TextDocumentSyncKind.Incremental,
+)
 
 
 @server.feature(types.TEXT_DOCUMENT_DID_OPEN)
@@ -1257,14 +2595,18 @@ async def did_open(ls: CK3LanguageServer, params: types.DidOpenTextDocumentParam
         This is a notification from client to server, no response is expected.
     """
     logger.info(f"Document opened: {params.text_document.uri}")
+    # Cross-file revalidation is scheduled from worker threads too
+    ls._event_loop = asyncio.get_running_loop()
 
     # Parse the document FIRST for immediate responsiveness
     # This ensures documentSymbol, hover, etc. work immediately
     doc = ls.workspace.get_text_document(params.text_document.uri)
     ls.parse_and_index_document(doc)
 
-    # Publish initial diagnostics (may have false positives until workspace scan completes)
-    ls.publish_diagnostics_for_document(doc)
+    # Publish initial diagnostics (may have false positives until workspace scan completes);
+    # a client pulling diagnostics asks for them itself
+    if not ls.pulls_diagnostics:
+        ls.publish_diagnostics_for_document(doc)
 
     # On first document open, scan workspace for scripted effects/triggers/localization
     # This runs after parsing so the document is immediately usable
@@ -1276,6 +2618,9 @@ async def did_open(ls: CK3LanguageServer, params: types.DidOpenTextDocumentParam
         # This clears false positives for custom triggers/effects
         ls.publish_diagnostics_for_document(doc)
 
+    # Parse the files this document refers to while the server is idle
+    ls.queue_preparse(ls.related_files(doc.uri, ls.get_ast(doc.uri)))
+
 
 @server.feature(types.TEXT_DOCUMENT_DID_CHANGE)
 async def did_change(ls: CK3LanguageServer, params: types.DidChangeTextDocumentParams):
@@ -1313,8 +2658,18 @@ async def did_change(ls: CK3LanguageServer, params: types.DidChangeTextDocumentP
         logger.warning(f"Could not get document {uri}: {e}")
         return
 
+    # Remember the edits so the update can re-parse only the touched blocks
+    ls.add_pending_changes(uri, params.content_changes)
+
+    # Artifacts memoized for the previous version are stale now
+    ls.discard_snapshot(uri)
+
     # Schedule async update (debounced, runs in thread pool)
-    await ls.schedule_document_update(uri, doc.source)
+    # Buffered documents report their line count without building the source
+    if isinstance(doc, BufferedTextDocument):
+        await ls.schedule_document_update(uri, line_count=doc.line_count)
+    else:
+        await ls.schedule_document_update(uri, doc.source)
 
 
 @server.feature(types.TEXT_DOCUMENT_DID_CLOSE)
@@ -1323,8 +2678,9 @@ def did_close(ls: CK3LanguageServer, params: types.DidCloseTextDocumentParams):
     Handle document close event.
 
     This handler is called when a user closes a CK3 script file in their editor.
-    It cleans up document-specific resources, removes entries from the index,
-    and clears diagnostics.
+    It cleans up document-specific resources, re-indexes the saved file (or
+    removes the document from the index if there is none), and clears
+    diagnostics.
 
     Args:
         ls: The CK3 language server instance
@@ -1350,13 +2706,17 @@ def did_close(ls: CK3LanguageServer, params: types.DidCloseTextDocumentParams):
 
     # Remove version tracking
     ls._document_versions.pop(uri, None)
+    ls._pending_changes.pop(uri, None)
 
-    # Thread-safe AST removal
+    # Thread-safe AST removal (also stops cross-file revalidation)
     ls.remove_ast(uri)
+    with ls._revalidation_lock:
+        ls._revalidation_pending.discard(uri)
+    # Its pulled result is of the editor content, not of the saved file
+    ls._diagnostic_results.discard(uri)
 
-    # Thread-safe index removal
-    with ls._index_lock:
-        ls.index.remove_document(uri)
+    # Index the saved file instead of the editor content (in the background)
+    ls._scheduler.background.submit(ls.reindex_closed_document, uri)
 
     # Clear diagnostics for this document
     ls.text_document_publish_diagnostics(
@@ -1367,6 +2727,85 @@ def did_close(ls: CK3LanguageServer, params: types.DidCloseTextDocumentParams):
     )
 
 
+@server.feature(
+    types.TEXT_DOCUMENT_DIAGNOSTIC,
+    types.DiagnosticOptions(
+        identifier="ck3", inter_file_dependencies=True, workspace_diagnostics=False
+    ),
+)
+async def document_diagnostic(ls: CK3LanguageServer, params: types.DocumentDiagnosticParams):
+    """
+    Handle pull diagnostics for one document.
+
+    Clients supporting pull diagnostics ask for a document's diagnostics
+    when they need them (e.g. after an edit, for visible documents),
+    instead of receiving every result the server computes. The response is
+    "unchanged", without diagnostics, if the client's previous result ID is
+    still current.
+
+    Args:
+        ls: The CK3 language server instance
+        params: Contains:
+            - text_document.uri: The document to validate
+            - previous_result_id: Result ID of the client's current diagnostics
+
+    Returns:
+        Full or unchanged document diagnostic report
+
+    LSP Specification:
+        textDocument/diagnostic (3.17). inter_file_dependencies tells the
+        client that editing one file can change the diagnostics of others.
+        workspace_diagnostics is set from whether workspace/diagnostic is
+        registered (see CK3LanguageServer.enable_workspace_diagnostics).
+    """
+    result = await ls.pull_document_diagnostics(params.text_document.uri)
+    return document_report(result, params.previous_result_id)
+
+
+async def workspace_diagnostic(ls: CK3LanguageServer, params: types.WorkspaceDiagnosticParams):
+    """
+    Handle pull diagnostics for the whole workspace.
+
+    Reports every script file of the indexed workspace: open documents from
+    their current results, closed files from the stored results that are
+    still valid or by validating them from disk. With a partial result
+    token, reports are streamed in batches as ``$/progress`` notifications
+    and the response itself is empty.
+
+    Args:
+        ls: The CK3 language server instance
+        params: Contains:
+            - previous_result_ids: Result IDs the client has, per URI
+            - partial_result_token: Token for streaming partial results
+
+    Returns:
+        Workspace diagnostic report
+
+    LSP Specification:
+        workspace/diagnostic (3.17). Only registered when enabled, see
+        CK3LanguageServer.enable_workspace_diagnostics.
+    """
+    previous_result_ids = {previous.uri: previous.value for previous in params.previous_result_ids}
+    token = params.partial_result_token
+    items: List[types.WorkspaceDocumentDiagnosticReport] = []
+
+    def on_reports(reports: List[types.WorkspaceDocumentDiagnosticReport]):
+        if token is None:
+            items.extend(reports)
+        else:
+            ls.protocol.notify(
+                types.PROGRESS,
+                types.ProgressParams(
+                    token=token, value=types.WorkspaceDiagnosticReportPartialResult(items=reports)
+                ),
+            )
+
+    await ls.pull_workspace_diagnostics(
+        _get_workspace_folder_paths(ls), previous_result_ids, on_reports
+    )
+    return types.WorkspaceDiagnosticReport(items=items)
+
+
 @server.feature(
     types.TEXT_DOCUMENT_COMPLETION,
     types.CompletionOptions(trigger_characters=["_", ".", ":", "="]),
@@ -1402,7 +2841,6 @@ def completions(ls: CK3LanguageServer, params: types.CompletionParams):
     try:
         logger.debug(f"Completion request at {params.text_document.uri}:{params.position.line}:{params.position.character}")
         doc = ls.workspace.get_text_document(params.text_document.uri)
-        ast = ls.get_ast(doc.uri)
 
         # Get the current line text for context detection
         lines = doc.source.split("\n")
@@ -1410,7 +2848,8 @@ def completions(ls: CK3LanguageServer, params: types.CompletionParams):
         logger.debug(f"Completion line text: '{line_text}'")
 
         # Find the AST node at cursor position for context
-        node = get_node_at_position(ast, params.position) if ast else None
+        position_index = ls.get_position_index(doc.uri)
+        node = position_index.node_at(params.position) if position_index else None
 
         # Get context-aware completions
         result = get_context_aware_completions(
@@ -1467,7 +2906,9 @@ def hover(ls: CK3LanguageServer, params: types.HoverParams):
         doc = ls.workspace.get_text_document(params.text_document.uri)
         ast = ls.get_ast(doc.uri)
 
-        result = create_hover_response(doc, params.position, ast, ls.index)
+        result = create_hover_response(
+            doc, params.position, ast, ls.index, ls.get_position_index(doc.uri)
+        )
         logger.debug(f"Hover result: {'Found' if result else 'None'}")
         return result
     except Exception as e:
@@ -1648,8 +3089,8 @@ def code_action(ls: CK3LanguageServer, params: types.CodeActionParams):
             selected_text = "\n".join(selected_lines)
 
         # Detect context (trigger vs effect block)
-        ast = ls.get_ast(doc.uri)
-        node = get_node_at_position(ast, params.range.start) if ast else None
+        position_index = ls.get_position_index(doc.uri)
+        node = position_index.node_at(params.range.start) if position_index else None
         context = "unknown"
         if node:
             ctx = detect_context(node, params.range.start, "", ls.index)
@@ -1676,7 +3117,7 @@ def code_action(ls: CK3LanguageServer, params: types.CodeActionParams):
 
 
 @server.feature(types.TEXT_DOCUMENT_REFERENCES)
-@server.thread()  # Run in thread pool - iterates all ASTs
+@server.thread()  # Run in thread pool - may fall back to walking open ASTs
 def references(ls: CK3LanguageServer, params: types.ReferenceParams):
     """
     Find all references to a symbol across the workspace.
@@ -1685,7 +3126,10 @@ def references(ls: CK3LanguageServer, params: types.ReferenceParams):
     trigger, saved scope, etc.) is referenced. This is useful for understanding
     how events are connected, where effects are used, and for refactoring.
 
-    Runs in thread pool as it iterates through all open document ASTs.
+    Events, scripted effects/triggers, saved scopes, character flags and
+    script values are answered from the index's reference table, which
+    covers every scanned workspace file (open or not). Other words fall back
+    to searching the ASTs of open documents.
 
     Args:
         ls: The CK3 language server instance
@@ -1715,9 +3159,43 @@ def references(ls: CK3LanguageServer, params: types.ReferenceParams):
 
         logger.debug(f"Find references for: {word}")
 
-        references_list = []
+        # Index snapshot (immutable, no lock needed)
+        index = ls.index
+
+        # Find the definition location
+        def_location = None
+        if word.startswith("scope:"):
+            name, kinds = word[6:], {"saved_scope"}
+            if index:
+                def_location = index.find_saved_scope(name)
+        else:
+            name, kinds = word, None
+            if "." in word and index:
+                def_location = index.find_event(word)
+            if not def_location and index:
+                def_location = index.find_scripted_effect(word)
+            if not def_location and index:
+                def_location = index.find_scripted_trigger(word)
+            if not def_location and index:
+                def_location = index.script_values.get(word)
+
+        references_list = index.find_references(name, kinds) if index else []
+
+        if references_list or def_location:
+            if def_location:
+                # The declaration is listed once, first (save_scope_as is
+                # both the saved scope definition and a reference)
+                references_list = [
+                    ref
+                    for ref in references_list
+                    if ref.uri != def_location.uri
+                    or ref.range.start.line != def_location.range.start.line
+                ]
+                if params.context.include_declaration:
+                    references_list.insert(0, def_location)
+            return references_list if references_list else None
 
-        # Thread-safe iteration over ASTs
+        # Not an indexed symbol: search the open documents
         with ls._ast_lock:
             ast_items = list(ls.document_asts.items())
 
@@ -1730,33 +3208,6 @@ def references(ls: CK3LanguageServer, params: types.ReferenceParams):
                 logger.warning(f"Error searching {uri}: {e}")
                 continue
 
-        # If include_declaration is False, filter out the definition itself
-        if not params.context.include_declaration:
-            # Try to find the definition location
-            def_location = None
-
-            # Thread-safe index access
-            with ls._index_lock:
-                # Check various symbol types
-                if "." in word and ls.index:
-                    def_location = ls.index.find_event(word)
-                if not def_location and ls.index:
-                    def_location = ls.index.find_scripted_effect(word)
-                if not def_location and ls.index:
-                    def_location = ls.index.find_scripted_trigger(word)
-                if not def_location and word.startswith("scope:") and ls.index:
-                    scope_name = word[6:]
-                    def_location = ls.index.find_saved_scope(scope_name)
-
-            # Filter out the definition
-            if def_location:
-                references_list = [
-                    ref
-                    for ref in references_list
-                    if ref.uri != def_location.uri
-                    or ref.range.start.line != def_location.range.start.line
-                ]
-
         return references_list if references_list else None
 
     except Exception as e:
@@ -1815,19 +3266,8 @@ def document_symbol(ls: CK3LanguageServer, params: types.DocumentSymbolParams):
         DocumentSymbol[] or SymbolInformation[], or null.
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
-        ast = ls.get_ast(doc.uri)
-
-        if not ast:
-            return None
-
-        symbols = []
-
-        # Extract symbols from AST
-        for node in ast:
-            symbol = _extract_symbol_from_node(node)
-            if symbol:
-                symbols.append(symbol)
+        snapshot = ls.get_snapshot(params.text_document.uri)
+        symbols = snapshot.memoize("document_symbols", lambda: _document_symbols(snapshot.ast))
 
         return symbols if symbols else None
 
@@ -1836,6 +3276,24 @@ def document_symbol(ls: CK3LanguageServer, params: types.DocumentSymbolParams):
         return None
 
 
+def _document_symbols(ast: List[CK3Node]) -> List[types.DocumentSymbol]:
+    """
+    Build the outline symbols of a document.
+
+    Args:
+        ast: Top-level nodes of the document
+
+    Returns:
+        DocumentSymbol for each top-level node that has one
+    """
+    symbols = []
+    for node in ast:
+        symbol = _extract_symbol_from_node(node)
+        if symbol:
+            symbols.append(symbol)
+    return symbols
+
+
 def _extract_symbol_from_node(node: CK3Node) -> Optional[types.DocumentSymbol]:
     """
     Extract a DocumentSymbol from a CK3Node.
@@ -1915,8 +3373,18 @@ def _extract_symbol_from_node(node: CK3Node) -> Optional[types.DocumentSymbol]:
     )
 
 
+# Symbol kind and container name per searched index table
+_WORKSPACE_SYMBOL_KINDS = {
+    "events": (types.SymbolKind.Event, "Event"),
+    "scripted_effects": (types.SymbolKind.Function, "Scripted Effect"),
+    "scripted_triggers": (types.SymbolKind.Function, "Scripted Trigger"),
+    "script_values": (types.SymbolKind.Variable, "Script Value"),
+    "on_action_definitions": (types.SymbolKind.Event, "On-Action"),
+}
+
+
 @server.feature(types.WORKSPACE_SYMBOL)
-@server.thread()  # Run in thread pool - searches entire index
+@server.thread()  # Run in thread pool - searches the symbol index
 def workspace_symbol(ls: CK3LanguageServer, params: types.WorkspaceSymbolParams):
     """
     Search for symbols across the entire workspace.
@@ -1925,7 +3393,10 @@ def workspace_symbol(ls: CK3LanguageServer, params: types.WorkspaceSymbolParams)
     workspace by name. It supports fuzzy matching and is typically invoked with
     Ctrl+T in VS Code.
 
-    Runs in thread pool as it searches through the full index.
+    Uses the index's symbol search (DocumentIndex.search_symbols), which
+    looks up candidates instead of testing every name, and returns the best
+    ranked matches only. An empty query (the initial list VS Code shows)
+    returns the top symbols. Runs in thread pool.
 
     Args:
         ls: The CK3 language server instance
@@ -1940,79 +3411,24 @@ def workspace_symbol(ls: CK3LanguageServer, params: types.WorkspaceSymbolParams)
         SymbolInformation[] or WorkspaceSymbol[], or null.
     """
     try:
-        query = params.query.lower()
+        query = params.query
 
-        if not query:
+        # Index snapshot (immutable, no lock needed)
+        index = ls.index
+        if not index:
             return None
 
         symbols = []
-
-        # Thread-safe index access - wrap all index reads in lock
-        with ls._index_lock:
-            # Search events
-            if ls.index:
-                for event_id, location in ls.index.events.items():
-                    if query in event_id.lower():
-                        symbols.append(
-                            types.SymbolInformation(
-                                name=event_id,
-                                kind=types.SymbolKind.Event,
-                                location=location,
-                                container_name="Event",
-                            )
-                        )
-
-            # Search scripted effects
-            if ls.index:
-                for effect_name, location in ls.index.scripted_effects.items():
-                    if query in effect_name.lower():
-                        symbols.append(
-                            types.SymbolInformation(
-                                name=effect_name,
-                                kind=types.SymbolKind.Function,
-                                location=location,
-                                container_name="Scripted Effect",
-                            )
-                        )
-
-            # Search scripted triggers
-            if ls.index:
-                for trigger_name, location in ls.index.scripted_triggers.items():
-                    if query in trigger_name.lower():
-                        symbols.append(
-                            types.SymbolInformation(
-                                name=trigger_name,
-                                kind=types.SymbolKind.Function,
-                                location=location,
-                                container_name="Scripted Trigger",
-                            )
-                        )
-
-            # Search script values
-            if ls.index:
-                for value_name, location in ls.index.script_values.items():
-                    if query in value_name.lower():
-                        symbols.append(
-                            types.SymbolInformation(
-                                name=value_name,
-                                kind=types.SymbolKind.Variable,
-                                location=location,
-                                container_name="Script Value",
-                            )
-                        )
-
-            # Search on_actions
-            if ls.index:
-                for on_action_name, location in ls.index.on_action_definitions.items():
-                    if query in on_action_name.lower():
-                        symbols.append(
-                            types.SymbolInformation(
-                                name=on_action_name,
-                                kind=types.SymbolKind.Event,
-                                location=location,
-                                container_name="On-Action",
-                            )
-                        )
+        for table_name, name, location in index.search_symbols(query):
+            kind, container_name = _WORKSPACE_SYMBOL_KINDS[table_name]
+            symbols.append(
+                types.SymbolInformation(
+                    name=name,
+                    kind=kind,
+                    location=location,
+                    container_name=container_name,
+                )
+            )
 
         return symbols if symbols else None
 
@@ -2076,14 +3492,14 @@ def semantic_tokens_full(ls: CK3LanguageServer, params: types.SemanticTokensPara
         - defaultLibrary: Built-in game effects/triggers
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
+        snapshot = ls.get_snapshot(params.text_document.uri)
 
-        # Thread-safe index access
-        with ls._index_lock:
-            index = ls.index
+        # Index snapshot (immutable, no lock needed)
+        index = ls.index
 
-        # Get semantic tokens using the module
-        return get_semantic_tokens(doc.source, index)
+        # Memoized per document version and index version; stops early when
+        # the client cancels or the document changes
+        return snapshot.semantic_tokens(index, ls.cancellation_token(params.text_document.uri))
 
     except Exception as e:
         logger.error(f"Error in semantic_tokens handler: {e}", exc_info=True)
@@ -2307,7 +3723,7 @@ def inlay_hint(ls: CK3LanguageServer, params: types.InlayHintParams):
         via editor settings (e.g., Editor > Inlay Hints in VS Code).
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
+        snapshot = ls.get_snapshot(params.text_document.uri)
 
         # Get inlay hint configuration from initialization options
         config = InlayHintConfig(
@@ -2318,7 +3734,7 @@ def inlay_hint(ls: CK3LanguageServer, params: types.InlayHintParams):
         )
 
         # Get inlay hints for the range
-        hints = get_inlay_hints(doc.source, params.range, ls.index, config)
+        hints = get_inlay_hints(snapshot.source, params.range, ls.index, config, snapshot.lines)
 
         if hints:
             logger.debug(f"Providing {len(hints)} inlay hint(s)")
@@ -2456,9 +3872,9 @@ def document_highlight(
         `scope:target` and `save_scope_as = target` will be highlighted.
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
+        snapshot = ls.get_snapshot(params.text_document.uri)
 
-        highlights = get_document_highlights(doc.source, params.position)
+        highlights = get_document_highlights(snapshot.source, params.position, snapshot.lines)
 
         if highlights:
             logger.debug(f"Found {len(highlights)} highlight(s) at position {params.position}")
@@ -2508,12 +3924,14 @@ def document_link(
         comments can navigate to event definitions.
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
+        snapshot = ls.get_snapshot(params.text_document.uri)
 
         # Get workspace folders for path resolution
         workspace_folders = _get_workspace_folder_paths(ls)
 
-        links = get_document_links(doc.source, params.text_document.uri, workspace_folders)
+        links = get_document_links(
+            snapshot.source, params.text_document.uri, workspace_folders, snapshot.lines
+        )
 
         if links:
             logger.debug(f"Found {len(links)} document link(s)")
@@ -2562,15 +3980,9 @@ def _get_workspace_folder_paths(ls: CK3LanguageServer) -> List[str]:
     if ls.workspace.folders:
         for folder in ls.workspace.folders:
             folder_uri = folder.uri if hasattr(folder, "uri") else folder
-            if folder_uri.startswith("file:///"):
-                from urllib.parse import unquote
-
-                path = unquote(folder_uri[8:])
-                if len(path) > 2 and path[0] == "/" and path[2] == ":":
-                    path = path[1:]
-                workspace_folders.append(path)
-            else:
-                workspace_folders.append(folder_uri)
+            # to_fs_path keeps the leading "/" of POSIX paths and drops it before drive letters
+            path = to_fs_path(folder_uri) if folder_uri.startswith("file:") else None
+            workspace_folders.append(path or folder_uri)
     return workspace_folders
 
 
@@ -2721,9 +4133,8 @@ def folding_range(
         Use Ctrl+Shift+] to unfold at cursor.
     """
     try:
-        doc = ls.workspace.get_text_document(params.text_document.uri)
-
-        ranges = get_folding_ranges(doc.source)
+        # Memoized per document version (editors re-request after every edit)
+        ranges = ls.get_snapshot(params.text_document.uri).folding_ranges
 
         logger.debug(f"Folding ranges: {len(ranges)} ranges for {params.text_document.uri}")
 
@@ -2764,79 +4175,76 @@ async def validate_workspace_command(ls: CK3LanguageServer, *args: Any):
     """
     Command: Validate entire workspace.
 
-    Scans all files in the workspace and reports validation results.
-    Shows progress during validation and summarizes findings.
+    Rescans the workspace, then runs all diagnostics on every script file
+    (in worker processes, see workspace_validation.py). Diagnostics of each
+    file are published as they are ready; progress is shown and the user
+    can cancel the run.
 
     Args:
         ls: The language server instance
         args: Command arguments (unused)
 
     Returns:
-        Dictionary with validation results
+        Dictionary with index statistics and the validation summary
+        (files, diagnostics, counts by code and by severity)
     """
     logger.info("Executing ck3.validateWorkspace command")
     args = _normalize_command_args(args)
 
-    async def validate_with_progress(report_progress):
-        report_progress("Validating workspace...", 0)
+    async def validate_with_progress(report_progress, is_cancelled):
+        report_progress("Scanning workspace files...", 0)
 
         # Force rescan of workspace
+        was_scanned = ls._workspace_scanned
         ls._workspace_scanned = False
-
-        report_progress("Scanning workspace files...", 25)
-
-        # Get workspace folders and scan
-        workspace_folders = []
-        if ls.workspace.folders:
-            for folder in ls.workspace.folders:
-                folder_uri = folder.uri if hasattr(folder, "uri") else folder
-                if folder_uri.startswith("file:///"):
-                    from urllib.parse import unquote
-
-                    path = unquote(folder_uri[8:])
-                    if len(path) > 2 and path[0] == "/" and path[2] == ":":
-                        path = path[1:]
-                    workspace_folders.append(path)
-                else:
-                    workspace_folders.append(folder_uri)
+        workspace_folders = _get_workspace_folder_paths(ls)
 
         if workspace_folders:
             loop = asyncio.get_event_loop()
 
-            # Run scan in thread pool with thread-safe index access
-            def scan_with_lock():
-                with ls._index_lock:
-                    ls.index.scan_workspace(workspace_folders)
-
-            await loop.run_in_executor(ls._thread_pool, scan_with_lock)
+            # Run scan in the background lane; the scanned index is published
+            # atomically, or not at all if the user cancels
+            try:
+                async with ls._scan_lock:
+                    await loop.run_in_executor(
+                        ls._scheduler.background,
+                        functools.partial(
+                            ls.scan_index,
+                            workspace_folders,
+                            cancel=CancellationToken(is_cancelled),
+                        ),
+                    )
+            except OperationCancelled:
+                ls._workspace_scanned = was_scanned
+                return _workspace_stats(ls, WorkspaceValidationResult(cancelled=True))
 
         ls._workspace_scanned = True
 
-        report_progress("Analyzing results...", 75)
-
-        # Thread-safe stats collection
-        with ls._index_lock:
-            stats = {
-                "events": len(ls.index.events),
-                "scripted_effects": len(ls.index.scripted_effects),
-                "scripted_triggers": len(ls.index.scripted_triggers),
-                "localization_keys": len(ls.index.localization),
-                "character_flags": len(ls.index.character_flags),
-                "saved_scopes": len(ls.index.saved_scopes),
-            }
+        report_progress("Validating files...", 0)
+        result = await ls.validate_workspace_files(
+            workspace_folders, report_progress, is_cancelled
+        )
+
+        stats = _workspace_stats(ls, result)
 
-        report_progress("Validation complete!", 100)
+        report_progress("Validation cancelled" if result.cancelled else "Validation complete!", 100)
         return stats
 
     try:
-        stats = await ls.with_progress("Validating CK3 Workspace", validate_with_progress)
+        stats = await ls.with_progress(
+            "Validating CK3 Workspace", validate_with_progress, cancellable=True
+        )
 
         # Show summary message
+        validation = stats["validation"]
+        top_codes = ", ".join(
+            f"{code} ({count})" for code, count in list(validation["by_code"].items())[:5]
+        )
         summary = (
-            f"Workspace validated: {stats['events']} events, "
-            f"{stats['scripted_effects']} effects, "
-            f"{stats['scripted_triggers']} triggers, "
-            f"{stats['localization_keys']} loc keys"
+            f"Workspace validated: {validation['diagnostics']} issues "
+            f"in {validation['files']} files"
+            + (f" (most frequent: {top_codes})" if top_codes else "")
+            + (" - cancelled" if validation["cancelled"] else "")
         )
         ls.notify_info(summary)
 
@@ -2848,6 +4256,20 @@ async def validate_workspace_command(ls: CK3LanguageServer, *args: Any):
         return {"error": str(e)}
 
 
+def _workspace_stats(ls: CK3LanguageServer, result: WorkspaceValidationResult) -> Dict[str, Any]:
+    """ck3.validateWorkspace response: current index statistics and the validation summary."""
+    index = ls.index
+    return {
+        "events": len(index.events),
+        "scripted_effects": len(index.scripted_effects),
+        "scripted_triggers": len(index.scripted_triggers),
+        "localization_keys": len(index.localization),
+        "character_flags": len(index.character_flags),
+        "saved_scopes": len(index.saved_scopes),
+        "validation": result.to_dict(),
+    }
+
+
 @server.command("ck3.rescanWorkspace")
 async def rescan_workspace_command(ls: CK3LanguageServer, *args: Any):
     """
@@ -2869,21 +4291,18 @@ async def rescan_workspace_command(ls: CK3LanguageServer, *args: Any):
     # Reset scan state
     ls._workspace_scanned = False
 
-    # Thread-safe index replacement
-    with ls._index_lock:
-        ls.index = DocumentIndex()
+    # Rescan into a fresh index with progress; the old index keeps serving
+    # requests until the new one is published
+    await ls._scan_workspace_folders_async(fresh=True)
 
-    # Rescan with progress
-    await ls._scan_workspace_folders_async()
-
-    # Thread-safe stats collection
-    with ls._index_lock:
-        return {
-            "events": len(ls.index.events),
-            "scripted_effects": len(ls.index.scripted_effects),
-            "scripted_triggers": len(ls.index.scripted_triggers),
-            "localization_keys": len(ls.index.localization),
-        }
+    # Stats from the current index snapshot
+    index = ls.index
+    return {
+        "events": len(index.events),
+        "scripted_effects": len(index.scripted_effects),
+        "scripted_triggers": len(index.scripted_triggers),
+        "localization_keys": len(index.localization),
+    }
 
 
 @server.command("ck3.getWorkspaceStats")
@@ -2903,24 +4322,25 @@ def get_workspace_stats_command(ls: CK3LanguageServer, *args: Any):
     logger.info("Executing ck3.getWorkspaceStats command")
     args = _normalize_command_args(args)
 
-    # Thread-safe stats collection
-    with ls._index_lock:
-        return {
-            "scanned": ls._workspace_scanned,
-            "events": len(ls.index.events),
-            "namespaces": len(ls.index.namespaces),
-            "scripted_effects": len(ls.index.scripted_effects),
-            "scripted_triggers": len(ls.index.scripted_triggers),
-            "script_values": len(ls.index.script_values),
-            "localization_keys": len(ls.index.localization),
-            "character_flags": len(ls.index.character_flags),
-            "saved_scopes": len(ls.index.saved_scopes),
-            "character_interactions": len(ls.index.character_interactions),
-            "modifiers": len(ls.index.modifiers),
-            "on_actions": len(ls.index.on_action_definitions),
-            "opinion_modifiers": len(ls.index.opinion_modifiers),
-            "scripted_guis": len(ls.index.scripted_guis),
-        }
+    # Stats from the current index snapshot
+    index = ls.index
+    return {
+        "scanned": ls._workspace_scanned,
+        "events": len(index.events),
+        "namespaces": len(index.namespaces),
+        "scripted_effects": len(index.scripted_effects),
+        "scripted_triggers": len(index.scripted_triggers),
+        "script_values": len(index.script_values),
+        "localization_keys": len(index.localization),
+        "character_flags": len(index.character_flags),
+        "saved_scopes": len(index.saved_scopes),
+        "character_interactions": len(index.character_interactions),
+        "modifiers": len(index.modifiers),
+        "on_actions": len(index.on_action_definitions),
+        "opinion_modifiers": len(index.opinion_modifiers),
+        "scripted_guis": len(index.scripted_guis),
+        "scheduler": ls._scheduler.stats(),
+    }
 
 
 @server.command("ck3.generateEventTemplate")
@@ -3704,11 +5124,21 @@ def main():
     Usage:
         python -m pychivalry.server
         python -m pychivalry.server --log-level debug
+        python -m pychivalry.server --scan-workers 4
+        python -m pychivalry.server --validate-workers 8
+        pychivalry lint path/to/mod (batch linting, see lint.py)
 
     The server will log "Starting Crusader Kings 3 Language Server..." and then wait for
     LSP messages. You should see "Starting IO server" when it begins listening.
     """
     import argparse
+    import sys
+
+    # Batch linting for CI: pychivalry lint <mod> ... (see lint.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "lint":
+        from .lint import main as lint_main
+
+        sys.exit(lint_main(sys.argv[2:]))
 
     parser = argparse.ArgumentParser(description="Crusader Kings 3 Language Server")
     parser.add_argument(
@@ -3717,11 +5147,29 @@ def main():
         default="info",
         help="Set the logging level (default: info)",
     )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Scan the workspace with N worker processes (default: 0, use threads)",
+    )
+    parser.add_argument(
+        "--validate-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Validate the workspace with N worker processes (default: one per CPU, 0: threads)",
+    )
     args = parser.parse_args()
 
     # Configure logging with the specified level
     configure_logging(args.log_level)
 
+    server._scan_process_workers = max(0, args.scan_workers)
+    if args.validate_workers is not None:
+        server._validate_process_workers = max(0, args.validate_workers)
+
     logger.info("Starting Crusader Kings 3 Language Server...")
     # Start the language server in IO mode (stdin/stdout communication)
     # This is a blocking call that runs until the server is shut down
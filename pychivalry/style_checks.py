@@ -63,6 +63,29 @@ ARCHITECTURE:
        - Find truncated scope references
        - Pattern-based suspicious name detection
 
+    **Single-Pass Scanner**:
+    All checks run in one StyleScanner pass instead of one pass each. Every
+    line is analyzed once: strings and comments are stripped, braces are
+    located, and the diagnostics that depend on the line alone (trailing
+    whitespace, operator spacing, line length, empty blocks, scope
+    references, merged identifiers, ...) are computed. A second, cheap loop
+    over those results carries the state that spans lines (indentation
+    stack, nesting depth, open braces, namespace position) and emits the
+    diagnostics that depend on it. Identical lines (closing braces, blank
+    lines, ...) are analyzed once.
+
+    **Incremental Re-Checking**:
+    A StyleScanner kept per document (like BlockDiagnosticCache in
+    diagnostic_cache.py for the AST checks) remembers its previous lines.
+    Only lines whose text changed are analyzed again; unchanged lines keep
+    their results (shifted if lines were inserted above them). The
+    cross-line state is checkpointed every _CHECKPOINT_LINES lines, so the
+    second loop resumes at the last checkpoint before the first changed
+    line instead of at the top of the file.
+
+    The check_* functions run the scanner and return one check's results;
+    check_style() returns all of them, in the order of the check_* functions.
+
 PARADOX STYLE CONVENTIONS:
     1. **Tabs for Indentation**: Always use tabs, not spaces
     2. **Brace Placement**: Opening brace on same line
@@ -97,10 +120,10 @@ USAGE EXAMPLES:
     >>> edits = format_document(document)  # Auto-fixes style issues
 
 PERFORMANCE:
-    - Style validation: ~10-30ms per 1000 lines
-    - Indentation check: O(n) line scan
-    - Brace matching: O(n) with stack
-    - Full file: ~30-50ms for 2000-line file
+    - One analysis per distinct line text, instead of one pass per check
+      (most of which stripped strings and comments again)
+    - Re-check after an edit: analysis of the changed lines, plus the
+      cross-line loop from the last checkpoint before them
     
     Fast enough to run on every file change.
     Results cached until next edit.
@@ -124,8 +147,9 @@ SEE ALSO:
 
 import re
 import logging
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
 
 from lsprotocol import types
 from pygls.workspace import TextDocument
@@ -170,30 +194,42 @@ def create_style_diagnostic(
     )
 
 
+def _find_quote(line: str, start: int) -> int:
+    """Index of the next '"' that is not preceded by a backslash (-1 if none)."""
+    pos = line.find('"', start)
+    while pos > 0 and line[pos - 1] == "\\":
+        pos = line.find('"', pos + 1)
+    return pos
+
+
 def _remove_strings_and_comments(line: str) -> str:
     """Remove string literals and comments from a line for analysis."""
-    result = []
-    in_string = False
-    i = 0
-    while i < len(line):
-        char = line[i]
-
-        # Handle string boundaries
-        if char == '"' and (i == 0 or line[i - 1] != "\\"):
-            in_string = not in_string
-            result.append(char)
-            i += 1
-            continue
+    if '"' not in line:
+        comment = line.find("#")
+        return line if comment < 0 else line[:comment]
 
-        # Handle comments (only outside strings)
-        if char == "#" and not in_string:
-            break  # Rest of line is comment
+    result = []
+    pos = 0
+    while True:
+        quote = _find_quote(line, pos)
+        comment = line.find("#", pos)
+        # Comments (only outside strings)
+        if comment >= 0 and (quote < 0 or comment < quote):
+            result.append(line[pos:comment])
+            break
+        if quote < 0:
+            result.append(line[pos:])
+            break
+        result.append(line[pos : quote + 1])
 
-        if in_string:
-            result.append(" ")  # Replace string content with space
-        else:
-            result.append(char)
-        i += 1
+        # Replace string content with spaces
+        end = _find_quote(line, quote + 1)
+        if end < 0:
+            result.append(" " * (len(line) - quote - 1))
+            break
+        result.append(" " * (end - quote - 1))
+        result.append('"')
+        pos = end + 1
 
     return "".join(result)
 
@@ -220,67 +256,723 @@ def _count_indent_level(line: str) -> Tuple[int, int, bool]:
     return tabs, spaces, has_mixed
 
 
-def check_indentation(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
-    """
-    Check for indentation issues.
+def _is_similar(s1: str, s2: str, threshold: int = 2) -> bool:
+    """Check if two strings are similar (within edit distance threshold)."""
+    if abs(len(s1) - len(s2)) > threshold:
+        return False
 
-    Detects:
-    - CK3301: Inconsistent indentation within block
-    - CK3303: Spaces instead of tabs
-    - CK3305: Block content not indented relative to parent
-    - CK3307: Closing brace doesn't match opening
-    """
-    diagnostics = []
+    # Simple check: same prefix or suffix
+    if s1.startswith(s2[:3]) or s2.startswith(s1[:3]):
+        return True
+    if s1.endswith(s2[-3:]) or s2.endswith(s1[-3:]):
+        return True
 
-    if not config.indentation:
-        return diagnostics
+    # Check character overlap
+    common = set(s1) & set(s2)
+    if len(common) >= min(len(s1), len(s2)) - threshold:
+        return True
 
-    # Track brace stack: (line_num, indent_tabs, key_name)
-    brace_stack: List[Tuple[int, int, str]] = []
-    expected_indent = 0
+    return False
 
-    for line_num, line in enumerate(lines):
-        stripped = line.lstrip()
 
-        # Skip empty lines and comment-only lines
-        if not stripped or stripped.startswith("#"):
-            continue
+# Rules, in the order check_style() reports them (index into StyleScanner results)
+_INDENTATION = 0
+_MULTIPLE_STATEMENTS = 1
+_WHITESPACE = 2
+_LINE_LENGTH = 3
+_NESTING_DEPTH = 4
+_EMPTY_BLOCKS = 5
+_NAMESPACE_POSITION = 6
+_BRACE_MISMATCH = 7
+_SCOPE_REFERENCES = 8
+_MERGED_IDENTIFIERS = 9
+_RULE_COUNT = 10
+
+# Cross-line state is saved before every _CHECKPOINT_LINES-th line
+_CHECKPOINT_LINES = 32
+
+# Pattern 1: Closing brace followed by new assignment
+# e.g., "}father = {" or "} else_if = {"
+_MULTIPLE_STATEMENTS_PATTERN = re.compile(r"\}\s*\w+\s*=\s*\{")
+
+# Pattern: key = { } with nothing or only whitespace between braces
+_EMPTY_BLOCK_PATTERN = re.compile(r"(\w+)\s*=\s*\{\s*\}")
+
+_BLOCK_KEY_PATTERN = re.compile(r"(\w+)\s*=\s*\{")
+
+# Pattern to find scope: references
+_SCOPE_REFERENCE_PATTERN = re.compile(r"\bscope:(\w+)")
+
+# Pattern for assignments: key = value
+_ASSIGNMENT_PATTERN = re.compile(r"(\w+)\s*=")
+
+_MERGED_SCOPE_PATTERN = re.compile(r"scope:(\w+)")
+
+# Common valid scope targets
+_KNOWN_SCOPE_PATTERNS = {
+    "root",
+    "this",
+    "prev",
+    "from",
+    "actor",
+    "recipient",
+    "target",
+    "owner",
+    "holder",
+    "liege",
+    "spouse",
+    "primary_heir",
+    "player_heir",
+    "father",
+    "mother",
+    "real_father",
+    "child",
+    "friend",
+    "rival",
+    "lover",
+    "killer",
+    "culture",
+    "faith",
+    "dynasty",
+    "house",
+    "capital_province",
+    "primary_title",
+    "location",
+    "home_court",
+    "employer",
+    "activity",
+    "secret",
+    "scheme",
+    "story",
+    "inspiration",
+    "epidemic",
+    "war",
+    # Common custom scopes from event chains
+    "character",
+    "main_character",
+    "third_party",
+    "guest",
+    "host",
+    "challenger",
+}
+
+# Known valid compound identifiers in CK3 (not false positives)
+_VALID_COMPOUND_IDENTIFIERS = {
+    # Portrait positions
+    "left_portrait",
+    "right_portrait",
+    "lower_left_portrait",
+    "lower_right_portrait",
+    "center_portrait",
+    "artifact_portrait",
+    # Event structure
+    "character_event",
+    "letter_event",
+    "court_event",
+    "activity_event",
+    "fullscreen_event",
+    "triggered_desc",
+    "first_valid",
+    "random_valid",
+    # Triggers
+    "has_character_flag",
+    "has_global_flag",
+    "has_title_flag",
+    "has_trait",
+    "is_character",
+    "is_target",
+    "has_opinion_modifier",
+    "reverse_opinion",
+    # Effects
+    "add_character_flag",
+    "add_gold",
+    "add_prestige",
+    "add_piety",
+    "add_stress",
+    "set_character_flag",
+    "remove_character_flag",
+    "save_scope_as",
+    "trigger_event",
+    "random_character",
+    "every_character",
+    "any_character",
+    # Common modifiers
+    "opinion_modifier",
+    "character_modifier",
+    "county_modifier",
+    # Other common
+    "event_background",
+    "override_background",
+    "window_character",
+    "on_action",
+    "scripted_effect",
+    "scripted_trigger",
+}
+
+# Known CK3 keywords that might get merged
+_CK3_KEYWORDS = {
+    "animation",
+    "character",
+    "trigger",
+    "effect",
+    "modifier",
+    "opinion",
+    "scope",
+    "event",
+    "option",
+    "desc",
+    "title",
+    "theme",
+    "portrait",
+    "limit",
+    "weight",
+    "value",
+    "target",
+    "name",
+    "flag",
+    "trait",
+    "skill",
+    "gold",
+    "prestige",
+    "piety",
+    "stress",
+    "health",
+    "age",
+}
+
+_VALID_PREFIXES = {
+    "un",
+    "re",
+    "pre",
+    "sub",
+    "anti",
+}
+
+_Spec = Tuple[int, str, int, int, types.DiagnosticSeverity, str]
+
+
+class _LineFacts:
+    """
+    What the style rules need to know about one line of text.
+
+    Attributes:
+        content: Not empty and not a comment (the lines indentation,
+            nesting depth and namespace position look at)
+        comment: Comment-only line
+        tabs: Leading tabs
+        indent: Leading tabs and spaces
+        closes_first: Starts with '}'
+        end: Length without trailing whitespace
+        braces: (index, is_open) of each brace outside strings and comments
+        opens: Number of '{'
+        closes: Number of '}'
+        key: Key of the first block opened ("block" if none)
+        namespace: Starts with "namespace"
+        specs: Diagnostics that depend on this line alone, as
+            (rule, message, start, end, severity, code)
+    """
 
-        # Get actual indentation
-        tabs, spaces, has_mixed = _count_indent_level(line)
-        actual_indent = tabs  # We count tabs as indent level
+    __slots__ = (
+        "content",
+        "comment",
+        "tabs",
+        "indent",
+        "closes_first",
+        "end",
+        "braces",
+        "opens",
+        "closes",
+        "key",
+        "namespace",
+        "specs",
+    )
 
-        # CK3303: Check for spaces used as indentation
-        if config.prefer_tabs and spaces > 0 and tabs == 0 and len(line) > len(stripped):
-            diagnostics.append(
-                create_style_diagnostic(
-                    message="Indentation uses spaces instead of tabs (Paradox convention prefers tabs)",
-                    line=line_num,
-                    start_char=0,
-                    end_char=spaces,
-                    severity=types.DiagnosticSeverity.Information,
-                    code="CK3303",
+
+def _scan_line(line: str, config: StyleConfig) -> _LineFacts:
+    """Analyze one line: strip strings and comments once, run the line-local rules."""
+    facts = _LineFacts()
+    stripped = line.strip()
+    comment = stripped.startswith("#")
+    content = bool(stripped) and not comment
+    tabs, spaces, has_mixed = _count_indent_level(line)
+    end = len(line.rstrip())
+    clean_line = "" if comment else _remove_strings_and_comments(line)
+
+    braces: Tuple[Tuple[int, bool], ...] = ()
+    opens = closes = 0
+    if "{" in clean_line or "}" in clean_line:
+        braces = tuple(
+            (index, char == "{") for index, char in enumerate(clean_line) if char in "{}"
+        )
+        opens = clean_line.count("{")
+        closes = len(braces) - opens
+
+    key = "block"
+    if opens > 0:
+        key_match = _BLOCK_KEY_PATTERN.match(line.lstrip())
+        if key_match:
+            key = key_match.group(1)
+
+    specs: List[_Spec] = []
+
+    # CK3303: Indentation
+    if config.indentation and content:
+        if config.prefer_tabs and spaces > 0 and tabs == 0 and len(line) > len(line.lstrip()):
+            specs.append(
+                (
+                    _INDENTATION,
+                    "Indentation uses spaces instead of tabs (Paradox convention prefers tabs)",
+                    0,
+                    spaces,
+                    types.DiagnosticSeverity.Information,
+                    "CK3303",
                 )
             )
-
-        # Check for mixed tabs/spaces
         if has_mixed:
-            diagnostics.append(
-                create_style_diagnostic(
-                    message="Mixed tabs and spaces in indentation",
-                    line=line_num,
-                    start_char=0,
-                    end_char=tabs + spaces,
-                    severity=types.DiagnosticSeverity.Warning,
-                    code="CK3303",
+            specs.append(
+                (
+                    _INDENTATION,
+                    "Mixed tabs and spaces in indentation",
+                    0,
+                    tabs + spaces,
+                    types.DiagnosticSeverity.Warning,
+                    "CK3303",
+                )
+            )
+
+    # CK3302: Multiple block assignments (one warning per line is enough)
+    if config.multiple_statements and content and closes:
+        match = _MULTIPLE_STATEMENTS_PATTERN.search(clean_line)
+        if match:
+            # Find position in original line
+            start_pos = line.find(match.group())
+            specs.append(
+                (
+                    _MULTIPLE_STATEMENTS,
+                    "Multiple block assignments on one line - consider splitting for readability",
+                    max(start_pos, 0),
+                    end,
+                    types.DiagnosticSeverity.Warning,
+                    "CK3302",
+                )
+            )
+
+    # CK3304: Trailing whitespace
+    if config.trailing_whitespace and end < len(line):
+        specs.append(
+            (
+                _WHITESPACE,
+                f"Trailing whitespace ({len(line) - end} characters)",
+                end,
+                len(line),
+                types.DiagnosticSeverity.Hint,
+                "CK3304",
+            )
+        )
+
+    # CK3306: Spacing around '=' that is not part of >=, <=, !=, == (one per line)
+    if config.operator_spacing and not comment:
+        i = clean_line.find("=")
+        while i >= 0:
+            prev_char = clean_line[i - 1] if i > 0 else " "
+            next_char = clean_line[i + 1] if i < len(clean_line) - 1 else " "
+            if prev_char not in "!><=" and next_char != "=":
+                if prev_char not in " \t" or next_char not in " \t{":
+                    specs.append(
+                        (
+                            _WHITESPACE,
+                            "Inconsistent spacing around '=' operator. Use: key = value",
+                            max(0, i - 1),
+                            min(len(line), i + 2),
+                            types.DiagnosticSeverity.Information,
+                            "CK3306",
+                        )
+                    )
+                    break
+            i = clean_line.find("=", i + 1)
+
+    # CK3316: Line length (trailing whitespace not counted)
+    if 0 < config.max_line_length < end:
+        specs.append(
+            (
+                _LINE_LENGTH,
+                f"Line exceeds {config.max_line_length} characters ({end} chars)",
+                config.max_line_length,
+                end,
+                types.DiagnosticSeverity.Information,
+                "CK3316",
+            )
+        )
+
+    # CK3314: Empty blocks (trigger and limit are often intentionally empty)
+    if config.check_empty_blocks and content and opens:
+        for match in _EMPTY_BLOCK_PATTERN.finditer(clean_line):
+            block_key = match.group(1)
+            if block_key not in ("trigger", "limit"):
+                start_pos = line.find(match.group())
+                specs.append(
+                    (
+                        _EMPTY_BLOCKS,
+                        f"Empty block '{block_key} = {{ }}' - consider removing or adding content",
+                        start_pos if start_pos >= 0 else 0,
+                        end,
+                        types.DiagnosticSeverity.Hint,
+                        "CK3314",
+                    )
+                )
+
+    if "scope:" in clean_line:
+        _scope_reference_specs(clean_line, specs)
+    if "=" in clean_line or "scope:" in clean_line:
+        _merged_identifier_specs(clean_line, specs)
+
+    facts.content = content
+    facts.comment = comment
+    facts.tabs = tabs
+    facts.indent = tabs + spaces
+    facts.closes_first = stripped.startswith("}")
+    facts.end = end
+    facts.braces = braces
+    facts.opens = opens
+    facts.closes = closes
+    facts.key = key
+    facts.namespace = stripped.startswith("namespace")
+    facts.specs = tuple(specs)
+    return facts
+
+
+def _scope_reference_specs(clean_line: str, specs: List[_Spec]):
+    """CK3340/CK3341: Truncated and misspelled scope references."""
+    for match in _SCOPE_REFERENCE_PATTERN.finditer(clean_line):
+        scope_name = match.group(1)
+
+        # Check for very short scope names (likely typos/truncations)
+        if len(scope_name) <= 2:
+            specs.append(
+                (
+                    _SCOPE_REFERENCES,
+                    f"Suspicious scope reference 'scope:{scope_name}' - name appears truncated",
+                    match.start(),
+                    match.end(),
+                    types.DiagnosticSeverity.Warning,
+                    "CK3341",
                 )
             )
+        # Check for potential typos in common scopes
+        elif scope_name not in _KNOWN_SCOPE_PATTERNS:
+            # Check for near-matches (simple edit distance check)
+            close_matches = [
+                known for known in _KNOWN_SCOPE_PATTERNS if _is_similar(scope_name, known)
+            ]
+            if close_matches:
+                suggestion = close_matches[0]
+                specs.append(
+                    (
+                        _SCOPE_REFERENCES,
+                        f"Unknown scope 'scope:{scope_name}' - did you mean 'scope:{suggestion}'?",
+                        match.start(),
+                        match.end(),
+                        types.DiagnosticSeverity.Warning,
+                        "CK3340",
+                    )
+                )
+
+
+def _merged_identifier_specs(clean_line: str, specs: List[_Spec]):
+    """CK3345: Identifiers and scope references with a keyword merged into them."""
+    for match in _ASSIGNMENT_PATTERN.finditer(clean_line):
+        identifier = match.group(1)
+
+        # Skip known valid compound identifiers, and identifiers with
+        # underscores (properly separated)
+        if identifier.lower() in _VALID_COMPOUND_IDENTIFIERS or "_" in identifier:
+            continue
+
+        # Check if identifier contains a known keyword NOT at the start
+        # This catches things like "cildanimation" or "charactername"
+        lowered = identifier.lower()
+        for keyword in _CK3_KEYWORDS:
+            if keyword in lowered and not lowered.startswith(keyword):
+                idx = lowered.find(keyword)
+                if idx > 0:
+                    prefix = identifier[:idx]
+                    # Only flag if prefix looks like a truncated word (not a valid prefix)
+                    if len(prefix) >= 2 and prefix.lower() not in _VALID_PREFIXES:
+                        specs.append(
+                            (
+                                _MERGED_IDENTIFIERS,
+                                f"Identifier '{identifier}' appears to contain merged text - "
+                                f"did you mean '{prefix}' and '{keyword}' on separate lines?",
+                                match.start(1),
+                                match.end(1),
+                                types.DiagnosticSeverity.Error,
+                                "CK3345",
+                            )
+                        )
+                        break  # Only report once per identifier
+
+    # Also check scope references for merging (these should NOT have keywords embedded)
+    for match in _MERGED_SCOPE_PATTERN.finditer(clean_line):
+        scope_ref = match.group(1)
+
+        # Skip properly formatted scope references with underscores
+        if "_" in scope_ref:
+            continue
+
+        lowered = scope_ref.lower()
+        for keyword in _CK3_KEYWORDS:
+            if keyword in lowered and lowered != keyword:
+                idx = lowered.find(keyword)
+                if idx > 0:
+                    prefix = scope_ref[:idx]
+                    if len(prefix) >= 2:
+                        specs.append(
+                            (
+                                _MERGED_IDENTIFIERS,
+                                f"Scope 'scope:{scope_ref}' appears to contain merged text - "
+                                f"possible missing newline before '{keyword}'?",
+                                match.start(),
+                                match.end(),
+                                types.DiagnosticSeverity.Error,
+                                "CK3345",
+                            )
+                        )
+                        break
+
+
+class _ScanState:
+    """
+    Cross-line state of the rules, before one line.
+
+    Stacks are immutable linked lists ((top, rest) pairs, () when empty),
+    so checkpoints share them instead of copying.
+    """
+
+    __slots__ = (
+        "expected_indent",
+        "indent_stack",
+        "depth",
+        "found_content",
+        "first_content_line",
+        "namespace_done",
+        "open_braces",
+    )
+
+    def __init__(self):
+        self.expected_indent = 0
+        # (line_num, indent_tabs, key_name) of each open block
+        self.indent_stack: tuple = ()
+        self.depth = 0
+        self.found_content = False
+        self.first_content_line = -1
+        self.namespace_done = False
+        # (line, char) of each unclosed '{'
+        self.open_braces: tuple = ()
+
+    def copy(self) -> "_ScanState":
+        state = _ScanState()
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name))
+        return state
+
+
+class StyleScanner:
+    """
+    Single-pass, incremental style checker of one document.
+
+    scan() analyzes each distinct line once (strings and comments stripped
+    once, line-local rules), then walks the lines carrying the cross-line
+    state (indentation, nesting depth, braces, namespace position).
+    Successive scans of the same document only analyze changed lines and
+    resume the walk at the last checkpoint before the first change.
+
+    Thread-safe: scans of one scanner are serialized.
+
+    Attributes:
+        lines_scanned: Number of line analyses run (distinct changed lines)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lines_scanned = 0
+        self._reset(None)
+
+    def _reset(self, config: Optional[StyleConfig]):
+        """Forget all previous results (for a new configuration)."""
+        self._config = config
+        self._lines: List[str] = []
+        self._facts: Dict[str, _LineFacts] = {}
+        # Line-local diagnostics of each line: (text, ((rule, diagnostic), ...))
+        self._local: List[Tuple[str, tuple]] = []
+        # Diagnostics of each rule, without the unclosed braces (CK3330)
+        self._results: List[List[types.Diagnostic]] = [[] for _ in range(_RULE_COUNT)]
+        self._end_state = _ScanState()
+        # (state, result lengths) before every _CHECKPOINT_LINES-th line
+        self._checkpoints: List[Tuple[_ScanState, Tuple[int, ...]]] = []
+
+    def scan(self, lines: List[str], config: StyleConfig) -> List[List[types.Diagnostic]]:
+        """
+        Check lines, reusing the previous scan's results where lines are unchanged.
+
+        Args:
+            lines: The document's lines
+            config: Style configuration (a different one starts over)
+
+        Returns:
+            Diagnostics of each rule, in check_style() order
+        """
+        with self._lock:
+            if config != self._config:
+                self._reset(replace(config))
+            self._update(lines)
+            return self._collect()
+
+    def run(self, lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
+        """All diagnostics of scan(), in one list."""
+        return [diagnostic for rule in self.scan(lines, config) for diagnostic in rule]
+
+    def _update(self, lines: List[str]):
+        previous = self._lines
+        limit = min(len(previous), len(lines))
+        prefix = 0
+        while prefix < limit and previous[prefix] == lines[prefix]:
+            prefix += 1
+        if prefix == len(previous) == len(lines) and self._checkpoints:
+            return
+
+        checkpoint = min(prefix // _CHECKPOINT_LINES, len(self._checkpoints) - 1)
+        if checkpoint < 0:
+            start, state, lengths = 0, _ScanState(), (0,) * _RULE_COUNT
+        else:
+            start = checkpoint * _CHECKPOINT_LINES
+            saved, lengths = self._checkpoints[checkpoint]
+            state = saved.copy()
+        del self._checkpoints[max(checkpoint, 0) :]
+        results = self._results
+        for rule, length in zip(results, lengths):
+            del rule[length:]
+
+        # Facts of lines no longer in the document are dropped now and then
+        if len(self._facts) > 2 * len(lines) + 256:
+            self._facts = {}
+        del self._local[len(lines) :]
+
+        self._walk(lines, start, state)
+        self._lines = list(lines)
+        self._end_state = state
+
+    def _walk(self, lines: List[str], start: int, state: _ScanState):
+        """Run the rules over lines[start:], updating state and self._results."""
+        config = self._config
+        facts_by_text = self._facts
+        local = self._local
+        results = self._results
+        checkpoints = self._checkpoints
+        indentation = results[_INDENTATION]
+        nesting = results[_NESTING_DEPTH]
+        namespace = results[_NAMESPACE_POSITION]
+        mismatch = results[_BRACE_MISMATCH]
+        check_indentation = config.indentation
+        max_depth = config.max_nesting_depth
+        check_namespace = config.check_namespace_position
+
+        for line_num in range(start, len(lines)):
+            if line_num % _CHECKPOINT_LINES == 0:
+                checkpoints.append((state.copy(), tuple(map(len, results))))
+
+            line = lines[line_num]
+            facts = facts_by_text.get(line)
+            if facts is None:
+                facts = facts_by_text[line] = _scan_line(line, config)
+                self.lines_scanned += 1
+
+            # Line-local diagnostics (kept while the line keeps its text and number)
+            if facts.specs:
+                if line_num < len(local) and local[line_num][0] == line:
+                    diagnostics = local[line_num][1]
+                else:
+                    diagnostics = tuple(
+                        (rule, create_style_diagnostic(message, line_num, start, end, severity, code))
+                        for rule, message, start, end, severity, code in facts.specs
+                    )
+                    if line_num < len(local):
+                        local[line_num] = (line, diagnostics)
+                    else:
+                        local.append((line, diagnostics))
+                for rule, diagnostic in diagnostics:
+                    results[rule].append(diagnostic)
+            elif line_num >= len(local):
+                local.append((line, ()))
+
+            if facts.content:
+                if check_indentation:
+                    self._check_indentation(line_num, facts, state, indentation)
+                if check_namespace and not state.namespace_done:
+                    if facts.namespace:
+                        # Namespace found after other content
+                        if state.found_content:
+                            namespace.append(
+                                create_style_diagnostic(
+                                    message=f"Namespace declaration should be at the top of the file (found content on line {state.first_content_line + 1})",
+                                    line=line_num,
+                                    start_char=0,
+                                    end_char=facts.end,
+                                    severity=types.DiagnosticSeverity.Warning,
+                                    code="CK3325",
+                                )
+                            )
+                        state.namespace_done = True
+                    elif not state.found_content:
+                        state.first_content_line = line_num
+                        state.found_content = True
+
+            if facts.braces:
+                reported = False
+                for char_idx, is_open in facts.braces:
+                    if is_open:
+                        state.open_braces = ((line_num, char_idx), state.open_braces)
+                        state.depth += 1
+                        if 0 < max_depth < state.depth and not reported:
+                            nesting.append(
+                                create_style_diagnostic(
+                                    message=f"Deeply nested block (depth {state.depth}, max recommended {max_depth}). Consider refactoring.",
+                                    line=line_num,
+                                    start_char=0,
+                                    end_char=facts.end,
+                                    severity=types.DiagnosticSeverity.Warning,
+                                    code="CK3317",
+                                )
+                            )
+                            reported = True
+                    else:
+                        state.depth = max(0, state.depth - 1)
+                        if state.open_braces:
+                            state.open_braces = state.open_braces[1]
+                        else:
+                            # Extra closing brace
+                            mismatch.append(
+                                create_style_diagnostic(
+                                    message="Extra closing brace '}' without matching opening brace",
+                                    line=line_num,
+                                    start_char=char_idx,
+                                    end_char=char_idx + 1,
+                                    severity=types.DiagnosticSeverity.Error,
+                                    code="CK3331",
+                                )
+                            )
+
+    @staticmethod
+    def _check_indentation(
+        line_num: int, facts: _LineFacts, state: _ScanState, diagnostics: List[types.Diagnostic]
+    ):
+        """CK3301/CK3307: Indentation relative to the enclosing blocks."""
+        actual_indent = facts.tabs
 
         # Handle closing brace - check alignment before updating expected
-        if stripped.startswith("}"):
-            if brace_stack:
-                open_line, open_indent, key = brace_stack.pop()
-                expected_indent = max(0, expected_indent - 1)
+        if facts.closes_first:
+            state.expected_indent = max(0, state.expected_indent - 1)
+            if state.indent_stack:
+                (open_line, open_indent, key), state.indent_stack = state.indent_stack
 
                 # CK3307: Check closing brace alignment
                 if actual_indent != open_indent:
@@ -289,56 +981,72 @@ def check_indentation(lines: List[str], config: StyleConfig) -> List[types.Diagn
                             message=f"Closing brace indent ({actual_indent} tabs) doesn't match opening '{key}' at line {open_line + 1} ({open_indent} tabs)",
                             line=line_num,
                             start_char=0,
-                            end_char=len(line.rstrip()),
+                            end_char=facts.end,
                             severity=types.DiagnosticSeverity.Warning,
                             code="CK3307",
                         )
                     )
-            else:
-                expected_indent = max(0, expected_indent - 1)
-        else:
-            # CK3301/CK3305: Check content indentation
-            if actual_indent != expected_indent:
-                # Only warn if significantly off (allow some flexibility)
-                if abs(actual_indent - expected_indent) > 0:
-                    diagnostics.append(
-                        create_style_diagnostic(
-                            message=f"Inconsistent indentation: expected {expected_indent} tabs, found {actual_indent}",
-                            line=line_num,
-                            start_char=0,
-                            end_char=max(tabs + spaces, 1),
-                            severity=types.DiagnosticSeverity.Warning,
-                            code="CK3301",
-                        )
-                    )
-
-        # Track opening braces for next iteration
-        clean_line = _remove_strings_and_comments(stripped)
+        # CK3301/CK3305: Check content indentation
+        elif actual_indent != state.expected_indent:
+            diagnostics.append(
+                create_style_diagnostic(
+                    message=f"Inconsistent indentation: expected {state.expected_indent} tabs, found {actual_indent}",
+                    line=line_num,
+                    start_char=0,
+                    end_char=max(facts.indent, 1),
+                    severity=types.DiagnosticSeverity.Warning,
+                    code="CK3301",
+                )
+            )
 
-        # Count braces (handling inline blocks)
-        open_count = clean_line.count("{")
-        close_count = clean_line.count("}")
+        # For each net opening brace, push to stack
+        net_braces = facts.opens - facts.closes
+        if facts.opens > 0:
+            for _ in range(net_braces):
+                state.indent_stack = ((line_num, actual_indent, facts.key), state.indent_stack)
+
+        # Update expected indent for next line (a closing brace was handled above)
+        if not facts.closes_first:
+            state.expected_indent = max(0, state.expected_indent + net_braces)
+
+    def _collect(self) -> List[List[types.Diagnostic]]:
+        """Copies of the results, with the unclosed braces (CK3330) of the last scan."""
+        results = [list(rule) for rule in self._results]
+        unclosed = []
+        stack = self._end_state.open_braces
+        while stack:
+            unclosed.append(stack[0])
+            stack = stack[1]
+        for brace_line, brace_char in reversed(unclosed):
+            results[_BRACE_MISMATCH].append(
+                create_style_diagnostic(
+                    message="Unclosed brace '{' - missing closing '}'",
+                    line=brace_line,
+                    start_char=brace_char,
+                    end_char=brace_char + 1,
+                    severity=types.DiagnosticSeverity.Error,
+                    code="CK3330",
+                )
+            )
+        return results
 
-        # If line has opening brace(s), track them
-        if open_count > 0:
-            # Extract key name before the brace
-            key_match = re.match(r"(\w+)\s*=\s*\{", stripped)
-            key = key_match.group(1) if key_match else "block"
 
-            # For each net opening brace, push to stack
-            for _ in range(open_count - close_count):
-                brace_stack.append((line_num, actual_indent, key))
+def _check(lines: List[str], config: StyleConfig, rule: int) -> List[types.Diagnostic]:
+    """Diagnostics of one rule (a full scan of the lines)."""
+    return StyleScanner().scan(lines, config)[rule]
 
-        # Update expected indent for next line
-        net_braces = open_count - close_count
 
-        # Only update if this line doesn't start with closing brace
-        # (we already handled that case above)
-        if not stripped.startswith("}"):
-            expected_indent += net_braces
-            expected_indent = max(0, expected_indent)
+def check_indentation(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
+    """
+    Check for indentation issues.
 
-    return diagnostics
+    Detects:
+    - CK3301: Inconsistent indentation within block
+    - CK3303: Spaces instead of tabs
+    - CK3305: Block content not indented relative to parent
+    - CK3307: Closing brace doesn't match opening
+    """
+    return _check(lines, config, _INDENTATION)
 
 
 def check_multiple_statements(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -348,50 +1056,7 @@ def check_multiple_statements(lines: List[str], config: StyleConfig) -> List[typ
     Detects:
     - CK3302: Multiple block assignments on one line
     """
-    diagnostics = []
-
-    if not config.multiple_statements:
-        return diagnostics
-
-    for line_num, line in enumerate(lines):
-        stripped = line.strip()
-
-        # Skip empty lines and comments
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        clean_line = _remove_strings_and_comments(stripped)
-
-        # Pattern 1: Closing brace followed by new assignment
-        # e.g., "}father = {" or "} else_if = {"
-        pattern1 = r"\}\s*\w+\s*=\s*\{"
-
-        # Pattern 2: Complete inline block followed by another block assignment
-        # e.g., "{ x = y } z = {" - but NOT "{ x = y }" alone
-        # Look for: } followed by word = {
-
-        matches = list(re.finditer(pattern1, clean_line))
-
-        if matches:
-            for match in matches:
-                # Find position in original line
-                start_pos = line.find(match.group())
-                if start_pos == -1:
-                    start_pos = 0
-
-                diagnostics.append(
-                    create_style_diagnostic(
-                        message="Multiple block assignments on one line - consider splitting for readability",
-                        line=line_num,
-                        start_char=start_pos,
-                        end_char=len(line.rstrip()),
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3302",
-                    )
-                )
-                break  # One warning per line is enough
-
-    return diagnostics
+    return _check(lines, config, _MULTIPLE_STATEMENTS)
 
 
 def check_whitespace(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -402,69 +1067,7 @@ def check_whitespace(lines: List[str], config: StyleConfig) -> List[types.Diagno
     - CK3304: Trailing whitespace
     - CK3306: Inconsistent spacing around operators
     """
-    diagnostics = []
-
-    for line_num, line in enumerate(lines):
-        # CK3304: Trailing whitespace
-        if config.trailing_whitespace:
-            stripped = line.rstrip()
-            if len(stripped) < len(line):
-                trailing_count = len(line) - len(stripped)
-                diagnostics.append(
-                    create_style_diagnostic(
-                        message=f"Trailing whitespace ({trailing_count} characters)",
-                        line=line_num,
-                        start_char=len(stripped),
-                        end_char=len(line),
-                        severity=types.DiagnosticSeverity.Hint,
-                        code="CK3304",
-                    )
-                )
-
-        # CK3306: Operator spacing
-        if config.operator_spacing:
-            # Skip comment-only lines
-            if line.strip().startswith("#"):
-                continue
-
-            clean_line = _remove_strings_and_comments(line)
-
-            # Check for missing space around = (but not ==, >=, <=, !=)
-            # Pattern: non-space followed by = followed by non-space-or-=
-            # But exclude >=, <=, !=, ==
-
-            # Find = that's not part of >=, <=, !=, ==
-            for i, char in enumerate(clean_line):
-                if char == "=":
-                    # Check it's not part of a compound operator
-                    prev_char = clean_line[i - 1] if i > 0 else " "
-                    next_char = clean_line[i + 1] if i < len(clean_line) - 1 else " "
-
-                    if prev_char in "!><=":
-                        continue  # Part of compound operator
-                    if next_char == "=":
-                        continue  # Part of ==
-
-                    # Check spacing
-                    has_space_before = prev_char in " \t"
-                    has_space_after = next_char in " \t{"
-
-                    if not has_space_before or not has_space_after:
-                        # Find actual position in original line
-                        actual_pos = i
-                        diagnostics.append(
-                            create_style_diagnostic(
-                                message="Inconsistent spacing around '=' operator. Use: key = value",
-                                line=line_num,
-                                start_char=max(0, actual_pos - 1),
-                                end_char=min(len(line), actual_pos + 2),
-                                severity=types.DiagnosticSeverity.Information,
-                                code="CK3306",
-                            )
-                        )
-                        break  # One per line
-
-    return diagnostics
+    return _check(lines, config, _WHITESPACE)
 
 
 def check_line_length(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -474,28 +1077,7 @@ def check_line_length(lines: List[str], config: StyleConfig) -> List[types.Diagn
     Detects:
     - CK3316: Line exceeds recommended length
     """
-    diagnostics = []
-
-    if config.max_line_length <= 0:
-        return diagnostics
-
-    for line_num, line in enumerate(lines):
-        # Use rstrip to not count trailing whitespace
-        line_len = len(line.rstrip())
-
-        if line_len > config.max_line_length:
-            diagnostics.append(
-                create_style_diagnostic(
-                    message=f"Line exceeds {config.max_line_length} characters ({line_len} chars)",
-                    line=line_num,
-                    start_char=config.max_line_length,
-                    end_char=line_len,
-                    severity=types.DiagnosticSeverity.Information,
-                    code="CK3316",
-                )
-            )
-
-    return diagnostics
+    return _check(lines, config, _LINE_LENGTH)
 
 
 def check_nesting_depth(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -505,41 +1087,7 @@ def check_nesting_depth(lines: List[str], config: StyleConfig) -> List[types.Dia
     Detects:
     - CK3317: Deeply nested blocks
     """
-    diagnostics = []
-
-    if config.max_nesting_depth <= 0:
-        return diagnostics
-
-    current_depth = 0
-    max_reported_line = -1  # Avoid reporting multiple times for same deep block
-
-    for line_num, line in enumerate(lines):
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        clean_line = _remove_strings_and_comments(stripped)
-
-        # Count braces
-        for char in clean_line:
-            if char == "{":
-                current_depth += 1
-                if current_depth > config.max_nesting_depth and line_num > max_reported_line:
-                    diagnostics.append(
-                        create_style_diagnostic(
-                            message=f"Deeply nested block (depth {current_depth}, max recommended {config.max_nesting_depth}). Consider refactoring.",
-                            line=line_num,
-                            start_char=0,
-                            end_char=len(line.rstrip()),
-                            severity=types.DiagnosticSeverity.Warning,
-                            code="CK3317",
-                        )
-                    )
-                    max_reported_line = line_num
-            elif char == "}":
-                current_depth = max(0, current_depth - 1)
-
-    return diagnostics
+    return _check(lines, config, _NESTING_DEPTH)
 
 
 def check_empty_blocks(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -549,40 +1097,7 @@ def check_empty_blocks(lines: List[str], config: StyleConfig) -> List[types.Diag
     Detects:
     - CK3314: Empty block detected
     """
-    diagnostics = []
-
-    if not config.check_empty_blocks:
-        return diagnostics
-
-    for line_num, line in enumerate(lines):
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        clean_line = _remove_strings_and_comments(stripped)
-
-        # Pattern: key = { } with nothing or only whitespace between braces
-        empty_block_pattern = r"(\w+)\s*=\s*\{\s*\}"
-        matches = re.finditer(empty_block_pattern, clean_line)
-
-        for match in matches:
-            key = match.group(1)
-            # Some empty blocks are OK (like placeholder triggers)
-            # But warn about most of them
-            if key not in ("trigger", "limit"):  # These are often intentionally empty
-                start_pos = line.find(match.group())
-                diagnostics.append(
-                    create_style_diagnostic(
-                        message=f"Empty block '{key} = {{ }}' - consider removing or adding content",
-                        line=line_num,
-                        start_char=start_pos if start_pos >= 0 else 0,
-                        end_char=len(line.rstrip()),
-                        severity=types.DiagnosticSeverity.Hint,
-                        code="CK3314",
-                    )
-                )
-
-    return diagnostics
+    return _check(lines, config, _EMPTY_BLOCKS)
 
 
 def check_namespace_position(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -592,44 +1107,7 @@ def check_namespace_position(lines: List[str], config: StyleConfig) -> List[type
     Detects:
     - CK3325: Namespace declaration not at top
     """
-    diagnostics = []
-
-    if not config.check_namespace_position:
-        return diagnostics
-
-    found_content = False
-    namespace_line = -1
-    first_content_line = -1
-
-    for line_num, line in enumerate(lines):
-        stripped = line.strip()
-
-        # Skip empty lines and comments
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        # Check for namespace
-        if stripped.startswith("namespace"):
-            namespace_line = line_num
-            if found_content:
-                # Namespace found after other content
-                diagnostics.append(
-                    create_style_diagnostic(
-                        message=f"Namespace declaration should be at the top of the file (found content on line {first_content_line + 1})",
-                        line=line_num,
-                        start_char=0,
-                        end_char=len(line.rstrip()),
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3325",
-                    )
-                )
-            break
-        else:
-            if not found_content:
-                first_content_line = line_num
-            found_content = True
-
-    return diagnostics
+    return _check(lines, config, _NAMESPACE_POSITION)
 
 
 def check_brace_mismatch(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -641,52 +1119,7 @@ def check_brace_mismatch(lines: List[str], config: StyleConfig) -> List[types.Di
     - CK3331: Extra closing brace (more '}' than '{')
     - CK3332: Brace mismatch in block
     """
-    diagnostics = []
-
-    # Track brace positions for better error reporting
-    open_braces: List[Tuple[int, int]] = []  # (line, char)
-
-    for line_num, line in enumerate(lines):
-        # Skip comment-only lines
-        stripped = line.strip()
-        if stripped.startswith("#"):
-            continue
-
-        clean_line = _remove_strings_and_comments(line)
-
-        for char_idx, char in enumerate(clean_line):
-            if char == "{":
-                open_braces.append((line_num, char_idx))
-            elif char == "}":
-                if open_braces:
-                    open_braces.pop()
-                else:
-                    # Extra closing brace
-                    diagnostics.append(
-                        create_style_diagnostic(
-                            message="Extra closing brace '}' without matching opening brace",
-                            line=line_num,
-                            start_char=char_idx,
-                            end_char=char_idx + 1,
-                            severity=types.DiagnosticSeverity.Error,
-                            code="CK3331",
-                        )
-                    )
-
-    # Report unclosed braces
-    for brace_line, brace_char in open_braces:
-        diagnostics.append(
-            create_style_diagnostic(
-                message="Unclosed brace '{' - missing closing '}'",
-                line=brace_line,
-                start_char=brace_char,
-                end_char=brace_char + 1,
-                severity=types.DiagnosticSeverity.Error,
-                code="CK3330",
-            )
-        )
-
-    return diagnostics
+    return _check(lines, config, _BRACE_MISMATCH)
 
 
 def check_scope_references(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -697,122 +1130,7 @@ def check_scope_references(lines: List[str], config: StyleConfig) -> List[types.
     - CK3340: Unknown/suspicious scope reference (typo detection)
     - CK3341: Scope reference appears truncated
     """
-    diagnostics = []
-
-    # Common valid scope targets
-    known_scope_patterns = {
-        "root",
-        "this",
-        "prev",
-        "from",
-        "actor",
-        "recipient",
-        "target",
-        "owner",
-        "holder",
-        "liege",
-        "spouse",
-        "primary_heir",
-        "player_heir",
-        "father",
-        "mother",
-        "real_father",
-        "child",
-        "friend",
-        "rival",
-        "lover",
-        "killer",
-        "culture",
-        "faith",
-        "dynasty",
-        "house",
-        "capital_province",
-        "primary_title",
-        "location",
-        "home_court",
-        "employer",
-        "activity",
-        "secret",
-        "scheme",
-        "story",
-        "inspiration",
-        "epidemic",
-        "war",
-        # Common custom scopes from event chains
-        "character",
-        "main_character",
-        "third_party",
-        "guest",
-        "host",
-        "challenger",
-    }
-
-    # Pattern to find scope: references
-    scope_pattern = re.compile(r"\bscope:(\w+)")
-
-    for line_num, line in enumerate(lines):
-        # Skip comments
-        stripped = line.strip()
-        if stripped.startswith("#"):
-            continue
-
-        clean_line = _remove_strings_and_comments(line)
-
-        for match in scope_pattern.finditer(clean_line):
-            scope_name = match.group(1)
-            start_pos = match.start(1)
-
-            # Check for very short scope names (likely typos/truncations)
-            if len(scope_name) <= 2:
-                diagnostics.append(
-                    create_style_diagnostic(
-                        message=f"Suspicious scope reference 'scope:{scope_name}' - name appears truncated",
-                        line=line_num,
-                        start_char=match.start(),
-                        end_char=match.end(),
-                        severity=types.DiagnosticSeverity.Warning,
-                        code="CK3341",
-                    )
-                )
-            # Check for potential typos in common scopes
-            elif scope_name not in known_scope_patterns:
-                # Check for near-matches (simple edit distance check)
-                close_matches = [
-                    known for known in known_scope_patterns if _is_similar(scope_name, known)
-                ]
-                if close_matches:
-                    suggestion = close_matches[0]
-                    diagnostics.append(
-                        create_style_diagnostic(
-                            message=f"Unknown scope 'scope:{scope_name}' - did you mean 'scope:{suggestion}'?",
-                            line=line_num,
-                            start_char=match.start(),
-                            end_char=match.end(),
-                            severity=types.DiagnosticSeverity.Warning,
-                            code="CK3340",
-                        )
-                    )
-
-    return diagnostics
-
-
-def _is_similar(s1: str, s2: str, threshold: int = 2) -> bool:
-    """Check if two strings are similar (within edit distance threshold)."""
-    if abs(len(s1) - len(s2)) > threshold:
-        return False
-
-    # Simple check: same prefix or suffix
-    if s1.startswith(s2[:3]) or s2.startswith(s1[:3]):
-        return True
-    if s1.endswith(s2[-3:]) or s2.endswith(s1[-3:]):
-        return True
-
-    # Check character overlap
-    common = set(s1) & set(s2)
-    if len(common) >= min(len(s1), len(s2)) - threshold:
-        return True
-
-    return False
+    return _check(lines, config, _SCOPE_REFERENCES)
 
 
 def check_merged_identifiers(lines: List[str], config: StyleConfig) -> List[types.Diagnostic]:
@@ -822,174 +1140,15 @@ def check_merged_identifiers(lines: List[str], config: StyleConfig) -> List[type
     Detects:
     - CK3345: Identifier appears to contain merged words (missing newline/space)
     """
-    diagnostics = []
+    return _check(lines, config, _MERGED_IDENTIFIERS)
 
-    # Known valid compound identifiers in CK3 (not false positives)
-    valid_compound_identifiers = {
-        # Portrait positions
-        "left_portrait",
-        "right_portrait",
-        "lower_left_portrait",
-        "lower_right_portrait",
-        "center_portrait",
-        "artifact_portrait",
-        # Event structure
-        "character_event",
-        "letter_event",
-        "court_event",
-        "activity_event",
-        "fullscreen_event",
-        "triggered_desc",
-        "first_valid",
-        "random_valid",
-        # Triggers
-        "has_character_flag",
-        "has_global_flag",
-        "has_title_flag",
-        "has_trait",
-        "is_character",
-        "is_target",
-        "has_opinion_modifier",
-        "reverse_opinion",
-        # Effects
-        "add_character_flag",
-        "add_gold",
-        "add_prestige",
-        "add_piety",
-        "add_stress",
-        "set_character_flag",
-        "remove_character_flag",
-        "save_scope_as",
-        "trigger_event",
-        "random_character",
-        "every_character",
-        "any_character",
-        # Common modifiers
-        "opinion_modifier",
-        "character_modifier",
-        "county_modifier",
-        # Other common
-        "event_background",
-        "override_background",
-        "window_character",
-        "on_action",
-        "scripted_effect",
-        "scripted_trigger",
-    }
-
-    # Known CK3 keywords that might get merged
-    ck3_keywords = {
-        "animation",
-        "character",
-        "trigger",
-        "effect",
-        "modifier",
-        "opinion",
-        "scope",
-        "event",
-        "option",
-        "desc",
-        "title",
-        "theme",
-        "portrait",
-        "limit",
-        "weight",
-        "value",
-        "target",
-        "name",
-        "flag",
-        "trait",
-        "skill",
-        "gold",
-        "prestige",
-        "piety",
-        "stress",
-        "health",
-        "age",
-    }
-
-    # Pattern for assignments: key = value
-    assignment_pattern = re.compile(r"(\w+)\s*=")
-
-    for line_num, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("#"):
-            continue
 
-        clean_line = _remove_strings_and_comments(line)
-
-        for match in assignment_pattern.finditer(clean_line):
-            identifier = match.group(1)
-
-            # Skip known valid compound identifiers
-            if identifier.lower() in valid_compound_identifiers:
-                continue
-
-            # Skip identifiers with underscores (properly separated)
-            if "_" in identifier:
-                continue
-
-            # Check if identifier contains a known keyword NOT at the start
-            # This catches things like "cildanimation" or "charactername"
-            for keyword in ck3_keywords:
-                if keyword in identifier.lower() and not identifier.lower().startswith(keyword):
-                    # Found keyword embedded in identifier
-                    idx = identifier.lower().find(keyword)
-                    if idx > 0:
-                        prefix = identifier[:idx]
-                        # Only flag if prefix looks like a truncated word (not a valid prefix)
-                        if len(prefix) >= 2 and not prefix.lower() in {
-                            "un",
-                            "re",
-                            "pre",
-                            "sub",
-                            "anti",
-                        }:
-                            diagnostics.append(
-                                create_style_diagnostic(
-                                    message=f"Identifier '{identifier}' appears to contain merged text - "
-                                    f"did you mean '{prefix}' and '{keyword}' on separate lines?",
-                                    line=line_num,
-                                    start_char=match.start(1),
-                                    end_char=match.end(1),
-                                    severity=types.DiagnosticSeverity.Error,
-                                    code="CK3345",
-                                )
-                            )
-                            break  # Only report once per identifier
-
-        # Also check scope references for merging (these should NOT have keywords embedded)
-        scope_pattern = re.compile(r"scope:(\w+)")
-        for match in scope_pattern.finditer(clean_line):
-            scope_ref = match.group(1)
-
-            # Skip properly formatted scope references with underscores
-            if "_" in scope_ref:
-                continue
-
-            for keyword in ck3_keywords:
-                if keyword in scope_ref.lower() and not scope_ref.lower() == keyword:
-                    idx = scope_ref.lower().find(keyword)
-                    if idx > 0:
-                        prefix = scope_ref[:idx]
-                        if len(prefix) >= 2:
-                            diagnostics.append(
-                                create_style_diagnostic(
-                                    message=f"Scope 'scope:{scope_ref}' appears to contain merged text - "
-                                    f"possible missing newline before '{keyword}'?",
-                                    line=line_num,
-                                    start_char=match.start(),
-                                    end_char=match.end(),
-                                    severity=types.DiagnosticSeverity.Error,
-                                    code="CK3345",
-                                )
-                            )
-                            break
-
-    return diagnostics
-
-
-def check_style(doc: TextDocument, config: Optional[StyleConfig] = None) -> List[types.Diagnostic]:
+def check_style(
+    doc: TextDocument,
+    config: Optional[StyleConfig] = None,
+    lines: Optional[List[str]] = None,
+    scanner: Optional[StyleScanner] = None,
+) -> List[types.Diagnostic]:
     """
     Collect all style-related diagnostics for a document.
 
@@ -998,6 +1157,9 @@ def check_style(doc: TextDocument, config: Optional[StyleConfig] = None) -> List
     Args:
         doc: The text document to check
         config: Style configuration (uses defaults if None)
+        lines: ``doc.source.split("\\n")``, if the caller already has it
+        scanner: The document's scanner from previous checks; only changed
+            lines are checked again (a fresh one is used if None)
 
     Returns:
         List of style diagnostics
@@ -1006,21 +1168,11 @@ def check_style(doc: TextDocument, config: Optional[StyleConfig] = None) -> List
     diagnostics = []
 
     try:
-        lines = doc.source.split("\n")
+        if lines is None:
+            lines = doc.source.split("\n")
 
         # Run all style checks
-        diagnostics.extend(check_indentation(lines, config))
-        diagnostics.extend(check_multiple_statements(lines, config))
-        diagnostics.extend(check_whitespace(lines, config))
-        diagnostics.extend(check_line_length(lines, config))
-        diagnostics.extend(check_nesting_depth(lines, config))
-        diagnostics.extend(check_empty_blocks(lines, config))
-        diagnostics.extend(check_namespace_position(lines, config))
-
-        # New structural checks
-        diagnostics.extend(check_brace_mismatch(lines, config))
-        diagnostics.extend(check_scope_references(lines, config))
-        diagnostics.extend(check_merged_identifiers(lines, config))
+        diagnostics = (scanner or StyleScanner()).run(lines, config)
 
         logger.debug(f"Style checks found {len(diagnostics)} issues")
 
@@ -0,0 +1,422 @@
+"""
+CK3 Symbol Search - Ranked Fuzzy Search Over Workspace Symbol Names
+
+MODULE OVERVIEW:
+    workspace/symbol (Ctrl+T) is requested on every keystroke. Substring
+    testing every indexed name does not scale to a combined vanilla + mod
+    index with tens of thousands of events, effects and triggers. This
+    module keeps a search index over symbol names that answers a query by
+    looking up candidates, ranking them, and returning the best N.
+
+ARCHITECTURE:
+    **Search Structures** (per segment, built once):
+    1. Word prefix array: sorted (suffix of the name starting at a word
+       boundary, id) pairs. Bisecting finds names where the query starts
+       the name or any word in it.
+    2. Initials prefix array: sorted (suffix of the word initials, id)
+       pairs, so "mme" finds my_mod_effect and "me" finds mod_effect.
+    3. Trigram inverted index: trigram → ids of names containing it.
+       Intersecting postings finds substring matches, and counting shared
+       trigrams finds fuzzy (subsequence) candidates.
+
+    Words are split at separators (_ . - :), lower→upper camel humps and
+    letter/digit transitions. All matching is case-insensitive.
+
+    **Incremental Updates** (base + overlay):
+    The segment is immutable. add() and remove() record changes in a small
+    overlay (added names are scored directly, removed names are filtered
+    out), and once the overlay grows past COMPACT_THRESHOLD the live names
+    are rebuilt into a new segment. copy() shares the segment and copies
+    only the overlay, which fits the copy-on-write DocumentIndex versions.
+
+    **Ranking** (higher is better):
+    - 100 exact name, 90 name prefix, 80 word prefix
+    - 70 substring, 60 word initials prefix
+    - 20-59 subsequence, favouring characters at word starts and few gaps
+    Ties prefer shorter names, then alphabetical order. Weaker tiers are
+    only looked up while the stronger ones give fewer than N results, and
+    queries shorter than three characters only match word starts and
+    initials.
+
+USAGE EXAMPLES:
+    >>> search = SymbolSearchIndex([("scripted_effects", "my_mod_effect")])
+    >>> search.add("events", "my_mod.0001")
+    >>> search.search("mme")
+    [('scripted_effects', 'my_mod_effect')]
+
+PERFORMANCE:
+    - Query: proportional to the number of candidates, not the index size
+    - Build: ~1s for 60k names (once per workspace scan)
+    - add()/remove(): O(1), plus an occasional rebuild
+
+SEE ALSO:
+    - indexer.py: DocumentIndex.search_symbols() maintains the index
+    - server.py: workspace_symbol handler
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Default number of results returned by search()
+DEFAULT_SEARCH_LIMIT = 200
+
+# Overlay size (added + removed names) that triggers a rebuild of the segment
+COMPACT_THRESHOLD = 1024
+
+# A word starts after a separator, at a lower→upper camel hump, and where
+# digits start or end (separators: _ . - : and space)
+_WORD_START = re.compile(
+    r"(?:^|(?<=[_.\-: ]))[^_.\-: ]"
+    r"|(?<=[a-z])[A-Z]"
+    r"|(?<=[^\d_.\-: ])\d"
+    r"|(?<=\d)[^\d_.\-: ]"
+)
+
+_SCORE_EXACT = 100
+_SCORE_PREFIX = 90
+_SCORE_WORD_PREFIX = 80
+_SCORE_SUBSTRING = 70
+_SCORE_INITIALS = 60
+_SCORE_FUZZY = 20
+
+# (kind, name), e.g. ("events", "my_mod.0001")
+SymbolKey = Tuple[str, str]
+
+
+def word_starts(name: str) -> List[int]:
+    """
+    Return the positions where words start in a symbol name.
+
+    Args:
+        name: Symbol name (original case, for camel humps)
+
+    Returns:
+        Ascending character offsets
+    """
+    return [match.start() for match in _WORD_START.finditer(name)]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Distinct trigrams of an (already lowercased) string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def match_score(query: str, name: str, starts: Optional[List[int]] = None) -> Optional[int]:
+    """
+    Score how well a lowercased query matches a symbol name.
+
+    Args:
+        query: Lowercased search query
+        name: Symbol name
+        starts: Precomputed word_starts(name)
+
+    Returns:
+        Score (see module docstring), or None if the name does not match
+    """
+    lower = name.lower()
+    if lower == query:
+        return _SCORE_EXACT
+    if lower.startswith(query):
+        return _SCORE_PREFIX
+    if starts is None:
+        starts = word_starts(name)
+    if any(lower.startswith(query, i) for i in starts):
+        return _SCORE_WORD_PREFIX
+    if query in lower:
+        return _SCORE_SUBSTRING
+    initials = "".join(lower[i] for i in starts)
+    if query in initials:
+        return _SCORE_INITIALS
+
+    return _fuzzy_score(query, lower, starts)
+
+
+def _fuzzy_score(query: str, lower: str, starts: List[int]) -> Optional[int]:
+    """
+    Score a subsequence match, preferring query characters at word starts.
+
+    Each query character is matched at its next occurrence, or at a later
+    word start with the same character if the rest of the query still fits.
+    """
+    boundaries = set(starts)
+    position = 0
+    boundary_hits = 0
+    gaps = 0
+    for k, char in enumerate(query):
+        found = lower.find(char, position)
+        if found < 0:
+            return None
+        if found not in boundaries:
+            for start in starts:
+                if (
+                    start > found
+                    and lower[start] == char
+                    and _is_subsequence(query[k + 1 :], lower, start + 1)
+                ):
+                    found = start
+                    break
+        if found in boundaries:
+            boundary_hits += 1
+        if found > position:
+            gaps += 1
+        position = found + 1
+    return _SCORE_FUZZY + min(boundary_hits * 4, 30) + max(9 - gaps, 0)
+
+
+def _is_subsequence(query: str, text: str, start: int = 0) -> bool:
+    """Whether query's characters appear in order in text[start:]."""
+    position = start
+    for char in query:
+        position = text.find(char, position)
+        if position < 0:
+            return False
+        position += 1
+    return True
+
+
+def _prefixed_ids(array: List[Tuple[str, int]], query: str) -> List[Tuple[str, int]]:
+    """Entries of a sorted (text, id) array whose text starts with query."""
+    start = bisect_left(array, (query,))
+    end = bisect_left(array, (query + "\U0010ffff",), start)
+    return array[start:end]
+
+
+class _SearchSegment:
+    """Immutable search structures over a fixed list of symbols."""
+
+    def __init__(self, keys: List[SymbolKey]):
+        self.keys = keys
+        self.ids: Dict[SymbolKey, int] = {key: i for i, key in enumerate(keys)}
+        self.lower = [name.lower() for _, name in keys]
+
+        words: List[Tuple[str, int]] = []
+        initials: List[Tuple[str, int]] = []
+        postings: Dict[str, List[int]] = {}
+        for i, (_, name) in enumerate(keys):
+            lower = self.lower[i]
+            starts = word_starts(name)
+            words.extend((lower[start:], i) for start in starts)
+            letters = "".join(lower[start] for start in starts)
+            initials.extend((letters[j:], i) for j in range(len(letters)))
+            for trigram in _trigrams(lower):
+                posting = postings.get(trigram)
+                if posting is None:
+                    postings[trigram] = [i]
+                else:
+                    posting.append(i)
+        words.sort()
+        initials.sort()
+        # Ids in tie-break order (shorter names, then alphabetical), which is
+        # the ranking of an empty query
+        self.order = sorted(
+            range(len(keys)), key=lambda i: (len(keys[i][1]), keys[i][1], keys[i][0])
+        )
+        self.words = words
+        self.initials = initials
+        self.postings = postings
+
+    def score_candidates(self, query: str, limit: int) -> Dict[int, int]:
+        """
+        Score names matching the query by prefix, substring or initials.
+
+        Tiers are looked up from strongest to weakest, stopping once a tier
+        leaves at least ``limit`` better-scored names.
+
+        Args:
+            query: Lowercased query
+            limit: Number of results the caller needs
+
+        Returns:
+            id → score
+        """
+        lower = self.lower
+        scores: Dict[int, int] = {}
+        for _, i in _prefixed_ids(self.words, query):
+            if i not in scores:
+                name = lower[i]
+                if name == query:
+                    scores[i] = _SCORE_EXACT
+                elif name.startswith(query):
+                    scores[i] = _SCORE_PREFIX
+                else:
+                    scores[i] = _SCORE_WORD_PREFIX
+        if len(scores) >= limit:
+            return scores
+
+        if len(query) >= 3:
+            postings = [self.postings.get(trigram) for trigram in _trigrams(query)]
+            if all(postings):
+                postings.sort(key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates.intersection_update(posting)
+                for i in candidates:
+                    if i not in scores and query in lower[i]:
+                        scores[i] = _SCORE_SUBSTRING
+            if len(scores) >= limit:
+                return scores
+
+        for _, i in _prefixed_ids(self.initials, query):
+            if i not in scores:
+                scores[i] = _SCORE_INITIALS
+        return scores
+
+    def score_fuzzy(self, query: str, limit: int, exclude: Dict[int, int]) -> Dict[int, int]:
+        """
+        Score subsequence matches among names sharing the query's trigrams.
+
+        Candidates sharing at least a third of the query's trigrams are
+        tried from most to fewest shared trigrams, until ``limit`` matches
+        are found. Queries shorter than a trigram have no fuzzy candidates.
+
+        Args:
+            query: Lowercased query
+            limit: Number of matches to stop after
+            exclude: Ids that are already scored
+
+        Returns:
+            id → score
+        """
+        scores: Dict[int, int] = {}
+        query_trigrams = _trigrams(query)
+        if not query_trigrams:
+            return scores
+        counts: Counter = Counter()
+        for trigram in query_trigrams:
+            counts.update(self.postings.get(trigram, ()))
+        needed = max(1, (len(query_trigrams) + 2) // 3)
+        for i, count in counts.most_common():
+            if count < needed or len(scores) >= limit:
+                break
+            if i not in exclude and _is_subsequence(query, self.lower[i]):
+                scores[i] = _fuzzy_score(query, self.lower[i], word_starts(self.keys[i][1]))
+        return scores
+
+
+class SymbolSearchIndex:
+    """
+    Search index over (kind, name) symbol keys with ranked fuzzy matching.
+
+    ``kind`` is an opaque label (the DocumentIndex table name); the same
+    name may be indexed under several kinds.
+    """
+
+    def __init__(self, symbols: Iterable[SymbolKey] = ()):
+        """
+        Build the index.
+
+        Args:
+            symbols: Initial (kind, name) keys
+        """
+        self._segment = _SearchSegment(list(dict.fromkeys(symbols)))
+        self._added: Set[SymbolKey] = set()
+        self._removed: Set[SymbolKey] = set()
+
+    def __len__(self) -> int:
+        return len(self._segment.keys) - len(self._removed) + len(self._added)
+
+    def __contains__(self, key: SymbolKey) -> bool:
+        if key in self._added:
+            return True
+        return key in self._segment.ids and key not in self._removed
+
+    def copy(self) -> "SymbolSearchIndex":
+        """
+        Copy the index; the immutable segment is shared, only the overlay is copied.
+
+        Returns:
+            Independent SymbolSearchIndex with the same contents
+        """
+        clone = SymbolSearchIndex.__new__(SymbolSearchIndex)
+        clone._segment = self._segment
+        clone._added = set(self._added)
+        clone._removed = set(self._removed)
+        return clone
+
+    def add(self, kind: str, name: str):
+        """Add a symbol (no-op if already present)."""
+        key = (kind, name)
+        if key in self._removed:
+            self._removed.discard(key)
+        elif key not in self._segment.ids:
+            self._added.add(key)
+            self._maybe_compact()
+
+    def remove(self, kind: str, name: str):
+        """Remove a symbol (no-op if absent)."""
+        key = (kind, name)
+        if key in self._added:
+            self._added.discard(key)
+        elif key in self._segment.ids and key not in self._removed:
+            self._removed.add(key)
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Rebuild the segment once the overlay has grown too large."""
+        if len(self._added) + len(self._removed) <= COMPACT_THRESHOLD:
+            return
+        removed = self._removed
+        live = [key for key in self._segment.keys if key not in removed]
+        live.extend(sorted(self._added))
+        self._segment = _SearchSegment(live)
+        self._added = set()
+        self._removed = set()
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[SymbolKey]:
+        """
+        Find the best matching symbols for a query.
+
+        Args:
+            query: Search text (case-insensitive); an empty query matches
+                every symbol
+            limit: Maximum number of results
+
+        Returns:
+            (kind, name) keys, best match first
+        """
+        query = query.strip().lower()
+        if limit <= 0:
+            return []
+
+        segment = self._segment
+        removed = self._removed
+        if not query:
+            # Every name matches (the initial list of Go to Symbol in Workspace)
+            keys = segment.keys
+            candidates = [keys[i] for i in segment.order[: limit + len(removed)]]
+            best = heapq.nsmallest(
+                limit,
+                (
+                    (len(name), name, kind)
+                    for kind, name in candidates + list(self._added)
+                    if (kind, name) not in removed
+                ),
+            )
+            return [(kind, name) for _, name, kind in best]
+
+        scores = segment.score_candidates(query, limit + len(removed))
+
+        results: Dict[SymbolKey, int] = {}
+        for i, score in scores.items():
+            key = segment.keys[i]
+            if key not in removed:
+                results[key] = score
+        for key in self._added:
+            score = match_score(query, key[1])
+            if score is not None:
+                results[key] = score
+
+        if len(results) < limit:
+            fuzzy = segment.score_fuzzy(query, limit + len(removed), scores)
+            for i, score in fuzzy.items():
+                key = segment.keys[i]
+                if key not in removed:
+                    results[key] = score
+
+        best = heapq.nsmallest(
+            limit, ((-score, len(key[1]), key[1], key[0]) for key, score in results.items())
+        )
+        return [(kind, name) for _, _, name, kind in best]
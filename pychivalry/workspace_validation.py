@@ -0,0 +1,336 @@
+"""
+CK3 Workspace Validation - Diagnostics for Every Script File of a Mod
+
+MODULE OVERVIEW:
+    The editor only validates open documents. This module runs the full
+    diagnostic pipeline (collect_all_diagnostics) over every script file of
+    the workspace, so a whole mod can be checked at once: from the
+    ck3.validateWorkspace command of the language server, or from scripts.
+
+    Validation is pure Python and CPU-bound, so threads would be serialized
+    by the GIL. Files are instead validated in a pool of worker processes,
+    in batches, and the results are handed to a callback as each batch
+    finishes, so callers can stream them (the server publishes them as
+    diagnostics while the run continues).
+
+ARCHITECTURE:
+    **Files**:
+    find_script_files() lists the *.txt files under each workspace root,
+    skipping hidden folders (.git, .pychivalry, ...), in a stable order.
+
+    **Worker Processes**:
+    The DocumentIndex is pickled once and shipped to each worker by the pool
+    initializer (_init_worker), not with every batch. A worker reads,
+    parses and validates the files of a batch against that index and
+    returns a FileValidation per file: its diagnostics plus the fingerprint
+    and symbols a result cache needs (see lint.py). Workers are spawned rather than
+    forked: the server process runs threads, and forking while another
+    thread holds a lock can deadlock.
+
+    Batches are small enough that every worker gets several (load balancing
+    between large and small files) and large enough to amortize IPC.
+
+    **Small Workspaces**:
+    Below _MIN_PROCESS_FILES files (or with workers=0) the files are
+    validated inline; starting processes would cost more than it saves.
+
+    **Cancellation**:
+    is_cancelled() is polled between batches. When it returns true, batches
+    that have not started are cancelled, the result is marked cancelled and
+    the call returns; batches already running finish in the background.
+
+    **Summary**:
+    WorkspaceValidationResult counts files, diagnostics, diagnostics per
+    code and per severity, for the command's response.
+
+USAGE EXAMPLES:
+    >>> files = find_script_files(["/path/to/mod"])
+    >>> result = validate_files(files, index, workers=8, on_batch=publish)
+    >>> result.by_code
+    {'CK3101': 12, 'CK3760': 3}
+
+PERFORMANCE:
+    - Scales with cores: each worker validates its batches independently
+    - One pickled index per worker, not per file
+    - Per-file results reach on_batch while other batches are still running
+
+SEE ALSO:
+    - diagnostics.py: collect_all_diagnostics() (what is run per file)
+    - indexer.py: scan_workspace() (the same process pool approach)
+    - server.py: ck3.validateWorkspace command
+"""
+
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence
+
+from lsprotocol import types
+from pygls.workspace import TextDocument
+
+from .diagnostic_cache import _block_keys
+from .diagnostics import DiagnosticConfig, collect_all_diagnostics
+from .indexer import DocumentIndex, _decode_file
+from .parser import parse_document
+
+logger = logging.getLogger(__name__)
+
+# Below this many files, validate inline instead of starting processes
+_MIN_PROCESS_FILES = 32
+
+# Largest number of files per worker batch
+_BATCH_MAX = 64
+
+# Batches per worker (more batches balance uneven file sizes better)
+_BATCHES_PER_WORKER = 4
+
+# Index and configuration of a worker process (set by _init_worker)
+_worker_index: Optional[DocumentIndex] = None
+_worker_config: Optional[DiagnosticConfig] = None
+
+
+class FileValidation(NamedTuple):
+    """
+    Result of validating one file.
+
+    Attributes:
+        uri: File URI
+        diagnostics: Diagnostics of the file (None if it could not be read
+            or validated)
+        fingerprint: [mtime_ns, size, content MD5] of the validated content,
+            as stored by the index cache (None if unreadable)
+        symbols: All node keys of the file: the index symbols its diagnostics
+            can depend on (see DocumentIndex.dependency_symbols)
+    """
+
+    uri: str
+    diagnostics: Optional[List[types.Diagnostic]]
+    fingerprint: Optional[List] = None
+    symbols: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class WorkspaceValidationResult:
+    """
+    Summary of a workspace validation run.
+
+    Attributes:
+        files: Number of files validated
+        failed: Number of files that could not be read or validated
+        diagnostics: Total number of diagnostics
+        by_code: Diagnostic count per code
+        by_severity: Diagnostic count per severity name ("Error", ...)
+        cancelled: Whether the run was cancelled before all files were validated
+    """
+
+    files: int = 0
+    failed: int = 0
+    diagnostics: int = 0
+    by_code: Dict[str, int] = field(default_factory=dict)
+    by_severity: Dict[str, int] = field(default_factory=dict)
+    cancelled: bool = False
+
+    def add(self, diagnostics: Sequence[types.Diagnostic]):
+        """Count the diagnostics of one file."""
+        self.files += 1
+        self.diagnostics += len(diagnostics)
+        for diagnostic in diagnostics:
+            code = str(diagnostic.code) if diagnostic.code is not None else "unknown"
+            self.by_code[code] = self.by_code.get(code, 0) + 1
+            severity = (
+                diagnostic.severity.name if diagnostic.severity is not None else "Unknown"
+            )
+            self.by_severity[severity] = self.by_severity.get(severity, 0) + 1
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary, codes sorted by count (most frequent first)."""
+        return {
+            "files": self.files,
+            "failed": self.failed,
+            "diagnostics": self.diagnostics,
+            "by_code": dict(sorted(self.by_code.items(), key=lambda item: (-item[1], item[0]))),
+            "by_severity": dict(sorted(self.by_severity.items())),
+            "cancelled": self.cancelled,
+        }
+
+
+def find_script_files(workspace_roots: Iterable[str]) -> List[Path]:
+    """
+    List the script files of workspace folders.
+
+    Args:
+        workspace_roots: Workspace folder paths
+
+    Returns:
+        Paths of all *.txt files outside hidden folders, sorted per root
+    """
+    files: List[Path] = []
+    for root in workspace_roots:
+        root_path = Path(root)
+        if not root_path.is_dir():
+            continue
+        root_files = []
+        for directory, subdirectories, names in os.walk(root_path):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            root_files.extend(
+                Path(directory, name) for name in names if name.lower().endswith(".txt")
+            )
+        files.extend(sorted(root_files))
+    return files
+
+
+def validate_file(
+    path: Path, index: Optional[DocumentIndex], config: Optional[DiagnosticConfig] = None
+) -> Optional[List[types.Diagnostic]]:
+    """
+    Validate one script file from disk.
+
+    Args:
+        path: File path
+        index: Workspace index to validate against
+        config: Diagnostic configuration (defaults if None)
+
+    Returns:
+        List of diagnostics, or None if the file could not be read
+    """
+    return _validate_path(path, index, config).diagnostics
+
+
+def validate_files(
+    paths: Sequence[Path],
+    index: Optional[DocumentIndex],
+    workers: int = 0,
+    config: Optional[DiagnosticConfig] = None,
+    on_batch: Optional[Callable[[List[FileValidation]], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> WorkspaceValidationResult:
+    """
+    Validate script files, in worker processes if there are enough of them.
+
+    Blocking; the server calls it from its thread pool. on_batch is called
+    from the calling thread with the FileValidation results of each
+    finished batch, in completion order. Files that could not be read are
+    counted as failed and not passed to on_batch.
+
+    Args:
+        paths: Files to validate
+        index: Workspace index to validate against
+        workers: Number of worker processes (0 = validate inline)
+        config: Diagnostic configuration (defaults if None)
+        on_batch: Called with the results of each finished batch
+        is_cancelled: Polled between batches; stops the run when it returns true
+
+    Returns:
+        Summary of the run
+    """
+    result = WorkspaceValidationResult()
+
+    def collect(batch_results: List[FileValidation]):
+        finished = []
+        for file_result in batch_results:
+            if file_result.diagnostics is None:
+                result.failed += 1
+            else:
+                result.add(file_result.diagnostics)
+                finished.append(file_result)
+        if on_batch is not None and finished:
+            on_batch(finished)
+
+    if workers <= 0 or len(paths) < _MIN_PROCESS_FILES:
+        for start in range(0, len(paths), _BATCH_MAX):
+            if is_cancelled is not None and is_cancelled():
+                result.cancelled = True
+                break
+            collect([_validate_path(path, index, config) for path in paths[start : start + _BATCH_MAX]])
+        return result
+
+    batch_size = max(1, min(_BATCH_MAX, math.ceil(len(paths) / (workers * _BATCHES_PER_WORKER))))
+    batches = [
+        [str(path) for path in paths[start : start + batch_size]]
+        for start in range(0, len(paths), batch_size)
+    ]
+
+    # Spawn (not fork): the server process runs threads
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(pickle.dumps((index, config), pickle.HIGHEST_PROTOCOL),),
+    )
+    try:
+        futures = {pool.submit(_validate_batch, batch): batch for batch in batches}
+        pending = set(futures)
+        while pending:
+            # Wake up regularly to poll for cancellation
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    collect(future.result())
+                except Exception as e:
+                    logger.warning(f"Error in validation worker: {e}")
+                    result.failed += len(futures[future])
+            if pending and is_cancelled is not None and is_cancelled():
+                result.cancelled = True
+                break
+    finally:
+        # On cancellation, don't wait for the batches already running
+        pool.shutdown(wait=not result.cancelled, cancel_futures=True)
+
+    return result
+
+
+def _validate_path(
+    path: Path, index: Optional[DocumentIndex], config: Optional[DiagnosticConfig]
+) -> FileValidation:
+    """Read and validate a file; errors are reported as a failed file."""
+    uri = path.as_uri()
+    try:
+        stat = path.stat()
+        data = path.read_bytes()
+    except OSError as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return FileValidation(uri, None)
+    content = _decode_file(data)
+    if content is None:
+        logger.warning(f"Could not decode {path}")
+        return FileValidation(uri, None)
+
+    try:
+        ast = parse_document(content)
+        doc = TextDocument(uri=uri, source=content)
+        diagnostics = collect_all_diagnostics(doc, ast, index, config)
+    except Exception as e:
+        logger.warning(f"Error validating {path}: {e}")
+        return FileValidation(uri, None)
+
+    return FileValidation(
+        uri,
+        diagnostics,
+        [stat.st_mtime_ns, stat.st_size, hashlib.md5(data).hexdigest()],
+        frozenset().union(*(_block_keys(node) for node in ast)),
+    )
+
+
+def _init_worker(payload: bytes):
+    """Worker process initializer: unpickle the index and configuration once."""
+    global _worker_index, _worker_config
+    _worker_index, _worker_config = pickle.loads(payload)
+
+
+def _validate_batch(batch: List[str]) -> List[FileValidation]:
+    """
+    Worker process entry point: validate a batch of files.
+
+    Args:
+        batch: File paths
+
+    Returns:
+        FileValidation results in batch order
+    """
+    return [_validate_path(Path(path), _worker_index, _worker_config) for path in batch]
@@ -5,7 +5,13 @@ Tests the parser and other components with randomly generated inputs.
 
 import pytest
 from hypothesis import given, strategies as st, settings, HealthCheck
-from pychivalry.parser import parse_document
+from pychivalry.parser import (
+    _parse_tokens,
+    _parse_tokens_reference,
+    parse_document,
+    parse_outline,
+    tokenize,
+)
 from pychivalry.diagnostics import collect_all_diagnostics, get_diagnostics_for_text
 from pychivalry.completions import get_context_aware_completions
 from pychivalry.indexer import DocumentIndex
@@ -123,6 +129,122 @@ class TestParserRobustness:
             pytest.fail(f"Parser crashed on quotes: {repr(text[:100])}\nError: {e}")
 
 
+def _tree_shape(nodes):
+    """Flatten a tree into comparable tuples (CK3Node equality recurses via parent)."""
+    result = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        result.append(
+            (
+                node.type,
+                node.key,
+                node.value,
+                node.range,
+                node.parent.range if node.parent else None,
+                len(node.children),
+            )
+        )
+        stack.extend(reversed(node.children))
+    return result
+
+
+# Token soup: fragments that exercise every parser branch in random order
+_CK3_FRAGMENTS = st.sampled_from(
+    [
+        "a",
+        "b.1",
+        "namespace",
+        "scope:x",
+        "=",
+        ">",
+        "<=",
+        "{",
+        "}",
+        "1",
+        "-2.5",
+        '"s"',
+        "# c",
+        "\n",
+        " ",
+    ]
+)
+
+
+class TestExplicitStackParser:
+    """The explicit-stack parser builds the same trees as the recursive reference."""
+
+    @staticmethod
+    def _assert_equivalent(text):
+        tokens = tokenize(text)
+        nodes, truncated = _parse_tokens(tokens)
+        reference_nodes, reference_truncated = _parse_tokens_reference(tokens)
+        assert _tree_shape(nodes) == _tree_shape(reference_nodes)
+        assert truncated == reference_truncated
+
+    @given(st.lists(_CK3_FRAGMENTS, max_size=80).map(" ".join))
+    @settings(max_examples=200)
+    def test_matches_reference_on_token_soup(self, text):
+        """Random mixes of keys, operators, braces and values parse identically."""
+        self._assert_equivalent(text)
+
+    @given(st.lists(ck3_block(), min_size=0, max_size=5).map("".join))
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow])
+    def test_matches_reference_on_generated_scripts(self, text):
+        """Well-formed generated scripts parse identically."""
+        self._assert_equivalent(text)
+
+    @given(st.lists(ck3_block(), min_size=1, max_size=3).map("".join), st.data())
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow])
+    def test_matches_reference_on_truncated_scripts(self, text, data):
+        """Scripts cut off anywhere (unclosed blocks, dangling keys) parse identically."""
+        cut = data.draw(st.integers(min_value=0, max_value=len(text)))
+        self._assert_equivalent(text[:cut])
+
+    @given(st.text(min_size=0, max_size=300))
+    @settings(max_examples=100, suppress_health_check=[HealthCheck.too_slow])
+    def test_matches_reference_on_arbitrary_text(self, text):
+        """Arbitrary text parses identically."""
+        self._assert_equivalent(text)
+
+    @given(st.integers(min_value=400, max_value=2000))
+    @settings(max_examples=5, deadline=None)
+    def test_nesting_beyond_recursion_limit(self, depth):
+        """Nesting deeper than the recursion limit parses without RecursionError."""
+        content = "if = {\n" * depth + "value = 1\n" + "}\n" * depth
+
+        nodes = parse_document(content)
+
+        node = nodes[0]
+        for _ in range(depth - 1):
+            node = node.children[0]
+        assert node.children[0].key == "value"
+
+
+class TestOutlineParser:
+    """The skeleton parser agrees with the full parser on top-level statements."""
+
+    @given(st.lists(ck3_block(), min_size=0, max_size=5).map("".join))
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow])
+    def test_matches_full_parse_on_generated_scripts(self, text):
+        """Generated scripts give the same top-level nodes, parsed lazily."""
+        outline = parse_outline(text)
+
+        assert _tree_shape([node.parse() for node in outline]) == _tree_shape(
+            parse_document(text)
+        )
+
+    @given(st.lists(_CK3_FRAGMENTS.filter(lambda f: f not in "{}"), max_size=60).map(" ".join))
+    @settings(max_examples=200)
+    def test_matches_full_parse_without_blocks(self, text):
+        """Token soup without braces gives the same statements."""
+        outline = parse_outline(text)
+
+        assert [(n.type, n.key, n.value, n.key_range) for n in outline] == [
+            (n.type, n.key, n.value, n.range) for n in parse_document(text)
+        ]
+
+
 class TestDiagnosticsRobustness:
     """Test diagnostics handles edge cases."""
 
@@ -3,9 +3,12 @@
 Tests response times and memory usage to ensure performance requirements are met.
 """
 
+import gc
 import pytest
+import re
+import statistics
 import time
-from pychivalry.parser import parse_document
+from pychivalry.parser import parse_document, tokenize, tokenize_reference
 from pychivalry.diagnostics import collect_all_diagnostics
 from pychivalry.completions import get_context_aware_completions
 from pychivalry.navigation import find_definition, find_references
@@ -18,6 +21,33 @@ DIAGNOSTICS_THRESHOLD = 0.1
 COMPLETIONS_THRESHOLD = 0.05
 NAVIGATION_THRESHOLD = 0.05
 
+# Largest median time ratio of an optimized function over its reference
+# implementation. Generous on purpose: the speedups themselves are tracked by
+# the benchmark tests, this only catches an optimization falling clearly behind
+REFERENCE_RATIO_LIMIT = 1.25
+
+
+def _median_time_ratio(function, reference, argument, rounds=7):
+    """
+    Median over interleaved rounds of function's CPU time over reference's.
+
+    CPU time with GC paused, so other processes and collections triggered by
+    earlier tests do not count.
+    """
+    ratios = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.process_time()
+            function(argument)
+            middle = time.process_time()
+            reference(argument)
+            ratios.append((middle - start) / max(time.process_time() - middle, 1e-9))
+    finally:
+        gc.enable()
+    return statistics.median(ratios)
+
 
 class TestParserPerformance:
     """Test parser performance on various file sizes."""
@@ -124,6 +154,146 @@ class TestParserPerformance:
         result = benchmark(parse_document, content)
         assert result is not None
 
+    def test_parse_500_level_nesting(self, benchmark):
+        """Benchmark 500 levels of nesting (beyond the reference parser's recursion limit)."""
+        content = "if = {\n" * 500 + "add_gold = 100\n" + "}\n" * 500
+
+        result = benchmark(parse_document, content)
+
+        node = result[0]
+        for _ in range(499):
+            node = node.children[0]
+        assert node.children[0].key == "add_gold"
+        assert node.range.end.line == 501
+
+    @pytest.mark.slow
+    def test_parser_vs_reference_vanilla_sized_file(self):
+        """The explicit-stack parser keeps up with the recursive reference."""
+        from pychivalry.parser import _parse_tokens, _parse_tokens_reference
+
+        tokens = tokenize(TestTokenizerPerformance._vanilla_sized_content())
+
+        ratio = _median_time_ratio(_parse_tokens, _parse_tokens_reference, tokens)
+
+        print(f"\nParser time / reference time: {ratio:.2f}")
+        assert ratio < REFERENCE_RATIO_LIMIT
+
+
+class TestTokenizerPerformance:
+    """Compare the regex tokenizer with the reference tokenizer."""
+
+    @staticmethod
+    def _vanilla_sized_content() -> str:
+        """Generate a ~20k line event file, comparable to large vanilla files."""
+        event_template = """
+# Event {i}
+character_event = {{
+\tid = test.{i:04d}
+\ttitle = test.{i:04d}.t
+\tdesc = "test.{i:04d}.desc"
+\ttheme = intrigue
+
+\ttrigger = {{
+\t\tage >= 16
+\t\tis_adult = yes
+\t\tscope:target = {{ has_trait = brave }}
+\t}}
+
+\toption = {{ # Accept
+\t\tname = test.{i:04d}.a
+\t\tadd_gold = -100.5
+\t\tadd_character_modifier = {{
+\t\t\tmodifier = test_modifier
+\t\t\tyears = 5
+\t\t}}
+\t}}
+}}
+"""
+        content = "namespace = test\n"
+        content += "".join(event_template.format(i=i) for i in range(850))
+        return content
+
+    @staticmethod
+    def _commented_content() -> str:
+        """The ~20k line event file commented out line by line, keeping indentation."""
+        content = TestTokenizerPerformance._vanilla_sized_content()
+        return re.sub(r"(?m)^(\s*)(?=\S)", r"\1# ", content)
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("content_name", ["_vanilla_sized_content", "_commented_content"])
+    def test_tokenize_keeps_up_with_reference(self, content_name):
+        """The regex tokenizer keeps up with the reference on code and on comments."""
+        content = getattr(self, content_name)()
+
+        ratio = _median_time_ratio(tokenize, tokenize_reference, content)
+
+        print(f"\nTokenizer time / reference time ({content_name}): {ratio:.2f}")
+        assert ratio < REFERENCE_RATIO_LIMIT
+
+    def test_tokenize_vanilla_sized_file(self, benchmark):
+        """Benchmark the regex tokenizer on a ~20k line file."""
+        content = self._vanilla_sized_content()
+
+        result = benchmark(tokenize, content)
+        assert len(result) > 0
+
+    def test_tokenize_reference_vanilla_sized_file(self, benchmark):
+        """Benchmark the reference character loop tokenizer on a ~20k line file."""
+        content = self._vanilla_sized_content()
+
+        result = benchmark(tokenize_reference, content)
+        assert len(result) > 0
+
+    def test_tokenizers_agree_on_vanilla_sized_file(self):
+        """Both tokenizers emit the same token stream."""
+        content = self._vanilla_sized_content()
+
+        fast = [(t.type, t.value, t.line, t.character) for t in tokenize(content)]
+        slow = [(t.type, t.value, t.line, t.character) for t in tokenize_reference(content)]
+        assert fast == slow
+
+    def test_position_index_lookup_vanilla_sized_file(self, benchmark):
+        """Benchmark indexed cursor lookups on a ~20k line file."""
+        from lsprotocol import types
+
+        from pychivalry.parser import PositionIndex, get_node_at_position
+
+        content = self._vanilla_sized_content()
+        ast = parse_document(content)
+        position_index = PositionIndex(ast)
+        line_count = content.count("\n")
+        positions = [
+            types.Position(line=line, character=4) for line in range(0, line_count, 97)
+        ]
+
+        nodes = benchmark(lambda: [position_index.node_at(position) for position in positions])
+
+        assert all(
+            node is get_node_at_position(ast, position) for node, position in zip(nodes, positions)
+        )
+
+    def test_parse_outline_vanilla_sized_file(self, benchmark):
+        """Benchmark the skeleton parser (top-level statements only) on a ~20k line file."""
+        from pychivalry.parser import parse_outline
+
+        content = self._vanilla_sized_content()
+
+        outline = benchmark(parse_outline, content)
+
+        assert len(outline) == len(parse_document(content))
+
+    def test_snapshot_repeated_requests_vanilla_sized_file(self, benchmark):
+        """Benchmark a second round of folding/semantic token requests on one version."""
+        from pychivalry.document_snapshot import DocumentSnapshot
+
+        content = self._vanilla_sized_content()
+        snapshot = DocumentSnapshot("file:///test.txt", 1, content)
+        first = (snapshot.folding_ranges, snapshot.semantic_tokens())
+
+        result = benchmark(lambda: (snapshot.folding_ranges, snapshot.semantic_tokens()))
+
+        assert result[0] is first[0] and result[1] is first[1]
+
 
 class TestDiagnosticsPerformance:
     """Test diagnostics performance on various scenarios."""
@@ -147,6 +317,46 @@ class TestDiagnosticsPerformance:
         result = benchmark(collect_all_diagnostics, doc, ast)
         assert result is not None
 
+    def test_paradox_conventions_vanilla_sized_file(self, benchmark):
+        """Benchmark all Paradox convention checks (one shared traversal) on a ~20k line file."""
+        from pychivalry.paradox_checks import check_paradox_conventions
+
+        ast = parse_document(TestTokenizerPerformance._vanilla_sized_content())
+
+        result = benchmark(check_paradox_conventions, ast)
+        assert result is not None
+
+    def test_block_cache_single_event_edit(self, benchmark):
+        """Benchmark AST checks after editing one event in a 250 event file."""
+        from pychivalry.diagnostic_cache import BlockDiagnosticCache
+        from pychivalry.diagnostics import create_scope_checks, create_semantic_checks
+        from pychivalry.paradox_checks import create_paradox_checks
+
+        events = [
+            f"test.{i:04d} = {{\n    type = character_event\n    option = {{ name = a }}\n}}\n"
+            for i in range(250)
+        ]
+        versions = []
+        for body in ("add_gold = 1", "add_gold = 2"):
+            source = "".join(events[:125]) + f"test.9999 = {{\n    {body}\n}}\n" + "".join(events[125:])
+            versions.append((parse_document(source), source.split("\n")))
+        index = DocumentIndex()
+        cache = BlockDiagnosticCache()
+        edits = iter(range(10**9))
+
+        def check_edit():
+            ast, lines = versions[next(edits) % 2]
+            checks = (
+                create_semantic_checks(index)
+                + create_scope_checks(index)
+                + create_paradox_checks(index)
+            )
+            return cache.run(ast, lines, checks, index)
+
+        check_edit()
+        benchmark(check_edit)
+        assert cache.misses == 1
+
     def test_diagnostics_large_workspace(self):
         """Test diagnostics performance across large workspace."""
         from pygls.workspace import TextDocument
@@ -343,6 +553,101 @@ class TestNavigationPerformance:
         # assert len(references) >= 31
         assert elapsed < 0.5  # Allow more time for finding many references
 
+    def test_workspace_symbol_search_60k_symbols(self, benchmark):
+        """Benchmark ranked symbol search on a vanilla + mod sized index."""
+        from pychivalry.symbol_search import SymbolSearchIndex
+
+        words = ["trait", "marriage", "war", "county", "faith", "gold", "scheme", "vassal"]
+        symbols = [("events", f"mod_{i % 300}.{i:04d}") for i in range(40000)]
+        symbols += [
+            ("scripted_effects", f"{words[i % 8]}_{words[i // 8 % 8]}_{words[i // 64 % 8]}_{i}")
+            for i in range(20000)
+        ]
+        search = SymbolSearchIndex(symbols)
+
+        def run_queries():
+            return [search.search(query) for query in ("mod_12", "gold_war", "gwf", "marrfaith")]
+
+        results = benchmark(run_queries)
+
+        assert all(results)
+        assert results[0][0] == ("events", "mod_12.0012")
+
+
+class TestIndexUpdatePerformance:
+    """Per-edit index updates of copy-on-write DocumentIndex versions."""
+
+    EDITED_URI = "file:///mod/events/edited.txt"
+
+    @staticmethod
+    def _index_with_events(count):
+        """Index with ``count`` events spread over files of 100 events."""
+        from lsprotocol import types
+
+        index = DocumentIndex()
+        for i in range(count):
+            uri = f"file:///mod/events/file_{i // 100}.txt"
+            index.namespaces[f"mod_{i // 100}"] = uri
+            index.events[f"mod_{i // 100}.{i:04d}"] = types.Location(
+                uri=uri,
+                range=types.Range(
+                    start=types.Position(line=i % 100, character=0),
+                    end=types.Position(line=i % 100, character=12),
+                ),
+            )
+        index._rebuild_document_keys()
+        index._rebuild_symbol_search()
+        return index
+
+    @classmethod
+    def _edit(cls, index, source, ast):
+        """Publish the next version of the index for one edit."""
+        version = index.copy()
+        version.update_from_ast(cls.EDITED_URI, ast, source)
+        return version
+
+    @classmethod
+    def _best_edit_time(cls, index, source, ast, edits=50, repeats=5):
+        """Best average time per edit over several runs of ``edits`` edits."""
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(edits):
+                index = cls._edit(index, source, ast)
+            best = min(best, (time.perf_counter() - start) / edits)
+        return best
+
+    @staticmethod
+    def _edited_document():
+        source = "namespace = edited\n" + "".join(
+            f"edited.{i:04d} = {{\n\ttype = character_event\n\tset_global_variable = x\n}}\n"
+            for i in range(10)
+        )
+        return source, parse_document(source)
+
+    def test_edit_80k_event_workspace(self, benchmark):
+        """Benchmark one edit (copy + update_from_ast) with 80k indexed events."""
+        source, ast = self._edited_document()
+        versions = [self._index_with_events(80000)]
+
+        def edit():
+            versions[0] = self._edit(versions[0], source, ast)
+
+        benchmark(edit)
+
+        assert "edited.0009" in versions[0].events
+        assert len(versions[0].events) == 80010
+
+    def test_edit_cost_independent_of_workspace_size(self):
+        """An edit costs about the same with 1k and 80k indexed events."""
+        source, ast = self._edited_document()
+        small = self._best_edit_time(self._index_with_events(1000), source, ast)
+        large = self._best_edit_time(self._index_with_events(80000), source, ast)
+
+        print(f"\nPer-edit time: 1k events {small * 1000:.3f}ms, 80k events {large * 1000:.3f}ms")
+        # Copying whole tables made the 80k edit ~20x slower than the 1k edit
+        assert large < small * 3
+
 
 class TestMemoryPerformance:
     """Test memory usage."""
@@ -381,6 +686,134 @@ class TestMemoryPerformance:
         growth = final_size - initial_size
         assert growth < 10_000_000  # Less than 10MB growth for 500 files
 
+    def test_compact_ast_memory(self):
+        """Compact ASTs use a fraction of the memory of CK3Node trees."""
+        import gc
+        import tracemalloc
+
+        from pychivalry.compact_ast import CompactAST
+
+        content = TestTokenizerPerformance._vanilla_sized_content()
+
+        gc.collect()
+        tracemalloc.start()
+        ast = parse_document(content)
+        node_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        compact = CompactAST.from_nodes(ast)
+        compact_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(f"\nCK3Node tree: {node_bytes / 1e6:.1f} MB, compact: {compact_bytes / 1e6:.2f} MB")
+        assert compact_bytes * 5 < node_bytes
+
+
+def _write_synthetic_mod(root, file_count):
+    """Write a synthetic mod: a third each of event, scripted effect and localization files."""
+    events = root / "events"
+    effects = root / "common" / "scripted_effects"
+    loc = root / "localization" / "english"
+    for folder in (events, effects, loc):
+        folder.mkdir(parents=True)
+
+    for i in range(file_count):
+        if i % 3 == 0:
+            body = f"namespace = ns{i}\n" + "".join(
+                f"ns{i}.{j:04d} = {{\n\ttype = character_event\n\timmediate = {{\n"
+                f"\t\tsave_scope_as = s{j}\n\t\tadd_character_flag = f{j}\n\t}}\n"
+                f"\toption = {{ name = ns{i}.{j:04d}.a }}\n}}\n"
+                for j in range(20)
+            )
+            (events / f"e{i}.txt").write_text(body, encoding="utf-8")
+        elif i % 3 == 1:
+            body = "".join(
+                f"effect_{i}_{j} = {{\n\tif = {{ limit = {{ has_character_flag = f{j} }} "
+                f"add_gold = 1 }}\n}}\n"
+                for j in range(20)
+            )
+            (effects / f"s{i}.txt").write_text(body, encoding="utf-8")
+        else:
+            body = "l_english:\n" + "".join(f' key_{i}_{j}:0 "Text {j}"\n' for j in range(30))
+            (loc / f"l{i}_l_english.yml").write_text(body, encoding="utf-8-sig")
+
+
+SYNTHETIC_MOD_FILES = 5000
+
+
+@pytest.fixture(scope="module")
+def synthetic_mod(tmp_path_factory):
+    """Path of a synthetic 5,000-file mod shared by the scan benchmarks."""
+    root = tmp_path_factory.mktemp("synthetic_mod")
+    _write_synthetic_mod(root, SYNTHETIC_MOD_FILES)
+    return str(root)
+
+
+@pytest.mark.slow
+class TestWorkspaceScanPerformance:
+    """Compare thread and process workspace scanning on a synthetic 5,000-file mod."""
+
+    FILE_COUNT = SYNTHETIC_MOD_FILES
+
+    @staticmethod
+    def _scan(root, **kwargs):
+        index = DocumentIndex()
+        index.scan_workspace([root], **kwargs)
+        return index
+
+    def test_scan_with_threads(self, benchmark, synthetic_mod):
+        """Benchmark scanning with the thread pool (GIL-bound)."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            index = benchmark.pedantic(
+                self._scan, args=(synthetic_mod,), kwargs={"executor": executor}, rounds=1
+            )
+        assert len(index.events) == 20 * len(range(0, self.FILE_COUNT, 3))
+
+    def test_scan_with_processes(self, benchmark, synthetic_mod):
+        """Benchmark scanning with worker processes (includes pool startup)."""
+        index = benchmark.pedantic(
+            self._scan, args=(synthetic_mod,), kwargs={"process_workers": 4}, rounds=1
+        )
+        assert len(index.events) == 20 * len(range(0, self.FILE_COUNT, 3))
+
+    def test_scan_modes_agree(self, synthetic_mod):
+        """Process and thread scans build the same index."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = self._scan(synthetic_mod, executor=executor)
+        processed = self._scan(synthetic_mod, process_workers=2)
+
+        for table in ("events", "scripted_effects", "localization", "character_flags"):
+            assert getattr(processed, table) == getattr(threaded, table), table
+
+
+@pytest.mark.slow
+class TestWorkspaceValidationPerformance:
+    """Compare inline and process workspace validation on a synthetic 5,000-file mod."""
+
+    @staticmethod
+    def _validate(root, workers):
+        from pychivalry.workspace_validation import find_script_files, validate_files
+
+        index = DocumentIndex()
+        index.scan_workspace([root])
+        return validate_files(find_script_files([root]), index, workers=workers)
+
+    def test_validate_inline(self, benchmark, synthetic_mod):
+        """Benchmark validating every file in the calling thread."""
+        result = benchmark.pedantic(self._validate, args=(synthetic_mod, 0), rounds=1)
+        assert result.failed == 0
+
+    def test_validate_with_processes(self, benchmark, synthetic_mod):
+        """Benchmark validating with worker processes (includes pool startup)."""
+        result = benchmark.pedantic(self._validate, args=(synthetic_mod, 8), rounds=1)
+        assert result.failed == 0
+        assert result.to_dict() == self._validate(synthetic_mod, 0).to_dict()
+
 
 @pytest.mark.slow
 class TestConcurrencyPerformance:
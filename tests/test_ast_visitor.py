@@ -0,0 +1,178 @@
+"""
+Tests for the single-traversal check dispatcher.
+"""
+
+from pychivalry.ast_visitor import CheckDispatcher, NodeCheck, run_checks
+from pychivalry.diagnostics import check_scopes, check_semantics, collect_all_diagnostics
+from pychivalry.indexer import DocumentIndex
+from pychivalry.paradox_checks import (
+    ParadoxConfig,
+    check_ai_chance_issues,
+    check_option_has_name,
+    check_paradox_conventions,
+    create_paradox_checks,
+)
+from pychivalry.parser import parse_document
+from pygls.workspace import TextDocument
+
+SAMPLE = """namespace = test_mod
+
+test_mod.0001 = {
+    type = character_event
+    trigger = { add_gold = 10 }
+    option = {
+        ai_chance = { base = -5 }
+        any_vassal = { add_gold = 5 }
+    }
+    option = { }
+}
+
+test_mod.0002 = {
+    type = bogus_event
+    hidden = yes
+    option = { name = a name = b }
+}
+"""
+
+
+class RecordingCheck(NodeCheck):
+    """Records the visit/leave calls it receives."""
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    def visit(self, node, ancestors):
+        self.log.append(("visit", node.key, tuple(a.key for a in ancestors)))
+
+    def leave(self, node):
+        self.log.append(("leave", node.key))
+
+
+class TestDispatcher:
+    """Tests for node filtering and traversal order."""
+
+    def test_key_prefix_and_suffix_filters(self):
+        """Checks only see the keys they registered for."""
+        log = []
+        check = RecordingCheck(log)
+        check.keys = frozenset({"option"})
+        check.prefixes = ("any_",)
+        check.suffixes = ("_chance",)
+
+        run_checks(parse_document(SAMPLE), [check])
+
+        assert [entry[1] for entry in log] == [
+            "option",
+            "ai_chance",
+            "any_vassal",
+            "option",
+            "option",
+        ]
+
+    def test_top_level(self):
+        """top_level checks see every top-level node and nothing below."""
+        log = []
+        check = RecordingCheck(log)
+        check.top_level = True
+
+        run_checks(parse_document(SAMPLE), [check])
+
+        assert [entry[1] for entry in log] == ["namespace", "test_mod.0001", "test_mod.0002"]
+
+    def test_pre_order_with_ancestors_and_leave(self):
+        """Nodes arrive in pre-order with their ancestors; leave follows the subtree."""
+        log = []
+        check = RecordingCheck(log)
+        check.visit_all = True
+        check.wants_leave = True
+
+        run_checks(parse_document("a = { b = { c = d } e = f }\ng = h"), [check])
+
+        assert log == [
+            ("visit", "a", ()),
+            ("visit", "b", ("a",)),
+            ("visit", "c", ("a", "b")),
+            ("leave", "c"),
+            ("leave", "b"),
+            ("visit", "e", ("a",)),
+            ("leave", "e"),
+            ("leave", "a"),
+            ("visit", "g", ()),
+            ("leave", "g"),
+        ]
+
+    def test_failing_check_is_isolated(self):
+        """A check that raises is dropped; other checks keep running."""
+
+        class Failing(NodeCheck):
+            visit_all = True
+
+            def visit(self, node, ancestors):
+                self.diagnostics.append(node.key)
+                raise ValueError("boom")
+
+        log = []
+        recorder = RecordingCheck(log)
+        recorder.visit_all = True
+        failing = Failing()
+
+        results = CheckDispatcher([failing, recorder]).run(parse_document("a = { b = c }"))
+
+        assert results[0] == ["a"]
+        assert [entry[1] for entry in log] == ["a", "b"]
+
+    def test_finish_called_once(self):
+        """finish() runs after the traversal."""
+        calls = []
+
+        class Finishing(NodeCheck):
+            def finish(self):
+                calls.append(True)
+
+        run_checks(parse_document("a = b"), [Finishing()])
+
+        assert calls == [True]
+
+
+def _dump(diagnostics):
+    return [(str(d.code), d.message, d.range.start.line, d.range.start.character) for d in diagnostics]
+
+
+class TestSharedTraversal:
+    """Combined runs report the same diagnostics as the individual checks."""
+
+    def test_paradox_conventions_match_individual_checks(self):
+        """check_paradox_conventions equals its checks run one at a time."""
+        ast = parse_document(SAMPLE)
+        combined = check_paradox_conventions(ast)
+
+        individual = []
+        for check in create_paradox_checks():
+            individual.extend(run_checks(ast, [check]))
+
+        assert _dump(combined) == _dump(individual)
+        assert any(d.code == "CK3610" for d in combined)
+
+    def test_config_disables_wrappers(self):
+        """Disabled categories produce no diagnostics."""
+        ast = parse_document(SAMPLE)
+        config = ParadoxConfig(event_structure=False)
+
+        assert check_option_has_name(ast, config) == []
+        assert check_ai_chance_issues(ast, config) == []
+        assert check_ai_chance_issues(ast, ParadoxConfig())
+
+    def test_collect_all_keeps_per_module_order(self):
+        """collect_all_diagnostics groups results by module as before."""
+        ast = parse_document(SAMPLE)
+        index = DocumentIndex()
+        doc = TextDocument(uri="file:///mod/events/test.txt", source=SAMPLE)
+
+        result = _dump(collect_all_diagnostics(doc, ast, index))
+        expected = _dump(check_semantics(ast, index)) + _dump(check_scopes(ast, index))
+
+        assert result[: len(expected)] == expected
+        paradox = _dump(check_paradox_conventions(ast, index))
+        start = result.index(paradox[0])
+        assert result[start : start + len(paradox)] == paradox
@@ -0,0 +1,128 @@
+"""
+Tests for cooperative cancellation of diagnostics, semantic tokens and scans.
+"""
+
+import pytest
+from pygls.workspace import TextDocument
+
+from pychivalry.ast_visitor import run_checks
+from pychivalry.cancellation import CancellationToken, OperationCancelled
+from pychivalry.diagnostic_cache import BlockDiagnosticCache
+from pychivalry.diagnostics import (
+    collect_all_diagnostics,
+    create_scope_checks,
+    create_semantic_checks,
+)
+from pychivalry.indexer import DocumentIndex
+from pychivalry.parser import parse_document
+from pychivalry.semantic_tokens import analyze_document
+
+
+def _source(count: int = 5) -> str:
+    events = [
+        f"test_mod.{i:04d} = {{\n"
+        "    type = character_event\n"
+        "    immediate = { add_gold = 10 }\n"
+        "}\n"
+        for i in range(count)
+    ]
+    return "namespace = test_mod\n\n" + "\n".join(events)
+
+
+def _after(checks: int) -> CancellationToken:
+    """A token that is cancelled from its (checks + 1)th check on."""
+    calls = []
+
+    def condition():
+        calls.append(None)
+        return len(calls) > checks
+
+    return CancellationToken(condition)
+
+
+class TestCancellationToken:
+    """Tests for the token itself."""
+
+    def test_cancel(self):
+        token = CancellationToken()
+        assert not token.cancelled
+        token.cancel()
+        assert token.cancelled
+        assert token()
+        with pytest.raises(OperationCancelled):
+            token.raise_if_cancelled()
+
+    def test_condition_latches(self):
+        changed = [True]
+        token = CancellationToken(lambda: changed[0])
+        assert token.cancelled
+        changed[0] = False
+        assert token.cancelled
+
+    def test_not_an_exception(self):
+        """Cancellation gets through ``except Exception`` wrappers."""
+        assert not issubclass(OperationCancelled, Exception)
+
+
+class TestCancelledWork:
+    """Long-running functions stop at their next check."""
+
+    def test_run_checks(self):
+        ast = parse_document(_source())
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(OperationCancelled):
+            run_checks(ast, create_semantic_checks(DocumentIndex()), cancel=token)
+
+    def test_collect_all_diagnostics(self):
+        source = _source()
+        doc = TextDocument("file:///test.txt", source)
+        ast = parse_document(source)
+
+        with pytest.raises(OperationCancelled):
+            collect_all_diagnostics(doc, ast, DocumentIndex(), cancel=_after(2))
+        # Without a token, the same call runs to the end
+        assert isinstance(collect_all_diagnostics(doc, ast, DocumentIndex()), list)
+
+    def test_block_cache_keeps_finished_blocks(self):
+        """A cancelled run caches the blocks it checked; the next run skips them."""
+        source = _source()
+        ast = parse_document(source)
+        lines = source.split("\n")
+        index = DocumentIndex()
+        cache = BlockDiagnosticCache()
+
+        def checks():
+            return create_semantic_checks(index) + create_scope_checks(index)
+
+        with pytest.raises(OperationCancelled):
+            cache.run(ast, lines, checks(), index, cancel=_after(3))
+        cache.run(ast, lines, checks(), index)
+
+        assert cache.hits == 3
+        assert cache.misses == len(ast) - 3
+
+    def test_analyze_document(self):
+        source = "\n".join(["add_gold = 10"] * 200)
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(OperationCancelled):
+            analyze_document(source, cancel=token)
+        assert analyze_document(source)
+
+    def test_scan_workspace(self, tmp_path):
+        effects = tmp_path / "common" / "scripted_effects"
+        effects.mkdir(parents=True)
+        for i in range(5):
+            (effects / f"effects_{i}.txt").write_text(f"effect_{i} = {{\n\tadd_gold = 10\n}}\n")
+
+        index = DocumentIndex()
+        with pytest.raises(OperationCancelled):
+            index.scan_workspace([str(tmp_path)], cancel=_after(2))
+        assert len(index.scripted_effects) < 5
+
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)], cancel=CancellationToken())
+        assert len(index.scripted_effects) == 5
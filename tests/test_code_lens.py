@@ -18,6 +18,7 @@ from pychivalry.code_lens import (
     _analyze_event,
 )
 from pychivalry.indexer import DocumentIndex
+from pychivalry.parser import parse_document
 
 
 class TestGetCodeLenses:
@@ -240,6 +241,16 @@ class TestEventLenses:
         assert "my_mod.0001.t" in missing_loc
         assert "my_mod.0001.desc" in missing_loc
 
+    def test_reference_count_from_index(self):
+        """Event lens counts references from the workspace reference index."""
+        index = DocumentIndex()
+        source = "other.0001 = {\n    immediate = { trigger_event = my_mod.0001 }\n}"
+        index.update_from_ast("file:///other.txt", parse_document(source), source)
+
+        ref_count, _, _ = _analyze_event("my_mod.0001", index)
+
+        assert ref_count == 1
+
 
 class TestScriptedEffectLenses:
     """Tests for scripted effect code lens detection."""
@@ -0,0 +1,147 @@
+"""
+Tests for the compact array-backed AST storage.
+"""
+
+from lsprotocol import types
+
+from pychivalry.compact_ast import CompactAST
+from pychivalry.parser import CK3Node, parse_document
+
+SAMPLE = """namespace = test_mod
+
+test_mod.0001 = {
+    type = character_event
+    trigger = {
+        is_adult = yes
+        traits = { brave cruel }
+    }
+    immediate = {
+        add_gold = 100
+        save_scope_as = target
+    }
+}
+
+my_effect = {
+    add_prestige = -5.5
+}
+"""
+
+
+def _dump(nodes):
+    """Flatten a tree into comparable tuples (CK3Node equality recurses via parent)."""
+    result = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        result.append(
+            (
+                node.type,
+                node.key,
+                node.value,
+                node.scope_type,
+                node.range,
+                node.parent.key if node.parent else None,
+                len(node.children),
+            )
+        )
+        stack.extend(reversed(node.children))
+    return result
+
+
+class TestCompactRoundTrip:
+    """Tests for converting to and from compact form."""
+
+    def test_round_trip_matches_parse(self):
+        """Materialized nodes match the parsed tree, including parents and ranges."""
+        ast = parse_document(SAMPLE)
+        compact = CompactAST.from_nodes(ast)
+
+        nodes = compact.to_nodes()
+
+        assert _dump(nodes) == _dump(ast)
+        assert nodes[1].children[1].parent is nodes[1]
+        assert nodes[0] is not ast[0]
+
+    def test_round_trip_fixture(self, fixtures_dir):
+        """Real fixture files survive the round trip."""
+        ast = parse_document((fixtures_dir / "valid_event.txt").read_text())
+
+        assert _dump(CompactAST.from_nodes(ast).to_nodes()) == _dump(ast)
+
+    def test_empty(self):
+        """An empty AST stays empty."""
+        compact = CompactAST.from_nodes([])
+
+        assert len(compact) == 0
+        assert compact.to_nodes() == []
+        assert compact.roots() == []
+
+    def test_non_string_values(self):
+        """None, numbers and booleans keep their type."""
+        position = types.Position(line=0, character=0)
+        node_range = types.Range(start=position, end=position)
+        ast = [
+            CK3Node(type="assignment", key="a", value=1, range=node_range),
+            CK3Node(type="assignment", key="b", value=True, range=node_range),
+            CK3Node(type="assignment", key="c", value="1", range=node_range),
+            CK3Node(type="block", key="d", value=None, range=node_range, scope_type="character"),
+        ]
+
+        values = [node.value for node in CompactAST.from_nodes(ast).to_nodes()]
+
+        assert values == [1, True, "1", None]
+        assert [type(value) for value in values] == [int, bool, str, type(None)]
+
+    def test_strings_are_shared(self):
+        """Repeated keys are stored once and interned across ASTs."""
+        first = CompactAST.from_nodes(parse_document("a = { limit = { } limit = { } }"))
+        second = CompactAST.from_nodes(parse_document("b = { limit = { } }"))
+
+        assert first._strings.count("limit") == 1
+        assert first.node(1).key is second.node(1).key
+
+    def test_smaller_than_nodes(self):
+        """Column storage is a fraction of a CK3Node per node."""
+        compact = CompactAST.from_nodes(parse_document(SAMPLE))
+
+        assert compact.nbytes == len(compact) * 11 * 4 + len(compact.roots()) * 4
+
+
+class TestCompactViews:
+    """Tests for the lightweight node views."""
+
+    def test_view_attributes(self):
+        """Views expose CK3Node attributes read from the arrays."""
+        ast = parse_document(SAMPLE)
+        compact = CompactAST.from_nodes(ast)
+
+        event = compact.roots()[1]
+        immediate = event.children[2]
+
+        assert (event.type, event.key, event.value) == ("event", "test_mod.0001", None)
+        assert event.range == ast[1].range
+        assert event.parent is None
+        assert immediate.key == "immediate"
+        assert immediate.parent == event
+        assert [child.value for child in immediate.children] == ["100", "target"]
+
+    def test_materialize_subtree(self):
+        """A view materializes only its own subtree."""
+        ast = parse_document(SAMPLE)
+        compact = CompactAST.from_nodes(ast)
+        trigger_view = compact.roots()[1].children[1]
+
+        trigger = trigger_view.materialize()
+
+        assert _dump([trigger])[1:] == _dump([ast[1].children[1]])[1:]
+        assert trigger.parent is None
+        assert [child.key for child in trigger.children] == ["is_adult", "traits"]
+
+    def test_materialize_last_subtree(self):
+        """The last top-level subtree runs to the end of the arrays."""
+        compact = CompactAST.from_nodes(parse_document(SAMPLE))
+
+        effect = compact.roots()[-1].materialize()
+
+        assert effect.key == "my_effect"
+        assert [child.value for child in effect.children] == ["-5.5"]
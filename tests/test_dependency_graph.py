@@ -0,0 +1,40 @@
+"""
+Tests for the symbol -> document dependency graph.
+"""
+
+from pychivalry.dependency_graph import DependencyGraph
+
+
+class TestDependencyGraph:
+    """Tests for DependencyGraph."""
+
+    def test_dependents_of_symbols(self):
+        """Documents are returned for any of the symbols they use."""
+        graph = DependencyGraph()
+        graph.update("file:///a.txt", frozenset({"my_effect", "add_gold"}))
+        graph.update("file:///b.txt", frozenset({"my_trigger", "add_gold"}))
+
+        assert graph.dependents({"my_effect"}) == {"file:///a.txt"}
+        assert graph.dependents({"my_effect", "my_trigger"}) == {"file:///a.txt", "file:///b.txt"}
+        assert graph.dependents({"unused"}) == set()
+
+    def test_update_replaces_previous_keys(self):
+        """A document no longer depends on keys removed by an edit."""
+        graph = DependencyGraph()
+        graph.update("file:///a.txt", frozenset({"old_effect", "add_gold"}))
+        graph.update("file:///a.txt", frozenset({"new_effect", "add_gold"}))
+
+        assert graph.dependents({"old_effect"}) == set()
+        assert graph.dependents({"new_effect"}) == {"file:///a.txt"}
+        assert graph.dependents({"add_gold"}) == {"file:///a.txt"}
+
+    def test_remove(self):
+        """Removed documents are no longer dependents."""
+        graph = DependencyGraph()
+        graph.update("file:///a.txt", frozenset({"my_effect"}))
+        graph.update("file:///b.txt", frozenset({"my_effect"}))
+
+        graph.remove("file:///a.txt")
+        graph.remove("file:///unknown.txt")
+
+        assert graph.dependents({"my_effect"}) == {"file:///b.txt"}
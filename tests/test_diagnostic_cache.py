@@ -0,0 +1,185 @@
+"""
+Tests for the per-block diagnostic cache.
+"""
+
+import random
+
+import pytest
+from pygls.workspace import TextDocument
+
+from pychivalry.ast_visitor import CheckDispatcher, NodeCheck
+from pychivalry.diagnostic_cache import BlockDiagnosticCache
+from pychivalry.diagnostics import collect_all_diagnostics, create_scope_checks, create_semantic_checks
+from pychivalry.indexer import DocumentIndex
+from pychivalry.paradox_checks import create_paradox_checks
+from pychivalry.parser import parse_document
+
+
+def _event(number: int, body: str = "add_gold = 10") -> str:
+    return f"""test_mod.{number:04d} = {{
+    type = character_event
+    trigger = {{ {body} }}
+    immediate = {{ my_effect = yes }}
+    option = {{
+        ai_chance = {{ base = -5 }}
+    }}
+}}
+"""
+
+
+def _source(count: int = 5, edited: int = -1, body: str = "is_adult = yes") -> str:
+    events = [_event(i, body if i == edited else "add_gold = 10") for i in range(count)]
+    return "namespace = test_mod\n\n" + "\n".join(events)
+
+
+def _checks(index):
+    return create_semantic_checks(index) + create_scope_checks(index) + create_paradox_checks(index)
+
+
+def _dump(per_check):
+    return [
+        [
+            (str(d.code), d.message, d.range.start.line, d.range.start.character, d.range.end.line)
+            for d in diagnostics
+        ]
+        for diagnostics in per_check
+    ]
+
+
+def _run(cache, source, index):
+    return _dump(cache.run(parse_document(source), source.split("\n"), _checks(index), index))
+
+
+def _uncached(source, index):
+    return _dump(CheckDispatcher(_checks(index)).run(parse_document(source)))
+
+
+class TestBlockDiagnosticCache:
+    """Cached results always equal a full run."""
+
+    def test_unchanged_document_is_served_from_cache(self):
+        """A second run over the same text checks no blocks."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        source = _source()
+
+        first = _run(cache, source, index)
+        second = _run(cache, source, index)
+
+        assert first == second == _uncached(source, index)
+        assert cache.misses == 0
+        assert cache.hits == 6
+
+    def test_only_edited_block_is_rechecked(self):
+        """Editing one event re-checks that event only."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        _run(cache, _source(), index)
+
+        edited = _source(edited=3)
+        result = _run(cache, edited, index)
+
+        assert result == _uncached(edited, index)
+        assert cache.misses == 1
+
+    def test_moved_blocks_are_shifted(self):
+        """Inserting lines above blocks shifts their cached diagnostics."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        _run(cache, _source(), index)
+
+        moved = "# header\n# comment\n" + _source()
+        result = _run(cache, moved, index)
+
+        assert result == _uncached(moved, index)
+        assert cache.misses == 0
+
+    def test_symbol_change_rechecks_dependent_blocks(self):
+        """Adding a referenced symbol re-checks only the blocks using it."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        source = _source(edited=2, body="my_trigger = yes")
+        _run(cache, source, index)
+
+        updated = index.copy()
+        updated.scripted_triggers["my_trigger"] = None
+        result = _run(cache, source, updated)
+
+        assert result == _uncached(source, updated)
+        assert cache.misses == 1
+
+    def test_edit_inside_unclosed_block_is_rechecked(self):
+        """An unclosed block's key covers its body, not just its header line."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        _run(cache, "t.1 = {\n\timmediate = {\n\t\tadd_gld = 10\n", index)
+
+        fixed = "t.1 = {\n\timmediate = {\n\t\tadd_gold = 10\n"
+        result = _run(cache, fixed, index)
+
+        assert result == _uncached(fixed, index)
+        assert cache.misses == 1
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_edits_match_uncached(self, seed):
+        """Typing, deleting and unbalancing braces never serves stale results."""
+        rng = random.Random(seed)
+        pieces = ["{", "}", "\n", " ", "add_gld = 10", "add_gold = 10", "theme = war", "x"]
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+        source = _source(count=3)
+
+        for _ in range(60):
+            start = rng.randrange(len(source) + 1)
+            end = min(len(source), start + rng.randrange(8))
+            source = source[:start] + rng.choice(pieces) + source[end:]
+            assert _run(cache, source, index) == _uncached(source, index)
+
+    def test_failing_check_results_are_not_cached(self):
+        """Blocks checked after a check raised are re-checked next time."""
+
+        class Failing(NodeCheck):
+            keys = frozenset({"ai_chance"})
+
+            def visit(self, node, ancestors):
+                raise ValueError("boom")
+
+        cache = BlockDiagnosticCache()
+        source = _source(count=2)
+        ast = parse_document(source)
+        lines = source.split("\n")
+
+        cache.run(ast, lines, [Failing()])
+        assert cache.misses == 3
+        cache.run(ast, lines, [Failing()])
+        assert cache.misses == 2
+
+
+class TestCollectAllDiagnosticsWithCache:
+    """collect_all_diagnostics returns the same results with a block cache."""
+
+    def test_matches_uncached(self):
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+
+        for source in (_source(), _source(edited=1), "# top\n" + _source(edited=1)):
+            ast = parse_document(source)
+            doc = TextDocument(uri="file:///mod/events/test.txt", source=source)
+            cached = collect_all_diagnostics(doc, ast, index, block_cache=cache)
+            plain = collect_all_diagnostics(doc, ast, index)
+
+            assert _dump([cached]) == _dump([plain])
+
+    def test_unclosed_block_edit_matches_uncached(self):
+        """Editing the body of an unclosed event does not keep stale diagnostics."""
+        cache = BlockDiagnosticCache()
+        index = DocumentIndex()
+
+        for theme in ("party", "war"):
+            source = f"namespace = t\nt.0001 = {{\n\ttype = character_event\n\ttheme = {theme}\n"
+            ast = parse_document(source)
+            doc = TextDocument(uri="file:///mod/events/test.txt", source=source)
+            cached = collect_all_diagnostics(doc, ast, index, block_cache=cache)
+            plain = collect_all_diagnostics(doc, ast, index)
+
+            assert _dump([cached]) == _dump([plain])
@@ -0,0 +1,186 @@
+"""
+Tests for the incremental document buffers.
+
+Buffered documents must produce exactly the same text as pygls' own
+TextDocument for any sequence of incremental edits.
+"""
+
+import random
+
+import pytest
+from lsprotocol import types
+from pygls.workspace import TextDocument, Workspace
+
+from pychivalry import document_buffer
+from pychivalry.document_buffer import BufferedTextDocument, BufferedWorkspace, LineBuffer
+
+SAMPLE = """namespace = test_mod
+
+test_mod.0001 = {
+\ttype = character_event
+\ttitle = test_mod.0001.t
+\toption = {
+\t\tname = test_mod.0001.a
+\t}
+}
+"""
+
+
+def _change(start_line, start_char, end_line, end_char, text):
+    return types.TextDocumentContentChangePartial(
+        range=types.Range(
+            start=types.Position(line=start_line, character=start_char),
+            end=types.Position(line=end_line, character=end_char),
+        ),
+        text=text,
+    )
+
+
+def _random_change(rng, lines):
+    pieces = ["", "x", "\n", "\r\n", "\r", "{ a = b }\n", "é", "😀", "\n\n# c\n", "\t"]
+    line_count = max(len(lines), 1)
+    start_line = rng.randrange(line_count + 1)
+    end_line = rng.randrange(start_line, min(start_line + 3, line_count + 1))
+    start_char = rng.randrange(6)
+    end_char = rng.randrange(6) if end_line > start_line else start_char + rng.randrange(3)
+    if rng.random() < 0.2:
+        # Ranges ending at (line count, 0), e.g. select-all or deleting the last line
+        start_line = min(start_line, len(lines))
+        end_line, end_char = len(lines), 0
+    text = "".join(rng.choice(pieces) for _ in range(rng.randrange(3)))
+    return _change(start_line, start_char, end_line, end_char, text)
+
+
+class TestLineBuffer:
+    """Tests for LineBuffer."""
+
+    def test_line_count_matches_splitlines(self):
+        """Line count follows str.splitlines semantics."""
+        for text in ["", "a", "a\n", "a\nb", "a\r\nb\r\n", "a\rb c"]:
+            assert LineBuffer(text).line_count == len(text.splitlines())
+
+    def test_replace_within_line(self):
+        """Replacing inside a line updates text and keeps line count."""
+        buffer = LineBuffer("a = 1\nb = 2\n")
+        buffer.replace(1, 4, 1, 5, "3")
+
+        assert buffer.text == "a = 1\nb = 3\n"
+        assert buffer.line_count == 2
+
+    def test_replace_inserting_lines(self):
+        """Inserting line breaks increases the line count."""
+        buffer = LineBuffer("a = 1\nb = 2\n")
+        buffer.replace(0, 5, 0, 5, "\nc = 3\nd = 4")
+
+        assert buffer.text == "a = 1\nc = 3\nd = 4\nb = 2\n"
+        assert buffer.line_count == 4
+
+    def test_replace_joining_lines(self):
+        """Deleting a line break joins the lines."""
+        buffer = LineBuffer("a = 1\nb = 2\n")
+        buffer.replace(0, 5, 1, 0, " ")
+
+        assert buffer.text == "a = 1 b = 2\n"
+        assert buffer.line_count == 1
+
+    def test_replace_to_end_of_file(self):
+        """A range ending past the last line replaces the whole tail."""
+        buffer = LineBuffer("a\nb\n")
+        buffer.replace(0, 0, 2, 0, "X")
+        assert buffer.text == "X"
+
+        buffer = LineBuffer("a\nb\n")
+        buffer.replace(1, 0, 2, 0, "")
+        assert buffer.text == "a\n"
+        assert buffer.line_count == 1
+
+    def test_content_hash_tracks_content(self):
+        """Hash changes with content and is stable without edits."""
+        buffer = LineBuffer(SAMPLE)
+        original = buffer.content_hash
+
+        assert buffer.content_hash == original
+        buffer.replace(3, 8, 3, 23, "letter_event")
+        assert buffer.content_hash != original
+        buffer.replace(3, 8, 3, 20, "character_event")
+        assert buffer.text == SAMPLE
+        assert buffer.content_hash == original
+
+    def test_lines_view(self):
+        """The lines view behaves like the list of lines."""
+        buffer = LineBuffer(SAMPLE)
+        expected = SAMPLE.splitlines(True)
+
+        assert len(buffer.lines) == len(expected)
+        assert list(buffer.lines) == expected
+        assert buffer.lines[-1] == expected[-1]
+        assert buffer.lines[2:4] == expected[2:4]
+        with pytest.raises(IndexError):
+            buffer.lines[len(expected)]
+
+
+class TestBufferedTextDocument:
+    """Tests for BufferedTextDocument against pygls' TextDocument."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_edits_match_pygls(self, monkeypatch, seed):
+        """Random incremental edits give the same text as pygls."""
+        # Small chunks so edits regularly cross chunk boundaries
+        monkeypatch.setattr(document_buffer, "CHUNK_LINES", 3)
+        rng = random.Random(seed)
+        reference = TextDocument("file:///test.txt", SAMPLE)
+        buffered = BufferedTextDocument("file:///test.txt", SAMPLE)
+
+        for _ in range(200):
+            change = _random_change(rng, reference.lines)
+            reference.apply_change(change)
+            buffered.apply_change(change)
+            assert buffered.source == reference.source
+            assert buffered.line_count == len(reference.lines)
+
+    def test_full_change(self):
+        """Full-document changes replace the buffer."""
+        doc = BufferedTextDocument("file:///test.txt", SAMPLE)
+        doc.apply_change(types.TextDocumentContentChangeWholeDocument(text="a = b\n"))
+
+        assert doc.source == "a = b\n"
+        assert doc.line_count == 1
+
+    def test_utf16_positions(self):
+        """Client positions are converted from UTF-16 units."""
+        doc = BufferedTextDocument("file:///test.txt", "a = 😀b\n")
+        doc.apply_change(_change(0, 6, 0, 7, "c"))
+
+        assert doc.source == "a = 😀c\n"
+
+
+class TestBufferedWorkspace:
+    """Tests for BufferedWorkspace."""
+
+    def test_creates_buffered_documents(self):
+        """Opened documents are stored in line buffers."""
+        workspace = BufferedWorkspace.from_workspace(Workspace(None))
+        workspace.put_text_document(
+            types.TextDocumentItem(
+                uri="file:///test.txt", language_id="paradox-script", version=1, text=SAMPLE
+            )
+        )
+
+        doc = workspace.get_text_document("file:///test.txt")
+        assert isinstance(doc, BufferedTextDocument)
+        assert doc.source == SAMPLE
+
+    def test_server_installs_buffered_workspace(self):
+        """The server switches to a buffered workspace on initialize."""
+        from pychivalry.server import CK3LanguageServer
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        handler = server.protocol.lsp_initialize(
+            types.InitializeParams(capabilities=types.ClientCapabilities())
+        )
+        with pytest.raises(StopIteration) as finished:
+            while True:
+                next(handler)
+
+        assert isinstance(finished.value.value, types.InitializeResult)
+        assert isinstance(server.workspace, BufferedWorkspace)
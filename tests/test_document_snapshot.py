@@ -0,0 +1,101 @@
+"""
+Tests for per-version document snapshots.
+"""
+
+from pychivalry.document_snapshot import DocumentSnapshot
+from pychivalry.folding import get_folding_ranges
+from pychivalry.indexer import DocumentIndex
+from pychivalry.parser import parse_document
+from pychivalry.semantic_tokens import get_semantic_tokens
+
+SAMPLE = """namespace = test_mod
+
+# A comment
+# spanning lines
+test_mod.0001 = {
+    type = character_event
+    immediate = {
+        add_gold = 100
+    }
+}
+"""
+
+
+class TestSnapshotArtifacts:
+    """Tests for the lazily memoized artifacts."""
+
+    def test_lines(self):
+        """Lines split on newlines."""
+        snapshot = DocumentSnapshot("file:///a.txt", 1, "ab\n\ncd\n")
+
+        assert snapshot.lines == ["ab", "", "cd", ""]
+
+    def test_artifacts_are_computed_once(self):
+        """Each artifact is built on first access and then reused."""
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE)
+
+        assert snapshot.lines is snapshot.lines
+        assert snapshot.ast is snapshot.ast
+        assert snapshot.folding_ranges is snapshot.folding_ranges
+
+    def test_artifacts_match_direct_computation(self):
+        """Memoized artifacts equal what the feature modules compute."""
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE)
+
+        assert [node.key for node in snapshot.ast] == [
+            node.key for node in parse_document(SAMPLE)
+        ]
+        assert snapshot.folding_ranges == get_folding_ranges(SAMPLE)
+        assert snapshot.semantic_tokens() == get_semantic_tokens(SAMPLE)
+
+    def test_custom_parser(self):
+        """A parse function replaces the default parser."""
+        calls = []
+
+        def parse(source):
+            calls.append(source)
+            return parse_document(source)
+
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE, parse=parse)
+        snapshot.ast
+        snapshot.ast
+
+        assert calls == [SAMPLE]
+
+    def test_seeded_ast_is_used(self):
+        """A seeded AST is returned instead of parsing; later seeds are ignored."""
+        ast = parse_document(SAMPLE)
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE)
+
+        snapshot.seed_ast(ast)
+        snapshot.seed_ast(parse_document(SAMPLE))
+
+        assert snapshot.ast is ast
+
+    def test_semantic_tokens_follow_index_version(self):
+        """Semantic tokens are reused for one index version and rebuilt for another."""
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE)
+        index = DocumentIndex()
+
+        first = snapshot.semantic_tokens(index)
+
+        assert snapshot.semantic_tokens(index) is first
+        assert snapshot.semantic_tokens(index.copy()) is not first
+
+    def test_memoize(self):
+        """Named artifacts are computed once."""
+        snapshot = DocumentSnapshot("file:///a.txt", 1, SAMPLE)
+        calls = []
+
+        for _ in range(3):
+            snapshot.memoize("symbols", lambda: calls.append(1) or ["symbol"])
+
+        assert calls == [1]
+
+    def test_matches(self):
+        """Snapshots match only the same version and text."""
+        snapshot = DocumentSnapshot("file:///a.txt", 2, "a = b")
+
+        assert snapshot.matches(2, "a = b")
+        assert not snapshot.matches(3, "a = b")
+        assert not snapshot.matches(2, "a = c")
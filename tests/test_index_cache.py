@@ -0,0 +1,208 @@
+"""
+Tests for the persistent workspace index cache.
+
+Cached scans must build exactly the same index as uncached scans, and must
+notice files that were added, changed or deleted between scans.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pychivalry import index_cache
+from pychivalry.index_cache import CACHE_DIR_NAME, CACHE_FILE_NAME, IndexCache
+from pychivalry.indexer import DocumentIndex
+
+INDEX_TABLES = [
+    "namespaces",
+    "events",
+    "scripted_effects",
+    "scripted_triggers",
+    "saved_scopes",
+    "localization",
+    "character_flags",
+    "character_interactions",
+    "modifiers",
+    "on_action_definitions",
+    "opinion_modifiers",
+    "scripted_guis",
+]
+
+
+@pytest.fixture
+def mod_root(tmp_path):
+    """A small mod with events, scripted effects and localization."""
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "test_events.txt").write_text(
+        "namespace = test_mod\n"
+        "test_mod.0001 = {\n"
+        "\ttype = character_event\n"
+        "\timmediate = {\n"
+        "\t\tsave_scope_as = friend\n"
+        "\t\tadd_character_flag = met_friend\n"
+        "\t}\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    effects = tmp_path / "common" / "scripted_effects"
+    effects.mkdir(parents=True)
+    (effects / "test_effects.txt").write_text(
+        "my_effect = {\n\tremove_character_flag = met_friend\n}\n", encoding="utf-8"
+    )
+    loc = tmp_path / "localization" / "english"
+    loc.mkdir(parents=True)
+    (loc / "test_l_english.yml").write_text(
+        'l_english:\n test_mod.0001.t:0 "A Friend"\n', encoding="utf-8-sig"
+    )
+    return tmp_path
+
+
+def _scan(root, **kwargs):
+    index = DocumentIndex()
+    index.scan_workspace([str(root)], **kwargs)
+    return index
+
+
+def _assert_same_index(actual, expected):
+    for table in INDEX_TABLES:
+        assert getattr(actual, table) == getattr(expected, table), table
+
+
+def _touch_later(path):
+    """Move a file's mtime into the past so the cache trusts it."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+
+
+class TestCachedScan:
+    """Tests for DocumentIndex.scan_workspace(use_cache=True)."""
+
+    def test_cached_scan_matches_sequential_scan(self, mod_root):
+        """Cold and warm cached scans build the same index as a plain scan."""
+        expected = _scan(mod_root)
+
+        _assert_same_index(_scan(mod_root, use_cache=True), expected)
+        _assert_same_index(_scan(mod_root, use_cache=True), expected)
+        assert (mod_root / CACHE_DIR_NAME / CACHE_FILE_NAME).exists()
+
+    def test_parallel_scan_matches_sequential_scan(self, mod_root):
+        """The thread pool scan builds the same index as a plain scan."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            _assert_same_index(_scan(mod_root, executor=executor), _scan(mod_root))
+
+    def test_warm_scan_reuses_results(self, mod_root, monkeypatch):
+        """Unchanged files are not scanned again."""
+        for path in mod_root.rglob("*.*"):
+            _touch_later(path)
+        _scan(mod_root, use_cache=True)
+
+        scanned = []
+        original = DocumentIndex._scan_file
+
+        def spy(self, file_path, scan_type):
+            scanned.append(file_path.name)
+            return original(self, file_path, scan_type)
+
+        monkeypatch.setattr(DocumentIndex, "_scan_file", spy)
+        index = _scan(mod_root, use_cache=True)
+
+        assert scanned == []
+        assert "test_mod.0001" in index.events
+
+    def test_changed_file_is_rescanned(self, mod_root):
+        """Edits between scans are picked up."""
+        _scan(mod_root, use_cache=True)
+        (mod_root / "events" / "test_events.txt").write_text(
+            "namespace = test_mod\ntest_mod.0002 = {\n}\n", encoding="utf-8"
+        )
+
+        index = _scan(mod_root, use_cache=True)
+
+        assert "test_mod.0002" in index.events
+        assert "test_mod.0001" not in index.events
+        assert "met_friend" in index.character_flags  # still set by the effect file
+
+    def test_deleted_file_is_pruned(self, mod_root):
+        """Deleted files disappear from the index and the cache."""
+        _scan(mod_root, use_cache=True)
+        effect_file = mod_root / "common" / "scripted_effects" / "test_effects.txt"
+        effect_file.unlink()
+
+        index = _scan(mod_root, use_cache=True)
+
+        assert "my_effect" not in index.scripted_effects
+        db = sqlite3.connect(str(mod_root / CACHE_DIR_NAME / CACHE_FILE_NAME))
+        paths = [row[0] for row in db.execute("SELECT path FROM files")]
+        db.close()
+        assert str(effect_file) not in paths
+
+    def test_version_change_discards_cache(self, mod_root, monkeypatch):
+        """Results written by another cache format are not reused."""
+        _scan(mod_root, use_cache=True)
+        monkeypatch.setattr(index_cache, "INDEX_CACHE_FORMAT", index_cache.INDEX_CACHE_FORMAT + 1)
+
+        cache = IndexCache(mod_root)
+        assert cache.open()
+        assert cache.lookup(mod_root / "events" / "test_events.txt") is None
+        cache.close(prune=False)
+
+    def test_corrupt_cache_falls_back_to_scan(self, mod_root):
+        """An unreadable cache file does not break scanning."""
+        cache_dir = mod_root / CACHE_DIR_NAME
+        cache_dir.mkdir()
+        (cache_dir / CACHE_FILE_NAME).write_bytes(b"not a database" * 100)
+
+        index = _scan(mod_root, use_cache=True)
+
+        assert "test_mod.0001" in index.events
+
+    def test_roots_without_scan_files_get_no_cache(self, tmp_path):
+        """Missing roots and roots without mod folders are left untouched."""
+        missing = tmp_path / "missing" / "mod"
+        empty = tmp_path / "empty"
+        empty.mkdir()
+
+        index = DocumentIndex()
+        index.scan_workspace([str(missing), str(empty)], use_cache=True)
+
+        assert not (tmp_path / "missing").exists()
+        assert not (empty / CACHE_DIR_NAME).exists()
+
+
+class TestIndexCache:
+    """Tests for IndexCache fingerprint validation."""
+
+    def test_touched_file_with_same_content_is_reused(self, mod_root):
+        """A new mtime with identical content is still a cache hit."""
+        path = mod_root / "events" / "test_events.txt"
+        _touch_later(path)
+        result = DocumentIndex()._scan_file(path, "events")
+
+        cache = IndexCache(mod_root)
+        assert cache.open()
+        cache.store(path, result)
+        cache.close()
+
+        os.utime(path)
+        cache = IndexCache(mod_root)
+        assert cache.open()
+        assert cache.lookup(path) == result
+        assert cache.hits == 1
+        cache.close()
+
+    def test_cache_directory_is_git_ignored(self, mod_root):
+        """The cache folder ignores itself so it is not committed with the mod."""
+        cache = IndexCache(mod_root)
+        assert cache.open()
+        cache.close()
+
+        assert (mod_root / CACHE_DIR_NAME / ".gitignore").read_text() == "*\n"
+
+    def test_missing_root_is_not_created(self, tmp_path):
+        """Opening a cache never creates the root's parent folders."""
+        root = tmp_path / "missing" / "mod"
+
+        assert not IndexCache(root).open()
+        assert not (tmp_path / "missing").exists()
@@ -4,6 +4,8 @@ Tests for the document indexer.
 This module tests indexing of symbols across documents for navigation features.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from lsprotocol import types
 
@@ -132,6 +134,62 @@ test_mod.0001 = {
         assert "test_mod.0001" not in index.events
         assert "my_scope" not in index.saved_scopes
 
+    def test_remove_document_keeps_other_documents(self):
+        """Removing a document leaves entries from other documents untouched."""
+        index = DocumentIndex()
+        index.update_from_ast("file:///a.txt", parse_document("namespace = a\na.0001 = { }"))
+        index.update_from_ast("file:///b.txt", parse_document("namespace = b\nb.0001 = { }"))
+
+        index.remove_document("file:///a.txt")
+
+        assert "a.0001" not in index.events
+        assert "b.0001" in index.events
+        assert index.namespaces == {"b": "file:///b.txt"}
+
+    def test_remove_document_keeps_redefined_keys(self):
+        """Keys redefined by a later document are not removed with the first one."""
+        index = DocumentIndex()
+        index.update_from_ast("file:///a.txt", parse_document("shared.0001 = { }"))
+        index.update_from_ast("file:///b.txt", parse_document("shared.0001 = { }"))
+
+        index.remove_document("file:///a.txt")
+
+        assert index.events["shared.0001"].uri == "file:///b.txt"
+
+    def test_remove_scanned_document(self, tmp_path):
+        """Entries found by a workspace scan are removed with their document."""
+        effects = tmp_path / "common" / "scripted_effects"
+        effects.mkdir(parents=True)
+        effect_file = effects / "effects.txt"
+        effect_file.write_text("my_effect = {\n}\n", encoding="utf-8")
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)])
+
+        assert "my_effect" in index.scripted_effects
+        index.remove_document(effect_file.as_uri())
+        assert "my_effect" not in index.scripted_effects
+
+    def test_scan_finds_top_level_definitions_only(self, tmp_path):
+        """Scans index top-level definitions (even split over lines), not nested blocks."""
+        events = tmp_path / "events"
+        events.mkdir()
+        (events / "a.txt").write_text(
+            "namespace = a\n"
+            "a.0001 =\n{\n\tdesc = \"}\"\n\tnested.0002 = { }\n}\n"
+            "a.0003 = { }\n"
+        )
+        effects = tmp_path / "common" / "scripted_effects"
+        effects.mkdir(parents=True)
+        (effects / "effects.txt").write_text(
+            "my_effect = {\n\tif = { limit = { always = yes } }\n}\n# other = {\nlast = { }\n"
+        )
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)])
+
+        assert set(index.events) == {"a.0001", "a.0003"}
+        assert index.events["a.0003"].range.start == types.Position(line=6, character=0)
+        assert set(index.scripted_effects) == {"my_effect", "last"}
+
 
 class TestIndexLookup:
     """Tests for index lookup methods."""
@@ -214,6 +272,215 @@ test_mod.0002 = {
         assert "mod2" in namespaces
 
 
+class TestIndexCopyOnWrite:
+    """Tests for copy-on-write index versions."""
+
+    def test_copy_has_same_contents(self):
+        """A copy answers lookups like the original."""
+        index = DocumentIndex()
+        index.update_from_ast("file:///a.txt", parse_document("namespace = a\na.0001 = { }"))
+
+        clone = index.copy()
+
+        assert clone.find_event("a.0001") == index.find_event("a.0001")
+        assert clone.get_all_namespaces() == ["a"]
+
+    def test_writes_to_copy_do_not_change_original(self):
+        """Updating or removing documents in a copy leaves the original intact."""
+        index = DocumentIndex()
+        index.update_from_ast("file:///a.txt", parse_document("a.0001 = { }"))
+
+        clone = index.copy()
+        clone.update_from_ast("file:///b.txt", parse_document("b.0001 = { }"))
+        clone.remove_document("file:///a.txt")
+
+        assert set(index.events) == {"a.0001"}
+        assert set(clone.events) == {"b.0001"}
+
+        # The original still removes its own entries correctly
+        index.remove_document("file:///a.txt")
+        assert index.events == {}
+        assert set(clone.events) == {"b.0001"}
+
+    def test_scan_into_copy_does_not_change_original(self, tmp_path):
+        """Workspace scans (which append to flag lists) only affect the copy."""
+        events = tmp_path / "events"
+        events.mkdir()
+        (events / "a.txt").write_text("a.0001 = {\n\tadd_character_flag = seen\n}\n")
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)])
+
+        clone = index.copy()
+        clone.scan_workspace([str(tmp_path)])
+
+        assert len(index.character_flags["seen"]) == 1
+        assert len(clone.character_flags["seen"]) == 2
+
+
+class TestIndexSymbolSearch:
+    """Tests for workspace symbol search over the index."""
+
+    def test_search_after_scan(self, tmp_path):
+        """Scanned definitions are searchable with their locations."""
+        effects = tmp_path / "common" / "scripted_effects"
+        effects.mkdir(parents=True)
+        (effects / "effects.txt").write_text("give_gold_effect = {\n}\n")
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)])
+
+        results = index.search_symbols("gold")
+
+        assert [(table, name) for table, name, _ in results] == [
+            ("scripted_effects", "give_gold_effect")
+        ]
+        assert results[0][2] == index.scripted_effects["give_gold_effect"]
+
+    def test_search_follows_document_updates(self):
+        """Events added or removed by document updates are searchable at once."""
+        index = DocumentIndex()
+        index.update_from_ast("file:///a.txt", parse_document("a_mod.0001 = { }"))
+        snapshot = index.copy()
+
+        index.update_from_ast("file:///a.txt", parse_document("a_mod.0002 = { }"))
+
+        assert [name for _, name, _ in index.search_symbols("a_mod")] == ["a_mod.0002"]
+        assert [name for _, name, _ in snapshot.search_symbols("a_mod")] == ["a_mod.0001"]
+
+        index.remove_document("file:///a.txt")
+        assert index.search_symbols("a_mod") == []
+
+
+class TestIndexReferences:
+    """Tests for the workspace reference index."""
+
+    @staticmethod
+    def _write_mod(root):
+        (root / "common" / "scripted_effects").mkdir(parents=True)
+        (root / "common" / "scripted_effects" / "effects.txt").write_text(
+            "give_gold_effect = {\n\tadd_gold = 10\n}\n"
+        )
+        (root / "common" / "script_values").mkdir(parents=True)
+        (root / "common" / "script_values" / "values.txt").write_text("my_cost = 100\n")
+        (root / "events").mkdir()
+        (root / "events" / "a.txt").write_text(
+            "a.0001 = {\n"
+            "\timmediate = {\n"
+            "\t\tgive_gold_effect = yes\n"
+            "\t\tadd_character_flag = met_king\n"
+            "\t\tsave_scope_as = friend\n"
+            "\t\tadd_gold = my_cost\n"
+            "\t\ttrigger_event = a.0002  # a.0003 is only in a comment\n"
+            "\t}\n"
+            "}\n"
+            "a.0002 = {\n"
+            "\ttrigger = { has_character_flag = met_king }\n"
+            "\timmediate = { scope:friend = { give_gold_effect = yes } }\n"
+            "}\n"
+        )
+
+    def test_scan_finds_references(self, tmp_path):
+        """A scan indexes uses of every reference kind, but not definitions or comments."""
+        self._write_mod(tmp_path)
+        index = DocumentIndex()
+        index.scan_workspace([str(tmp_path)])
+        uri = (tmp_path / "events" / "a.txt").as_uri()
+
+        assert index.count_references("a.0002") == 1
+        assert index.count_references("a.0001") == 0
+        assert index.count_references("a.0003") == 0
+        assert index.count_references("give_gold_effect", {"scripted_effect"}) == 2
+        assert index.count_references("met_king", {"flag"}) == 2
+        assert index.count_references("friend", {"saved_scope"}) == 2
+        assert index.count_references("my_cost", {"script_value"}) == 1
+        # Built-in effects are not indexed as calls
+        assert "add_gold" not in index.references
+
+        locations = index.find_references("a.0002")
+        assert locations[0].uri == uri
+        assert locations[0].range.start == types.Position(line=6, character=18)
+        assert locations[0].range.end == types.Position(line=6, character=24)
+
+    def test_parallel_scan_matches_sequential(self, tmp_path):
+        """Thread-pool and sequential scans build the same references."""
+        self._write_mod(tmp_path)
+        sequential = DocumentIndex()
+        sequential.scan_workspace([str(tmp_path)])
+        threaded = DocumentIndex()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            threaded.scan_workspace([str(tmp_path)], executor=executor)
+
+        assert threaded.references == sequential.references
+
+    def test_update_replaces_document_references(self):
+        """Updating a document with its source replaces that document's references."""
+        index = DocumentIndex()
+        source = "a.0001 = { trigger_event = b.0001 }"
+        index.update_from_ast("file:///a.txt", parse_document(source), source)
+        other = "c.0001 = { trigger_event = b.0001 }"
+        index.update_from_ast("file:///c.txt", parse_document(other), other)
+        assert index.count_references("b.0001") == 2
+
+        source = "a.0001 = { trigger_event = b.0002 }"
+        index.update_from_ast("file:///a.txt", parse_document(source), source)
+        assert [loc.uri for loc in index.find_references("b.0001")] == ["file:///c.txt"]
+        assert index.count_references("b.0002") == 1
+
+        index.remove_document("file:///c.txt")
+        assert index.count_references("b.0001") == 0
+
+    def test_copy_isolates_references(self):
+        """Reference updates to a copy leave the original version intact."""
+        index = DocumentIndex()
+        source = "a.0001 = { trigger_event = b.0001 }"
+        index.update_from_ast("file:///a.txt", parse_document(source), source)
+
+        clone = index.copy()
+        clone.update_from_ast("file:///c.txt", parse_document(source), source)
+        clone.remove_document("file:///a.txt")
+
+        assert [loc.uri for loc in index.find_references("b.0001")] == ["file:///a.txt"]
+        assert [loc.uri for loc in clone.find_references("b.0001")] == ["file:///c.txt"]
+
+
+class TestIndexDefinitionDocuments:
+    """Open documents under common/ index the definitions they contain."""
+
+    def test_scripted_effects_document_defines_effects(self):
+        """Indexing a scripted effects file from its AST defines its effects."""
+        uri = "file:///mod/common/scripted_effects/my_effects.txt"
+        source = "my_effect = {\n    add_gold = 10\n}\nother_effect = { }\n"
+        index = DocumentIndex()
+
+        index.update_from_ast(uri, parse_document(source), source)
+
+        assert set(index.scripted_effects) == {"my_effect", "other_effect"}
+        assert {"my_effect", "other_effect"} <= index.document_dependency_symbols(uri)
+        assert index.has_dependency_symbol("my_effect")
+
+    def test_edit_replaces_definitions(self):
+        """Re-indexing an edited definition file drops removed definitions."""
+        uri = "file:///mod/common/scripted_triggers/my_triggers.txt"
+        index = DocumentIndex()
+        index.update_from_ast(uri, parse_document("old_trigger = { }"), "old_trigger = { }")
+
+        index.update_from_ast(uri, parse_document("new_trigger = { }"), "new_trigger = { }")
+
+        assert set(index.scripted_triggers) == {"new_trigger"}
+        assert not index.has_dependency_symbol("old_trigger")
+        assert index.has_dependency_symbol("new_trigger")
+
+    def test_remove_document_undefines_symbols(self):
+        """Removing a definition file removes its dependency symbols."""
+        uri = "file:///mod/common/scripted_effects/my_effects.txt"
+        index = DocumentIndex()
+        index.update_from_ast(uri, parse_document("my_effect = { }"), "my_effect = { }")
+
+        index.remove_document(uri)
+
+        assert "my_effect" not in index.dependency_symbols()
+        assert index.document_dependency_symbols(uri) == set()
+
+
 class TestIndexIntegration:
     """Integration tests with real fixture files."""
 
@@ -0,0 +1,138 @@
+"""
+Tests for the pychivalry lint command line interface.
+
+Cached runs must report exactly what uncached runs report.
+"""
+
+import io
+import json
+
+import pytest
+
+from pychivalry.diagnostics import DiagnosticConfig
+from pychivalry.index_cache import CACHE_DIR_NAME
+from pychivalry.lint import exceeds_threshold, lint_workspace, main
+
+USER_EVENT = """namespace = user
+user.0001 = {
+\ttype = character_event
+\timmediate = { my_effect = yes }
+}
+"""
+
+OTHER_EVENT = """namespace = other
+other.0001 = {
+\ttype = character_event
+\timmediate = { add_gold = 10 }
+}
+"""
+
+
+@pytest.fixture
+def mod_root(tmp_path):
+    """A mod with an event using an undefined scripted effect."""
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "user.txt").write_text(USER_EVENT)
+    (tmp_path / "events" / "other.txt").write_text(OTHER_EVENT)
+    return tmp_path
+
+
+def _messages(report, path):
+    return [d.message for d in report["files"][path]]
+
+
+def _dump(report):
+    return {
+        path: [(str(d.code), d.message, d.range.start.line) for d in diagnostics]
+        for path, diagnostics in report["files"].items()
+    }
+
+
+class TestLintWorkspace:
+    """Tests for lint_workspace() and its result cache."""
+
+    def test_warm_run_uses_cache(self, mod_root):
+        cold = lint_workspace(str(mod_root))
+        warm = lint_workspace(str(mod_root))
+
+        assert cold["summary"]["cached"] == 0
+        assert warm["summary"]["cached"] == 2
+        assert _dump(warm) == _dump(cold)
+        assert warm["summary"]["by_code"] == cold["summary"]["by_code"]
+        assert "Unknown effect: 'my_effect'" in _messages(cold, "events/user.txt")
+
+    def test_changed_file_is_revalidated(self, mod_root):
+        lint_workspace(str(mod_root))
+        (mod_root / "events" / "other.txt").write_text(OTHER_EVENT + "\n\n\n")
+
+        report = lint_workspace(str(mod_root))
+
+        assert report["summary"]["cached"] == 1
+        assert _dump(report) == _dump(lint_workspace(str(mod_root), use_cache=False))
+
+    def test_new_definition_revalidates_files_using_it(self, mod_root):
+        lint_workspace(str(mod_root))
+        effects = mod_root / "common" / "scripted_effects"
+        effects.mkdir(parents=True)
+        (effects / "effects.txt").write_text("my_effect = {\n\tadd_gold = 10\n}\n")
+
+        report = lint_workspace(str(mod_root))
+
+        # other.txt is reused; user.txt and the new file are validated
+        assert report["summary"]["cached"] == 1
+        assert "Unknown effect: 'my_effect'" not in _messages(report, "events/user.txt")
+
+    def test_config_change_discards_cache(self, mod_root):
+        lint_workspace(str(mod_root))
+
+        report = lint_workspace(str(mod_root), config=DiagnosticConfig(style_enabled=False))
+
+        assert report["summary"]["cached"] == 0
+
+    def test_no_cache_writes_nothing(self, mod_root):
+        lint_workspace(str(mod_root), use_cache=False)
+
+        assert not (mod_root / CACHE_DIR_NAME).exists()
+
+
+class TestLintMain:
+    """Tests for output formats and exit codes."""
+
+    def test_exit_code_follows_fail_on(self, mod_root):
+        output = io.StringIO()
+        assert main([str(mod_root), "--workers", "0"], stdout=output) == 1
+        assert "events/user.txt:4:" in output.getvalue()
+        assert main([str(mod_root), "--workers", "0", "--fail-on", "never"], io.StringIO()) == 0
+
+    def test_threshold(self, mod_root):
+        report = lint_workspace(str(mod_root), use_cache=False)
+
+        assert exceeds_threshold([report], "hint")
+        assert not exceeds_threshold([report], "never")
+
+    def test_json_output(self, mod_root):
+        output = io.StringIO()
+        main([str(mod_root), "--workers", "0", "--format", "json"], stdout=output)
+
+        (report,) = json.loads(output.getvalue())
+        files = {entry["path"]: entry["diagnostics"] for entry in report["files"]}
+        unknown = [d for d in files["events/user.txt"] if d["message"].startswith("Unknown")]
+        assert unknown[0]["line"] == 4
+        assert unknown[0]["severity"] == "warning"
+        assert report["summary"]["files"] == 2
+
+    def test_sarif_output(self, mod_root, tmp_path):
+        sarif_path = tmp_path / "lint.sarif"
+        main([str(mod_root), "--workers", "0", "--format", "sarif", "-o", str(sarif_path)])
+
+        sarif = json.loads(sarif_path.read_text())
+        (run,) = sarif["runs"]
+        assert sarif["version"] == "2.1.0"
+        rule_ids = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+        assert {result["ruleId"] for result in run["results"]} == rule_ids
+        location = run["results"][0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uriBaseId"] == "ROOT"
+        assert location["region"]["startLine"] >= 1
+
+    def test_missing_folder_is_usage_error(self, tmp_path, capsys):
+        assert main([str(tmp_path / "missing")]) == 2
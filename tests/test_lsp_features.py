@@ -311,6 +311,21 @@ class TestSymbolSearch:
         assert "test_mod.0001" in matches
         assert "my_modifier" in matches
 
+    def test_workspace_symbol_handler(self, server):
+        """The handler returns ranked matches from the index."""
+        from pychivalry.server import workspace_symbol
+
+        server.index.update_from_ast(
+            "file:///test.txt", parse_document("test_mod.0001 = { }\nother_test_mod.0001 = { }")
+        )
+
+        symbols = workspace_symbol(server, types.WorkspaceSymbolParams(query="TEST_MOD"))
+
+        assert [symbol.name for symbol in symbols] == ["test_mod.0001", "other_test_mod.0001"]
+        assert symbols[0].kind == types.SymbolKind.Event
+        assert symbols[0].container_name == "Event"
+        assert workspace_symbol(server, types.WorkspaceSymbolParams(query="zzz")) is None
+
 
 class TestReferenceContext:
     """Test reference context detection."""
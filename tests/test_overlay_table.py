@@ -0,0 +1,119 @@
+"""
+Tests for the copy-on-write overlay table.
+
+Copies must never see each other's writes, and a table must behave like a
+dict across overlay writes, deletions and compactions.
+"""
+
+import pickle
+import random
+
+import pytest
+
+from pychivalry import overlay_table
+from pychivalry.overlay_table import OverlayTable
+
+
+class TestOverlayTable:
+    """Tests for OverlayTable."""
+
+    def test_copies_are_independent(self):
+        """Writes and deletions on either side do not show on the other."""
+        table = OverlayTable({"a": 1, "b": 2})
+        clone = table.copy()
+
+        clone["c"] = 3
+        del clone["a"]
+        table["b"] = 20
+
+        assert dict(table) == {"a": 1, "b": 20}
+        assert dict(clone) == {"b": 2, "c": 3}
+        assert "a" not in clone and clone.get("a") is None
+        assert len(table) == 2 and len(clone) == 2
+
+    def test_copy_shares_base(self):
+        """Only the overlay is copied, and copying gives up base ownership."""
+        table = OverlayTable({"a": 1})
+        assert table.owns_base
+
+        clone = table.copy()
+        clone["b"] = 2
+
+        assert not table.owns_base and not clone.owns_base
+        assert clone._base is table._base
+        assert clone._changes == {"b": 2}
+
+    def test_deleted_keys(self):
+        """Deleted keys raise KeyError and can be set again."""
+        clone = OverlayTable({"a": 1}).copy()
+        del clone["a"]
+
+        with pytest.raises(KeyError):
+            clone["a"]
+        with pytest.raises(KeyError):
+            del clone["a"]
+        assert clone.pop("a", None) is None
+
+        clone["a"] = 5
+        assert clone == {"a": 5}
+
+    def test_compaction(self, monkeypatch):
+        """A large overlay is merged into a new base owned by the table."""
+        monkeypatch.setattr(overlay_table, "COMPACT_THRESHOLD", 4)
+        table = OverlayTable({i: i for i in range(10)})
+        clone = table.copy()
+
+        for i in range(5):
+            clone[i] = -i
+
+        assert clone.owns_base
+        assert clone._changes == {}
+        assert dict(table) == {i: i for i in range(10)}
+        assert dict(clone) == {i: -i if i < 5 else i for i in range(10)}
+
+    def test_compact_copies_values(self):
+        """compact(list) gives the table its own copies of list values."""
+        table = OverlayTable({"flag": [1]})
+        clone = table.copy()
+        clone.compact(list)
+        clone["flag"].append(2)
+
+        assert table["flag"] == [1]
+        assert clone["flag"] == [1, 2]
+
+    def test_pickle(self):
+        """Pickling keeps the contents and drops the overlay."""
+        clone = OverlayTable({"a": 1, "b": 2}).copy()
+        del clone["a"]
+        clone["c"] = 3
+
+        restored = pickle.loads(pickle.dumps(clone))
+
+        assert restored == {"b": 2, "c": 3}
+        assert restored.owns_base
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_operations_match_dict(self, monkeypatch, seed):
+        """Random writes, deletions and copies behave like dict copies."""
+        monkeypatch.setattr(overlay_table, "COMPACT_THRESHOLD", 8)
+        rng = random.Random(seed)
+        tables = [OverlayTable()]
+        dicts = [{}]
+
+        for _ in range(500):
+            i = rng.randrange(len(tables))
+            table, expected = tables[i], dicts[i]
+            key = rng.randrange(30)
+            action = rng.random()
+            if action < 0.5:
+                table[key] = expected[key] = rng.random()
+            elif action < 0.8:
+                assert table.pop(key, None) == expected.pop(key, None)
+            elif len(tables) < 6:
+                tables.append(table.copy())
+                dicts.append(dict(expected))
+
+        for table, expected in zip(tables, dicts):
+            assert dict(table.items()) == expected
+            assert sorted(table) == sorted(expected)
+            assert len(table) == len(expected)
@@ -7,11 +7,16 @@ Abstract Syntax Tree (AST) with correct structure and position information.
 
 import pytest
 from lsprotocol import types
+from pygls.workspace import TextDocument
 
 from pychivalry.parser import (
     parse_document,
+    parse_document_incremental,
     get_node_at_position,
+    parse_outline,
+    PositionIndex,
     tokenize,
+    tokenize_reference,
     CK3Node,
     CK3Token,
 )
@@ -85,6 +90,23 @@ class TestTokenizer:
         assert tokens[1].character == 0  # 'line2' starts at character 0
         assert tokens[2].character > 0  # 'test' is after 'line2 '
 
+    @pytest.mark.parametrize(
+        "text",
+        [
+            'name = "unterminated\nnext = 1',
+            'desc = "escaped \\" quote" x = y',
+            'desc = "trailing backslash\\\nvalue = -5.25.1',
+            "a>=1 b<=2 c!=3 d==4 e=5 f>6 g<7 ! - ?= 1.",
+            "\tif = {\r\n\t\tlimit = { $PARAM$ = @value }\r\n\t}\r\n",
+            "clé_é = valeur # commentaire\n  # only comment  \n",
+        ],
+    )
+    def test_tokenize_matches_reference(self, text):
+        """Regex tokenizer emits the same stream as the reference tokenizer."""
+        fast = [(t.type, t.value, t.line, t.character) for t in tokenize(text)]
+        slow = [(t.type, t.value, t.line, t.character) for t in tokenize_reference(text)]
+        assert fast == slow
+
 
 class TestParser:
     """Tests for the CK3 script parser."""
@@ -289,6 +311,147 @@ class TestGetNodeAtPosition:
         # Implementation may vary, just ensure no crash
 
 
+class TestPositionIndex:
+    """Tests for the indexed cursor lookup."""
+
+    @staticmethod
+    def _all_positions(text):
+        """Every cursor position in the text, plus a few past the end of lines."""
+        lines = text.split("\n")
+        for line_number, line in enumerate(lines + ["", ""]):
+            for character in range(len(line) + 3):
+                yield types.Position(line=line_number, character=character)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "outer = {\n    inner = {\n        deep = yes\n    }\n}",
+            "a = { b = 1 }c = { d = 2 }\ne = f",
+            # Unclosed blocks: children extend past their parent's range
+            "broken = { a = { b = c\nd = e",
+            "x = { traits = { brave cruel } y = { } } # comment\nz = 1",
+        ],
+    )
+    def test_matches_tree_walk(self, text):
+        """The index returns the same node as get_node_at_position everywhere."""
+        ast = parse_document(text)
+        position_index = PositionIndex(ast)
+
+        for position in self._all_positions(text):
+            assert position_index.node_at(position) is get_node_at_position(ast, position)
+
+    def test_matches_tree_walk_on_fixture(self, sample_event_text):
+        """The index agrees with the tree walk on a full event."""
+        ast = parse_document(sample_event_text)
+        position_index = PositionIndex(ast)
+
+        for position in self._all_positions(sample_event_text):
+            assert position_index.node_at(position) is get_node_at_position(ast, position)
+
+    def test_deepest_node(self):
+        """The innermost containing node is returned."""
+        ast = parse_document("outer = {\n    inner = {\n        deep = yes\n    }\n}")
+
+        node = PositionIndex(ast).node_at(types.Position(line=2, character=10))
+
+        assert node.key == "deep"
+
+    def test_unordered_siblings(self):
+        """Siblings out of start order are still searched first to last."""
+        ast = parse_document("a = 1\nb = 2")
+        ast.reverse()
+        position_index = PositionIndex(ast)
+
+        assert position_index.node_at(types.Position(line=1, character=0)).key == "b"
+        assert position_index.node_at(types.Position(line=0, character=0)).key == "a"
+
+    def test_empty(self):
+        """An empty AST has no nodes at any position."""
+        assert PositionIndex([]).node_at(types.Position(line=0, character=0)) is None
+
+
+def _tree_shape(node):
+    """Flatten a subtree into comparable tuples (CK3Node equality recurses via parent)."""
+    result = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        result.append(
+            (current.type, current.key, current.value, current.range, len(current.children))
+        )
+        stack.extend(reversed(current.children))
+    return result
+
+
+class TestParseOutline:
+    """Tests for the skeleton (outline-only) parser."""
+
+    TEXT = """namespace = test_mod
+# top-level comment with { brace
+test_mod.0001 = {
+    desc = "a } in a string"
+    immediate = { # a { in a comment
+        add_gold = 100
+    }
+}
+my_value = -5.5
+  my_effect =
+  {
+    if = { limit = { always = yes } }
+}
+"""
+
+    def test_matches_full_parse_top_level(self):
+        """Top-level statements, types, values and key ranges match parse_document."""
+        ast = parse_document(self.TEXT)
+        outline = parse_outline(self.TEXT)
+
+        assert [(n.type, n.key, n.value) for n in outline] == [
+            (n.type, n.key, n.value) for n in ast
+        ]
+        assert [n.key_range.start for n in outline] == [n.range.start for n in ast]
+        assert [n.value_type for n in outline] == ["identifier", None, "number", None]
+        assert all(n.closed for n in outline)
+
+    def test_lazy_parse_matches_full_parse(self):
+        """OutlineNode.parse() builds the same node as parse_document, positions included."""
+        ast = parse_document(self.TEXT)
+        outline = parse_outline(self.TEXT)
+
+        for outline_node, node in zip(outline, ast):
+            assert _tree_shape(outline_node.parse()) == _tree_shape(node)
+        assert outline[1].parse() is outline[1].parse()
+
+    def test_spans(self):
+        """Spans run from the key to just past the closing brace."""
+        outline = parse_outline(self.TEXT)
+
+        event = outline[1]
+        assert self.TEXT[event.start : event.end].startswith("test_mod.0001 = {")
+        assert self.TEXT[event.start : event.end].endswith("    }\n}")
+
+    def test_matches_full_parse_on_fixture(self, sample_event_text):
+        """A full event file gives the same top-level statements."""
+        ast = parse_document(sample_event_text)
+        outline = parse_outline(sample_event_text)
+
+        assert [_tree_shape(n.parse()) for n in outline] == [_tree_shape(n) for n in ast]
+
+    def test_unclosed_block(self):
+        """An unclosed block runs to the end of the text."""
+        text = "a = 1\nb = {\n    c = {\n"
+        outline = parse_outline(text)
+
+        assert [(n.key, n.closed) for n in outline] == [("a", True), ("b", False)]
+        assert outline[1].end == len(text)
+        assert outline[1].parse().children[0].key == "c"
+
+    def test_non_statements_skipped(self):
+        """Stray tokens and incomplete statements are skipped like parse_document does."""
+        text = "} a > 5 b = = c d = { }\n\"x\" e"
+        assert [n.key for n in parse_outline(text)] == [n.key for n in parse_document(text)]
+
+
 class TestParserIntegration:
     """Integration tests with real-world fixtures."""
 
@@ -373,3 +536,111 @@ class TestParserScopeTypes:
 
         if ast:
             assert ast[0].scope_type == "unknown"
+
+
+def _apply_edit(text, start_line, start_char, end_line, end_char, new_text):
+    """Apply an edit to text and return (new_text, LSP content change)."""
+    doc = TextDocument(uri="file:///edit.txt", source=text)
+    change = types.TextDocumentContentChangePartial(
+        range=types.Range(
+            start=types.Position(line=start_line, character=start_char),
+            end=types.Position(line=end_line, character=end_char),
+        ),
+        text=new_text,
+    )
+    doc.apply_change(change)
+    return doc.source, change
+
+
+def _flatten(nodes):
+    """Flatten an AST into comparable tuples (structure, positions, parents)."""
+    result = []
+
+    def visit(node, depth, parent):
+        assert node.parent is parent
+        r = node.range
+        result.append(
+            (depth, node.type, node.key, node.value, r.start.line, r.start.character, r.end.line, r.end.character)
+        )
+        for child in node.children:
+            visit(child, depth + 1, node)
+
+    for node in nodes:
+        visit(node, 0, None)
+    return result
+
+
+class TestIncrementalParsing:
+    """Tests for parse_document_incremental."""
+
+    BASE = """namespace = test
+
+test.0001 = {
+    trigger = { is_adult = yes }
+    option = {
+        add_gold = 100
+    }
+}
+
+test.0002 = {
+    immediate = { add_prestige = 50 }
+}
+
+test.0003 = {
+    desc = test.0003.desc
+}
+"""
+
+    @pytest.mark.parametrize(
+        "edit",
+        [
+            (5, 19, 5, 19, "0"),  # Change a value inside one block
+            (5, 0, 5, 0, "        add_piety = 10\n"),  # Insert a line (shifts later blocks)
+            (10, 0, 11, 0, ""),  # Delete a line
+            (7, 0, 7, 1, ""),  # Remove a closing brace (regroups following blocks)
+            (8, 0, 8, 0, "test.0004 = {\n}\n"),  # Insert a new top-level block
+            (0, 0, 0, 0, "# header\n"),  # Edit before everything
+            (15, 0, 15, 0, "orphan = {"),  # Unclosed block at end of file
+            (9, 12, 9, 12, "\n"),  # Split a block header across lines
+        ],
+    )
+    def test_matches_full_parse(self, edit):
+        """Incremental re-parse yields the same AST as a full parse."""
+        old_ast = parse_document(self.BASE)
+        new_text, change = _apply_edit(self.BASE, *edit)
+
+        incremental = parse_document_incremental(old_ast, new_text, [change])
+
+        assert _flatten(incremental) == _flatten(parse_document(new_text))
+
+    def test_multiple_changes_applied_in_order(self):
+        """A batch of sequential changes is handled like a full parse."""
+        old_ast = parse_document(self.BASE)
+        text, first = _apply_edit(self.BASE, 14, 0, 14, 0, "    title = test.0003.t\n")
+        text, second = _apply_edit(text, 2, 0, 2, 0, "\n\n")
+        text, third = _apply_edit(text, 7, 18, 7, 21, "5")
+
+        incremental = parse_document_incremental(old_ast, text, [first, second, third])
+
+        assert _flatten(incremental) == _flatten(parse_document(text))
+
+    def test_untouched_blocks_are_reused(self):
+        """Blocks outside the edited region are not re-parsed."""
+        old_ast = parse_document(self.BASE)
+        new_text, change = _apply_edit(self.BASE, 5, 19, 5, 19, "0")
+
+        incremental = parse_document_incremental(old_ast, new_text, [change])
+
+        assert incremental[0] is old_ast[0]  # namespace
+        assert incremental[1] is not old_ast[1]  # edited event
+        assert incremental[2] is old_ast[2]
+        assert incremental[3] is old_ast[3]
+
+    def test_full_document_change_falls_back(self):
+        """A change without a range re-parses the whole document."""
+        old_ast = parse_document(self.BASE)
+        change = types.TextDocumentContentChangeWholeDocument(text="namespace = other")
+
+        incremental = parse_document_incremental(old_ast, change.text, [change])
+
+        assert _flatten(incremental) == _flatten(parse_document("namespace = other"))
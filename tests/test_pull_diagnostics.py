@@ -0,0 +1,121 @@
+"""
+Tests for pull diagnostic results and their result IDs.
+"""
+
+import os
+
+from lsprotocol import types
+
+from pychivalry.pull_diagnostics import (
+    DiagnosticResultStore,
+    document_report,
+    workspace_report,
+)
+
+
+def _diagnostic(message: str, line: int = 0) -> types.Diagnostic:
+    return types.Diagnostic(
+        range=types.Range(
+            start=types.Position(line=line, character=0),
+            end=types.Position(line=line, character=5),
+        ),
+        message=message,
+    )
+
+
+def _fingerprint(path):
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size, "md5"]
+
+
+class TestDiagnosticResultStore:
+    """Result IDs change exactly when the diagnostics do."""
+
+    def test_equal_diagnostics_keep_result_id(self):
+        store = DiagnosticResultStore()
+        first, changed = store.store("file:///a.txt", [_diagnostic("x")], version=1)
+        assert changed
+
+        second, changed = store.store("file:///a.txt", [_diagnostic("x")], version=2)
+        assert not changed
+        assert second.result_id == first.result_id
+        assert second.version == 2
+
+        third, changed = store.store("file:///a.txt", [_diagnostic("x", line=1)], version=3)
+        assert changed
+        assert third.result_id != first.result_id
+
+    def test_result_ids_differ_between_stores(self):
+        first, _ = DiagnosticResultStore().store("file:///a.txt", [])
+        second, _ = DiagnosticResultStore().store("file:///a.txt", [])
+        assert first.result_id != second.result_id
+
+    def test_invalidate_keeps_result_id(self):
+        store = DiagnosticResultStore()
+        result, _ = store.store("file:///a.txt", [], version=4)
+
+        store.invalidate(["file:///a.txt", "file:///missing.txt"])
+
+        assert store.get("file:///a.txt").version is None
+        assert store.get("file:///a.txt").result_id == result.result_id
+        assert len(store) == 1
+
+    def test_reusable_closed_files(self, tmp_path):
+        """Closed-file results are reused until the file or a symbol it uses changes."""
+        unchanged = tmp_path / "unchanged.txt"
+        edited = tmp_path / "edited.txt"
+        dependent = tmp_path / "dependent.txt"
+        for path in (unchanged, edited, dependent):
+            path.write_text("a = yes\n")
+        symbols = frozenset({"my_effect"})
+        store = DiagnosticResultStore()
+        for path in (unchanged, edited, dependent):
+            keys = frozenset({"my_trigger"}) if path is dependent else frozenset({"a"})
+            store.store(
+                path.as_uri(), [], fingerprint=_fingerprint(path), keys=keys, symbols=symbols
+            )
+
+        edited.write_text("a = no\nb = yes\n")
+        os.utime(edited, ns=(0, 0))
+        reusable = store.reusable(
+            [unchanged, edited, dependent, tmp_path / "new.txt"],
+            frozenset({"my_effect", "my_trigger"}),
+        )
+
+        assert list(reusable) == [unchanged]
+
+    def test_prune_keeps_open_documents(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("")
+        store = DiagnosticResultStore()
+        store.store(path.as_uri(), [], fingerprint=_fingerprint(path))
+        store.store("file:///open.txt", [], version=1)
+
+        store.prune([])
+
+        assert store.get(path.as_uri()) is None
+        assert store.get("file:///open.txt") is not None
+
+
+class TestReports:
+    """Reports are unchanged when the client has the current result ID."""
+
+    def test_document_report(self):
+        result, _ = DiagnosticResultStore().store("file:///a.txt", [_diagnostic("x")])
+
+        full = document_report(result, None)
+        unchanged = document_report(result, result.result_id)
+
+        assert full.kind == "full"
+        assert [d.message for d in full.items] == ["x"]
+        assert unchanged.kind == "unchanged"
+        assert unchanged.result_id == result.result_id
+
+    def test_workspace_report(self):
+        result, _ = DiagnosticResultStore().store("file:///a.txt", [])
+
+        full = workspace_report("file:///a.txt", result, "other", version=3)
+        unchanged = workspace_report("file:///a.txt", result, result.result_id)
+
+        assert (full.kind, full.uri, full.version) == ("full", "file:///a.txt", 3)
+        assert (unchanged.kind, unchanged.version) == ("unchanged", None)
@@ -0,0 +1,87 @@
+"""
+Tests for the server's work lanes.
+
+Work queued in one lane must not wait behind work in another.
+"""
+
+import threading
+
+from pychivalry.scheduler import LaneExecutor, LaneScheduler
+
+
+class TestLaneExecutor:
+    """Tests for LaneExecutor queue metrics."""
+
+    def test_counts_tasks(self):
+        lane = LaneExecutor("test", 1)
+        release = threading.Event()
+        try:
+            blocker = lane.submit(release.wait)
+            queued = lane.submit(lambda: 42)
+
+            stats = lane.stats()
+            assert stats["submitted"] == 2
+            assert stats["queued"] + stats["running"] == 2
+            assert stats["max_queued"] >= 1
+
+            release.set()
+            assert queued.result(timeout=5) == 42
+            blocker.result(timeout=5)
+        finally:
+            release.set()
+            lane.shutdown(wait=True)
+
+        stats = lane.stats()
+        assert (stats["queued"], stats["running"], stats["completed"]) == (0, 0, 2)
+        assert stats["wait_ms_max"] >= stats["wait_ms_avg"] >= 0
+
+    def test_cancelled_tasks_leave_the_queue(self):
+        lane = LaneExecutor("test", 1)
+        release = threading.Event()
+        try:
+            lane.submit(release.wait)
+            cancelled = lane.submit(lambda: None)
+            assert cancelled.cancel()
+
+            assert lane.queued == 0
+        finally:
+            release.set()
+            lane.shutdown(wait=True)
+        assert lane.stats()["completed"] == 1
+
+
+class TestLaneScheduler:
+    """Tests for LaneScheduler."""
+
+    def test_busy_background_lane_does_not_delay_interactive_work(self):
+        scheduler = LaneScheduler(1, 1, 2)
+        release = threading.Event()
+        try:
+            for _ in range(10):
+                scheduler.background.submit(release.wait)
+
+            assert scheduler.interactive.submit(lambda: "done").result(timeout=5) == "done"
+            assert scheduler.is_idle()
+            assert scheduler.stats()["background"]["queued"] == 8
+        finally:
+            release.set()
+            scheduler.shutdown(wait=True)
+
+    def test_diagnostics_work_is_not_idle(self):
+        scheduler = LaneScheduler(1, 1, 2)
+        release = threading.Event()
+        try:
+            scheduler.diagnostics.submit(release.wait)
+
+            assert not scheduler.is_idle()
+        finally:
+            release.set()
+            scheduler.shutdown(wait=True)
+        assert scheduler.is_idle()
+
+    def test_background_lane_has_two_workers(self):
+        scheduler = LaneScheduler(background_workers=1)
+        try:
+            assert scheduler.background.max_workers == 2
+        finally:
+            scheduler.shutdown()
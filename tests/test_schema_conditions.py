@@ -0,0 +1,113 @@
+"""
+Unit tests for compiled schema condition expressions.
+
+The compiled conditions must keep the semantics of the string evaluator
+SchemaValidator used before, including its quirks.
+"""
+
+from lsprotocol.types import Position, Range
+
+from pychivalry.parser import CK3Node
+from pychivalry.schema_conditions import compile_condition, evaluate
+from pychivalry.schema_loader import SchemaLoader
+from pychivalry.schema_validator import SchemaValidator
+
+
+def _context(**fields):
+    """Evaluation context with the given field values (count 1 each)."""
+    context = {'children': {'count': len(fields)}}
+    for key, value in fields.items():
+        context[key] = {'exists': True, 'count': 1, 'value': value, 'nodes': []}
+    return context
+
+
+class TestCompileCondition:
+    """Tests for compile_condition()."""
+
+    def test_compiled_once_per_expression(self):
+        assert compile_condition('type.exists') is compile_condition('type.exists')
+
+    def test_not_negates_the_whole_rest(self):
+        condition = compile_condition('NOT hidden.exists AND option.exists')
+
+        # NOT (hidden AND option), not (NOT hidden) AND option
+        assert condition(_context(hidden='yes'))
+        assert not condition(_context(hidden='yes', option='x'))
+
+    def test_and_binds_looser_than_or(self):
+        condition = compile_condition('a.exists OR b.exists AND c.exists')
+
+        assert not condition(_context(a='x'))
+        assert condition(_context(b='x', c='x'))
+
+    def test_comparisons(self):
+        context = _context(hidden='yes')
+        context['option'] = {'exists': True, 'count': 3, 'value': None, 'nodes': []}
+
+        assert compile_condition('option.count >= 3')(context)
+        assert not compile_condition('option.count < 3')(context)
+        assert compile_condition('hidden.value != no')(context)
+        assert compile_condition('children.count == 1')(context)
+        assert compile_condition('option.count > -1')(context)
+
+    def test_missing_operands_do_not_order(self):
+        condition = compile_condition('missing.count > 0')
+
+        assert condition(_context()) is False
+        assert compile_condition('missing.value == missing.other')(_context())
+
+    def test_count_is_truthy(self):
+        assert not compile_condition('option.count')(_context())
+        assert compile_condition('option.count')(_context(option='x'))
+
+    def test_unknown_expression_is_false(self):
+        assert compile_condition('something odd')(_context()) is False
+
+    def test_evaluate_treats_errors_as_false(self):
+        def broken(context):
+            raise ValueError('broken')
+
+        assert evaluate(broken, {}, 'broken') is False
+        assert evaluate(None, {}) is False
+
+
+class TestSchemaLoaderConditions:
+    """Tests for conditions compiled by the schema loader."""
+
+    def test_schema_conditions_are_compiled_at_load(self):
+        loader = SchemaLoader()
+        loader.load_all()
+
+        expr = loader.get_all_schemas()['event']['validations'][0]['condition']
+        assert compile_condition.cache_info().currsize > 0
+        assert loader.get_condition(expr) is compile_condition(expr)
+        assert loader.get_condition('') is None
+
+
+class TestCompiledRules:
+    """Tests for the validator's compiled schema rules."""
+
+    def test_replaced_schema_is_recompiled(self):
+        loader = SchemaLoader()
+        loader.load_all()
+        validator = SchemaValidator(loader)
+        node = CK3Node(
+            type='block',
+            key='test.0001',
+            value=None,
+            range=Range(start=Position(line=0, character=0), end=Position(line=0, character=9)),
+        )
+
+        loader._schemas['test'] = {
+            'file_type': 'test',
+            'identification': {'path_patterns': ['test/*']},
+            'fields': {'type': {'required': True, 'diagnostic': 'TEST-001'}},
+        }
+        assert [d.code for d in validator.validate('test/file.txt', [node])] == ['TEST-001']
+
+        loader._schemas['test'] = {
+            'file_type': 'test',
+            'identification': {'path_patterns': ['test/*']},
+            'fields': {'type': {'required': False}},
+        }
+        assert validator.validate('test/file.txt', [node]) == []
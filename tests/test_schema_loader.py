@@ -6,6 +6,7 @@ Tests schema loading, caching, variable resolution, and diagnostic lookup.
 
 import pytest
 from pathlib import Path
+from pychivalry import schema_loader
 from pychivalry.schema_loader import SchemaLoader
 
 
@@ -249,3 +250,39 @@ class TestSchemaPathMatching:
         assert (schema1 is None) == (schema2 is None)
         if schema1 is not None:
             assert schema1.get('file_type') == schema2.get('file_type')
+
+    def test_matches_like_fnmatch(self):
+        """The compiled patterns pick the schema the first matching pattern names."""
+        loader = SchemaLoader()
+        loader.load_all()
+
+        assert loader.get_schema_for_file("/mod/events/sub/dir/test.txt")['file_type'] == 'event'
+        assert loader.get_schema_for_file("/mod/common/decisions/x.txt")['file_type'] == 'decision'
+        assert loader.get_schema_for_file("events/test.yml") is None
+        assert loader.get_schema_for_file("common/scripted_effects/x.txt") is None
+
+    def test_file_type_cache_is_bounded(self, monkeypatch):
+        """The least recently used lookups are evicted."""
+        monkeypatch.setattr(schema_loader, "FILE_TYPE_CACHE_SIZE", 2)
+        loader = SchemaLoader()
+        loader.load_all()
+
+        loader.get_schema_for_file("events/a.txt")
+        loader.get_schema_for_file("events/b.txt")
+        loader.get_schema_for_file("events/a.txt")
+        loader.get_schema_for_file("other/c.txt")
+
+        assert list(loader._file_type_cache) == ["events/a.txt", "other/c.txt"]
+
+    def test_added_schema_is_matched(self):
+        """Schemas added after loading are matched, even for looked up paths."""
+        loader = SchemaLoader()
+        loader.load_all()
+        assert loader.get_schema_for_file("test/file.txt") is None
+
+        loader._schemas['test'] = {
+            'file_type': 'test',
+            'identification': {'path_patterns': ['test/*']},
+        }
+
+        assert loader.get_schema_for_file("test/file.txt")['file_type'] == 'test'
@@ -407,3 +407,39 @@ class TestDiagnosticCreation:
         assert vars['id'] == 'test.0001'
         assert vars['key'] == 'test.0001'
         assert vars['value'] == 'character_event'
+
+
+class TestNestedSchemas:
+    """Test validation of fields that reference nested schemas."""
+
+    def test_validate_character_interactions_file(self, validator):
+        """Test a character interactions file validates against the real schema."""
+        from pathlib import Path
+        from pychivalry.parser import parse_document
+
+        path = (
+            Path(__file__).parent.parent
+            / 'example mod' / 'common' / 'character_interactions' / 'example_interactions.txt'
+        )
+        ast = parse_document(path.read_text(encoding='utf-8-sig'))
+
+        diagnostics = validator.validate(str(path), ast)
+
+        assert isinstance(diagnostics, list)
+
+    def test_placeholder_nested_schema_is_skipped(self, validator):
+        """Test a field whose nested schema is a placeholder (options: pass)."""
+        from pychivalry.parser import parse_document
+
+        ast = parse_document(
+            'my_interaction = {\n'
+            '    category = interaction_category_friendly\n'
+            '    options = { send_gift = yes }\n'
+            '}\n'
+        )
+
+        diagnostics = validator.validate(
+            'common/character_interactions/my_interactions.txt', ast
+        )
+
+        assert isinstance(diagnostics, list)
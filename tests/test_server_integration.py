@@ -4,6 +4,8 @@ Integration tests for the CK3 language server with parser and indexer.
 This module tests the complete integration of parser, indexer, and server.
 """
 
+import asyncio
+
 import pytest
 from lsprotocol import types
 from pygls.workspace import TextDocument
@@ -129,6 +131,33 @@ test_mod.0001 = {
         assert scope_loc is not None
         assert scope_loc.uri == "file:///test.txt"
 
+    def test_incremental_reparse_with_pending_changes(self):
+        """Pending content changes are applied by re-parsing only the edited block."""
+        server = CK3LanguageServer("test-server", "v0.1.0")
+
+        text = "namespace = test\n\ntest.0001 = {\n    add_gold = 100\n}\n"
+        doc = TextDocument(uri="file:///test.txt", source=text)
+        old_ast = server.parse_and_index_document(doc)
+
+        change = types.TextDocumentContentChangePartial(
+            range=types.Range(
+                start=types.Position(line=3, character=18),
+                end=types.Position(line=3, character=18),
+            ),
+            text="0",
+        )
+        doc.apply_change(change)
+        server.add_pending_changes(doc.uri, [change])
+
+        ast = server.get_or_parse_ast(doc.source, old_ast, [change])
+
+        assert ast[0] is old_ast[0]
+        assert ast[1].children[0].value == "1000"
+
+        server.set_ast(doc.uri, ast)
+        server.consume_pending_changes(doc.uri, 1)
+        assert server._pending_changes[doc.uri] == []
+
     def test_empty_document(self):
         """Server handles empty documents."""
         server = CK3LanguageServer("test-server", "v0.1.0")
@@ -140,6 +169,575 @@ test_mod.0001 = {
         assert isinstance(ast, list)
         assert "file:///empty.txt" in server.document_asts
 
+    def test_closed_document_is_reindexed_from_disk(self, tmp_path):
+        """Closing a document re-indexes the saved file, keeping its references."""
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        path = tmp_path / "a.txt"
+        path.write_text("a.0001 = { trigger_event = b.0001 }\n")
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server.workspace.add_folder(types.WorkspaceFolder(uri=tmp_path.as_uri(), name="mod"))
+        doc = TextDocument(uri=path.as_uri(), source="a.0001 = { trigger_event = b.0002 }\n")
+        server.parse_and_index_document(doc)
+        assert server.index.count_references("b.0002") == 1
+
+        # The unsaved edit is dropped; the saved file is indexed instead
+        server.reindex_closed_document(doc.uri)
+        assert server.index.count_references("b.0002") == 0
+        assert server.index.count_references("b.0001") == 1
+
+        path.unlink()
+        server.reindex_closed_document(doc.uri)
+        assert "a.0001" not in server.index.events
+
+    def test_closed_document_outside_workspace_is_unindexed(self, tmp_path):
+        """Closing a file outside the workspace folders removes it from the index."""
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        (tmp_path / "mod").mkdir()
+        path = tmp_path / "elsewhere.txt"
+        path.write_text("a.0001 = { trigger_event = b.0001 }\n")
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server.workspace.add_folder(
+            types.WorkspaceFolder(uri=(tmp_path / "mod").as_uri(), name="mod")
+        )
+        server.parse_and_index_document(TextDocument(uri=path.as_uri(), source=path.read_text()))
+        assert "a.0001" in server.index.events
+
+        server.reindex_closed_document(path.as_uri())
+
+        assert "a.0001" not in server.index.events
+        assert server.index.count_references("b.0001") == 0
+
+    @pytest.mark.parametrize("sync", [True, False])
+    def test_workspace_scan_gets_file_system_paths(self, tmp_path, sync):
+        """Workspace folder URIs are scanned as absolute, unquoted paths."""
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        folder = tmp_path / "my mod"
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server.workspace.add_folder(types.WorkspaceFolder(uri=folder.as_uri(), name="mod"))
+        scanned = []
+        server.scan_index = lambda folders, **kwargs: scanned.append(folders)
+
+        if sync:
+            server._scan_workspace_folders()
+        else:
+            asyncio.run(server._scan_workspace_folders_async())
+
+        assert scanned == [[str(folder)]]
+
+    def test_ast_cache_stores_compact_asts(self):
+        """Compacted cached ASTs are materialized as new nodes on a hit."""
+        from pychivalry.compact_ast import CompactAST
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        source = "a.0001 = {\n    add_gold = 100\n}\n"
+        ast = server.get_or_parse_ast(source, compact=True)
+
+        assert all(isinstance(entry, CompactAST) for entry in server._ast_cache.values())
+        cached = server.get_or_parse_ast(source)
+        assert cached[0] is not ast[0]
+        assert cached[0].children[0].value == "100"
+        assert cached[0].children[0].parent is cached[0]
+
+    def test_ast_cache_compacts_only_asts_no_document_holds(self):
+        """Parsed ASTs are cached as is and compacted once no document holds them."""
+        from pychivalry.compact_ast import CompactAST
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server._schedule_ast_compaction = lambda: None
+        doc = TextDocument(uri="file:///test.txt", source="a = {\n    b = c\n}\n")
+        live = server.parse_and_index_document(doc)
+        old_source = "a = {\n    b = d\n}\n"
+        old = server.get_or_parse_ast(old_source)
+
+        assert server.get_or_parse_ast(doc.source) is live
+        server.compact_ast_cache()
+
+        entries = server._ast_cache
+        assert entries[server._compute_content_hash(doc.source)] is live
+        assert isinstance(entries[server._compute_content_hash(old_source)], CompactAST)
+        assert server.get_cached_ast(old_source)[0] is not old[0]
+
+        server.remove_ast(doc.uri)
+        server.compact_ast_cache()
+        assert all(isinstance(entry, CompactAST) for entry in server._ast_cache.values())
+
+    def test_position_index_follows_ast(self):
+        """The cursor lookup index is reused for an AST and rebuilt when it changes."""
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        doc = TextDocument(uri="file:///test.txt", source="a = {\n    b = c\n}\n")
+        server.parse_and_index_document(doc)
+        position = types.Position(line=1, character=5)
+
+        position_index = server.get_position_index(doc.uri)
+        assert position_index.node_at(position).key == "b"
+        assert server.get_position_index(doc.uri) is position_index
+
+        doc._source = "a = {\n    d = c\n}\n"
+        server.parse_and_index_document(doc)
+        assert server.get_position_index(doc.uri).node_at(position).key == "d"
+
+        server.remove_ast(doc.uri)
+        assert server.get_position_index(doc.uri) is None
+
+    def test_snapshot_is_shared_per_version(self):
+        """Handlers share one snapshot per document version, seeded with the AST."""
+        from pychivalry.document_buffer import BufferedWorkspace
+        from pychivalry.server import document_symbol, folding_range
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        uri = "file:///test.txt"
+        server.workspace.put_text_document(
+            types.TextDocumentItem(
+                uri=uri, language_id="ck3", version=1, text="a = {\n    b = c\n}\n"
+            )
+        )
+        doc = server.workspace.get_text_document(uri)
+        ast = server.parse_and_index_document(doc)
+
+        snapshot = server.get_snapshot(uri)
+        assert snapshot.ast is ast
+        assert server.get_snapshot(uri) is snapshot
+
+        text_document = types.TextDocumentIdentifier(uri=uri)
+        symbols = document_symbol(server, types.DocumentSymbolParams(text_document=text_document))
+        ranges = folding_range(server, types.FoldingRangeParams(text_document=text_document))
+        assert [symbol.name for symbol in symbols] == ["a"]
+        assert ranges is snapshot.folding_ranges
+        assert snapshot.memoize("document_symbols", list) is symbols
+
+        # A new version gets a new snapshot (parsed on demand)
+        server.workspace.update_text_document(
+            types.VersionedTextDocumentIdentifier(uri=uri, version=2),
+            types.TextDocumentContentChangeWholeDocument(text="d = {\n}\n"),
+        )
+        server.discard_snapshot(uri)
+        new_snapshot = server.get_snapshot(uri)
+        assert new_snapshot is not snapshot
+        assert new_snapshot.version == 2
+        assert [node.key for node in new_snapshot.ast] == ["d"]
+
+        server.remove_ast(uri)
+        assert server.get_snapshot(uri) is not new_snapshot
+
+    def test_semantic_diagnostics_use_block_cache(self):
+        """The semantic phase re-checks only top-level blocks that changed."""
+        from pychivalry.parser import parse_document
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        uri = "file:///events/test.txt"
+        source = "a.0001 = {\n    trigger = { add_gold = 1 }\n}\nb.0001 = {\n}\n"
+        ast = parse_document(source)
+
+        first = server._collect_semantic_diagnostics_sync(uri, ast, source.split("\n"))
+        cache = server.get_block_cache(uri)
+        assert cache.misses == 2
+
+        edited = source.replace("b.0001 = {", "b.0001 = { c = d")
+        second = server._collect_semantic_diagnostics_sync(
+            uri, parse_document(edited), edited.split("\n")
+        )
+        assert cache.misses == 1
+        assert [d.message for d in second] == [d.message for d in first]
+
+        server.remove_ast(uri)
+        assert server.get_block_cache(uri) is not cache
+
+
+class TestCrossFileRevalidation:
+    """Tests for re-validating documents that use changed definitions."""
+
+    def test_new_definition_queues_dependent_documents(self):
+        """Defining a used effect queues the documents using it, and only those."""
+        from pychivalry.parser import parse_document
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        user_uri = "file:///mod/events/user.txt"
+        other_uri = "file:///mod/events/other.txt"
+        for uri, effect in ((user_uri, "my_effect"), (other_uri, "add_gold")):
+            source = f"a.0001 = {{\n    immediate = {{ {effect} = yes }}\n}}\n"
+            server._collect_semantic_diagnostics_sync(
+                uri, parse_document(source), source.split("\n")
+            )
+
+        effects_uri = "file:///mod/common/scripted_effects/my_effects.txt"
+        source = "my_effect = {\n    add_gold = 10\n}\n"
+        server.index_document(effects_uri, parse_document(source), source)
+
+        assert "my_effect" in server.index.scripted_effects
+        assert server._revalidation_pending == {user_uri}
+
+        # Re-indexing the same definitions changes nothing
+        server._revalidation_pending.clear()
+        server.index_document(effects_uri, parse_document(source), source)
+        assert server._revalidation_pending == set()
+
+        # Removing the definition affects the user again
+        server.unindex_document(effects_uri)
+        assert server._revalidation_pending == {user_uri}
+
+    async def test_revalidation_publishes_diagnostics(self):
+        """Queued documents are validated against the new index and published."""
+        from unittest.mock import MagicMock
+
+        from pychivalry.document_buffer import BufferedWorkspace
+        from pychivalry.parser import parse_document
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server._revalidation_delay = 0.01
+        server.text_document_publish_diagnostics = MagicMock()
+
+        uri = "file:///mod/events/user.txt"
+        source = "namespace = a\na.0001 = {\n    immediate = { my_effect = yes }\n}\n"
+        server.workspace.put_text_document(
+            types.TextDocumentItem(uri=uri, language_id="ck3", version=1, text=source)
+        )
+        doc = server.workspace.get_text_document(uri)
+        server.parse_and_index_document(doc)
+        before = server.collect_document_diagnostics(doc)
+        assert "Unknown effect: 'my_effect'" in [d.message for d in before]
+
+        effects = "my_effect = { add_gold = 1 }\n"
+        server.index_document(
+            "file:///mod/common/scripted_effects/e.txt", parse_document(effects), effects
+        )
+        await asyncio.sleep(0.2)
+
+        published = server.text_document_publish_diagnostics.call_args.args[0]
+        assert published.uri == uri
+        assert "Unknown effect: 'my_effect'" not in [d.message for d in published.diagnostics]
+        assert not server._revalidation_scheduled
+
+    def test_closed_documents_are_not_revalidated(self):
+        """Closing a document removes it from the dependency graph."""
+        from pychivalry.parser import parse_document
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        uri = "file:///mod/events/user.txt"
+        source = "a.0001 = {\n    immediate = { my_effect = yes }\n}\n"
+        server._collect_semantic_diagnostics_sync(uri, parse_document(source), source.split("\n"))
+        server.remove_ast(uri)
+
+        server.revalidate_dependents({"my_effect"})
+
+        assert server._revalidation_pending == set()
+
+
+class TestWorkspaceValidation:
+    """Tests for validating every file of the workspace from the server."""
+
+    async def test_publishes_closed_files_and_counts_open_ones(self, tmp_path):
+        """Closed files are published as validated; open ones keep live diagnostics."""
+        from unittest.mock import MagicMock
+
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        (tmp_path / "events").mkdir()
+        closed = tmp_path / "events" / "closed.txt"
+        closed.write_text("namespace = a\na.0001 = {\n\timmediate = { my_effect = yes }\n}\n")
+        clean = tmp_path / "events" / "clean.txt"
+        clean.write_text("")
+        opened = tmp_path / "events" / "open.txt"
+        opened.write_text("namespace = b\n")
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server._validate_process_workers = 0
+        server.text_document_publish_diagnostics = MagicMock()
+        server.workspace.put_text_document(
+            types.TextDocumentItem(
+                uri=opened.as_uri(), language_id="ck3", version=1, text="b.0001 = {\n}\n"
+            )
+        )
+
+        result = await server.validate_workspace_files([str(tmp_path)])
+
+        published = {
+            call.args[0].uri: call.args[0].diagnostics
+            for call in server.text_document_publish_diagnostics.call_args_list
+        }
+        assert list(published) == [closed.as_uri()]
+        assert "Unknown effect: 'my_effect'" in [d.message for d in published[closed.as_uri()]]
+        assert result.files == 3
+        assert not result.cancelled
+
+        # Fixed files are cleared by the next run
+        closed.write_text("")
+        server.text_document_publish_diagnostics.reset_mock()
+        await server.validate_workspace_files([str(tmp_path)])
+
+        cleared = server.text_document_publish_diagnostics.call_args.args[0]
+        assert (cleared.uri, cleared.diagnostics) == (closed.as_uri(), [])
+        assert server._workspace_diagnostic_uris == set()
+
+
+class TestPullDiagnostics:
+    """Tests for textDocument/diagnostic and workspace/diagnostic."""
+
+    @staticmethod
+    def _pull_server():
+        from unittest.mock import MagicMock
+
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server.protocol.client_capabilities = types.ClientCapabilities(
+            text_document=types.TextDocumentClientCapabilities(
+                diagnostic=types.DiagnosticClientCapabilities()
+            ),
+            workspace=types.WorkspaceClientCapabilities(
+                diagnostics=types.DiagnosticWorkspaceClientCapabilities(refresh_support=True)
+            ),
+        )
+        server._workspace_scanned = True
+        server._revalidation_delay = 0.01
+        server._validate_process_workers = 0
+        server.text_document_publish_diagnostics = MagicMock()
+        server.workspace_diagnostic_refresh = MagicMock()
+        return server
+
+    async def test_document_pull_reports_unchanged_results(self):
+        """Pulls return result IDs; unchanged results come without diagnostics."""
+        from pychivalry.parser import parse_document
+        from pychivalry.server import document_diagnostic
+
+        server = self._pull_server()
+        assert server.pulls_diagnostics
+        uri = "file:///mod/events/user.txt"
+        source = "namespace = a\na.0001 = {\n    immediate = { my_effect = yes }\n}\n"
+        server.workspace.put_text_document(
+            types.TextDocumentItem(uri=uri, language_id="ck3", version=1, text=source)
+        )
+        server.parse_and_index_document(server.workspace.get_text_document(uri))
+
+        def params(previous_result_id=None):
+            return types.DocumentDiagnosticParams(
+                text_document=types.TextDocumentIdentifier(uri=uri),
+                previous_result_id=previous_result_id,
+            )
+
+        first = await document_diagnostic(server, params())
+        assert first.kind == "full"
+        assert "Unknown effect: 'my_effect'" in [d.message for d in first.items]
+        second = await document_diagnostic(server, params(first.result_id))
+        assert (second.kind, second.result_id) == ("unchanged", first.result_id)
+
+        # A definition elsewhere asks the client to pull again, with a new result
+        effects = "my_effect = { add_gold = 1 }\n"
+        server.index_document(
+            "file:///mod/common/scripted_effects/e.txt", parse_document(effects), effects
+        )
+        await asyncio.sleep(0.2)
+        server.workspace_diagnostic_refresh.assert_called_once()
+        third = await document_diagnostic(server, params(first.result_id))
+        assert third.kind == "full"
+        assert "Unknown effect: 'my_effect'" not in [d.message for d in third.items]
+
+        # Nothing is pushed to a pulling client
+        server.text_document_publish_diagnostics.assert_not_called()
+
+    async def test_document_pull_waits_for_pending_update(self):
+        """A pull after an edit reports the edited text, without pushing."""
+        server = self._pull_server()
+        uri = "file:///mod/events/user.txt"
+        server.workspace.put_text_document(
+            types.TextDocumentItem(uri=uri, language_id="ck3", version=1, text="a = {\n")
+        )
+        doc = server.workspace.get_text_document(uri)
+        server.parse_and_index_document(doc)
+        before = await server.pull_document_diagnostics(uri)
+        assert before.diagnostics
+
+        server.workspace.put_text_document(
+            types.TextDocumentItem(uri=uri, language_id="ck3", version=2, text="a = yes\n")
+        )
+        await server.schedule_document_update(uri, "a = yes\n")
+        after = await server.pull_document_diagnostics(uri)
+
+        assert after.diagnostics == []
+        assert after.result_id != before.result_id
+        server.text_document_publish_diagnostics.assert_not_called()
+
+    @pytest.mark.parametrize("options", [None, {"workspaceDiagnostics": True}])
+    def test_workspace_diagnostics_are_opt_in(self, options):
+        """workspace/diagnostic is only served when the initialization options ask for it."""
+        from pychivalry.server import document_diagnostic
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.feature(
+            types.TEXT_DOCUMENT_DIAGNOSTIC,
+            types.DiagnosticOptions(inter_file_dependencies=True, workspace_diagnostics=False),
+        )(document_diagnostic)
+        handler = server.protocol.lsp_initialize(
+            types.InitializeParams(
+                capabilities=types.ClientCapabilities(), initialization_options=options
+            )
+        )
+        with pytest.raises(StopIteration) as finished:
+            while True:
+                next(handler)
+
+        enabled = options is not None
+        provider = finished.value.value.capabilities.diagnostic_provider
+        assert provider.workspace_diagnostics is enabled
+        assert (types.WORKSPACE_DIAGNOSTIC in server.protocol.fm.features) is enabled
+
+    async def test_workspace_pull_reuses_unchanged_files(self, tmp_path):
+        """Closed files keep their result until they change; partial results are streamed."""
+        from unittest.mock import MagicMock
+
+        from pychivalry.server import workspace_diagnostic
+
+        (tmp_path / "events").mkdir()
+        broken = tmp_path / "events" / "broken.txt"
+        broken.write_text("namespace = a\na.0001 = {\n\timmediate = { my_effect = yes }\n}\n")
+        clean = tmp_path / "events" / "clean.txt"
+        clean.write_text("namespace = b\n")
+        server = self._pull_server()
+        server.workspace.add_folder(types.WorkspaceFolder(uri=tmp_path.as_uri(), name="mod"))
+
+        reports = []
+        await server.pull_workspace_diagnostics([str(tmp_path)], {}, reports.extend)
+        by_uri = {report.uri: report for report in reports}
+        assert sorted(by_uri) == sorted([broken.as_uri(), clean.as_uri()])
+        assert "Unknown effect: 'my_effect'" in [d.message for d in by_uri[broken.as_uri()].items]
+
+        # Unchanged files are reported as unchanged, changed ones in full
+        previous = {report.uri: report.result_id for report in reports}
+        broken.write_text("namespace = a\n")
+        server.protocol.notify = MagicMock()
+        response = await workspace_diagnostic(
+            server,
+            types.WorkspaceDiagnosticParams(
+                previous_result_ids=[
+                    types.PreviousResultId(uri=uri, value=value) for uri, value in previous.items()
+                ],
+                partial_result_token="partial",
+            ),
+        )
+
+        assert response.items == []
+        streamed = {
+            report.uri: report.kind
+            for call in server.protocol.notify.call_args_list
+            for report in call.args[1].value.items
+        }
+        assert streamed == {broken.as_uri(): "full", clean.as_uri(): "unchanged"}
+
+
+class TestPreparse:
+    """Tests for pre-parsing files related to opened documents."""
+
+    def test_related_files(self):
+        """Definitions of used effects and mentioned events are related."""
+        from pychivalry.document_buffer import BufferedWorkspace
+        from pychivalry.parser import parse_document
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        effects_uri = "file:///mod/common/scripted_effects/e.txt"
+        events_uri = "file:///mod/events/b.txt"
+        for uri, source in (
+            (effects_uri, "my_effect = { add_gold = 1 }\n"),
+            (events_uri, "namespace = b\nb.0001 = {\n}\n"),
+        ):
+            server.index_document(uri, parse_document(source), source)
+
+        source = (
+            "a.0001 = {\n    immediate = {\n        trigger_event = b.0001\n"
+            "        my_effect = yes\n        a.0001 = yes\n    }\n}\n"
+        )
+        related = server.related_files("file:///mod/events/a.txt", parse_document(source))
+
+        assert related == [events_uri, effects_uri]
+
+    async def test_queue_is_drained_into_ast_cache(self, tmp_path):
+        """Queued files are parsed in the background and cached."""
+        from pychivalry.document_buffer import BufferedWorkspace
+
+        source = "my_effect = {\n    add_gold = 10\n}\n"
+        path = tmp_path / "effects.txt"
+        path.write_text(source)
+
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.protocol._workspace = BufferedWorkspace(None)
+        server._preparse_idle_delay = 0.01
+        server.queue_preparse([path.as_uri(), (tmp_path / "missing.txt").as_uri()])
+        for _ in range(100):
+            if not server._preparse_scheduled:
+                break
+            await asyncio.sleep(0.02)
+
+        assert not server._preparse_scheduled
+        assert server._preparse_queue == []
+        assert server.get_cached_ast(source) is not None
+        assert server._scheduler.stats()["background"]["completed"] == 2
+
+
+class TestIndexSnapshots:
+    """Tests for lock-free index snapshots in the server."""
+
+    def test_update_publishes_new_version(self):
+        """Index updates publish a new version and leave old snapshots unchanged."""
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server.parse_and_index_document(
+            TextDocument(uri="file:///a.txt", source="namespace = a\na.0001 = { }")
+        )
+        snapshot = server.index
+
+        server.parse_and_index_document(
+            TextDocument(uri="file:///b.txt", source="namespace = b\nb.0001 = { }")
+        )
+
+        assert server.index is not snapshot
+        assert "b.0001" in server.index.events
+        assert "b.0001" not in snapshot.events
+
+    def test_scan_does_not_block_readers_or_writers(self, tmp_path, monkeypatch):
+        """Updates made during a scan are kept, and the old index serves reads meanwhile."""
+        import threading
+
+        from pychivalry.indexer import DocumentIndex
+
+        (tmp_path / "events").mkdir()
+        (tmp_path / "events" / "disk.txt").write_text("disk.0001 = {\n}\n")
+
+        scan_started = threading.Event()
+        finish_scan = threading.Event()
+        original_scan = DocumentIndex.scan_workspace
+
+        def slow_scan(self, *args, **kwargs):
+            scan_started.set()
+            assert finish_scan.wait(5)
+            return original_scan(self, *args, **kwargs)
+
+        monkeypatch.setattr(DocumentIndex, "scan_workspace", slow_scan)
+        server = CK3LanguageServer("test-server", "v0.1.0")
+        server._use_index_cache = False
+        scanner = threading.Thread(target=server.scan_index, args=([str(tmp_path)],))
+        scanner.start()
+        assert scan_started.wait(5)
+
+        # Writers and readers proceed while the scan is running
+        server.parse_and_index_document(
+            TextDocument(uri="file:///open.txt", source="open.0001 = { }")
+        )
+        assert "open.0001" in server.index.events
+
+        finish_scan.set()
+        scanner.join(5)
+
+        assert "disk.0001" in server.index.events
+        assert "open.0001" in server.index.events
+
 
 class TestServerWithRealFixtures:
     """Integration tests with real fixture files."""
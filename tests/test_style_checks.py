@@ -24,6 +24,7 @@ from pychivalry.style_checks import (
     check_empty_blocks,
     check_namespace_position,
     StyleConfig,
+    StyleScanner,
 )
 
 
@@ -382,3 +383,56 @@ rq_gender_test.0001 = {
 
         spacing_diags = [d for d in diagnostics if d.code == "CK3306"]
         assert len(spacing_diags) == 0
+
+
+def _keys(diagnostics):
+    return [(d.code, d.range.start.line, d.range.start.character, d.message) for d in diagnostics]
+
+
+class TestStyleScanner:
+    """Incremental scans give the same results as fresh ones."""
+
+    def _source(self, count=40):
+        lines = ["namespace = test"]
+        for i in range(count):
+            lines += [f"test.{i:04d} = {{", "\ttrigger = {", "\t\tadd_gold = 10", "\t}", "}"]
+        return lines
+
+    def test_unchanged_lines_are_not_scanned_again(self):
+        scanner = StyleScanner()
+        config = StyleConfig()
+        lines = self._source()
+        scanner.run(lines, config)
+        scanned = scanner.lines_scanned
+
+        lines[100] = "\t\tadd_gold=10   "
+        scanner.run(lines, config)
+
+        assert scanner.lines_scanned == scanned + 1
+
+    @pytest.mark.parametrize(
+        "edit",
+        [
+            lambda lines: lines.__setitem__(150, "\t\tkey=value {"),
+            lambda lines: lines.insert(3, "extra = {"),
+            lambda lines: lines.__delitem__(slice(2, 40)),
+            lambda lines: lines.append("}"),
+            lambda lines: lines.__setitem__(0, "key = value"),
+        ],
+    )
+    def test_incremental_matches_fresh_scan(self, edit):
+        scanner = StyleScanner()
+        config = StyleConfig()
+        lines = self._source()
+        scanner.run(lines, config)
+
+        edit(lines)
+
+        assert _keys(scanner.run(lines, config)) == _keys(StyleScanner().run(lines, config))
+
+    def test_config_change_starts_over(self):
+        scanner = StyleScanner()
+        lines = ["a = { b = { c = { d = yes } } }"]
+        assert not scanner.run(lines, StyleConfig())
+        codes = [d.code for d in scanner.run(lines, StyleConfig(max_nesting_depth=2))]
+        assert codes == ["CK3317"]
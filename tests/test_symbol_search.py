@@ -0,0 +1,149 @@
+"""
+Tests for the workspace symbol search index.
+
+Searches must rank matches consistently, and incremental add/remove (including
+the rebuild of the overlay) must return the same results as a fresh index.
+"""
+
+import pytest
+
+from pychivalry import symbol_search
+from pychivalry.symbol_search import SymbolSearchIndex, match_score, word_starts
+
+SYMBOLS = [
+    ("events", "my_mod.0001"),
+    ("events", "my_mod.0002"),
+    ("events", "other_mod.0001"),
+    ("scripted_effects", "my_mod_effect"),
+    ("scripted_effects", "give_gold_effect"),
+    ("scripted_triggers", "isAdultRuler"),
+    ("on_action_definitions", "on_birth_child"),
+]
+
+
+class TestMatching:
+    """Tests for word splitting and scoring."""
+
+    def test_word_starts(self):
+        """Words split at separators, camel humps and digit runs."""
+        assert word_starts("my_mod.0001") == [0, 3, 7]
+        assert word_starts("isAdultRuler") == [0, 2, 7]
+        assert word_starts("trait12x") == [0, 5, 7]
+        assert word_starts("__") == []
+
+    def test_score_tiers(self):
+        """Stronger kinds of match score higher."""
+        scores = [
+            match_score("my_mod_effect", "my_mod_effect"),  # exact
+            match_score("my_mod", "my_mod_effect"),  # prefix
+            match_score("effect", "my_mod_effect"),  # word prefix
+            match_score("ffec", "my_mod_effect"),  # substring
+            match_score("mme", "my_mod_effect"),  # initials
+            match_score("mdeff", "my_mod_effect"),  # subsequence
+        ]
+        assert scores == sorted(scores, reverse=True)
+        assert len(set(scores)) == len(scores)
+        assert match_score("xyz", "my_mod_effect") is None
+
+    def test_fuzzy_prefers_word_starts(self):
+        """Subsequences that hit word starts outrank scattered ones."""
+        assert match_score("gge", "give_gold_effect") > match_score("ivd", "give_gold_effect")
+
+
+class TestSymbolSearchIndex:
+    """Tests for SymbolSearchIndex."""
+
+    def test_ranked_results(self):
+        """Results are ordered by score, then shorter names."""
+        search = SymbolSearchIndex(SYMBOLS)
+
+        assert search.search("my_mod")[:3] == [
+            ("events", "my_mod.0001"),
+            ("events", "my_mod.0002"),
+            ("scripted_effects", "my_mod_effect"),
+        ]
+        assert search.search("effect") == [
+            ("scripted_effects", "my_mod_effect"),
+            ("scripted_effects", "give_gold_effect"),
+        ]
+
+    def test_case_insensitive_and_camel_case(self):
+        """Queries ignore case and match camel case words and initials."""
+        search = SymbolSearchIndex(SYMBOLS)
+
+        assert search.search("RULER") == [("scripted_triggers", "isAdultRuler")]
+        assert search.search("iar") == [("scripted_triggers", "isAdultRuler")]
+
+    def test_fuzzy_match(self):
+        """Subsequences are found through shared trigrams."""
+        search = SymbolSearchIndex(SYMBOLS)
+
+        assert search.search("birthchld") == [("on_action_definitions", "on_birth_child")]
+
+    def test_limit(self):
+        """Only the best ``limit`` results are returned."""
+        search = SymbolSearchIndex(SYMBOLS)
+
+        assert search.search("mod", limit=2) == [
+            ("events", "my_mod.0001"),
+            ("events", "my_mod.0002"),
+        ]
+        assert search.search("mod", limit=0) == []
+
+    def test_empty_query_lists_top_symbols(self):
+        """An empty query returns the top ``limit`` symbols, shorter names first."""
+        search = SymbolSearchIndex(SYMBOLS)
+        search.add("events", "a.0001")
+        search.remove("scripted_triggers", "isAdultRuler")
+
+        assert search.search("", limit=4) == [
+            ("events", "a.0001"),
+            ("events", "my_mod.0001"),
+            ("events", "my_mod.0002"),
+            ("scripted_effects", "my_mod_effect"),
+        ]
+        assert search.search("  ") == search.search("")
+        assert len(search.search("")) == len(search)
+
+    def test_add_and_remove(self):
+        """Incremental changes are reflected in searches."""
+        search = SymbolSearchIndex(SYMBOLS)
+        search.add("events", "my_mod.0003")
+        search.remove("events", "my_mod.0001")
+
+        results = search.search("my_mod.000")
+        assert ("events", "my_mod.0003") in results
+        assert ("events", "my_mod.0001") not in results
+        assert len(search) == len(SYMBOLS)
+
+        search.add("events", "my_mod.0001")
+        assert ("events", "my_mod.0001") in search.search("my_mod.000")
+
+    def test_copy_is_independent(self):
+        """Changes to a copy do not affect the original."""
+        search = SymbolSearchIndex(SYMBOLS)
+        clone = search.copy()
+        clone.remove("scripted_effects", "my_mod_effect")
+        clone.add("events", "new_mod.0001")
+
+        assert ("scripted_effects", "my_mod_effect") in search
+        assert ("events", "new_mod.0001") not in search
+        assert clone.search("new_mod") == [("events", "new_mod.0001")]
+
+    @pytest.mark.parametrize("threshold", [0, 3, 1000])
+    def test_overlay_matches_fresh_index(self, monkeypatch, threshold):
+        """Searching after edits gives the same results as rebuilding from scratch."""
+        monkeypatch.setattr(symbol_search, "COMPACT_THRESHOLD", threshold)
+        search = SymbolSearchIndex(SYMBOLS)
+        live = list(SYMBOLS)
+        for n in range(10):
+            key = ("events", f"my_mod.{n + 10:04d}")
+            search.add(*key)
+            live.append(key)
+        for key in SYMBOLS[::2]:
+            search.remove(*key)
+            live.remove(key)
+
+        fresh = SymbolSearchIndex(live)
+        for query in ["", "my", "mod", "0001", "mme", "effect", "my_mod.001", "modeff"]:
+            assert search.search(query) == fresh.search(query), query
@@ -0,0 +1,121 @@
+"""
+Tests for workspace-wide validation.
+
+Validation in worker processes must report exactly what validating each
+file inline reports.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from pychivalry import workspace_validation
+from pychivalry.indexer import DocumentIndex
+from pychivalry.workspace_validation import find_script_files, validate_file, validate_files
+
+EVENT = """namespace = test_mod
+test_mod.{number:04d} = {{
+    type = character_event
+    immediate = {{ unknown_effect_{number} = yes }}
+}}
+"""
+
+
+@pytest.fixture
+def mod_root(tmp_path):
+    """A mod with a few event files and a hidden folder."""
+    (tmp_path / "events").mkdir()
+    for number in range(3):
+        (tmp_path / "events" / f"e{number}.txt").write_text(EVENT.format(number=number))
+    (tmp_path / "common" / "scripted_effects").mkdir(parents=True)
+    (tmp_path / "common" / "scripted_effects" / "effects.txt").write_text(
+        "my_effect = {\n\tadd_gold = 10\n}\n"
+    )
+    (tmp_path / ".pychivalry").mkdir()
+    (tmp_path / ".pychivalry" / "ignored.txt").write_text("a = {")
+    (tmp_path / "localization").mkdir()
+    (tmp_path / "localization" / "test_l_english.yml").write_text("l_english:\n")
+    return tmp_path
+
+
+def _index(root: Path) -> DocumentIndex:
+    index = DocumentIndex()
+    index.scan_workspace([str(root)])
+    return index
+
+
+class TestFindScriptFiles:
+    """Tests for listing the files to validate."""
+
+    def test_lists_txt_files_outside_hidden_folders(self, mod_root):
+        files = find_script_files([str(mod_root), str(mod_root / "missing")])
+
+        assert [path.relative_to(mod_root).as_posix() for path in files] == [
+            "common/scripted_effects/effects.txt",
+            "events/e0.txt",
+            "events/e1.txt",
+            "events/e2.txt",
+        ]
+
+
+class TestValidateFiles:
+    """Tests for validate_files()."""
+
+    def test_inline_results_and_summary(self, mod_root):
+        """Every file is validated and counted; on_batch gets the results."""
+        index = _index(mod_root)
+        files = find_script_files([str(mod_root)])
+        batches = []
+
+        result = validate_files(files, index, workers=0, on_batch=batches.append)
+
+        by_uri = {item.uri: item.diagnostics for batch in batches for item in batch}
+        assert set(by_uri) == {path.as_uri() for path in files}
+        for path in files:
+            assert by_uri[path.as_uri()] == validate_file(path, index)
+        assert result.files == 4
+        assert result.failed == 0
+        assert result.diagnostics == sum(len(d) for d in by_uri.values())
+        assert sum(result.by_code.values()) == result.diagnostics
+        assert sum(result.by_severity.values()) == result.diagnostics
+
+    def test_unreadable_files_are_counted_as_failed(self, mod_root):
+        files = [mod_root / "events" / "e0.txt", mod_root / "events" / "missing.txt"]
+
+        result = validate_files(files, None)
+
+        assert result.files == 1
+        assert result.failed == 1
+
+    def test_cancelled_before_start(self, mod_root):
+        files = find_script_files([str(mod_root)])
+        batches = []
+
+        result = validate_files(files, None, on_batch=batches.append, is_cancelled=lambda: True)
+
+        assert result.cancelled
+        assert result.files == 0
+        assert batches == []
+
+    def test_summary_orders_codes_by_count(self):
+        result = workspace_validation.WorkspaceValidationResult(
+            by_code={"B": 1, "A": 3, "C": 1}
+        )
+
+        assert list(result.to_dict()["by_code"]) == ["A", "B", "C"]
+
+    @pytest.mark.slow
+    def test_processes_match_inline(self, mod_root, monkeypatch):
+        """Worker processes report the same diagnostics as inline validation."""
+        monkeypatch.setattr(workspace_validation, "_MIN_PROCESS_FILES", 1)
+        index = _index(mod_root)
+        files = find_script_files([str(mod_root)])
+
+        inline, processed = [], []
+        validate_files(files, index, workers=0, on_batch=inline.extend)
+        result = validate_files(files, index, workers=2, on_batch=processed.extend)
+
+        assert sorted(processed, key=lambda item: item[0]) == sorted(
+            inline, key=lambda item: item[0]
+        )
+        assert result.files == len(files)
@@ -1098,6 +1098,7 @@ async function startServer(context: vscode.ExtensionContext): Promise<void> {
     const args = config.get<string[]>('args', []);
     const traceLevel = config.get<string>('trace.server', 'off');
     const logLevel = config.get<string>('logLevel', 'info');
+    const scanWorkers = config.get<number>('indexing.scanWorkers', 0);
 
     logger.logServer(`Server args: ${args.join(' ') || '(none)'}`);
     logger.logServer(`Log level: ${logLevel}`);
@@ -1107,7 +1108,15 @@ async function startServer(context: vscode.ExtensionContext): Promise<void> {
     // Server options
     const serverOptions: ServerOptions = {
         command: pythonPath,
-        args: ['-m', 'pychivalry.server', '--log-level', logLevel, ...args],
+        args: [
+            '-m',
+            'pychivalry.server',
+            '--log-level',
+            logLevel,
+            '--scan-workers',
+            String(scanWorkers),
+            ...args,
+        ],
         options: {
             env: { ...process.env },
         },